@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import argparse
+import logging
+from unittest import mock
+
+import redis
+
+from slurmweb.cache import CachingService, CacheKey
+from slurmweb.serialization import CacheSerializer, CODECS, COMPRESSIONS
+from slurmweb.errors import SlurmwebConfigurationError
+
+from .lib import load_slurmrestd_asset, scale_records, measure, report
+
+logger = logging.getLogger("run-benchmarks")
+
+
+def benchmark_cache_codecs(args: argparse.Namespace) -> None:
+    """Compare cache serialization codecs and compression algorithms on jobs and
+    nodes payloads."""
+    rounds, scale = args.rounds, args.scale
+    payloads = {
+        "jobs": scale_records(
+            load_slurmrestd_asset("slurm-jobs", "jobs"), scale, "job_id"
+        ),
+        "nodes": scale_records(
+            load_slurmrestd_asset("slurm-nodes", "nodes"), scale, "name"
+        ),
+    }
+    rows = []
+    for name, payload in payloads.items():
+        for codec in CODECS:
+            for compression in COMPRESSIONS:
+                try:
+                    serializer = CacheSerializer(codec.NAME, compression.NAME)
+                except SlurmwebConfigurationError as err:
+                    logger.warning(
+                        "Skipping %s/%s: %s", codec.NAME, compression.NAME, err
+                    )
+                    continue
+                data = serializer.dumps(payload)
+                rows.append(
+                    [
+                        name,
+                        codec.NAME,
+                        compression.NAME,
+                        len(data),
+                        measure(lambda: serializer.dumps(payload), rounds) * 1000,
+                        measure(lambda: serializer.loads(data), rounds) * 1000,
+                    ]
+                )
+    report(
+        f"Cache codecs ({scale} records)",
+        ["payload", "codec", "compression", "size (bytes)", "dumps (ms)", "loads (ms)"],
+        rows,
+    )
+
+
+# Keys counted in cache statistics by the agent
+COUNTED_KEYS = [
+    "version",
+    "jobs",
+    "individual-job",
+    "nodes",
+    "node",
+    "partitions",
+    "qos",
+    "reservations",
+    "accounts",
+    "associations",
+]
+
+
+class LegacyCachingService(CachingService):
+    """Caching service with counters layout of previous versions, with one Redis
+    key per counter and sets of counted keys, for comparison."""
+
+    def _count(self, prefix: str, key: CacheKey):
+        self.connection.sadd(f"{prefix}keys", key.count)
+        self.connection.incr(f"{prefix}{key.count}")
+        self.connection.incr(f"{prefix}total")
+
+    def count_miss(self, key: CacheKey):
+        self._count("cache-miss-", key)
+
+    def count_hit(self, key: CacheKey):
+        self._count("cache-hit-", key)
+
+    def count_coalesced(self, key: CacheKey):
+        self._count("cache-coalesced-", key)
+
+    def metrics(self):
+        result = []
+        for prefix in ["cache-hit-", "cache-miss-", "cache-coalesced-"]:
+            counters = {}
+            for _key in self.connection.smembers(f"{prefix}keys"):
+                _key = _key.decode()
+                value = self.connection.get(f"{prefix}{_key}")
+                if value:
+                    counters[_key] = int(value)
+            result.append(counters)
+        for prefix in ["cache-hit-", "cache-miss-", "cache-coalesced-"]:
+            result.append(int(self.connection.get(f"{prefix}total") or 0))
+        return tuple(result)
+
+    def reset(self):
+        for prefix in ["cache-hit-", "cache-miss-", "cache-coalesced-"]:
+            self.connection.set(f"{prefix}total", 0)
+            for _key in self.connection.smembers(f"{prefix}keys"):
+                self.connection.delete(f"{prefix}{_key.decode()}")
+            self.connection.delete(f"{prefix}keys")
+
+
+def _request_hit(service: CachingService, key: CacheKey) -> None:
+    """Redis operations of an agent request on data found in cache."""
+    service.get(key)
+    service.count_hit(key)
+
+
+def _request_miss(service: CachingService, key: CacheKey) -> None:
+    """Redis operations of an agent request on data missing in cache."""
+    service.get(key)
+    lock = service.lock(key, 30)
+    service.put(key, ["fake"], 30)
+    service.count_miss(key)
+    service.unlock(lock)
+
+
+def _scrape(service: CachingService, key: CacheKey) -> None:
+    """Redis operations to collect cache metrics."""
+    service.metrics()
+
+
+def _operations(service: CachingService, operation, key: CacheKey):
+    """Return the number of Redis commands and round-trips of the operation."""
+    commands = service.connection.info("stats")["total_commands_processed"]
+    with mock.patch.object(
+        redis.connection.Connection,
+        "send_packed_command",
+        autospec=True,
+        side_effect=redis.connection.Connection.send_packed_command,
+    ) as send:
+        operation(service, key)
+    # Remove the INFO command sent to retrieve the initial number of commands.
+    commands = (
+        service.connection.info("stats")["total_commands_processed"] - commands - 1
+    )
+    return commands, send.call_count
+
+
+def benchmark_cache_accounting(args: argparse.Namespace) -> None:
+    """Compare the number of Redis commands and round-trips, and the duration of
+    agent requests with the current cache statistics layout and the layout of
+    previous versions."""
+    rows = []
+    for layout, service_class in [
+        ("legacy", LegacyCachingService),
+        ("current", CachingService),
+    ]:
+        service = service_class(args.redis_host, args.redis_port, None)
+        try:
+            service.connection.ping()
+        except redis.exceptions.ConnectionError as err:
+            logger.error(
+                "Unable to connect to Redis server %s:%d: %s",
+                args.redis_host,
+                args.redis_port,
+                err,
+            )
+            return
+        # Populate statistics of all counted keys
+        service.reset()
+        for _key in COUNTED_KEYS:
+            service.count_hit(CacheKey(f"benchmark-{_key}", _key))
+            service.count_miss(CacheKey(f"benchmark-{_key}", _key))
+        key = CacheKey("benchmark-jobs", "jobs")
+        service.put(key, ["fake"], 30)
+        for name, operation in [
+            ("request hit", _request_hit),
+            ("request miss", _request_miss),
+            ("metrics", _scrape),
+        ]:
+            commands, round_trips = _operations(service, operation, key)
+            rows.append(
+                [
+                    name,
+                    layout,
+                    commands,
+                    round_trips,
+                    measure(lambda: operation(service, key), args.rounds) * 1000,
+                ]
+            )
+        service.reset()
+        service.connection.delete(key.main)
+    report(
+        f"Cache accounting ({len(COUNTED_KEYS)} counted keys)",
+        ["operation", "layout", "commands", "round-trips", "duration (ms)"],
+        rows,
+    )
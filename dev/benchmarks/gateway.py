@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import typing as t
+import argparse
+import json
+import asyncio
+import logging
+import shutil
+import socket
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import aiohttp
+import aiohttp.web
+import flask
+from rfl.core.asyncio import asyncio_run
+
+from slurmweb.sessions import AgentsSessions
+from slurmweb.views.gateway import (
+    AgentRequest,
+    open_agent_response,
+    stream_agent_response,
+)
+
+from .lib import load_slurmrestd_asset, scale_records, measure, report
+
+logger = logging.getLogger("run-benchmarks")
+
+# Number of threads sending requests simultaneously, as gateway workers.
+CONCURRENCIES = [1, 8]
+# Number of requests sent by each thread for every round.
+REQUESTS = 50
+
+
+class FakeAgent:
+    """Minimal HTTP server answering agent ping and jobs requests, running in a
+    dedicated thread."""
+
+    def __init__(
+        self, ssl_context: t.Optional[ssl.SSLContext] = None, jobs: bytes = b"[]"
+    ):
+        self.ssl_context = ssl_context
+        self.jobs = jobs
+        self.loop = asyncio.new_event_loop()
+        self.runner = None
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            self.port = sock.getsockname()[1]
+
+    @property
+    def url(self) -> str:
+        scheme = "https" if self.ssl_context else "http"
+        return f"{scheme}://localhost:{self.port}"
+
+    async def _ping(self, request):
+        return aiohttp.web.json_response({"cluster": "foo", "response": "pong"})
+
+    async def _jobs(self, request):
+        return aiohttp.web.Response(body=self.jobs, content_type="application/json")
+
+    async def _start(self):
+        app = aiohttp.web.Application()
+        app.router.add_get("/v6.0.0/ping", self._ping)
+        app.router.add_get("/v6.0.0/jobs", self._jobs)
+        self.runner = aiohttp.web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await aiohttp.web.TCPSite(
+            self.runner, "127.0.0.1", self.port, ssl_context=self.ssl_context
+        ).start()
+
+    def start(self) -> None:
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        asyncio.run_coroutine_threadsafe(self._start(), self.loop).result()
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.runner.cleanup(), self.loop).result()
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+def generate_certificate(path: Path) -> t.Optional[Path]:
+    """Generate self-signed certificate and key for localhost in the given directory
+    with openssl command. Return the path to the certificate, or None if openssl is
+    not available."""
+    if shutil.which("openssl") is None:
+        return None
+    cert, key = path / "cert.pem", path / "key.pem"
+    subprocess.run(
+        [
+            "openssl",
+            "req",
+            "-x509",
+            "-newkey",
+            "rsa:2048",
+            "-nodes",
+            "-days",
+            "1",
+            "-subj",
+            "/CN=localhost",
+            "-addext",
+            "subjectAltName=DNS:localhost",
+            "-keyout",
+            str(key),
+            "-out",
+            str(cert),
+        ],
+        check=True,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+    )
+    return cert
+
+
+def latencies(request: t.Callable[[], t.Any], concurrency: int, rounds: int):
+    """Return the list of latencies in seconds of all requests sent by the given
+    number of threads simultaneously."""
+
+    def worker():
+        results = []
+        for _ in range(REQUESTS):
+            start = time.perf_counter()
+            request()
+            results.append(time.perf_counter() - start)
+        return results
+
+    results = []
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(rounds):
+            for future in [executor.submit(worker) for _ in range(concurrency)]:
+                results.extend(future.result())
+    return results
+
+
+def percentiles(values: t.List[float]) -> t.Tuple[float, float]:
+    """Return 50th and 99th percentiles of values in milliseconds."""
+    values = sorted(values)
+    return (
+        values[int(len(values) * 0.50)] * 1000,
+        values[int(len(values) * 0.99)] * 1000,
+    )
+
+
+def benchmark_gateway_sessions(args: argparse.Namespace) -> None:
+    """Compare latency of requests to a local fake agent sent with a new event loop
+    and client session per request, as gateway did, or in the persistent event loop
+    of the gateway with a client session shared by all requests."""
+    rows = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        schemes = {"http": (None, None)}
+        cert = generate_certificate(Path(tmpdir))
+        if cert is None:
+            logger.warning("Skipping HTTPS agent: openssl command not found")
+        else:
+            server_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+            server_context.load_cert_chain(cert, Path(tmpdir) / "key.pem")
+            schemes["https"] = (
+                server_context,
+                ssl.create_default_context(cafile=str(cert)),
+            )
+        for scheme, (server_context, client_context) in schemes.items():
+            agent = FakeAgent(server_context)
+            agent.start()
+            url = f"{agent.url}/v6.0.0/ping"
+
+            def connector():
+                if client_context is None:
+                    return aiohttp.TCPConnector(limit=100, keepalive_timeout=15)
+                return aiohttp.TCPConnector(
+                    limit=100, keepalive_timeout=15, ssl=client_context
+                )
+
+            async def fresh():
+                async with aiohttp.ClientSession(connector=connector()) as session:
+                    async with session.get(url) as response:
+                        return await response.json()
+
+            sessions = AgentsSessions(connector)
+
+            async def shared():
+                async with sessions.session(agent.url).get(url) as response:
+                    return await response.json()
+
+            methods = {
+                "loop and session per request": lambda: asyncio_run(fresh()),
+                "persistent loop, shared session": lambda: sessions.run(shared()),
+            }
+            for concurrency in CONCURRENCIES:
+                for method, request in methods.items():
+                    # Warm up connections before measures
+                    request()
+                    p50, p99 = percentiles(latencies(request, concurrency, args.rounds))
+                    rows.append([scheme, concurrency, method, p50, p99])
+            sessions.stop()
+            agent.stop()
+    report(
+        f"Gateway requests to agent ({REQUESTS} requests × {args.rounds} rounds per "
+        "thread)",
+        ["scheme", "threads", "method", "p50 (ms)", "p99 (ms)"],
+        rows,
+    )
+
+
+def peak_memory(func: t.Callable) -> int:
+    """Return peak size in bytes of memory allocated by func, in all threads."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def benchmark_gateway_passthrough(args: argparse.Namespace) -> None:
+    """Compare duration and memory peak of gateway proxying of jobs from a local fake
+    agent, with agent response decoded and encoded again as gateway did, or
+    streamed to the client without being decoded."""
+    rounds, scale = args.rounds, args.scale
+    jobs = json.dumps(
+        scale_records(load_slurmrestd_asset("slurm-jobs", "jobs"), scale, "job_id")
+    ).encode()
+    agent = FakeAgent(jobs=jobs)
+    agent.start()
+    sessions = AgentsSessions(lambda: aiohttp.TCPConnector())
+    app = flask.Flask(__name__)
+    agent_request = AgentRequest(agent.url, "GET", f"{agent.url}/v6.0.0/jobs", {}, None)
+
+    async def decoded():
+        async with sessions.session(agent.url).get(agent_request.url) as response:
+            return await response.json()
+
+    def decode():
+        with app.app_context():
+            return flask.jsonify(sessions.run(decoded())).get_data()
+
+    def passthrough():
+        context, response = sessions.run(open_agent_response(sessions, agent_request))
+        return sum(
+            len(chunk) for chunk in stream_agent_response(sessions, context, response)
+        )
+
+    rows = []
+    for method, func in {
+        "decode and encode": decode,
+        "passthrough": passthrough,
+    }.items():
+        # Warm up connection before measures
+        func()
+        rows.append(
+            [
+                method,
+                measure(func, rounds) * 1000,
+                peak_memory(func) / 1024**2,
+            ]
+        )
+    sessions.stop()
+    agent.stop()
+    report(
+        f"Gateway proxy of jobs ({scale} jobs, {len(jobs) / 1024**2:.1f} MiB)",
+        ["method", "duration (ms)", "memory peak (MiB)"],
+        rows,
+    )
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import argparse
+import json
+import logging
+import pickle
+import random
+import typing as t
+
+from ClusterShell.NodeSet import NodeSet
+
+from slurmweb.slurmrestd import Slurmrestd
+from slurmweb.slurmrestd.memo import nodeset_expand
+from slurmweb.slurmrestd.jobs import (
+    JobsQuery,
+    select_jobs,
+    build_jobs_index,
+    select_jobs_in_index,
+)
+from slurmweb.slurmrestd.changes import build_snapshot_digests, snapshot_changes
+
+from .lib import measure, report
+
+logger = logging.getLogger("run-benchmarks")
+
+# Number of jobs per node in synthetic cluster
+JOBS_PER_NODE = 20
+# Number of node pages views measured
+VIEWS = 10
+# Number of users submitting jobs in synthetic cluster
+USERS = 500
+# Ratios of jobs modified between snapshots
+CHURNS = [0.001, 0.01, 0.1]
+
+
+def _optional_number(number: t.Optional[int]) -> t.Dict:
+    if number is None:
+        return {"set": False, "infinite": False, "number": 0}
+    return {"set": True, "infinite": False, "number": number}
+
+
+def _synthetic_jobs(nodes: int) -> t.List[t.Dict]:
+    """Return list of synthetic jobs on a cluster with the given number of nodes,
+    with pending, running and completed jobs allocated ranges of nodes, submitted
+    by a set of users in accounts, partitions and QOS."""
+    generator = random.Random(0)
+    # Separate generator for attributes, nodes allocations are not impacted.
+    attributes = random.Random(1)
+    width = len(str(nodes - 1))
+    jobs = []
+    for job_id in range(nodes * JOBS_PER_NODE):
+        state = generator.choices(
+            ["RUNNING", "PENDING", "COMPLETED", "COMPLETING"], [60, 25, 10, 5]
+        )[0]
+        if state == "PENDING":
+            allocated = ""
+        else:
+            first = generator.randrange(nodes)
+            last = min(first + generator.choice([0, 0, 0, 1, 3, 7]), nodes - 1)
+            allocated = str(NodeSet(f"cn[{first:0{width}d}-{last:0{width}d}]"))
+        jobs.append(
+            {
+                "job_id": job_id,
+                "nodes": allocated,
+                "job_state": [state],
+                "user_name": f"user{attributes.randrange(USERS)}",
+                "account": f"account{attributes.randrange(USERS // 10)}",
+                "partition": attributes.choice(["normal", "debug", "gpu"]),
+                "qos": attributes.choice(["normal", "high", "low"]),
+                "priority": _optional_number(attributes.randrange(1000)),
+                "node_count": _optional_number(
+                    len(nodeset_expand(allocated)) if allocated else None
+                ),
+                "cpus": _optional_number(attributes.choice([1, 4, 16, 64])),
+            }
+        )
+    return jobs
+
+
+def benchmark_jobs_by_node(args: argparse.Namespace) -> None:
+    """Compare duration of selection of jobs allocated to nodes, by parsing the
+    nodes of all jobs on every node page view and with the inverted index of jobs
+    by node, built once per jobs snapshot."""
+    nodes = args.scale
+    jobs = _synthetic_jobs(nodes)
+    width = len(str(nodes - 1))
+    names = [
+        f"cn{node:0{width}d}" for node in random.Random(1).sample(range(nodes), VIEWS)
+    ]
+    index = Slurmrestd._jobs_nodes_index(jobs)
+    for name in names:
+        if Slurmrestd._jobs_in_index(index, name) != Slurmrestd._jobs_on_node(
+            jobs, name
+        ):
+            logger.error("Jobs on node %s differ with inverted index", name)
+
+    def scan():
+        for name in names:
+            Slurmrestd._jobs_on_node(jobs, name)
+
+    def lookup():
+        for name in names:
+            Slurmrestd._jobs_in_index(index, name)
+
+    rounds = max(1, args.rounds // 5)
+    report(
+        f"jobs by node ({nodes} nodes, {len(jobs)} jobs, {VIEWS} node views)",
+        ["method", "duration (ms)", "cached size (bytes)"],
+        [
+            ["scan", measure(scan, rounds) * 1000, "-"],
+            [
+                "index build",
+                measure(lambda: Slurmrestd._jobs_nodes_index(jobs), rounds) * 1000,
+                len(pickle.dumps(index)),
+            ],
+            ["index lookup", measure(lookup, args.rounds) * 1000, "-"],
+        ],
+    )
+
+
+def benchmark_jobs_query(args: argparse.Namespace) -> None:
+    """Compare duration of selection of pages of jobs filtered and sorted, by
+    filtering and sorting all jobs on every request and with the index of jobs,
+    built once per jobs snapshot."""
+    jobs = _synthetic_jobs(args.scale)
+    index = build_jobs_index(jobs)
+    queries = [
+        ("first page", JobsQuery(page=1, limit=100)),
+        ("priority desc", JobsQuery("priority", "desc", page=1, limit=100)),
+        ("resources page 50", JobsQuery("resources", page=50, limit=100)),
+        (
+            "pending of user",
+            JobsQuery("user", filters={"states": {"pending"}, "users": {"user1"}}),
+        ),
+        (
+            "running in partition",
+            JobsQuery(
+                "priority",
+                "desc",
+                {"states": {"running"}, "partitions": {"gpu"}},
+                page=2,
+                limit=100,
+            ),
+        ),
+    ]
+    rows = [
+        [
+            "index build",
+            "-",
+            measure(lambda: build_jobs_index(jobs), max(1, args.rounds // 5)) * 1000,
+        ]
+    ]
+    for name, query in queries:
+        if select_jobs_in_index(index, query) != select_jobs(jobs, query):
+            logger.error("Results of query %s differ with index", name)
+        rows.append(
+            [
+                "select",
+                name,
+                measure(lambda: select_jobs(jobs, query), args.rounds) * 1000,
+            ]
+        )
+        rows.append(
+            [
+                "index select",
+                name,
+                measure(lambda: select_jobs_in_index(index, query), args.rounds) * 1000,
+            ]
+        )
+    report(
+        f"jobs queries ({len(jobs)} jobs)",
+        ["method", "query", "duration (ms)"],
+        rows,
+    )
+
+
+def _churned_jobs(jobs: t.List[t.Dict], churn: float) -> t.List[t.Dict]:
+    """Return new snapshot of jobs with the given ratio of jobs modified, a third of
+    them terminated and replaced by new jobs."""
+    generator = random.Random(2)
+    jobs = list(jobs)
+    last = max(job["job_id"] for job in jobs)
+    for position in generator.sample(range(len(jobs)), int(len(jobs) * churn)):
+        if generator.randrange(3):
+            jobs[position] = dict(jobs[position], job_state=["COMPLETING"])
+        else:
+            last += 1
+            jobs[position] = dict(jobs[position], job_id=last)
+    return jobs
+
+
+def benchmark_jobs_changes(args: argparse.Namespace) -> None:
+    """Compare size of responses with all jobs and with changes of jobs between
+    snapshots, for various ratios of modified jobs, with duration of computation of
+    snapshots fingerprints and changes."""
+    jobs = _synthetic_jobs(args.scale // JOBS_PER_NODE)
+    previous = build_snapshot_digests(jobs, "job_id")
+    rounds = max(1, args.rounds // 5)
+    rows = [
+        [
+            "fingerprint",
+            "-",
+            len(json.dumps(jobs)),
+            measure(lambda: build_snapshot_digests(jobs, "job_id"), rounds) * 1000,
+        ]
+    ]
+    for churn in CHURNS:
+        churned = _churned_jobs(jobs, churn)
+        current = build_snapshot_digests(churned, "job_id")
+        rows.append(
+            [
+                "changes",
+                f"{churn * 100:g}",
+                len(
+                    json.dumps(
+                        snapshot_changes(
+                            churned, "job_id", current, previous["digests"]
+                        )
+                    )
+                ),
+                measure(
+                    lambda: snapshot_changes(
+                        churned, "job_id", current, previous["digests"]
+                    ),
+                    args.rounds,
+                )
+                * 1000,
+            ]
+        )
+    report(
+        f"jobs changes ({len(jobs)} jobs)",
+        ["response", "churn (%)", "size (bytes)", "duration (ms)"],
+        rows,
+    )
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import typing as t
+import copy
+import json
+import time
+from pathlib import Path
+
+ASSETS = Path(__file__).parent.resolve() / ".." / ".." / "tests" / "assets"
+# Slurm and slurmrestd API versions of the assets used by benchmarks.
+SLURM_VERSION = "25.11"
+API_VERSION = "0.0.44"
+
+
+def load_slurmrestd_asset(name: str, key: str, api_version=API_VERSION) -> t.Any:
+    with open(
+        ASSETS / "slurmrestd" / SLURM_VERSION / api_version / f"{name}.json"
+    ) as f:
+        return json.load(f)[key]
+
+
+def scale_records(records: t.List[dict], count: int, key: str) -> t.List[dict]:
+    """Return a list of count records built by repeating the given records, with
+    unique values for the given key, to emulate large clusters."""
+    result = []
+    for idx in range(count):
+        record = copy.deepcopy(records[idx % len(records)])
+        if isinstance(record[key], int):
+            record[key] = idx
+        else:
+            record[key] = f"{record[key]}-{idx}"
+        result.append(record)
+    return result
+
+
+def measure(func: t.Callable, rounds: int) -> float:
+    """Return the minimal duration in seconds of func among the given number of
+    rounds."""
+    best = None
+    for _ in range(rounds):
+        start = time.perf_counter()
+        func()
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def measure_prepared(prepare: t.Callable, func: t.Callable, rounds: int) -> float:
+    """Return the minimal duration in seconds of func called with the result of
+    prepare among the given number of rounds. The duration of prepare is not
+    measured."""
+    best = None
+    for _ in range(rounds):
+        data = prepare()
+        start = time.perf_counter()
+        func(data)
+        duration = time.perf_counter() - start
+        if best is None or duration < best:
+            best = duration
+    return best
+
+
+def report(title: str, headers: t.List[str], rows: t.List[t.List[t.Any]]) -> None:
+    """Print a table with the results of a benchmark."""
+
+    def cell(value):
+        if isinstance(value, float):
+            return f"{value:.3f}"
+        return str(value)
+
+    rows = [[cell(value) for value in row] for row in rows]
+    widths = [
+        max(len(header), *(len(row[idx]) for row in rows))
+        for idx, header in enumerate(headers)
+    ]
+    print(f"\n{title}\n")
+    print("  ".join(header.ljust(width) for header, width in zip(headers, widths)))
+    print("  ".join("-" * width for width in widths))
+    for row in rows:
+        print("  ".join(value.ljust(width) for value, width in zip(row, widths)))
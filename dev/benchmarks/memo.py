@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import argparse
+
+from slurmweb.slurmrestd.memo import (
+    nodeset_expand,
+    gres_gpus,
+    memo_metrics,
+    memo_reset,
+)
+
+from .jobs import _synthetic_jobs
+from .lib import load_slurmrestd_asset, scale_records, measure, report
+
+
+def benchmark_memo(args: argparse.Namespace) -> None:
+    """Compare duration of nodesets expansion of jobs and GRES parsing of nodes
+    without and with memoization, with the resulting hit rate of memoization
+    caches."""
+    jobs = [job["nodes"] for job in _synthetic_jobs(args.scale // 10)]
+    nodes = [
+        gres
+        for node in scale_records(
+            load_slurmrestd_asset("slurm-nodes", "nodes"), args.scale, "name"
+        )
+        for gres in (node["gres"], node["gres_used"])
+    ]
+    rows = []
+    for name, func, values in [
+        ("nodeset", nodeset_expand, jobs),
+        ("gres", gres_gpus, nodes),
+    ]:
+
+        def parse():
+            for value in values:
+                func.__wrapped__(value)
+
+        def memoized():
+            for value in values:
+                func(value)
+
+        memo_reset()
+        durations = [measure(parse, args.rounds), measure(memoized, args.rounds)]
+        hits, misses = memo_metrics()
+        rows.append(
+            [
+                name,
+                len(values),
+                durations[0] * 1000,
+                durations[1] * 1000,
+                hits[name] / (hits[name] + misses[name]) * 100,
+            ]
+        )
+    report(
+        f"nodesets and GRES memoization ({args.scale} records)",
+        ["helper", "calls", "parse (ms)", "memoized (ms)", "hit rate (%)"],
+        rows,
+    )
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+#
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import argparse
+import json
+import logging
+import tracemalloc
+import typing as t
+from pathlib import Path
+
+from rfl.settings import RuntimeSettings
+
+from slurmweb.slurmrestd import Slurmrestd, SlurmrestdFiltered
+from slurmweb.slurmrestd.adapters import AdaptationChain, build_adaptation_chain
+from slurmweb.slurmrestd.stream import SlurmrestdProjection, IteratorReader, load_ijson
+from slurmweb.errors import SlurmwebConfigurationError
+
+from .lib import (
+    load_slurmrestd_asset,
+    scale_records,
+    measure,
+    measure_prepared,
+    report,
+)
+
+logger = logging.getLogger("run-benchmarks")
+
+AGENT_SETTINGS_DEFINITION = (
+    Path(__file__).parent.resolve() / ".." / ".." / "conf" / "vendor" / "agent.yml"
+)
+
+
+def _chunks(data: bytes) -> t.Iterator[bytes]:
+    """Return iterator over chunks of data, as received from slurmrestd."""
+    size = Slurmrestd.STREAMING_CHUNK_SIZE
+    return (data[idx : idx + size] for idx in range(0, len(data), size))
+
+
+def _full_parse(data: bytes, key: str, selection: t.List[str]) -> t.Any:
+    return SlurmrestdFiltered.filter_fields(json.loads(data)[key], selection)
+
+
+def _streaming_parse(ijson, data: bytes, key: str, selection: t.List[str]) -> t.Any:
+    return SlurmrestdProjection(ijson, key, selection).parse(
+        IteratorReader(_chunks(data))
+    )[key]
+
+
+def _peak_memory(func: t.Callable) -> int:
+    """Return the peak of memory allocated by func in bytes."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _filters():
+    return RuntimeSettings.yaml_definition(AGENT_SETTINGS_DEFINITION).filters
+
+
+def benchmark_slurmrestd_parse(args: argparse.Namespace) -> None:
+    """Compare duration and peak memory of slurmrestd responses parsing, with full
+    parse followed by filtering of records fields and streaming parse with
+    projection of records on selected fields."""
+    try:
+        ijson = load_ijson()
+    except SlurmwebConfigurationError as err:
+        logger.error("Unable to run benchmark: %s", err)
+        return
+    filters = _filters()
+    rows = []
+    for key, asset, identifier in [
+        ("jobs", "slurm-jobs", "job_id"),
+        ("nodes", "slurm-nodes", "name"),
+    ]:
+        data = json.dumps(
+            {
+                key: scale_records(
+                    load_slurmrestd_asset(asset, key), args.scale, identifier
+                ),
+                "errors": [],
+                "warnings": [],
+            }
+        ).encode()
+        selection = getattr(filters, key)
+        for parser, func in [
+            ("full", lambda: _full_parse(data, key, selection)),
+            ("streaming", lambda: _streaming_parse(ijson, data, key, selection)),
+        ]:
+            rows.append(
+                [
+                    key,
+                    parser,
+                    len(data),
+                    measure(func, args.rounds) * 1000,
+                    _peak_memory(func) // 1024**2,
+                ]
+            )
+    report(
+        f"slurmrestd responses parsing ({args.scale} records)",
+        ["payload", "parser", "size (bytes)", "duration (ms)", "peak memory (MiB)"],
+        rows,
+    )
+
+
+def benchmark_slurmrestd_adaptation(args: argparse.Namespace) -> None:
+    """Compare duration of adaptation of slurmrestd responses from the oldest
+    supported API version to the latest version, with adapters run successively
+    on all records (chained), with all adapters fused in a single pass on records
+    (fused) and with records projected on selected fields before fused adaptation
+    (projected). Results of all pipelines are checked to be identical."""
+    versions = ["0.0.44", "0.0.43", "0.0.42", "0.0.41"]
+    adapters = build_adaptation_chain(versions[-1], versions[0], versions)
+    filters = _filters()
+    rows = []
+    for name, component, key, asset, identifier, selection in [
+        ("jobs", "slurm", "jobs", "slurm-jobs", "job_id", filters.jobs),
+        ("ctldjob", "slurm", "jobs", "slurm-jobs", "job_id", filters.ctldjob),
+        (
+            "acctjob",
+            "slurmdb",
+            "jobs",
+            "slurmdb-job-running",
+            "job_id",
+            filters.acctjob,
+        ),
+        ("qos", "slurmdb", "qos", "slurm-qos", "name", filters.qos),
+    ]:
+        data = json.dumps(
+            scale_records(
+                load_slurmrestd_asset(asset, key, versions[-1]), args.scale, identifier
+            )
+        )
+        # Create a new chain for every payload to measure compilation of fused
+        # transforms.
+        chain = AdaptationChain(adapters)
+
+        def chained(records):
+            for adapter in adapters:
+                records = adapter.adapt(component, key, records)
+            return Slurmrestd.filter_fields(records, selection)
+
+        def fused(records):
+            return Slurmrestd.filter_fields(
+                chain.adapt(component, key, records), selection
+            )
+
+        def projected(records):
+            Slurmrestd.filter_fields(
+                records, chain.selections(component, key, selection)[0]
+            )
+            return Slurmrestd.filter_fields(
+                chain.adapt(component, key, records, selection), selection
+            )
+
+        pipelines = [("chained", chained), ("fused", fused), ("projected", projected)]
+        reference = chained(json.loads(data))
+        for pipeline, func in pipelines:
+            if func(json.loads(data)) != reference:
+                logger.error(
+                    "Results of %s pipeline differ on %s payload", pipeline, name
+                )
+            rows.append(
+                [
+                    name,
+                    pipeline,
+                    measure_prepared(lambda: json.loads(data), func, args.rounds)
+                    * 1000,
+                ]
+            )
+    report(
+        f"slurmrestd responses adaptation {versions[-1]} → {versions[0]} "
+        f"({args.scale} records)",
+        ["payload", "pipeline", "duration (ms)"],
+        rows,
+    )
@@ -13,9 +13,17 @@ import {
   PermissionError,
   CanceledRequestError
 } from '@/composables/HTTPErrors'
-import { useGatewayAPI } from '@/composables/GatewayAPI'
-import type { GatewayAnyClusterApiKey } from '@/composables/GatewayAPI'
+import { useGatewayAPI, applyClusterRecordsChanges } from '@/composables/GatewayAPI'
+import type {
+  GatewayAnyClusterApiKey,
+  ClusterRecordsChanges,
+  ClusterEventsResource,
+  ClusterJob,
+  ClusterNode
+} from '@/composables/GatewayAPI'
+import type { ServerSentEvent } from '@/composables/ServerSentEvents'
 import { useRuntimeStore } from '@/stores/runtime'
+import { useRuntimeConfiguration } from '@/plugins/runtimeConfiguration'
 import { useErrorsHandler } from '@/composables/ErrorsHandler'
 
 export interface ClusterDataPoller<ResponseType> {
@@ -41,18 +49,96 @@ export function useClusterDataPoller<Type>(
   let _stop: boolean = false
   const gateway = useGatewayAPI()
   const runtime = useRuntimeStore()
+  const runtimeConfiguration = useRuntimeConfiguration()
   const { reportAuthenticationError, reportPermissionError } = useErrorsHandler()
   let _timeout: number = -1
+  /* Version of the snapshot of records in data, for APIs whose changes are polled
+   * instead of all records, or identifier of the last event received in events
+   * streams. */
+  let version: string | undefined = undefined
 
   function reportOtherError(error: Error) {
     runtime.reportError(`Server error: ${error.message}`)
     unable.value = true
   }
 
+  function applyChanges<RecordType extends object>(
+    changes: ClusterRecordsChanges<RecordType>,
+    identifier: keyof RecordType
+  ) {
+    data.value = applyClusterRecordsChanges(
+      data.value as RecordType[] | undefined,
+      changes,
+      identifier
+    ) as Type
+    version = changes.version
+  }
+
+  function handleError(error: unknown) {
+    if (error instanceof AuthenticationError) {
+      reportAuthenticationError(error)
+    } else if (error instanceof PermissionError) {
+      reportPermissionError(error)
+      stop()
+      unable.value = true
+    } else if (!(error instanceof CanceledRequestError) && error instanceof Error) {
+      /* Ignore canceled requests errors */
+      reportOtherError(error)
+    }
+  }
+
+  /* Return the resource whose updates are pushed by gateway in events stream for
+   * the current callback, or undefined if the data must be polled. */
+  function eventsResource(): ClusterEventsResource | undefined {
+    if (!runtimeConfiguration.events) return undefined
+    if (callback == 'jobs' && otherParam === undefined) return 'jobs'
+    if (callback == 'nodes') return 'nodes'
+    if (callback == 'stats') return 'stats'
+    return undefined
+  }
+
+  function onEvent(event: ServerSentEvent) {
+    if (event.event == 'failure') {
+      reportOtherError(new Error(JSON.parse(event.data).description))
+      return
+    }
+    unable.value = false
+    if (event.event == 'changes' && callback == 'jobs') {
+      applyChanges(JSON.parse(event.data) as ClusterRecordsChanges<ClusterJob>, 'job_id')
+    } else if (event.event == 'changes') {
+      applyChanges(JSON.parse(event.data) as ClusterRecordsChanges<ClusterNode>, 'name')
+    } else {
+      data.value = JSON.parse(event.data) as Type
+      version = event.id
+    }
+    loaded.value = true
+  }
+
+  async function listen(resource: ClusterEventsResource) {
+    try {
+      unable.value = false
+      await gateway.events(cluster, resource, onEvent, version)
+      /* The stream is closed by gateway after a maximum duration, reconnect
+       * immediately. */
+      if (!_stop) _timeout = window.setTimeout(start, 0)
+    } catch (error) {
+      /* The stream is canceled when the poller is stopped or restarted */
+      if (error instanceof CanceledRequestError) return
+      handleError(error)
+      if (!_stop) _timeout = window.setTimeout(start, timeout)
+    }
+  }
+
   async function poll() {
     try {
       unable.value = false
-      if (gateway.isValidGatewayClusterWithStringAPIKey(callback)) {
+      /* Poll changes of jobs and nodes since the last snapshot, so that transfer
+       * and rendering costs depend on the number of modified records. */
+      if (callback == 'jobs' && otherParam === undefined) {
+        applyChanges(await gateway.jobs_changes(cluster, version), 'job_id')
+      } else if (callback == 'nodes') {
+        applyChanges(await gateway.nodes_changes(cluster, version), 'name')
+      } else if (gateway.isValidGatewayClusterWithStringAPIKey(callback)) {
         data.value = (await gateway[callback](cluster, otherParam as string)) as Type
       } else if (gateway.isValidGatewayClusterWithNumberAPIKey(callback)) {
         data.value = (await gateway[callback](cluster, otherParam as number)) as Type
@@ -62,22 +148,18 @@ export function useClusterDataPoller<Type>(
 
       loaded.value = true
     } catch (error) {
-      if (error instanceof AuthenticationError) {
-        reportAuthenticationError(error)
-      } else if (error instanceof PermissionError) {
-        reportPermissionError(error)
-        stop()
-        unable.value = true
-      } else if (!(error instanceof CanceledRequestError) && error instanceof Error) {
-        /* Ignore canceled requests errors */
-        reportOtherError(error)
-      }
+      handleError(error)
     }
   }
 
   async function start() {
     console.log(`Start polling ${callback} on cluster ${cluster}`)
     _stop = false
+    const resource = eventsResource()
+    if (resource !== undefined) {
+      await listen(resource)
+      return
+    }
     await poll()
     if (!_stop) {
       _timeout = window.setTimeout(start, timeout, cluster)
@@ -95,6 +177,7 @@ export function useClusterDataPoller<Type>(
     stop()
     cluster = newCluster
     loaded.value = false
+    version = undefined
     start()
   }
 
@@ -102,6 +185,7 @@ export function useClusterDataPoller<Type>(
     stop()
     callback = newCallback
     loaded.value = false
+    version = undefined
     start()
   }
 
@@ -109,6 +193,7 @@ export function useClusterDataPoller<Type>(
     stop()
     otherParam = newOtherParam
     loaded.value = false
+    version = undefined
     start()
   }
 
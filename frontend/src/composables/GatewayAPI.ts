@@ -10,6 +10,7 @@ import { useRESTAPI } from '@/composables/RESTAPI'
 import type { AxiosResponse } from 'axios'
 import { useRuntimeConfiguration } from '@/plugins/runtimeConfiguration'
 import { AuthenticationError, APIServerError } from '@/composables/HTTPErrors'
+import type { ServerSentEvent } from '@/composables/ServerSentEvents'
 import type { JobSortCriterion, JobSortOrder } from '@/stores/runtime/jobs'
 
 interface loginIdents {
@@ -803,6 +804,42 @@ export function renderWalltime(value: ClusterOptionalNumber): string {
   return result
 }
 
+/* Changes of records since a snapshot version, as returned by agents changes
+ * endpoints. When full is true, the snapshot version is unknown by the agent and
+ * all records are added. */
+export interface ClusterRecordsChanges<RecordType> {
+  version: string
+  full: boolean
+  added: RecordType[]
+  modified: RecordType[]
+  removed: string[]
+}
+
+/* Return the list of records with the given changes applied, identified by the
+ * given field, or the same list when there is no change. Unmodified records are
+ * kept in the returned list to minimize rendering. */
+export function applyClusterRecordsChanges<RecordType extends object>(
+  records: RecordType[] | undefined,
+  changes: ClusterRecordsChanges<RecordType>,
+  identifier: keyof RecordType
+): RecordType[] {
+  if (changes.full || records === undefined) return changes.added
+  if (!changes.added.length && !changes.modified.length && !changes.removed.length) {
+    return records
+  }
+  const removed = new Set(changes.removed)
+  const modified = new Map(
+    changes.modified.map((record): [string, RecordType] => [String(record[identifier]), record])
+  )
+  return records
+    .filter((record) => !removed.has(String(record[identifier])))
+    .map((record) => modified.get(String(record[identifier])) ?? record)
+    .concat(changes.added)
+}
+
+/* Resources whose updates are pushed by gateway in events streams, when enabled */
+export type ClusterEventsResource = 'jobs' | 'nodes' | 'stats'
+
 export type RacksDBAPIImage = ImageBitmapSource
 export type RacksDBAPIResult = RacksDBAPIImage
 export type RacksDBInfrastructureCoordinates = Record<string, [number, number, number, number]>
@@ -889,6 +926,17 @@ export function useGatewayAPI() {
     return await restAPI.get<ClusterJob[]>(`/agents/${cluster}/jobs`)
   }
 
+  async function jobs_changes(
+    cluster: string,
+    since?: string
+  ): Promise<ClusterRecordsChanges<ClusterJob>> {
+    if (since)
+      return await restAPI.get<ClusterRecordsChanges<ClusterJob>>(
+        `/agents/${cluster}/jobs/changes?since=${since}`
+      )
+    return await restAPI.get<ClusterRecordsChanges<ClusterJob>>(`/agents/${cluster}/jobs/changes`)
+  }
+
   async function job(cluster: string, job: number): Promise<ClusterIndividualJob> {
     return await restAPI.get<ClusterIndividualJob>(`/agents/${cluster}/job/${job}`)
   }
@@ -897,10 +945,30 @@ export function useGatewayAPI() {
     return await restAPI.get<ClusterNode[]>(`/agents/${cluster}/nodes`)
   }
 
+  async function nodes_changes(
+    cluster: string,
+    since?: string
+  ): Promise<ClusterRecordsChanges<ClusterNode>> {
+    if (since)
+      return await restAPI.get<ClusterRecordsChanges<ClusterNode>>(
+        `/agents/${cluster}/nodes/changes?since=${since}`
+      )
+    return await restAPI.get<ClusterRecordsChanges<ClusterNode>>(`/agents/${cluster}/nodes/changes`)
+  }
+
   async function node(cluster: string, nodeName: string): Promise<ClusterIndividualNode> {
     return await restAPI.get<ClusterIndividualNode>(`/agents/${cluster}/node/${nodeName}`)
   }
 
+  async function events(
+    cluster: string,
+    resource: ClusterEventsResource,
+    onEvent: (event: ServerSentEvent) => void,
+    lastEventId?: string
+  ): Promise<void> {
+    return await restAPI.stream(`/agents/${cluster}/events/${resource}`, onEvent, lastEventId)
+  }
+
   async function partitions(cluster: string): Promise<ClusterPartition[]> {
     return await restAPI.get<ClusterPartition[]>(`/agents/${cluster}/partitions`)
   }
@@ -1054,9 +1122,12 @@ export function useGatewayAPI() {
     ping,
     stats,
     jobs,
+    jobs_changes,
     job,
     nodes,
+    nodes_changes,
     node,
+    events,
     partitions,
     qos,
     reservations,
@@ -9,6 +9,8 @@ import {
   CanceledRequestError,
   RequestError
 } from '@/composables/HTTPErrors'
+import { createServerSentEventsParser } from '@/composables/ServerSentEvents'
+import type { ServerSentEvent } from '@/composables/ServerSentEvents'
 
 export function useRESTAPI() {
   const http = useHttp()
@@ -107,10 +109,63 @@ export function useRESTAPI() {
       return http.post(resource, data, requestConfig(withToken, responseType))
     })) as CType
   }
+
+  async function streamError(response: Response): Promise<Error> {
+    /* Keep status text when response body is not JSON */
+    const description: string = await response
+      .json()
+      .then((data) => data.description)
+      .catch(() => response.statusText)
+    if (response.status == 401) return new AuthenticationError(description)
+    if (response.status == 403) return new PermissionError(description)
+    return new APIServerError(response.status, description)
+  }
+
+  async function stream(
+    resource: string,
+    onEvent: (event: ServerSentEvent) => void,
+    lastEventId?: string
+  ): Promise<void> {
+    /* Receive Server-Sent Events stream with fetch API, as EventSource API does not
+     * support authorization header. The promise is resolved when the server closes
+     * the stream. */
+    console.log(`Slurm-web gateway API stream ${resource}`)
+    const headers: Record<string, string> = {
+      Accept: 'text/event-stream',
+      Authorization: `Bearer ${authStore.token}`
+    }
+    if (lastEventId !== undefined) headers['Last-Event-ID'] = lastEventId
+    const baseURL = (http.defaults.baseURL ?? '').replace(/\/+$/, '')
+    const url = `${baseURL}/${resource.replace(/^\/+/, '')}`
+    try {
+      const response = await fetch(url, { headers: headers, signal: controller.signal })
+      if (!response.ok) throw await streamError(response)
+      if (response.body === null) throw new RequestError('Request error: empty stream')
+      const reader = response.body.getReader()
+      const decoder = new TextDecoder()
+      const parse = createServerSentEventsParser()
+      while (true) {
+        const { done, value } = await reader.read()
+        if (done) return
+        parse(decoder.decode(value, { stream: true })).forEach(onEvent)
+      }
+    } catch (error) {
+      if (error instanceof DOMException && error.name == 'AbortError') {
+        throw new CanceledRequestError('Canceled request')
+      }
+      if (error instanceof TypeError) {
+        /* Network errors are reported by fetch API with TypeError */
+        throw new RequestError(`Request error: ${error.message}`)
+      }
+      throw error
+    }
+  }
+
   return {
     abortController,
     get,
     post,
-    postRaw
+    postRaw,
+    stream
   }
 }
@@ -0,0 +1,63 @@
+/*
+ * Copyright (c) 2026 Rackslab
+ *
+ * This file is part of Slurm-web.
+ *
+ * SPDX-License-Identifier: MIT
+ */
+
+export interface ServerSentEvent {
+  event: string
+  id?: string
+  data: string
+}
+
+/* Parse one block of lines of Server-Sent Events stream. Return undefined when the
+ * block has no data, such as keepalive comments. */
+function parseServerSentEvent(block: string): ServerSentEvent | undefined {
+  let event = 'message'
+  let id: string | undefined = undefined
+  const data: string[] = []
+  for (const line of block.split('\n')) {
+    /* Lines starting with colon are comments */
+    if (!line.length || line.startsWith(':')) continue
+    const separator = line.indexOf(':')
+    const field = separator == -1 ? line : line.slice(0, separator)
+    let value = separator == -1 ? '' : line.slice(separator + 1)
+    if (value.startsWith(' ')) value = value.slice(1)
+    if (field == 'event') {
+      event = value
+    } else if (field == 'id') {
+      id = value
+    } else if (field == 'data') {
+      data.push(value)
+    }
+  }
+  if (!data.length) return undefined
+  return { event: event, id: id, data: data.join('\n') }
+}
+
+/* Return function to parse Server-Sent Events stream incrementally. The function
+ * is fed with chunks of text as they are received, it returns the events completed
+ * in the chunk and keeps incomplete events for the next chunks. */
+export function createServerSentEventsParser(): (chunk: string) => ServerSentEvent[] {
+  let buffer = ''
+  return (chunk: string): ServerSentEvent[] => {
+    buffer += chunk
+    /* Normalize line endings, a carriage return at the end of buffer is kept in
+     * case it is followed by a line feed in the next chunk. */
+    const end = buffer.endsWith('\r') ? buffer.length - 1 : buffer.length
+    const pending = buffer.slice(end)
+    buffer = buffer.slice(0, end).replace(/\r\n?/g, '\n')
+    const events: ServerSentEvent[] = []
+    let separator = buffer.indexOf('\n\n')
+    while (separator != -1) {
+      const event = parseServerSentEvent(buffer.slice(0, separator))
+      if (event !== undefined) events.push(event)
+      buffer = buffer.slice(separator + 2)
+      separator = buffer.indexOf('\n\n')
+    }
+    buffer += pending
+    return events
+  }
+}
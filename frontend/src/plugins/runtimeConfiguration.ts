@@ -14,6 +14,7 @@ export interface RuntimeConfiguration {
   authentication: boolean
   racksdb_rows_labels: boolean
   racksdb_racks_labels: boolean
+  events: boolean
   version: string
 }
 
@@ -42,6 +43,7 @@ export const initRuntimeConfiguration = async (): Promise<RuntimeConfiguration>
     authentication: value.AUTHENTICATION,
     racksdb_rows_labels: value.RACKSDB_ROWS_LABELS,
     racksdb_racks_labels: value.RACKSDB_RACKS_LABELS,
+    events: value.EVENTS,
     version: value.VERSION
   } as RuntimeConfiguration
 }
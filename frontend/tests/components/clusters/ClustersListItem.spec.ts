@@ -112,6 +112,23 @@ describe('ClustersListItem.vue', () => {
     // Check cluster status is denied
     expect(wrapper.get('div div p').text()).toBe('Denied')
   })
+  test('cluster unhealthy', async () => {
+    useRuntimeStore().availableClusters[0].error = true
+    mockGatewayAPI.ping.mockReturnValueOnce(Promise.resolve(ping))
+    const wrapper = shallowMount(ClusterListItem, {
+      props: {
+        clusterName: useRuntimeStore().availableClusters[0].name
+      }
+    })
+    // Wait for result of clusters requests
+    await flushPromises()
+    // assert ping not retrieved
+    expect(mockGatewayAPI.ping).not.toBeCalled()
+    // Check absence of cluster stats component
+    expect(wrapper.findComponent(ClusterStats).exists()).toBeFalsy()
+    // Check cluster status informs about ongoing issue
+    expect(wrapper.get('div div p').text()).toBe('Ongoing issue')
+  })
   test('cluster without view-stats permission', async () => {
     useRuntimeStore().availableClusters[0].permissions.actions = ['view-jobs']
     mockGatewayAPI.ping.mockReturnValueOnce(Promise.resolve(ping))
@@ -10,6 +10,7 @@ import {
   getNodeAllocationState,
   getNodeGPUFromGres,
   getNodeGPU,
+  applyClusterRecordsChanges,
   useGatewayAPI
 } from '@/composables/GatewayAPI'
 import jobs from '../assets/jobs.json'
@@ -54,6 +55,7 @@ vi.mock('@/plugins/runtimeConfiguration', () => ({
     authentication: true,
     racksdb_rows_labels: true,
     racksdb_racks_labels: true,
+    events: false,
     version: 'test'
   })
 }))
@@ -930,3 +932,67 @@ describe('getNodeGPU', () => {
     expect(getNodeGPU(node.gres_used).length).toBe(0)
   })
 })
+
+describe('applyClusterRecordsChanges', () => {
+  const records = [
+    { name: 'cn1', state: ['IDLE'] },
+    { name: 'cn2', state: ['IDLE'] },
+    { name: 'cn3', state: ['IDLE'] }
+  ]
+  test('apply changes', () => {
+    const result = applyClusterRecordsChanges(
+      records,
+      {
+        version: '1a2b',
+        full: false,
+        added: [{ name: 'cn4', state: ['IDLE'] }],
+        modified: [{ name: 'cn2', state: ['ALLOCATED'] }],
+        removed: ['cn3']
+      },
+      'name'
+    )
+    expect(result).toStrictEqual([
+      { name: 'cn1', state: ['IDLE'] },
+      { name: 'cn2', state: ['ALLOCATED'] },
+      { name: 'cn4', state: ['IDLE'] }
+    ])
+    // Unmodified records are kept
+    expect(result[0]).toBe(records[0])
+  })
+  test('apply changes with numeric identifiers', () => {
+    const jobs = [{ job_id: 1 }, { job_id: 2 }]
+    expect(
+      applyClusterRecordsChanges(
+        jobs,
+        { version: '1a2b', full: false, added: [], modified: [], removed: ['1'] },
+        'job_id'
+      )
+    ).toStrictEqual([{ job_id: 2 }])
+  })
+  test('no change', () => {
+    expect(
+      applyClusterRecordsChanges(
+        records,
+        { version: '1a2b', full: false, added: [], modified: [], removed: [] },
+        'name'
+      )
+    ).toBe(records)
+  })
+  test('full changes', () => {
+    const added = [{ name: 'cn5', state: ['DOWN'] }]
+    expect(
+      applyClusterRecordsChanges(
+        records,
+        { version: '1a2b', full: true, added: added, modified: [], removed: [] },
+        'name'
+      )
+    ).toBe(added)
+    expect(
+      applyClusterRecordsChanges(
+        undefined,
+        { version: '1a2b', full: false, added: added, modified: [], removed: [] },
+        'name'
+      )
+    ).toBe(added)
+  })
+})
@@ -0,0 +1,43 @@
+import { describe, test, expect } from 'vitest'
+import { createServerSentEventsParser } from '@/composables/ServerSentEvents'
+
+describe('createServerSentEventsParser', () => {
+  test('parse complete events', () => {
+    const parse = createServerSentEventsParser()
+    expect(
+      parse('event: changes\nid: 1a2b\ndata: {"version": "1a2b"}\n\nevent: failure\ndata: {}\n\n')
+    ).toStrictEqual([
+      { event: 'changes', id: '1a2b', data: '{"version": "1a2b"}' },
+      { event: 'failure', id: undefined, data: '{}' }
+    ])
+  })
+  test('parse events split in chunks', () => {
+    const parse = createServerSentEventsParser()
+    expect(parse('event: stats\nid: 1a')).toStrictEqual([])
+    expect(parse('2b\ndata: {"jobs"')).toStrictEqual([])
+    expect(parse(': {}}\n')).toStrictEqual([])
+    expect(parse('\nevent: st')).toStrictEqual([
+      { event: 'stats', id: '1a2b', data: '{"jobs": {}}' }
+    ])
+  })
+  test('ignore comments', () => {
+    const parse = createServerSentEventsParser()
+    expect(parse(': keepalive\n\n: keepalive\n\ndata: foo\n\n')).toStrictEqual([
+      { event: 'message', id: undefined, data: 'foo' }
+    ])
+  })
+  test('join multiple data lines', () => {
+    const parse = createServerSentEventsParser()
+    expect(parse('data: foo\ndata:bar\n\n')).toStrictEqual([
+      { event: 'message', id: undefined, data: 'foo\nbar' }
+    ])
+  })
+  test('support carriage returns line endings', () => {
+    const parse = createServerSentEventsParser()
+    expect(parse('data: foo\r')).toStrictEqual([])
+    expect(parse('\n\r\ndata: bar\r\r')).toStrictEqual([
+      { event: 'message', id: undefined, data: 'foo' }
+    ])
+    expect(parse('data: baz')).toStrictEqual([{ event: 'message', id: undefined, data: 'bar' }])
+  })
+})
@@ -25,7 +25,8 @@ from ..views import SlurmwebAppRoute
 from ..views import agent as views
 from ..slurmrestd import SlurmrestdFilteredCached
 from ..slurmrestd.auth import SlurmrestdAuthentifier
-from ..cache import CachingService
+from ..cache import CachingService, LocalCache
+from ..prewarm import CachePrewarmer
 from ..errors import SlurmwebConfigurationError
 
 logger = logging.getLogger(__name__)
@@ -40,8 +41,10 @@ class SlurmwebAppAgent(SlurmwebWebApp, RFLTokenizedRBACWebApp):
         SlurmwebAppRoute(f"/v{get_version()}/ping", views.ping),
         SlurmwebAppRoute(f"/v{get_version()}/stats", views.stats),
         SlurmwebAppRoute(f"/v{get_version()}/jobs", views.jobs),
+        SlurmwebAppRoute(f"/v{get_version()}/jobs/changes", views.jobs_changes),
         SlurmwebAppRoute(f"/v{get_version()}/job/<int:job>", views.job),
         SlurmwebAppRoute(f"/v{get_version()}/nodes", views.nodes),
+        SlurmwebAppRoute(f"/v{get_version()}/nodes/changes", views.nodes_changes),
         SlurmwebAppRoute(f"/v{get_version()}/node/<name>", views.node),
         SlurmwebAppRoute(f"/v{get_version()}/partitions", views.partitions),
         SlurmwebAppRoute(f"/v{get_version()}/qos", views.qos),
@@ -104,11 +107,26 @@ class SlurmwebAppAgent(SlurmwebWebApp, RFLTokenizedRBACWebApp):
             roles=selected_roles_policy_path,
         )
         if self.settings.cache.enabled:
-            self.cache = CachingService(
-                host=self.settings.cache.host,
-                port=self.settings.cache.port,
-                password=self.settings.cache.password,
-            )
+            local_cache = None
+            if self.settings.cache.local:
+                local_cache = LocalCache(
+                    ttl=self.settings.cache.local_ttl,
+                    max_entries=self.settings.cache.local_max_entries,
+                    max_size=self.settings.cache.local_max_size * 1024**2,
+                )
+            try:
+                self.cache = CachingService(
+                    host=self.settings.cache.host,
+                    port=self.settings.cache.port,
+                    password=self.settings.cache.password,
+                    codec=self.settings.cache.codec,
+                    compression=self.settings.cache.compression,
+                    compression_threshold=self.settings.cache.compression_threshold,
+                    local=local_cache,
+                )
+            except SlurmwebConfigurationError as err:
+                logger.critical("Configuration error: %s", err)
+                sys.exit(1)
         else:
             logger.warning("Caching is disabled")
             self.cache = None
@@ -137,8 +155,16 @@ class SlurmwebAppAgent(SlurmwebWebApp, RFLTokenizedRBACWebApp):
                 "slurmrestd API versions."
             )
 
+        if self.settings.slurmrestd.client == "async":
+            # Lazy load asynchronous client module as it is not used by default.
+            from ..slurmrestd.aio import AsyncSlurmrestdFilteredCached
+
+            slurmrestd_class = AsyncSlurmrestdFilteredCached
+        else:
+            slurmrestd_class = SlurmrestdFilteredCached
+
         try:
-            self.slurmrestd = SlurmrestdFilteredCached(
+            self.slurmrestd = slurmrestd_class(
                 self.settings.slurmrestd.uri,
                 SlurmrestdAuthentifier(
                     self.settings.slurmrestd.auth,
@@ -152,11 +178,24 @@ class SlurmwebAppAgent(SlurmwebWebApp, RFLTokenizedRBACWebApp):
                 self.settings.filters,
                 self.settings.cache,
                 self.cache,
+                self.settings.slurmrestd.pool_size,
+                self.settings.slurmrestd.pool_idle_timeout,
+                self.settings.slurmrestd.incremental,
+                self.settings.slurmrestd.incremental_full_interval,
+                self.settings.slurmrestd.streaming,
             )
         except SlurmwebConfigurationError as err:
             logger.critical("Configuration error: %s", err)
             sys.exit(1)
 
+        # Refresh data in cache in background, if enabled. The background thread is
+        # started on first request, in the worker process forked by uWSGI.
+        self.prewarmer = None
+        if self.cache is not None and self.settings.cache.prewarm:
+            self.prewarmer = CachePrewarmer(
+                self.slurmrestd, self.cache, self.settings.cache
+            )
+
         # Default RacksDB infrastructure is the cluster name.
         if self.settings.racksdb.infrastructure is None:
             self.settings.racksdb.infrastructure = self.settings.service.cluster
@@ -166,11 +205,12 @@ class SlurmwebAppAgent(SlurmwebWebApp, RFLTokenizedRBACWebApp):
         if self.settings.metrics.enabled:
             # Lazy load metrics module to avoid failing on missing optional external
             # dependency when feature is actually disabled.
-            from ..metrics.collector import SlurmWebMetricsCollector, make_wsgi_app
+            from ..metrics.base import make_wsgi_app
+            from ..metrics.collector import SlurmWebMetricsCollector
             from ..metrics.db import SlurmwebMetricsDB
 
             self.metrics_collector = SlurmWebMetricsCollector(
-                self.slurmrestd, self.cache
+                self.slurmrestd, self.cache, self.prewarmer
             )
             self.wsgi_app = dispatcher.DispatcherMiddleware(
                 self.wsgi_app, {"/metrics": make_wsgi_app(self.settings.metrics)}
@@ -178,3 +218,11 @@ class SlurmwebAppAgent(SlurmwebWebApp, RFLTokenizedRBACWebApp):
             self.metrics_db = SlurmwebMetricsDB(
                 self.settings.metrics.host, self.settings.metrics.job
             )
+
+    def __call__(self, environ, start_response):
+        # Start cache pre-warming thread in the process which serves the request.
+        # When the application is loaded by uWSGI master process before forking
+        # the workers, a thread started at load time would not run in the workers.
+        if self.prewarmer is not None:
+            self.prewarmer.start()
+        return super().__call__(environ, start_response)
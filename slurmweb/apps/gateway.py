@@ -4,15 +4,13 @@
 #
 # SPDX-License-Identifier: MIT
 
-import time
 import collections
 import asyncio
+import threading
 import logging
-import ssl
 
 from rfl.web.tokens import RFLTokenizedWebApp
 from rfl.authentication.ldap import LDAPAuthentifier
-from rfl.core.asyncio import asyncio_run
 import aiohttp
 from flask import Response
 
@@ -27,6 +25,8 @@ except ModuleNotFoundError:
 
 from . import SlurmwebWebApp, load_ldap_password_from_file
 from ..ui import prepare_ui_assets
+from ..events import EventsHub
+from ..sessions import AgentsSessions, AgentsSSLContext
 from ..views import SlurmwebAppRoute
 from ..views import gateway as views
 from ..errors import (
@@ -122,9 +122,12 @@ class SlurmwebAppGateway(SlurmwebWebApp, RFLTokenizedWebApp):
             "/api/agents/<cluster>/cache/reset", views.cache_reset, methods=["POST"]
         ),
         SlurmwebAppRoute("/api/agents/<cluster>/jobs", views.jobs),
+        SlurmwebAppRoute("/api/agents/<cluster>/jobs/changes", views.jobs_changes),
         SlurmwebAppRoute("/api/agents/<cluster>/job/<int:job>", views.job),
         SlurmwebAppRoute("/api/agents/<cluster>/nodes", views.nodes),
+        SlurmwebAppRoute("/api/agents/<cluster>/nodes/changes", views.nodes_changes),
         SlurmwebAppRoute("/api/agents/<cluster>/node/<name>", views.node),
+        SlurmwebAppRoute("/api/agents/<cluster>/events/<resource>", views.events),
         SlurmwebAppRoute("/api/agents/<cluster>/partitions", views.partitions),
         SlurmwebAppRoute("/api/agents/<cluster>/qos", views.qos),
         SlurmwebAppRoute("/api/agents/<cluster>/reservations", views.reservations),
@@ -137,38 +140,35 @@ class SlurmwebAppGateway(SlurmwebWebApp, RFLTokenizedWebApp):
         ),
     }
 
-    def get_agent_connector(self):
-        """Return a TCPConnector configured for agent connections with custom CA if
-        configured, or None if no custom CA is configured."""
-        if not self.settings.agents.cacert:
-            return None
-
-        if not self.settings.agents.cacert.is_file():
-            raise SlurmwebConfigurationError(
-                f"Agent CA certificate file {self.settings.agents.cacert} not found"
-            )
-        return aiohttp.TCPConnector(
-            ssl=ssl.create_default_context(cafile=str(self.settings.agents.cacert))
-        )
+    def get_agent_connector(self) -> aiohttp.TCPConnector:
+        """Return a TCPConnector for connections to all agents, with the limit of
+        simultaneous connections to each agent, the idle connections timeout and the
+        SSL context of the custom CA if configured."""
+        kwargs = {
+            "limit": 0,
+            "limit_per_host": self.settings.agents.connections,
+            "keepalive_timeout": self.settings.agents.keepalive,
+        }
+        if self.agents_ssl_context is not None:
+            kwargs["ssl"] = self.agents_ssl_context.get()
+        return aiohttp.TCPConnector(**kwargs)
 
     async def _get_agent_info(self, url) -> SlurmwebAgent:
         """Retrieve information from one agent, check values and return SlurmwebAgent
         object if checks pass. Return None on error."""
         try:
             logger.info("Retrieving info from agent at url %s", url)
-            async with aiohttp.ClientSession(
-                connector=self.get_agent_connector()
-            ) as session:
-                async with session.get(f"{url}/info") as response:
-                    if response.status != 200:
-                        raise SlurmwebAgentError(
-                            f"unexpected status code {response.status}"
-                        )
-                    agent = SlurmwebAgent.from_json(url, await response.json())
+            async with self.sessions.session(url).get(f"{url}/info") as response:
+                if response.status != 200:
+                    raise SlurmwebAgentError(
+                        f"unexpected status code {response.status}"
+                    )
+                agent = SlurmwebAgent.from_json(url, await response.json())
         except (
             SlurmwebAgentError,
             aiohttp.client_exceptions.ClientConnectionError,
             aiohttp.client_exceptions.ContentTypeError,
+            asyncio.TimeoutError,
         ) as err:
             logger.error(
                 "Unable to retrieve agent info from url %s: [%s] %s",
@@ -206,34 +206,57 @@ class SlurmwebAppGateway(SlurmwebWebApp, RFLTokenizedWebApp):
         )
         return agent
 
-    async def _get_agents_info(self):
-        """Return the list of available clusters SlurmwebAgent. Agents on which request
-        failed are filtered out."""
-        return {
-            agent.cluster: agent
-            for agent in await asyncio.gather(
-                *[
-                    self._get_agent_info(url.geturl())
-                    for url in self.settings.agents.url
-                ]
+    async def _update_agents(self) -> bool:
+        """Retrieve information from all agents declared in configuration and publish
+        the new dictionnary of available clusters SlurmwebAgent. Agents on which
+        request failed are kept with their last retrieved information, if any. Return
+        True if request failed on at least one agent."""
+        urls = [url.geturl() for url in self.settings.agents.url]
+        failed = False
+        registry = {}
+        for url, agent in zip(
+            urls, await asyncio.gather(*[self._get_agent_info(url) for url in urls])
+        ):
+            if agent is None:
+                failed = True
+                agent = self._agents_by_url.get(url)
+                if agent is None:
+                    continue
+                logger.warning(
+                    "Keeping last information retrieved from agent at url %s", url
+                )
+            registry[url] = agent
+        self._agents_by_url = registry
+        # Replace the dictionnary in a single assignment, so that threads serving
+        # requests never see a partially updated dictionnary.
+        self._agents = {agent.cluster: agent for agent in registry.values()}
+        return failed
+
+    async def _refresh_agents(self, failed: bool) -> None:
+        """Refresh agents information in background periodically, or sooner when
+        request failed on at least one agent."""
+        while True:
+            await asyncio.sleep(
+                self.settings.agents.retry if failed else self.settings.agents.refresh
             )
-            if agent is not None
-        }
+            try:
+                failed = await self._update_agents()
+            except Exception as err:
+                logger.error("Unable to refresh agents information: %s", err)
+                failed = True
 
     @property
     def agents(self):
-        """Get agents information dictionnary. If the cache timeout is not reached,
-        return the _agent property without modification. Else, poll all agents declared
-        in configuration to get information from them, re-initialize _agents property
-        with new retrieved values and return it."""
-
-        if int(time.time()) < self._agents_timeout:
-            return self._agents
-
-        self._agents = asyncio_run(self._get_agents_info())
-        # Set new agents information timeout
-        self._agents_timeout = int(time.time()) + 300
-
+        """Get agents information dictionnary. On first access, agents declared in
+        configuration are polled to get information from them and a background task
+        is started in the event loop to refresh this information periodically. Next
+        accesses return the last published dictionnary without waiting for
+        agents."""
+        if self._agents is None:
+            with self._agents_lock:
+                if self._agents is None:
+                    failed = self.sessions.run(self._update_agents())
+                    self.sessions.spawn(self._refresh_agents(failed))
         return self._agents
 
     def _infer_ui_prefix(self) -> str:
@@ -315,5 +338,39 @@ class SlurmwebAppGateway(SlurmwebWebApp, RFLTokenizedWebApp):
             self.add_url_rule("/", view_func=views.ui_files)
             self.add_url_rule("/<path:name>", view_func=views.ui_files)
 
-        self._agents = {}
-        self._agents_timeout = 0
+        self._agents = None
+        self._agents_by_url = {}
+        self._agents_lock = threading.Lock()
+
+        # SSL context of agents custom CA, loaded once and reloaded when modified
+        self.agents_ssl_context = None
+        if self.settings.agents.cacert:
+            self.agents_ssl_context = AgentsSSLContext(self.settings.agents.cacert)
+
+        # Event loop and client sessions shared by all requests to agents
+        self.sessions = AgentsSessions(
+            self.get_agent_connector,
+            self.agents_ssl_context.get if self.agents_ssl_context else None,
+            timeout=aiohttp.ClientTimeout(
+                total=None,
+                sock_connect=self.settings.agents.timeout_connect,
+                sock_read=self.settings.agents.timeout_read,
+            ),
+            breaker_threshold=self.settings.agents.breaker_threshold,
+            breaker_delay=self.settings.agents.breaker_delay,
+        )
+
+        self.metrics_collector = None
+        if self.settings.metrics.enabled:
+            # Lazy load metrics module to avoid failing on missing optional external
+            # dependency when feature is actually disabled.
+            from ..metrics.base import make_wsgi_app
+            from ..metrics.gateway import SlurmwebGatewayMetricsCollector
+
+            self.metrics_collector = SlurmwebGatewayMetricsCollector(self.sessions)
+            self.wsgi_app = dispatcher.DispatcherMiddleware(
+                self.wsgi_app, {"/metrics": make_wsgi_app(self.settings.metrics)}
+            )
+
+        # Channels of events pushed to clients
+        self.events = EventsHub(self.settings.events, self.sessions)
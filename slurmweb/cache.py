@@ -5,11 +5,16 @@
 # SPDX-License-Identifier: MIT
 
 import typing as t
+import collections
+import hashlib
+import threading
 import logging
+import time
 
 import redis
-import pickle
+import redis.lock
 
+from .serialization import CacheSerializer
 from .errors import SlurmwebCacheError
 
 logger = logging.getLogger(__name__)
@@ -27,29 +32,209 @@ class CacheKey:
         return self.main == other.main and self.count == other.count
 
 
+class LocalCache:
+    """In-process LRU cache of deserialized values retrieved from Redis, bounded by
+    number of entries and approximate size in bytes of the serialized values.
+    Values are kept for a short delay, capped by their expiration in Redis, to
+    avoid Redis round-trips and deserialization on frequent requests. Values are
+    shared by all threads of the process, they must not be modified."""
+
+    def __init__(self, ttl: int, max_entries: int, max_size: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_size = max_size
+        self.size = 0
+        # Values indexed by main key with their size, their expiration deadline
+        # and their version, ordered from the least to the most recently used.
+        self._entries: t.Dict[str, t.Tuple[t.Any, int, float, t.Optional[str]]] = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self.hits: t.Dict[str, int] = {}
+        self.misses: t.Dict[str, int] = {}
+        self.total_hits = 0
+        self.total_misses = 0
+
+    def get(self, key: CacheKey) -> t.Any:
+        """Return the value of the given key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key.main)
+            if entry is not None:
+                value, size, deadline, _ = entry
+                if time.monotonic() < deadline:
+                    self._entries.move_to_end(key.main)
+                    self.hits[key.count] = self.hits.get(key.count, 0) + 1
+                    self.total_hits += 1
+                    return value
+                self._discard(key.main)
+            self.misses[key.count] = self.misses.get(key.count, 0) + 1
+            self.total_misses += 1
+            return None
+
+    def version(self, key: CacheKey) -> t.Optional[str]:
+        """Return the version of the value of the given key, or None if missing or
+        expired. Hits and misses are not counted."""
+        with self._lock:
+            entry = self._entries.get(key.main)
+            if entry is None or time.monotonic() >= entry[2]:
+                return None
+            return entry[3]
+
+    def put(
+        self,
+        key: CacheKey,
+        value: t.Any,
+        size: int,
+        expiration: float,
+        version: t.Optional[str] = None,
+    ):
+        """Save value with its serialized size and its version for the local cache
+        delay, capped by the given expiration delay in seconds. Least recently used
+        values are evicted when the cache is full."""
+        ttl = min(self.ttl, expiration)
+        with self._lock:
+            self._discard(key.main)
+            if ttl <= 0 or size > self.max_size:
+                return
+            self._entries[key.main] = (value, size, time.monotonic() + ttl, version)
+            self.size += size
+            while len(self._entries) > self.max_entries or self.size > self.max_size:
+                _, (_, _size, _, _) = self._entries.popitem(last=False)
+                self.size -= _size
+
+    def _discard(self, main: str):
+        entry = self._entries.pop(main, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def metrics(self):
+        with self._lock:
+            return (
+                self.hits.copy(),
+                self.misses.copy(),
+                self.total_hits,
+                self.total_misses,
+            )
+
+    def reset(self):
+        """Reset local cache statistics."""
+        with self._lock:
+            self.hits = {}
+            self.misses = {}
+            self.total_hits = 0
+            self.total_misses = 0
+
+
 class CachingService:
-    KEY_PREFIX_MISS = "cache-miss-"
-    KEY_PREFIX_HIT = "cache-hit-"
+    # Hashes of counters indexed by cache key
+    KEY_HITS = "cache-hits"
+    KEY_MISSES = "cache-misses"
+    KEY_COALESCED = "cache-coalesced"
+    KEY_PREFIX_LOCK = "cache-lock-"
+    KEY_PREFIX_FRESH = "cache-fresh-"
+    KEY_PREFIX_LEADER = "cache-leader-"
+    KEY_PREFIX_VERSION = "cache-version-"
+    # Extend leader key expiration only if it is still owned by the candidate.
+    RENEW_LEADER_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('expire', KEYS[1], ARGV[2])
+end
+return 0
+"""
 
-    def __init__(self, host: str, port: int, password: t.Union[str, None]):
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        password: t.Union[str, None],
+        codec: str = "pickle",
+        compression: str = "none",
+        compression_threshold: int = 0,
+        local: t.Optional[LocalCache] = None,
+    ):
         self.host = host
         self.port = port
         self.connection = redis.Redis(host=host, port=port, password=password)
+        self.serializer = CacheSerializer(codec, compression, compression_threshold)
+        # Optional in-process cache in front of Redis
+        self.local = local
 
-    def put(self, key: CacheKey, value: t.Any, expiration: int):
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Return the version of serialized value, as a digest of its content."""
+        return hashlib.blake2b(data, digest_size=12).hexdigest()
+
+    def put(self, key: CacheKey, value: t.Any, expiration: int, stale: int = 0):
+        """Save value in cache for expiration seconds, with the digest of its content
+        as version. When stale is greater than 0, value is kept in cache for this
+        additional delay after its expiration to be retrieved with get_stale()."""
+        self.put_many([(key, value)], expiration, stale)
+
+    def put_many(
+        self,
+        entries: t.List[t.Tuple[CacheKey, t.Any]],
+        expiration: int,
+        stale: int = 0,
+    ):
+        """Save the values of the given list of keys and values tuples in cache, in
+        a single transaction, with the same expiration and stale delay as put()."""
+        serialized = []
+        for key, value in entries:
+            data = self.serializer.dumps(value)
+            serialized.append((key, value, data, self.digest(data)))
         try:
-            self.connection.set(key.main, pickle.dumps(value), ex=expiration)
+            pipeline = self.connection.pipeline()
+            for key, _, data, version in serialized:
+                pipeline.set(key.main, data, ex=expiration + stale)
+                pipeline.set(
+                    f"{self.KEY_PREFIX_VERSION}{key.main}",
+                    version,
+                    ex=expiration + stale,
+                )
+                if stale:
+                    pipeline.set(f"{self.KEY_PREFIX_FRESH}{key.main}", 1, ex=expiration)
+            pipeline.execute()
         except (
             redis.exceptions.ConnectionError,
             redis.exceptions.ResponseError,
         ) as err:
             raise SlurmwebCacheError(str(err)) from err
+        if self.local is not None:
+            for key, value, data, version in serialized:
+                self.local.put(key, value, len(data), expiration, version)
+
+    def _load_local(self, key: CacheKey, main: str, fresh: str) -> t.Tuple[t.Any, int]:
+        """Return a tuple with the value of main key in Redis, or None if missing, and
+        the remaining time to live in milliseconds of fresh key. When the value is
+        fresh, it is also saved in local cache with its version for this remaining
+        time at most."""
+        pipeline = self.connection.pipeline()
+        pipeline.get(main)
+        pipeline.pttl(fresh)
+        pipeline.get(f"{self.KEY_PREFIX_VERSION}{key.main}")
+        data, ttl, version = pipeline.execute()
+        if data is None:
+            return None, ttl
+        value = self.serializer.loads(data)
+        # Negative TTL means that fresh key is missing (-2) or has no
+        # expiration (-1), the value is then not saved in local cache.
+        if ttl > 0:
+            self.local.put(
+                key,
+                value,
+                len(data),
+                ttl / 1000,
+                version.decode() if version is not None else None,
+            )
+        return value, ttl
 
     def get(self, key: CacheKey):
         try:
+            if self.local is not None:
+                return self._load_local(key, key.main, key.main)[0]
             value = self.connection.get(key.main)
             if value is not None:
-                value = pickle.loads(value)
+                value = self.serializer.loads(value)
             return value
         except (
             redis.exceptions.ConnectionError,
@@ -57,62 +242,130 @@ class CachingService:
         ) as err:
             raise SlurmwebCacheError(str(err)) from err
 
+    def get_stale(self, key: CacheKey) -> t.Tuple[t.Any, bool]:
+        """Return a tuple with the value in cache, or None if missing, and a boolean
+        which is False when the value is expired and kept in cache as stale."""
+        try:
+            if self.local is not None:
+                value, ttl = self._load_local(
+                    key, key.main, f"{self.KEY_PREFIX_FRESH}{key.main}"
+                )
+                return value, ttl != -2
+            value, fresh = self.connection.mget(
+                [key.main, f"{self.KEY_PREFIX_FRESH}{key.main}"]
+            )
+            if value is not None:
+                value = self.serializer.loads(value)
+            return value, fresh is not None
+        except (
+            redis.exceptions.ConnectionError,
+            redis.exceptions.ResponseError,
+        ) as err:
+            raise SlurmwebCacheError(str(err)) from err
+
+    def versions(self, keys: t.List[CacheKey]) -> t.List[t.Optional[str]]:
+        """Return the list of versions of the values of the given keys, or None for
+        values missing in cache. Versions are searched in local cache first, then in
+        Redis for the keys missing in local cache."""
+        versions = [None] * len(keys)
+        if self.local is not None:
+            versions = [self.local.version(key) for key in keys]
+        missing = [idx for idx, version in enumerate(versions) if version is None]
+        if not missing:
+            return versions
+        try:
+            found = self.connection.mget(
+                [f"{self.KEY_PREFIX_VERSION}{keys[idx].main}" for idx in missing]
+            )
+        except (
+            redis.exceptions.ConnectionError,
+            redis.exceptions.ResponseError,
+        ) as err:
+            raise SlurmwebCacheError(str(err)) from err
+        for idx, version in zip(missing, found):
+            if version is not None:
+                versions[idx] = version.decode()
+        return versions
+
+    def lock(self, key: CacheKey, timeout: int) -> t.Optional[redis.lock.Lock]:
+        """Try to acquire without blocking the lock to refresh key in cache, shared
+        with all agents connected to the same Redis server. Return the lock if
+        acquired, None otherwise. The lock is automatically released by Redis after
+        timeout seconds."""
+        lock = self.connection.lock(
+            f"{self.KEY_PREFIX_LOCK}{key.main}", timeout=timeout
+        )
+        try:
+            if lock.acquire(blocking=False):
+                return lock
+            return None
+        except (
+            redis.exceptions.ConnectionError,
+            redis.exceptions.ResponseError,
+        ) as err:
+            raise SlurmwebCacheError(str(err)) from err
+
+    def unlock(self, lock: redis.lock.Lock):
+        try:
+            lock.release()
+        except redis.exceptions.LockError:
+            logger.warning("Cache lock %s expired before being released", lock.name)
+        except (
+            redis.exceptions.ConnectionError,
+            redis.exceptions.ResponseError,
+        ) as err:
+            raise SlurmwebCacheError(str(err)) from err
+
+    def elect(self, name: str, candidate: str, ttl: int) -> bool:
+        """Try to elect candidate as leader of the given name among all agents
+        connected to the same Redis server, or renew its leadership. Return True if
+        candidate is leader. Leadership is lost when not renewed for ttl seconds."""
+        _key = f"{self.KEY_PREFIX_LEADER}{name}"
+        try:
+            if self.connection.set(_key, candidate, nx=True, ex=ttl):
+                return True
+            return bool(
+                self.connection.eval(self.RENEW_LEADER_SCRIPT, 1, _key, candidate, ttl)
+            )
+        except (
+            redis.exceptions.ConnectionError,
+            redis.exceptions.ResponseError,
+        ) as err:
+            raise SlurmwebCacheError(str(err)) from err
+
     def count_miss(self, key: CacheKey):
-        self.connection.sadd("cache-miss-keys", key.count)
-        _key = f"{self.KEY_PREFIX_MISS}{key.count}"
-        self.connection.incr(_key)
-        self.connection.incr("cache-miss-total")
+        self.connection.hincrby(self.KEY_MISSES, key.count)
 
     def count_hit(self, key: CacheKey):
-        self.connection.sadd("cache-hit-keys", key.count)
-        _key = f"{self.KEY_PREFIX_HIT}{key.count}"
-        self.connection.incr(_key)
-        self.connection.incr("cache-hit-total")
+        self.connection.hincrby(self.KEY_HITS, key.count)
 
-    def metrics(self):
-        cache_misses = {}
-        cache_hits = {}
-        for _key in self.connection.smembers("cache-miss-keys"):
-            _key = _key.decode()
-            full_key = f"{self.KEY_PREFIX_MISS}{_key}"
-            value = self.connection.get(full_key)
-            if not value:
-                logger.warning("Miss cache key %s referenced without value", full_key)
-                continue
-            cache_misses[_key] = int(value)
-        for _key in self.connection.smembers("cache-hit-keys"):
-            _key = _key.decode()
-            full_key = f"{self.KEY_PREFIX_HIT}{_key}"
-            value = self.connection.get(full_key)
-            if not value:
-                logger.warning("Hit cache key %s referenced without value", full_key)
-                continue
-            cache_hits[_key] = int(value)
+    def count_coalesced(self, key: CacheKey):
+        self.connection.hincrby(self.KEY_COALESCED, key.count)
 
+    def metrics(self):
+        """Return a tuple with cache hits, misses and coalesced requests per key and
+        their respective totals."""
+        pipeline = self.connection.pipeline()
+        pipeline.hgetall(self.KEY_HITS)
+        pipeline.hgetall(self.KEY_MISSES)
+        pipeline.hgetall(self.KEY_COALESCED)
+        cache_hits, cache_misses, cache_coalesced = [
+            {_key.decode(): int(value) for _key, value in counters.items()}
+            for counters in pipeline.execute()
+        ]
         return (
             cache_hits,
             cache_misses,
-            int(self.connection.get("cache-hit-total") or 0),
-            int(self.connection.get("cache-miss-total") or 0),
+            cache_coalesced,
+            sum(cache_hits.values()),
+            sum(cache_misses.values()),
+            sum(cache_coalesced.values()),
         )
 
     def reset(self):
         """Reset cache statistics."""
+        self.connection.delete(self.KEY_HITS, self.KEY_MISSES, self.KEY_COALESCED)
 
-        # Reset hit and miss totals
-        self.connection.set("cache-hit-total", 0)
-        self.connection.set("cache-miss-total", 0)
-
-        # Delete all hit keys
-        for _key in self.connection.smembers("cache-hit-keys"):
-            _key = _key.decode()
-            self.connection.delete(f"{self.KEY_PREFIX_HIT}{_key}")
-
-        # Delete all miss keys
-        for _key in self.connection.smembers("cache-miss-keys"):
-            _key = _key.decode()
-            self.connection.delete(f"{self.KEY_PREFIX_MISS}{_key}")
-
-        # Delete hit and miss keys sets
-        self.connection.delete("cache-hit-keys")
-        self.connection.delete("cache-miss-keys")
+        # Reset local cache statistics
+        if self.local is not None:
+            self.local.reset()
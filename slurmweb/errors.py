@@ -29,6 +29,10 @@ class SlurmwebMetricsDBError(Exception):
     pass
 
 
+class SlurmwebQueryError(Exception):
+    pass
+
+
 # Alias JSONDecodeError from simplejson external library and json standard library
 # module to catch generically the error raised with Requests < 2.27 on old systems in
 # presence of unexepected non-JSON responses.
@@ -0,0 +1,421 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Push of clusters data updates to clients in Server-Sent Events streams. For each
+cluster and resource with subscribed clients, the gateway polls the agent in a
+single background thread, whatever the number of subscribers, and pushes the
+updates to all of them."""
+
+import typing as t
+import asyncio
+import collections
+import hashlib
+import itertools
+import json
+import logging
+import queue
+import threading
+import time
+
+import aiohttp
+
+if t.TYPE_CHECKING:
+    from rfl.settings import RuntimeSettings
+    from .apps.gateway import SlurmwebAgent
+    from .sessions import AgentsSessions
+
+logger = logging.getLogger(__name__)
+
+
+EventsResource = collections.namedtuple(
+    "EventsResource", ["query", "action", "identifier"]
+)
+
+# Resources available in events streams, with the agent query polled, the action
+# required to subscribe and the identifier of records for the resources polled by
+# changes between snapshots.
+EVENTS_RESOURCES = {
+    "jobs": EventsResource("jobs/changes", "view-jobs", "job_id"),
+    "nodes": EventsResource("nodes/changes", "view-nodes", "name"),
+    "stats": EventsResource("stats", "view-stats", None),
+}
+# Maximum number of events waiting to be sent to a subscriber. When this limit is
+# reached, pending events are dropped and the subscriber receives the current
+# snapshot instead.
+EVENTS_QUEUE_SIZE = 32
+# Comment sent to subscribers when no event is available, to keep the connection
+# alive through proxies and detect disconnected clients.
+EVENTS_KEEPALIVE = b": keepalive\n\n"
+
+# Markers in subscriptions queues
+_RESYNC = object()
+_CLOSED = object()
+
+# Agent response to a poll, with its status, ETag header and JSON content.
+AgentPollResponse = collections.namedtuple(
+    "AgentPollResponse", ["status", "etag", "data"]
+)
+
+
+def encode_event(event: str, data: t.Any, id: t.Optional[str] = None) -> bytes:
+    """Return the given event encoded in Server-Sent Events format."""
+    lines = [f"event: {event}"]
+    if id is not None:
+        lines.append(f"id: {id}")
+    # JSON is encoded without newline, the data holds on a single line.
+    lines.append(f"data: {json.dumps(data)}")
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+class EventsSubscription:
+    """Events of a channel waiting to be sent to one client."""
+
+    def __init__(self, token: str, duration: int):
+        self.token = token
+        self.deadline = time.monotonic() + duration
+        self.events = queue.Queue()
+        # Set when pending events are dropped, until the subscriber receives the
+        # current snapshot.
+        self.overflow = False
+        # Event sent to client when the subscription is closed by the channel.
+        self.failure = None
+
+    def _drain(self) -> None:
+        while True:
+            try:
+                self.events.get_nowait()
+            except queue.Empty:
+                break
+
+    def push(self, event: bytes) -> None:
+        """Add event to the events waiting to be sent. When the queue is full,
+        pending events are replaced by a marker to send the current snapshot."""
+        if self.overflow:
+            return
+        if self.events.qsize() >= EVENTS_QUEUE_SIZE:
+            self._drain()
+            self.overflow = True
+            self.events.put(_RESYNC)
+            return
+        self.events.put(event)
+
+    def close(self, failure: t.Optional[bytes] = None) -> None:
+        """Drop pending events and mark the subscription closed, with the optional
+        failure event sent to client before closing the stream."""
+        self._drain()
+        self.failure = failure
+        self.events.put(_CLOSED)
+
+
+class EventsChannel:
+    """Updates of one resource of one cluster pushed to subscribers. The resource is
+    polled on the agent in a background thread, running as long as the channel has
+    subscribers. The current state of the resource is kept to send it to new
+    subscribers."""
+
+    def __init__(
+        self,
+        cluster: str,
+        resource: str,
+        fetch: t.Callable[..., AgentPollResponse],
+        settings: "RuntimeSettings",
+    ):
+        self.cluster = cluster
+        self.name = resource
+        self.resource = EVENTS_RESOURCES[resource]
+        self.fetch = fetch
+        self.settings = settings
+        self.agent = None
+        # Version of the current state, None until the first successful poll.
+        self.version = None
+        self._etag = None
+        # Records of current snapshot by identifier, or data for resources without
+        # records identifier.
+        self._records = collections.OrderedDict()
+        self._data = None
+        # Encoded event of current snapshot, built once per version when a
+        # subscriber needs it.
+        self._snapshot = None
+        self._failed = False
+        self._subscriptions = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread = None
+
+    def __repr__(self):
+        return f"{self.name} events of cluster {self.cluster}"
+
+    def subscribe(
+        self, token: str, agent: "SlurmwebAgent", last_event_id: t.Optional[str]
+    ) -> EventsSubscription:
+        """Return new subscription with the given token. The current snapshot is
+        sent first, unless the subscriber already received this version as last
+        event. Start the polling thread if not running."""
+        subscription = EventsSubscription(token, self.settings.duration)
+        with self._lock:
+            self.agent = agent
+            if self.version is not None and self.version != last_event_id:
+                subscription.push(self._snapshot_event())
+            self._subscriptions.append(subscription)
+            if self._thread is None:
+                logger.debug("Starting polling of %s", self)
+                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._thread.start()
+        return subscription
+
+    def unsubscribe(self, subscription: EventsSubscription) -> None:
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def stream(self, subscription: EventsSubscription) -> t.Iterator[bytes]:
+        """Iterate over the events of the subscription until its deadline, with
+        keepalive comments when no event is available. The subscription is removed
+        from channel when the iteration ends."""
+        try:
+            while True:
+                remaining = subscription.deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    event = subscription.events.get(
+                        timeout=min(self.settings.keepalive, remaining)
+                    )
+                except queue.Empty:
+                    yield EVENTS_KEEPALIVE
+                    continue
+                if event is _CLOSED:
+                    if subscription.failure is not None:
+                        yield subscription.failure
+                    return
+                if event is _RESYNC:
+                    event = self._resync(subscription)
+                yield event
+        finally:
+            self.unsubscribe(subscription)
+
+    def _resync(self, subscription: EventsSubscription) -> bytes:
+        """Return the current snapshot for the subscriber whose pending events were
+        dropped. The following events are pushed again to the subscriber."""
+        with self._lock:
+            subscription.overflow = False
+            return self._snapshot_event()
+
+    def _snapshot_event(self) -> bytes:
+        """Return encoded event of current snapshot, the lock must be acquired."""
+        if self._snapshot is None:
+            if self.resource.identifier is None:
+                self._snapshot = encode_event(self.name, self._data, self.version)
+            else:
+                self._snapshot = encode_event(
+                    "changes",
+                    {
+                        "version": self.version,
+                        "full": True,
+                        "added": list(self._records.values()),
+                        "modified": [],
+                        "removed": [],
+                    },
+                    self.version,
+                )
+        return self._snapshot
+
+    def _publish(self, event: bytes) -> None:
+        """Push event to all subscribers, the lock must be acquired."""
+        for subscription in self._subscriptions:
+            subscription.push(event)
+
+    def _run(self) -> None:
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    # Remove subscriptions whose stream has not been consumed before
+                    # its deadline, the client is gone.
+                    for subscription in [
+                        subscription
+                        for subscription in self._subscriptions
+                        if subscription.deadline + self.settings.keepalive < now
+                    ]:
+                        self._subscriptions.remove(subscription)
+                    if not self._subscriptions:
+                        logger.debug("Stopping polling of %s", self)
+                        self._thread = None
+                        return
+                    # Poll with the token of the most recent subscriber, which is the
+                    # most likely to be valid.
+                    token = self._subscriptions[-1].token
+                    agent = self.agent
+                try:
+                    self.poll(agent, token)
+                except Exception as err:
+                    logger.exception("Unexpected error while polling %s", self)
+                    self._reset()
+                    self._fail(f"Unexpected error: {err}")
+                self._wakeup.wait(self.settings.interval)
+                self._wakeup.clear()
+        finally:
+            # Polling thread can be started again by the next subscriber if the loop
+            # exits abnormally.
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    def _reset(self) -> None:
+        """Forget the current version of the resource after an unexpected error, so
+        that the next poll retrieves a full snapshot from the agent."""
+        with self._lock:
+            self._etag = None
+            self.version = None
+            self._snapshot = None
+
+    def poll(self, agent: "SlurmwebAgent", token: str) -> None:
+        """Poll the resource on the agent with the given token and push the updates
+        to subscribers."""
+        params = {}
+        if self.resource.identifier is not None and self.version is not None:
+            params["since"] = self.version
+        try:
+            response = self.fetch(agent, self.resource.query, token, self._etag, params)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            self._fail(f"Connection error with agent: {err}")
+            return
+        if response.status == 304:
+            return
+        if response.status in (401, 403):
+            self._reject(token, response.status)
+            return
+        if response.status != 200:
+            self._fail(f"Unexpected status code {response.status} from agent")
+            return
+        with self._lock:
+            self._etag = response.etag
+            if self.resource.identifier is None:
+                self._update_data(response.data)
+            else:
+                self._update_records(response.data)
+
+    def _update_data(self, data: t.Any) -> None:
+        version = hashlib.blake2b(
+            json.dumps(data, sort_keys=True).encode(), digest_size=12
+        ).hexdigest()
+        if version == self.version and not self._failed:
+            return
+        self._failed = False
+        self.version = version
+        self._data = data
+        self._snapshot = None
+        self._publish(self._snapshot_event())
+
+    def _update_records(self, changes: t.Dict[str, t.Any]) -> None:
+        if (
+            not changes["full"]
+            and changes["version"] == self.version
+            and not (changes["added"] or changes["modified"] or changes["removed"])
+            and not self._failed
+        ):
+            return
+        self._failed = False
+        if changes["full"]:
+            self._records = collections.OrderedDict()
+        for key in changes["removed"]:
+            self._records.pop(key, None)
+        for record in itertools.chain(changes["modified"], changes["added"]):
+            self._records[str(record[self.resource.identifier])] = record
+        self.version = changes["version"]
+        self._snapshot = None
+        self._publish(encode_event("changes", changes, self.version))
+
+    def _fail(self, description: str) -> None:
+        """Notify subscribers of the failure of the poll. Subscribers are notified
+        once until the next successful poll."""
+        logger.error("Unable to poll %s: %s", self, description)
+        with self._lock:
+            if self._failed:
+                return
+            self._failed = True
+            self._publish(encode_event("failure", {"description": description}))
+
+    def _reject(self, token: str, status: int) -> None:
+        """Close subscriptions with the token rejected by the agent, and poll again
+        immediately with another token."""
+        logger.warning(
+            "Token rejected by agent with status %d while polling %s", status, self
+        )
+        failure = encode_event(
+            "failure",
+            {"code": status, "description": "Token rejected by agent"},
+        )
+        with self._lock:
+            for subscription in [
+                subscription
+                for subscription in self._subscriptions
+                if subscription.token == token
+            ]:
+                subscription.close(failure)
+                self._subscriptions.remove(subscription)
+        self._wakeup.set()
+
+
+class EventsHub:
+    """Channels of events by cluster and resource."""
+
+    def __init__(
+        self,
+        settings: "RuntimeSettings",
+        sessions: "AgentsSessions",
+    ):
+        self.settings = settings
+        self.sessions = sessions
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def channel(self, cluster: str, resource: str) -> EventsChannel:
+        """Return the channel of the resource of the cluster, created if missing."""
+        with self._lock:
+            key = (cluster, resource)
+            if key not in self._channels:
+                self._channels[key] = EventsChannel(
+                    cluster, resource, self.fetch, self.settings
+                )
+            return self._channels[key]
+
+    def fetch(
+        self,
+        agent: "SlurmwebAgent",
+        query: str,
+        token: str,
+        etag: t.Optional[str],
+        params: t.Dict[str, str],
+    ) -> AgentPollResponse:
+        """Send request to agent with the given conditional request validator in the
+        event loop of the gateway and return the response."""
+        return self.sessions.run(self._fetch(agent, query, token, etag, params))
+
+    async def _fetch(
+        self,
+        agent: "SlurmwebAgent",
+        query: str,
+        token: str,
+        etag: t.Optional[str],
+        params: t.Dict[str, str],
+    ) -> AgentPollResponse:
+        headers = {"Authorization": f"Bearer {token}"}
+        if etag is not None:
+            headers["If-None-Match"] = etag
+        async with self.sessions.session(agent.url).get(
+            f"{agent.url}/v{agent.version}/{query}", headers=headers, params=params
+        ) as response:
+            data = None
+            if response.status == 200:
+                data = await response.json()
+            return AgentPollResponse(
+                response.status, response.headers.get("ETag"), data
+            )
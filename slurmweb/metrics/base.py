@@ -0,0 +1,90 @@
+# Copyright (c) 2024 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import typing as t
+import ipaddress
+import logging
+
+import prometheus_client
+
+# In Prometheus client < v0.14.0 (distributed in EPEL8), Collector abstract
+# class is not defined. Use concrete CollectorRegistry class as an alternative.
+try:
+    from prometheus_client.registry import Collector
+except ImportError:
+    from prometheus_client.registry import CollectorRegistry as Collector
+
+if t.TYPE_CHECKING:
+    from rfl.settings import RuntimeSettings
+
+logger = logging.getLogger(__name__)
+
+
+class SlurmwebBaseMetricsCollector(Collector):
+    def describe(self):
+        """This method is defined to avoid the registry call collect() and request
+        slurmrestd eventually when the collector is registered to get a description of
+        all metrics exported by this collector. Just return an empty list to avoid
+        redundant code with _collect() method."""
+        return []
+
+    def register(self):
+        prometheus_client.REGISTRY.register(self)
+        # Unregister all standard built-ins collectors.
+        for collector in (
+            prometheus_client.GC_COLLECTOR,
+            prometheus_client.PLATFORM_COLLECTOR,
+            prometheus_client.PROCESS_COLLECTOR,
+        ):
+            try:
+                prometheus_client.REGISTRY.unregister(collector)
+            except KeyError:
+                # Ignore if collector has not been found in registry
+                pass
+
+    def unregister(self):
+        prometheus_client.REGISTRY.unregister(self)
+
+
+def get_client_ipaddress(environ):
+    """Return IP address of the client as found in request environment."""
+    # To properly handle setup in which agent is behind a reverse proxy, first try to
+    # use X-Forwarded-For header if defined. In this header, the original client IP
+    # address the leftmost address in a comma (and optionally whitespaces) separated
+    # list of addresses, followed by the addresses of the intermediate proxies. If
+    # X-Forwarded-For is not defined, use REMOTE_ADDR environment key as fallback.
+    try:
+        ip = environ["HTTP_X_FORWARDED_FOR"].split(",")[0].strip()
+    except KeyError:
+        ip = environ["REMOTE_ADDR"]
+    return ipaddress.ip_address(ip)
+
+
+def make_wsgi_app(settings: "RuntimeSettings"):
+    prometheus_app = prometheus_client.make_wsgi_app()
+
+    def slurmweb_metrics_app(environ, start_response):
+        # Check if client IP address is member of restricted networks list. If
+        # not, send response with HTTP/403 status code.
+        ip = get_client_ipaddress(environ)
+        permitted = False
+        for restricted_network in settings.restrict:
+            if ip in restricted_network:
+                permitted = True
+                break
+        if not permitted:
+            status = "403 Forbidden"
+            headers = [("", "")]
+            output = f"IP address {ip} not authorized to request metrics"
+            logger.warning(output)
+            start_response(status, headers)
+            return [(output + "\n").encode()]
+
+        # Client IP address is authorized, return metrics.
+        logger.debug("IP address %s authorized to request metrics", ip)
+        return prometheus_app(environ, start_response)
+
+    return slurmweb_metrics_app
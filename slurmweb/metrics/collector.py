@@ -5,20 +5,14 @@
 # SPDX-License-Identifier: MIT
 
 import typing as t
-import ipaddress
 import logging
 
 import prometheus_client
 import prometheus_client.core
 
-# In Prometheus client < v0.14.0 (distributed in EPEL8), Collector abstract
-# class is not defined. Use concrete CollectorRegistry class as an alternative.
-try:
-    from prometheus_client.registry import Collector
-except ImportError:
-    from prometheus_client.registry import CollectorRegistry as Collector
-
+from .base import SlurmwebBaseMetricsCollector
 from ..errors import SlurmwebCacheError
+from ..slurmrestd.memo import memo_metrics
 from ..slurmrestd.errors import (
     SlurmrestdNotFoundError,
     SlurmrestdInvalidResponseError,
@@ -28,48 +22,29 @@ from ..slurmrestd.errors import (
 )
 
 if t.TYPE_CHECKING:
-    from rfl.settings import RuntimeSettings
     from ..slurmrestd import SlurmrestdFilteredCached
     from ..cache import CachingService
+    from ..prewarm import CachePrewarmer
 
 logger = logging.getLogger(__name__)
 
 
-class SlurmWebMetricsCollector(Collector):
+class SlurmWebMetricsCollector(SlurmwebBaseMetricsCollector):
     def __init__(
         self,
         slurmrestd: "SlurmrestdFilteredCached",
         cache: t.Optional["CachingService"],
+        prewarmer: t.Optional["CachePrewarmer"] = None,
     ):
         self.slurmrestd = slurmrestd
         self.cache = cache
+        self.prewarmer = prewarmer
         self.register()
 
-    def describe(self):
-        """This method is defined to avoid the registry call collect() and request
-        slurmrestd eventually when the collector is registered to get a description of
-        all metrics exported by this collector. Just return an empty list to avoid
-        redundant code with _collect() method."""
-        return []
-
-    def register(self):
-        prometheus_client.REGISTRY.register(self)
-        # Unregister all standard built-ins collectors.
-        for collector in (
-            prometheus_client.GC_COLLECTOR,
-            prometheus_client.PLATFORM_COLLECTOR,
-            prometheus_client.PROCESS_COLLECTOR,
-        ):
-            try:
-                prometheus_client.REGISTRY.unregister(collector)
-            except KeyError:
-                # Ignore if collector has not been found in registry
-                pass
-
-    def unregister(self):
-        prometheus_client.REGISTRY.unregister(self)
-
     def _collect(self):
+        resources_states, jobs_states = self.slurmrestd.query(
+            ("resources_states", ()), ("jobs_states", ())
+        )
         (
             nodes_states,
             cores_states,
@@ -77,7 +52,7 @@ class SlurmWebMetricsCollector(Collector):
             nodes_total,
             cores_total,
             gpus_total,
-        ) = self.slurmrestd.resources_states()
+        ) = resources_states
         c = prometheus_client.core.GaugeMetricFamily(
             "slurm_nodes", "Slurm nodes", labels=["state"]
         )
@@ -106,7 +81,7 @@ class SlurmWebMetricsCollector(Collector):
             "slurm_gpus_total", "Slurm total number of GPU", value=gpus_total
         )
 
-        (jobs_states, jobs_total) = self.slurmrestd.jobs_states()
+        jobs_states, jobs_total = jobs_states
         c = prometheus_client.core.GaugeMetricFamily(
             "slurm_jobs", "Slurm jobs", labels=["state"]
         )
@@ -117,10 +92,34 @@ class SlurmWebMetricsCollector(Collector):
             "slurm_jobs_total", "Slurm total number of jobs", value=jobs_total
         )
 
+        # Memoization caches metrics of the agent process
+        memo_hits, memo_misses = memo_metrics()
+        c = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_memo_hit", "Slurm-web memoization cache hits", labels=["cache"]
+        )
+        for _cache, value in memo_hits.items():
+            c.add_metric([_cache], value)
+        yield c
+        c = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_memo_miss",
+            "Slurm-web memoization cache misses",
+            labels=["cache"],
+        )
+        for _cache, value in memo_misses.items():
+            c.add_metric([_cache], value)
+        yield c
+
         # Skip cache metrics if cache service is disabled
         if not self.cache:
             return
-        (cache_hits, cache_misses, total_hits, total_misses) = self.cache.metrics()
+        (
+            cache_hits,
+            cache_misses,
+            cache_coalesced,
+            total_hits,
+            total_misses,
+            total_coalesced,
+        ) = self.cache.metrics()
         c = prometheus_client.core.GaugeMetricFamily(
             "slurmweb_cache_hit", "Slurm-web cache hits", labels=["key"]
         )
@@ -133,6 +132,14 @@ class SlurmWebMetricsCollector(Collector):
         for _key, value in cache_misses.items():
             c.add_metric([_key], value)
         yield c
+        c = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_cache_coalesced",
+            "Slurm-web cache coalesced requests",
+            labels=["key"],
+        )
+        for _key, value in cache_coalesced.items():
+            c.add_metric([_key], value)
+        yield c
         yield prometheus_client.core.GaugeMetricFamily(
             "slurmweb_cache_hit_total", "Slurm-web cache total hits", value=total_hits
         )
@@ -141,6 +148,78 @@ class SlurmWebMetricsCollector(Collector):
             "Slurm-web cache total misses",
             value=total_misses,
         )
+        yield prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_cache_coalesced_total",
+            "Slurm-web cache total coalesced requests",
+            value=total_coalesced,
+        )
+
+        # Local cache metrics of the agent process, if enabled
+        if self.cache.local is not None:
+            (
+                local_hits,
+                local_misses,
+                local_total_hits,
+                local_total_misses,
+            ) = self.cache.local.metrics()
+            c = prometheus_client.core.GaugeMetricFamily(
+                "slurmweb_cache_local_hit",
+                "Slurm-web local cache hits",
+                labels=["key"],
+            )
+            for _key, value in local_hits.items():
+                c.add_metric([_key], value)
+            yield c
+            c = prometheus_client.core.GaugeMetricFamily(
+                "slurmweb_cache_local_miss",
+                "Slurm-web local cache misses",
+                labels=["key"],
+            )
+            for _key, value in local_misses.items():
+                c.add_metric([_key], value)
+            yield c
+            yield prometheus_client.core.GaugeMetricFamily(
+                "slurmweb_cache_local_hit_total",
+                "Slurm-web local cache total hits",
+                value=local_total_hits,
+            )
+            yield prometheus_client.core.GaugeMetricFamily(
+                "slurmweb_cache_local_miss_total",
+                "Slurm-web local cache total misses",
+                value=local_total_misses,
+            )
+
+        # Skip cache pre-warming metrics if disabled
+        if not self.prewarmer:
+            return
+        yield prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_cache_prewarm_leader",
+            "Slurm-web agent leader of cache pre-warming",
+            value=int(self.prewarmer.leader),
+        )
+        durations = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_cache_prewarm_duration_seconds",
+            "Slurm-web cache pre-warming last refresh duration",
+            labels=["key"],
+        )
+        refreshes = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_cache_prewarm_refreshes",
+            "Slurm-web cache pre-warming refreshes",
+            labels=["key"],
+        )
+        failures = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_cache_prewarm_failures",
+            "Slurm-web cache pre-warming failures",
+            labels=["key"],
+        )
+        for _key, statistics in self.prewarmer.statistics.items():
+            if statistics.duration is not None:
+                durations.add_metric([_key], statistics.duration)
+            refreshes.add_metric([_key], statistics.refreshes)
+            failures.add_metric([_key], statistics.failures)
+        yield durations
+        yield refreshes
+        yield failures
 
     def collect(self):
         try:
@@ -170,44 +249,3 @@ class SlurmWebMetricsCollector(Collector):
                 "Unable to collect metrics due to slurmrestd authentication error: %s",
                 err,
             )
-
-
-def get_client_ipaddress(environ):
-    """Return IP address of the client as found in request environment."""
-    # To properly handle setup in which agent is behind a reverse proxy, first try to
-    # use X-Forwarded-For header if defined. In this header, the original client IP
-    # address the leftmost address in a comma (and optionally whitespaces) separated
-    # list of addresses, followed by the addresses of the intermediate proxies. If
-    # X-Forwarded-For is not defined, use REMOTE_ADDR environment key as fallback.
-    try:
-        ip = environ["HTTP_X_FORWARDED_FOR"].split(",")[0].strip()
-    except KeyError:
-        ip = environ["REMOTE_ADDR"]
-    return ipaddress.ip_address(ip)
-
-
-def make_wsgi_app(settings: "RuntimeSettings"):
-    prometheus_app = prometheus_client.make_wsgi_app()
-
-    def slurmweb_metrics_app(environ, start_response):
-        # Check if client IP address is member of restricted networks list. If
-        # not, send response with HTTP/403 status code.
-        ip = get_client_ipaddress(environ)
-        permitted = False
-        for restricted_network in settings.restrict:
-            if ip in restricted_network:
-                permitted = True
-                break
-        if not permitted:
-            status = "403 Forbidden"
-            headers = [("", "")]
-            output = f"IP address {ip} not authorized to request metrics"
-            logger.warning(output)
-            start_response(status, headers)
-            return [(output + "\n").encode()]
-
-        # Client IP address is authorized, return metrics.
-        logger.debug("IP address %s authorized to request metrics", ip)
-        return prometheus_app(environ, start_response)
-
-    return slurmweb_metrics_app
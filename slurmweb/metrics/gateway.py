@@ -0,0 +1,43 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import prometheus_client.core
+
+from .base import SlurmwebBaseMetricsCollector
+from ..sessions import AgentsSessions, CircuitBreaker
+
+
+class SlurmwebGatewayMetricsCollector(SlurmwebBaseMetricsCollector):
+    """Collector of gateway metrics, with the state of agents circuit breakers."""
+
+    def __init__(self, sessions: AgentsSessions):
+        self.sessions = sessions
+        self.register()
+
+    def collect(self):
+        states = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_agent_breaker_state",
+            "Slurm-web gateway agent circuit breaker state",
+            labels=["agent", "state"],
+        )
+        failures = prometheus_client.core.GaugeMetricFamily(
+            "slurmweb_agent_breaker_failures",
+            "Slurm-web gateway agent consecutive failures",
+            labels=["agent"],
+        )
+        trips = prometheus_client.core.CounterMetricFamily(
+            "slurmweb_agent_breaker_trips",
+            "Slurm-web gateway agent circuit breaker openings",
+            labels=["agent"],
+        )
+        for url, breaker in list(self.sessions.breakers.items()):
+            for state in CircuitBreaker.STATES:
+                states.add_metric([url, state], int(breaker.state == state))
+            failures.add_metric([url], breaker.failures)
+            trips.add_metric([url], breaker.trips)
+        yield states
+        yield failures
+        yield trips
@@ -0,0 +1,151 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import typing as t
+import threading
+import time
+import uuid
+import logging
+
+from .errors import SlurmwebCacheError
+from .slurmrestd.errors import (
+    SlurmrestdNotFoundError,
+    SlurmrestdInvalidResponseError,
+    SlurmrestConnectionError,
+    SlurmrestdInternalError,
+    SlurmrestdAuthenticationError,
+)
+
+if t.TYPE_CHECKING:
+    from rfl.settings import RuntimeSettings
+    from .slurmrestd import SlurmrestdFilteredCached
+    from .cache import CachingService
+
+logger = logging.getLogger(__name__)
+
+
+class CachePrewarmStatistics:
+    def __init__(self):
+        self.refreshes = 0
+        self.failures = 0
+        # Duration in seconds of the last successful refresh, None when never
+        # refreshed.
+        self.duration = None
+
+
+class CachePrewarmer:
+    """Refresh collections in cache in a background thread, shortly before their
+    expiration, so that clients requests are served from cache without waiting for
+    slurmrestd. Among all agents connected to the same Redis server, only the agent
+    elected as leader refreshes the collections."""
+
+    LEADER_NAME = "prewarm"
+    # Delay in seconds after which leadership is lost if not renewed.
+    LEADER_TTL = 30
+
+    def __init__(
+        self,
+        slurmrestd: "SlurmrestdFilteredCached",
+        service: "CachingService",
+        settings: "RuntimeSettings",
+    ):
+        self.slurmrestd = slurmrestd
+        self.service = service
+        self.settings = settings
+        self.identity = uuid.uuid4().hex
+        self.leader = False
+        self.statistics = {
+            collection: CachePrewarmStatistics() for collection in self.settings.prewarm
+        }
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def interval(self, collection: str) -> int:
+        """Return the delay in seconds between two refreshes of the collection."""
+        return max(getattr(self.settings, collection) - self.settings.prewarm_margin, 1)
+
+    def start(self) -> None:
+        """Start refreshing collections in a background thread, unless this thread
+        is already running. Threads are not inherited by forked processes, the
+        thread is started again when this method is called after fork."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            logger.info(
+                "Starting cache pre-warming of %s", ", ".join(self.settings.prewarm)
+            )
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def elect(self) -> bool:
+        """Try to acquire or renew leadership, return True if the agent is leader."""
+        try:
+            leader = self.service.elect(
+                self.LEADER_NAME, self.identity, self.LEADER_TTL
+            )
+        except SlurmwebCacheError as err:
+            logger.error("Unable to elect cache pre-warming leader: %s", err)
+            leader = False
+        if leader != self.leader:
+            if leader:
+                logger.info("Agent elected leader for cache pre-warming")
+            else:
+                logger.info("Agent is not leader for cache pre-warming anymore")
+        self.leader = leader
+        return leader
+
+    def refresh(self, collection: str) -> None:
+        statistics = self.statistics[collection]
+        start = time.monotonic()
+        try:
+            self.slurmrestd.refresh(collection)
+        except (
+            SlurmrestdNotFoundError,
+            SlurmrestdInvalidResponseError,
+            SlurmrestConnectionError,
+            SlurmrestdInternalError,
+            SlurmrestdAuthenticationError,
+            SlurmwebCacheError,
+        ) as err:
+            statistics.failures += 1
+            logger.error("Unable to pre-warm %s in cache: %s", collection, err)
+            return
+        statistics.refreshes += 1
+        statistics.duration = time.monotonic() - start
+        logger.debug(
+            "Pre-warmed %s in cache in %.3f seconds", collection, statistics.duration
+        )
+
+    def _run(self) -> None:
+        due = {}
+        next_election = 0
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if now >= next_election:
+                was_leader = self.leader
+                if self.elect() and not was_leader:
+                    # Refresh all collections when leadership is gained, the previous
+                    # leader may have failed for a while.
+                    due = {collection: now for collection in self.settings.prewarm}
+                next_election = now + self.LEADER_TTL / 3
+            deadline = next_election
+            if self.leader:
+                for collection, when in due.items():
+                    if now >= when:
+                        self.refresh(collection)
+                        due[collection] = time.monotonic() + self.interval(collection)
+                deadline = min(min(due.values()), next_election)
+            self._stop.wait(max(deadline - time.monotonic(), 0))
@@ -0,0 +1,220 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Serialization of values saved in cache.
+
+Serialized values are prefixed by a header which contains the version of the
+format, the codec and the compression algorithm used to encode the value. Values are
+then decoded with the codec and compression algorithm declared in their header,
+whatever the current settings, so these settings can be changed without flushing
+the cache. Values without header are decoded with pickle, for compatibility with
+values saved by previous versions of Slurm-web."""
+
+import typing as t
+import pickle
+import logging
+
+from .errors import SlurmwebConfigurationError, SlurmwebCacheError
+
+logger = logging.getLogger(__name__)
+
+
+class CacheCodec:
+    ID = None
+    NAME = None
+
+    def dumps(self, value: t.Any) -> bytes:
+        raise NotImplementedError
+
+    def loads(self, data: bytes) -> t.Any:
+        raise NotImplementedError
+
+
+class CachePickleCodec(CacheCodec):
+    ID = 0
+    NAME = "pickle"
+
+    def dumps(self, value: t.Any) -> bytes:
+        return pickle.dumps(value)
+
+    def loads(self, data: bytes) -> t.Any:
+        return pickle.loads(data)
+
+
+class CacheMsgpackCodec(CacheCodec):
+    ID = 1
+    NAME = "msgpack"
+
+    def __init__(self):
+        try:
+            import msgpack
+        except ModuleNotFoundError as err:
+            raise SlurmwebConfigurationError(
+                "msgpack module is required for msgpack cache codec"
+            ) from err
+        self.msgpack = msgpack
+
+    def dumps(self, value: t.Any) -> bytes:
+        return self.msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: bytes) -> t.Any:
+        return self.msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class CacheOrjsonCodec(CacheCodec):
+    ID = 2
+    NAME = "orjson"
+
+    def __init__(self):
+        try:
+            import orjson
+        except ModuleNotFoundError as err:
+            raise SlurmwebConfigurationError(
+                "orjson module is required for orjson cache codec"
+            ) from err
+        self.orjson = orjson
+
+    def dumps(self, value: t.Any) -> bytes:
+        return self.orjson.dumps(value)
+
+    def loads(self, data: bytes) -> t.Any:
+        return self.orjson.loads(data)
+
+
+class CacheCompression:
+    ID = None
+    NAME = None
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class CacheNoCompression(CacheCompression):
+    ID = 0
+    NAME = "none"
+
+    def compress(self, data: bytes) -> bytes:
+        return data
+
+    def decompress(self, data: bytes) -> bytes:
+        return data
+
+
+class CacheZstdCompression(CacheCompression):
+    ID = 1
+    NAME = "zstd"
+
+    def __init__(self):
+        try:
+            import zstandard
+        except ModuleNotFoundError as err:
+            raise SlurmwebConfigurationError(
+                "zstandard module is required for zstd cache compression"
+            ) from err
+        self.zstandard = zstandard
+
+    def compress(self, data: bytes) -> bytes:
+        return self.zstandard.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.zstandard.decompress(data)
+
+
+class CacheLz4Compression(CacheCompression):
+    ID = 2
+    NAME = "lz4"
+
+    def __init__(self):
+        try:
+            import lz4.frame
+        except ModuleNotFoundError as err:
+            raise SlurmwebConfigurationError(
+                "lz4 module is required for lz4 cache compression"
+            ) from err
+        self.lz4 = lz4.frame
+
+    def compress(self, data: bytes) -> bytes:
+        return self.lz4.compress(data)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self.lz4.decompress(data)
+
+
+CODECS = [CachePickleCodec, CacheMsgpackCodec, CacheOrjsonCodec]
+COMPRESSIONS = [CacheNoCompression, CacheZstdCompression, CacheLz4Compression]
+
+
+class CacheSerializer:
+    # Header is composed of the magic bytes followed by one byte for the format
+    # version, one byte for the codec ID and one byte for the compression ID.
+    MAGIC = b"SW"
+    VERSION = 1
+    HEADER_SIZE = len(MAGIC) + 3
+
+    def __init__(
+        self,
+        codec: str = "pickle",
+        compression: str = "none",
+        compression_threshold: int = 0,
+    ):
+        self.codec = self._select(CODECS, codec)()
+        self.compression = self._select(COMPRESSIONS, compression)()
+        self.compression_threshold = compression_threshold
+        # Codecs and compression algorithms used to decode values are loaded
+        # lazily, when values encoded with other settings are found in cache.
+        self._codecs = {self.codec.ID: self.codec}
+        self._compressions = {
+            CacheNoCompression.ID: CacheNoCompression(),
+            self.compression.ID: self.compression,
+        }
+
+    @staticmethod
+    def _select(choices, name):
+        for choice in choices:
+            if choice.NAME == name:
+                return choice
+        raise SlurmwebConfigurationError(f"Unsupported cache serialization {name}")
+
+    @staticmethod
+    def _load(choices, loaded, _id):
+        if _id not in loaded:
+            for choice in choices:
+                if choice.ID == _id:
+                    try:
+                        loaded[_id] = choice()
+                    except SlurmwebConfigurationError as err:
+                        raise SlurmwebCacheError(str(err)) from err
+                    break
+            else:
+                raise SlurmwebCacheError(f"Unsupported cache serialization ID {_id}")
+        return loaded[_id]
+
+    def dumps(self, value: t.Any) -> bytes:
+        data = self.codec.dumps(value)
+        compression = self._compressions[CacheNoCompression.ID]
+        if len(data) >= self.compression_threshold:
+            compression = self.compression
+        return (
+            self.MAGIC
+            + bytes([self.VERSION, self.codec.ID, compression.ID])
+            + compression.compress(data)
+        )
+
+    def loads(self, data: bytes) -> t.Any:
+        if not data.startswith(self.MAGIC):
+            # Value saved without header by previous versions.
+            return pickle.loads(data)
+        version, codec_id, compression_id = data[len(self.MAGIC) : self.HEADER_SIZE]
+        if version != self.VERSION:
+            raise SlurmwebCacheError(
+                f"Unsupported cache serialization format version {version}"
+            )
+        codec = self._load(CODECS, self._codecs, codec_id)
+        compression = self._load(COMPRESSIONS, self._compressions, compression_id)
+        return codec.loads(compression.decompress(data[self.HEADER_SIZE :]))
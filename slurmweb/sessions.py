@@ -0,0 +1,315 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Event loop of the gateway, running in a dedicated thread with one aiohttp client
+session per agent shared by all requests, so that connections to agents are kept
+alive and reused instead of being opened for every request."""
+
+import typing as t
+import asyncio
+import threading
+import logging
+import ssl
+import time
+from pathlib import Path
+
+import aiohttp
+
+from .errors import SlurmwebConfigurationError
+
+logger = logging.getLogger(__name__)
+
+# Minimal delay in seconds between two checks of modification of CA certificate file.
+CACERT_CHECK_INTERVAL = 10
+# Delay in seconds before closing the connector replaced after reload of CA
+# certificate, to let requests in progress complete.
+CONNECTOR_CLOSE_DELAY = 60
+
+
+class AgentCircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised when a request to an agent is rejected because its circuit breaker is
+    open."""
+
+    pass
+
+
+class CircuitBreaker:
+    """Circuit breaker of an agent. The circuit is opened after threshold consecutive
+    connection errors or timeouts, then requests are rejected immediately during
+    delay seconds. After this delay, the circuit is half-open: a single probe request
+    is allowed, the circuit is closed if it succeeds or opened again if it fails. A
+    threshold of 0 disables the circuit breaker."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+    STATES = [CLOSED, OPEN, HALF_OPEN]
+
+    def __init__(self, url: str, threshold: int, delay: int):
+        self.url = url
+        self.threshold = threshold
+        self.delay = delay
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trips = 0
+        self._since = None
+
+    def allow(self) -> bool:
+        """Return True if a request can be sent to the agent."""
+        if self.state == self.CLOSED:
+            return True
+        now = time.monotonic()
+        # In half-open state, another probe is allowed only if the previous one
+        # has not completed after delay.
+        if now < self._since + self.delay:
+            return False
+        if self.state == self.OPEN:
+            logger.info("Circuit breaker half-open for agent at url %s", self.url)
+            self.state = self.HALF_OPEN
+        self._since = now
+        return True
+
+    def success(self) -> None:
+        """Record a response received from the agent."""
+        if self.state != self.CLOSED:
+            logger.info("Circuit breaker closed for agent at url %s", self.url)
+            self.state = self.CLOSED
+        self.failures = 0
+
+    def failure(self) -> None:
+        """Record a connection error, a timeout or a server error with the
+        agent."""
+        self.failures += 1
+        if not self.threshold:
+            return
+        if self.state == self.HALF_OPEN or (
+            self.state == self.CLOSED and self.failures >= self.threshold
+        ):
+            logger.warning(
+                "Circuit breaker open for agent at url %s after %d failures",
+                self.url,
+                self.failures,
+            )
+            if self.state == self.CLOSED:
+                self.trips += 1
+            self.state = self.OPEN
+            self._since = time.monotonic()
+
+
+class AgentsSSLContext:
+    """SSL context to validate agents certificates with a custom CA certificate,
+    loaded once and reloaded when the CA certificate file is modified."""
+
+    def __init__(self, cacert: Path):
+        self.cacert = cacert
+        self._context = None
+        self._mtime = None
+        self._checked = None
+        self._lock = threading.Lock()
+
+    def get(self) -> ssl.SSLContext:
+        """Return the SSL context. Modification time of CA certificate file is checked
+        at most once every CACERT_CHECK_INTERVAL seconds and the SSL context is
+        reloaded if the file has been modified. If reload fails, the current SSL
+        context is kept. Raise SlurmwebConfigurationError if the file cannot be
+        loaded initially."""
+        with self._lock:
+            now = time.monotonic()
+            if (
+                self._context is not None
+                and now < self._checked + CACERT_CHECK_INTERVAL
+            ):
+                return self._context
+            self._checked = now
+            try:
+                mtime = self.cacert.stat().st_mtime
+                if mtime != self._mtime:
+                    logger.debug("Loading agent CA certificate %s", self.cacert)
+                    self._context = ssl.create_default_context(cafile=str(self.cacert))
+                    self._mtime = mtime
+            except FileNotFoundError as err:
+                self._reload_error(
+                    err, f"Agent CA certificate file {self.cacert} not found"
+                )
+            except (OSError, ssl.SSLError) as err:
+                self._reload_error(
+                    err, f"Unable to load agent CA certificate {self.cacert}: {err}"
+                )
+            return self._context
+
+    def _reload_error(self, err: Exception, msg: str) -> None:
+        """Raise SlurmwebConfigurationError with the given message if the SSL context
+        has never been loaded, else log error and keep the current SSL context."""
+        if self._context is None:
+            raise SlurmwebConfigurationError(msg) from err
+        logger.error("%s, keeping current certificate", msg)
+
+
+class AgentsSessions:
+    """Persistent event loop and pooled client sessions to agents. Coroutines are
+    submitted by the threads serving requests and run in the loop thread, started
+    on first use. All sessions share the same connector, which is replaced with the
+    sessions when the SSL context returned by ssl_context changes. Requests are
+    subject to the given timeout and to the circuit breaker of their agent."""
+
+    def __init__(
+        self,
+        connector: t.Callable[[], aiohttp.TCPConnector],
+        ssl_context: t.Optional[t.Callable[[], ssl.SSLContext]] = None,
+        timeout: t.Optional[aiohttp.ClientTimeout] = None,
+        breaker_threshold: int = 0,
+        breaker_delay: int = 0,
+    ):
+        self.connector = connector
+        self.ssl_context = ssl_context
+        self.timeout = timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_delay = breaker_delay
+        self.breakers = {}
+        self._loop = None
+        self._thread = None
+        self._connector = None
+        self._context = None
+        self._sessions = {}
+        self._tasks = []
+        self._lock = threading.Lock()
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop, started in a dedicated thread if not running."""
+        with self._lock:
+            if self._loop is None:
+                logger.debug("Starting agents sessions event loop")
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coroutine: t.Awaitable) -> t.Any:
+        """Run the coroutine in the event loop, wait for its completion and return
+        its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._start()).result()
+
+    def spawn(self, coroutine: t.Awaitable) -> None:
+        """Run the coroutine in background in the event loop, without waiting for its
+        completion. Background tasks are cancelled when the event loop is
+        stopped."""
+        loop = self._start()
+
+        def create():
+            self._tasks.append(loop.create_task(coroutine))
+
+        loop.call_soon_threadsafe(create)
+
+    def breaker(self, url: str) -> CircuitBreaker:
+        """Return the circuit breaker of the agent at the given URL, created if
+        missing."""
+        breaker = self.breakers.get(url)
+        if breaker is None:
+            breaker = self.breakers[url] = CircuitBreaker(
+                url, self.breaker_threshold, self.breaker_delay
+            )
+        return breaker
+
+    def _trace(self, breaker: CircuitBreaker) -> aiohttp.TraceConfig:
+        """Return trace configuration recording outcome of requests in the given
+        circuit breaker."""
+
+        async def on_request_end(session, context, params):
+            # Server errors are failures of the agent, except HTTP/501 returned
+            # for features disabled on the agent.
+            if params.response.status >= 500 and params.response.status != 501:
+                breaker.failure()
+            else:
+                breaker.success()
+
+        async def on_request_exception(session, context, params):
+            if isinstance(
+                params.exception, (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+            ):
+                breaker.failure()
+
+        trace = aiohttp.TraceConfig()
+        trace.on_request_end.append(on_request_end)
+        trace.on_request_exception.append(on_request_exception)
+        return trace
+
+    def session(self, url: str) -> aiohttp.ClientSession:
+        """Return the client session of the agent at the given URL, created if
+        missing. Raise AgentCircuitOpenError if the circuit breaker of the agent
+        rejects the request. This must be called by coroutines running in the event
+        loop."""
+        breaker = self.breaker(url)
+        if not breaker.allow():
+            raise AgentCircuitOpenError(f"Circuit breaker open for agent at url {url}")
+        if self.ssl_context is not None:
+            context = self.ssl_context()
+            if context is not self._context:
+                if self._connector is not None:
+                    logger.info("Agent SSL context reloaded, replacing connector")
+                    self._retire()
+                self._context = context
+        if self._connector is None:
+            self._connector = self.connector()
+        session = self._sessions.get(url)
+        if session is None or session.closed:
+            logger.debug("Opening client session to agent at url %s", url)
+            kwargs = {}
+            if self.timeout is not None:
+                kwargs["timeout"] = self.timeout
+            session = aiohttp.ClientSession(
+                connector=self._connector,
+                connector_owner=False,
+                trace_configs=[self._trace(breaker)],
+                **kwargs,
+            )
+            self._sessions[url] = session
+        return session
+
+    def _retire(self) -> None:
+        """Detach the current connector and sessions, they are closed after
+        CONNECTOR_CLOSE_DELAY to let requests in progress complete."""
+        connector, sessions = self._connector, list(self._sessions.values())
+
+        async def close():
+            for session in sessions:
+                await session.close()
+            await connector.close()
+
+        self._loop.call_later(
+            CONNECTOR_CLOSE_DELAY, lambda: self._loop.create_task(close())
+        )
+        self._connector = None
+        self._sessions = {}
+
+    async def _close_sessions(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        if self._tasks:
+            await asyncio.wait(self._tasks)
+        self._tasks = []
+        for session in self._sessions.values():
+            await session.close()
+        self._sessions = {}
+        if self._connector is not None:
+            await self._connector.close()
+            self._connector = None
+        self._context = None
+
+    def stop(self) -> None:
+        """Close all client sessions and stop the event loop."""
+        with self._lock:
+            if self._loop is None:
+                return
+            asyncio.run_coroutine_threadsafe(
+                self._close_sessions(), self._loop
+            ).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
@@ -5,15 +5,29 @@
 # SPDX-License-Identifier: MIT
 
 import typing as t
+import collections
+import functools
 import urllib
+import threading
+import concurrent.futures
+import time
 import logging
 
 import requests
-from ClusterShell.NodeSet import NodeSet
 
 from .unix import SlurmrestdUnixAdapter
 from .auth import SlurmrestdAuthentifier
-from .adapters import build_adaptation_chain
+from .adapters import build_adaptation_chain, AdaptationChain
+from .table import SlurmrestdTable
+from .stream import SlurmrestdProjection, IteratorReader, load_ijson
+from .memo import nodeset_expand, gres_gpus
+from .jobs import JobsQuery, select_jobs, build_jobs_index, select_jobs_in_index
+from .changes import (
+    CHANGES_IDENTIFIERS,
+    CHANGES_HISTORY_SIZE,
+    build_snapshot_digests,
+    snapshot_changes,
+)
 from ..cache import CacheKey
 from .errors import (
     SlurmrestdNotFoundError,
@@ -32,14 +46,20 @@ if t.TYPE_CHECKING:
 
 
 class Slurmrestd:
+    # Slurm error returned when no record has been updated since the given time.
+    SLURM_NO_CHANGE_IN_DATA = 1900
+    # Size in bytes of chunks of responses read by streaming parser.
+    STREAMING_CHUNK_SIZE = 64 * 1024
+
     def __init__(
         self,
         uri: urllib.parse.ParseResult,
         auth: SlurmrestdAuthentifier,
         supported_versions: t.List[str],
+        pool_size: int = 10,
+        pool_idle_timeout: int = 30,
+        streaming: bool = False,
     ):
-        self.session = requests.Session()
-
         # When using local authenciation, ensure slurmrestd URI is a Unix socket. For
         # authentication on TCP/IP socket, JWT authentication is required.
         if auth.method == "local" and uri.scheme != "unix":
@@ -47,20 +67,42 @@ class Slurmrestd:
                 "slurmrestd local authentication is only supported with unix socket URI"
             )
 
-        if uri.scheme == "unix":
-            self.prefix = "http+unix://slurmrestd"
-            self.session.mount(self.prefix, SlurmrestdUnixAdapter(uri.path))
-        else:
-            self.prefix = uri.geturl()
-
+        self.uri = uri
         self.auth = auth
         self.supported_versions = supported_versions
+        self.pool_size = pool_size
+        self.pool_idle_timeout = pool_idle_timeout
+        self._setup_session()
+        self.streaming = streaming
+        if self.streaming:
+            # Check streaming parser is available
+            load_ijson()
 
         # Initialized in discover()
         self.cluster_name = None
         self.slurm_version = None
         self.api_version = None
 
+        # Fingerprints of the last snapshots of records by collection and version,
+        # to compute changes since these snapshots.
+        self._snapshots: t.Dict[str, t.Dict[str, t.Dict[str, str]]] = {}
+        self._snapshots_lock = threading.Lock()
+
+    def _setup_session(self) -> None:
+        """Initialize HTTP session to slurmrestd, with a pool of persistent
+        connections when slurmrestd URI is a Unix socket."""
+        self.session = requests.Session()
+        if self.uri.scheme == "unix":
+            self.prefix = "http+unix://slurmrestd"
+            self.session.mount(
+                self.prefix,
+                SlurmrestdUnixAdapter(
+                    self.uri.path, self.pool_size, self.pool_idle_timeout
+                ),
+            )
+        else:
+            self.prefix = self.uri.geturl()
+
     def _validate_response(self, response, ignore_notfound: bool) -> None:
         """Validate slurmrestd response or abort agent resquest with error."""
         self._validate_status(response, ignore_notfound)
@@ -94,7 +136,13 @@ class Slurmrestd:
             )
 
     def _execute_request(
-        self, component: str, api_version: str, endpoint: str, ignore_notfound=False
+        self,
+        component: str,
+        api_version: str,
+        endpoint: str,
+        ignore_notfound=False,
+        key: t.Optional[str] = None,
+        fields: t.Optional[t.List[str]] = None,
     ) -> dict:
         """Execute HTTP request to slurmrestd API with provided API version and return
         parsed JSON result.
@@ -104,6 +152,10 @@ class Slurmrestd:
             api_version: API version to use
             endpoint: API endpoint path (e.g., "ping", "jobs", "job/123")
             ignore_notfound: If True, don't raise error on HTTP 404
+            key: Key of records in response JSON, required with fields
+            fields: If not None, the records under the key are projected on these
+              fields. With streaming enabled, the response is parsed while it is
+              received and the fields which are not selected are skipped.
 
         Returns:
             Parsed JSON response as a dictionary
@@ -111,16 +163,37 @@ class Slurmrestd:
         # Compose query path with provided API version
         query = f"/{component}/v{api_version}/{endpoint}"
 
+        streaming = self.streaming and fields is not None
         try:
             response = self.session.get(
-                f"{self.prefix}{query}", headers=self.auth.headers()
+                f"{self.prefix}{query}",
+                headers=self.auth.headers(),
+                stream=streaming,
             )
         except requests.exceptions.ConnectionError as err:
             raise SlurmrestConnectionError(str(err))
 
-        self._validate_response(response, ignore_notfound)
+        if not streaming:
+            self._validate_response(response, ignore_notfound)
+            result = response.json()
+        else:
+            # Release the connection in pool when the response is not entirely
+            # consumed, in case of error.
+            try:
+                self._validate_response(response, ignore_notfound)
+                result = SlurmrestdProjection(load_ijson(), key, fields).parse(
+                    IteratorReader(response.iter_content(self.STREAMING_CHUNK_SIZE))
+                )
+            finally:
+                response.close()
+        self._check_result(query, result)
+        if not streaming and fields is not None and key in result:
+            Slurmrestd.filter_fields(result[key], fields)
+        return result
 
-        result = response.json()
+    def _check_result(self, query: str, result: dict) -> None:
+        """Raise SlurmrestdInternalError if errors are reported in slurmrestd
+        response, log warnings otherwise."""
         if len(result["errors"]):
             error = result["errors"][0]
             raise SlurmrestdInternalError(
@@ -139,9 +212,15 @@ class Slurmrestd:
             logger.warning(
                 "slurmrestd query %s warnings: %s", query, result["warnings"]
             )
-        return result
 
-    def _request(self, component: str, endpoint: str, key: str, ignore_notfound=False):
+    def _request(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        ignore_notfound=False,
+        fields: t.Optional[t.List[str]] = None,
+    ):
         """Make a request to slurmrestd API with detected API version.
 
         Args:
@@ -149,16 +228,86 @@ class Slurmrestd:
             endpoint: API endpoint path (e.g., "ping", "jobs", "job/123")
             key: Key to extract from response JSON
             ignore_notfound: If True, don't raise error on HTTP 404
+            fields: If not None, fields of records to select while parsing response
         """
         # Ensure API version is discovered before making request
         if self.api_version is None:
             self.discover()
 
         result = self._execute_request(
-            component, self.api_version, endpoint, ignore_notfound
+            component, self.api_version, endpoint, ignore_notfound, key, fields
         )
         return result[key]
 
+    def _request_since(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        update_time: int,
+        fields: t.Optional[t.List[str]] = None,
+    ) -> t.Tuple[t.List, t.Optional[int]]:
+        """Make a request to slurmrestd API for the records updated since the given
+        timestamp, or all records if 0. Return a tuple with the list of records
+        and the last update timestamp reported by slurmrestd, or None if
+        unavailable."""
+        # Ensure API version is discovered before making request
+        if self.api_version is None:
+            self.discover()
+
+        try:
+            result = self._execute_request(
+                component,
+                self.api_version,
+                f"{endpoint}?update_time={update_time}",
+                key=key,
+                fields=fields,
+            )
+        except SlurmrestdInternalError as err:
+            if err.error != self.SLURM_NO_CHANGE_IN_DATA:
+                raise err
+            return [], None
+        return result[key], self._last_update(result)
+
+    @staticmethod
+    def filter_item_fields(item: t.Dict, selection: t.Optional[t.List[str]]):
+        for key in list(item.keys()):
+            if key not in selection:
+                del item[key]
+
+    @staticmethod
+    def filter_fields(
+        items: t.Union[t.List, t.Dict],
+        selection: t.Optional[t.List[str]],
+    ):
+        if selection is not None:
+            if isinstance(items, list):
+                for item in items:
+                    Slurmrestd.filter_item_fields(item, selection)
+            else:
+                Slurmrestd.filter_item_fields(items, selection)
+        return items
+
+    @staticmethod
+    def project_fields(
+        items: t.List[t.Dict], selection: t.Optional[t.List[str]]
+    ) -> t.List[t.Dict]:
+        """Return new list of items with only the selected fields. Contrary to
+        filter_fields(), the given items are not modified, this is suitable for
+        items shared with cache."""
+        if selection is None:
+            return items
+        return [{key: item[key] for key in selection if key in item} for item in items]
+
+    @staticmethod
+    def _last_update(result: dict) -> t.Optional[int]:
+        """Return last update timestamp of slurmrestd response, or None if not
+        set."""
+        last_update = result.get("last_update")
+        if not isinstance(last_update, dict) or not last_update.get("set"):
+            return None
+        return last_update["number"]
+
     def discover(self) -> t.Tuple[str, str, str]:
         """Discover the actual slurmrestd API version and Slurm version by trying
         versions from the configured list. Returns a tuple of
@@ -212,30 +361,184 @@ class Slurmrestd:
             f"Tried versions: {', '.join(self.supported_versions)}"
         )
 
+    def query(self, *calls: t.Tuple[str, t.Tuple[t.Any, ...]]) -> t.List[t.Any]:
+        """Run the given calls, as tuples of method name and arguments, and return
+        the list of their results in the same order. Calls are run sequentially with
+        this synchronous client."""
+        return [getattr(self, method)(*args) for method, args in calls]
+
+    def snapshot_version(self, *keys: str) -> t.Optional[str]:
+        """Return the version of the snapshot of data saved in cache under the given
+        keys, or None if unknown. Data is not cached by this client, the version is
+        always unknown."""
+        return None
+
+    def _snapshot_digests(
+        self, collection: str, records: t.List[t.Dict]
+    ) -> t.Dict[str, t.Any]:
+        """Return fingerprint of the given snapshot of records of the collection and
+        save it in history."""
+        snapshot = build_snapshot_digests(records, CHANGES_IDENTIFIERS[collection])
+        self._save_snapshot_history(collection, snapshot)
+        return snapshot
+
+    def _save_snapshot_history(self, collection: str, snapshot: t.Dict[str, t.Any]):
+        """Save digests of the records of the given snapshot fingerprint in the
+        history of the process, bounded to the last snapshots."""
+        with self._snapshots_lock:
+            history = self._snapshots.setdefault(collection, collections.OrderedDict())
+            history[snapshot["version"]] = snapshot["digests"]
+            history.move_to_end(snapshot["version"])
+            while len(history) > CHANGES_HISTORY_SIZE:
+                history.popitem(last=False)
+
+    def _snapshot_history(
+        self, collection: str, version: t.Optional[str]
+    ) -> t.Optional[t.Dict[str, str]]:
+        """Return digests of the records of the snapshot of the given version in
+        history, or None if unknown."""
+        if version is None:
+            return None
+        with self._snapshots_lock:
+            return self._snapshots.get(collection, {}).get(version)
+
+    def _changes(
+        self,
+        collection: str,
+        since: t.Optional[str],
+        digests: t.Callable[[], t.Dict[str, t.Any]],
+        records: t.Callable[[], t.List[t.Dict]],
+    ) -> t.Dict[str, t.Any]:
+        """Return changes of the records of the collection since the snapshot of the
+        given version. Records are not retrieved when the current snapshot has the
+        same version."""
+        current = digests()
+        if since == current["version"]:
+            return snapshot_changes(
+                [], CHANGES_IDENTIFIERS[collection], current, current["digests"]
+            )
+        return snapshot_changes(
+            records(),
+            CHANGES_IDENTIFIERS[collection],
+            current,
+            self._snapshot_history(collection, since),
+        )
+
+    def _derivations(
+        self, collection: str
+    ) -> t.Dict[str, t.Callable[[t.List[t.Dict]], t.Any]]:
+        """Return the functions which compute the entries derived from the records
+        of the collection, indexed by the names of these entries."""
+        if collection == "jobs":
+            return {
+                "jobs-summary": self._jobs_summary,
+                "jobs-nodes": self._jobs_nodes_index,
+                "jobs-index": build_jobs_index,
+                "jobs-digests": functools.partial(self._snapshot_digests, "jobs"),
+            }
+        if collection == "nodes":
+            return {
+                "nodes-summary": self._nodes_summary,
+                "nodes-digests": functools.partial(self._snapshot_digests, "nodes"),
+            }
+        return {}
+
+    def _derived(self, collection: str, name: str) -> t.Any:
+        """Return the entry of the given name derived from the records of the
+        collection."""
+        return self._derivations(collection)[name](getattr(self, collection)())
+
     def jobs(self, **kwargs):
         return self._request("slurm", "jobs", "jobs", **kwargs)
 
     def jobs_by_node(self, node: str):
         """Select jobs not completed which are allocated the given node."""
+        return self._jobs_on_node(self.jobs(), node)
+
+    @staticmethod
+    def _jobs_on_node(jobs: t.List[t.Dict], node: str) -> t.List[t.Dict]:
+        """Return jobs not completed in the given list which are allocated the given
+        node."""
 
         def on_node(job):
             """Return True if job is allocated this node."""
             if job["nodes"] == "":
                 return False
-            return node in NodeSet(job["nodes"])
+            return node in nodeset_expand(job["nodes"])
+
+        return [
+            job for job in jobs if on_node(job) and not Slurmrestd._job_terminated(job)
+        ]
 
-        def terminated(job):
-            """Return True if job is terminated."""
-            for terminated_state in ["COMPLETED", "FAILED", "TIMEOUT"]:
-                if terminated_state in job["job_state"]:
-                    return True
-            return False
+    @staticmethod
+    def _job_terminated(job: t.Dict) -> bool:
+        """Return True if job is terminated."""
+        for terminated_state in ["COMPLETED", "FAILED", "TIMEOUT"]:
+            if terminated_state in job["job_state"]:
+                return True
+        return False
+
+    def jobs_nodes_index(self):
+        return self._derived("jobs", "jobs-nodes")
+
+    @staticmethod
+    def _jobs_nodes_index(jobs: t.List[t.Dict]) -> t.Dict[str, t.Any]:
+        """Return inverted index of the jobs not completed in the given list by
+        allocated nodes. The index is a dict with the list of these jobs under key
+        jobs and the positions of the jobs in this list for every allocated node
+        under key nodes. Job IDs are not used as keys for compatibility with all
+        cache codecs."""
+        index = {"jobs": [], "nodes": {}}
+        for job in jobs:
+            if job["nodes"] == "" or Slurmrestd._job_terminated(job):
+                continue
+            position = len(index["jobs"])
+            index["jobs"].append(job)
+            for node in nodeset_expand(job["nodes"]):
+                index["nodes"].setdefault(node, []).append(position)
+        return index
+
+    @staticmethod
+    def _jobs_in_index(index: t.Dict[str, t.Any], node: str) -> t.List[t.Dict]:
+        """Return jobs allocated the given node in inverted index."""
+        jobs = index["jobs"]
+        return [jobs[position] for position in index["nodes"].get(node, [])]
+
+    def jobs_query(self, query: JobsQuery):
+        """Select the page of jobs filtered and sorted with the given query."""
+        return select_jobs(self.jobs(), query)
+
+    def jobs_index(self):
+        return self._derived("jobs", "jobs-index")
 
-        return [job for job in self.jobs() if on_node(job) and not terminated(job)]
+    def jobs_digests(self):
+        return self._derived("jobs", "jobs-digests")
+
+    def jobs_changes(self, since: t.Optional[str] = None):
+        """Return changes of jobs since the snapshot of the given version."""
+        return self._changes("jobs", since, self.jobs_digests, self.jobs)
 
     def jobs_states(self):
+        return self._summary_jobs_states(self.jobs_summary())
+
+    def jobs_summary(self):
+        return self._derived("jobs", "jobs-summary")
+
+    @staticmethod
+    def _jobs_summary(jobs: t.List[t.Dict]) -> t.Dict[str, t.Any]:
+        """Return summary of jobs with the number of jobs per state and the total
+        number of jobs, computed in a single pass on jobs."""
+        states, total = Slurmrestd._jobs_states(jobs)
+        return {"states": states, "total": total}
+
+    @staticmethod
+    def _summary_jobs_states(summary: t.Dict[str, t.Any]):
+        return summary["states"], summary["total"]
+
+    @staticmethod
+    def _jobs_states(jobs: t.List[t.Dict]):
         # All Slurm jobs base states. Jobs can have only one of them.
-        jobs = {
+        states = {
             "running": 0,
             "pending": 0,
             "completing": 0,
@@ -252,17 +555,17 @@ class Slurmrestd:
             "unknown": 0,
         }
         total = 0
-        for job in self.jobs():
+        for job in jobs:
             state_found = False
-            for state in jobs.keys():
+            for state in states.keys():
                 if state.upper() in job["job_state"]:
-                    jobs[state] += 1
+                    states[state] += 1
                     state_found = True
                     break
             if not state_found:
-                jobs["unknown"] += 1
+                states["unknown"] += 1
             total += 1
-        return jobs, total
+        return states, total
 
     def _ctldjob(self, job_id: int, **kwargs):
         return self._request("slurm", f"job/{job_id}", "jobs", **kwargs)[0]
@@ -274,6 +577,38 @@ class Slurmrestd:
         return self._request("slurm", "nodes", "nodes", **kwargs)
 
     def resources_states(self):
+        return self._summary_resources_states(self.nodes_summary())
+
+    def nodes_summary(self):
+        return self._derived("nodes", "nodes-summary")
+
+    def nodes_digests(self):
+        return self._derived("nodes", "nodes-digests")
+
+    def nodes_changes(self, since: t.Optional[str] = None):
+        """Return changes of nodes since the snapshot of the given version."""
+        return self._changes("nodes", since, self.nodes_digests, self.nodes)
+
+    @classmethod
+    def _resources_states(cls, nodes: t.List[t.Dict]):
+        return cls._summary_resources_states(cls._nodes_summary(nodes))
+
+    @staticmethod
+    def _summary_resources_states(summary: t.Dict[str, t.Any]):
+        return (
+            summary["nodes"],
+            summary["cores"],
+            summary["gpus"],
+            summary["totals"]["nodes"],
+            summary["totals"]["cores"],
+            summary["totals"]["gpus"],
+        )
+
+    @classmethod
+    def _nodes_summary(cls, nodes: t.List[t.Dict]) -> t.Dict[str, t.Any]:
+        """Return summary of nodes with the number of nodes, cores and GPU per state
+        and their totals with the total amount of memory, computed in a single pass
+        on nodes."""
         # All Slurm nodes base states and some interesting flags such as drain and fail.
         nodes_states = {
             "idle": 0,
@@ -308,9 +643,10 @@ class Slurmrestd:
         nodes_total = 0
         cores_total = 0
         gpus_total = 0
-        for node in self.nodes():
+        memory_total = 0
+        for node in nodes:
             cores = node["cpus"]
-            node_gpus = self.node_gres_extract_gpus(node["gres"])
+            node_gpus = cls.node_gres_extract_gpus(node["gres"])
             if "ERROR" in node["state"]:
                 nodes_states["error"] += 1
                 cores_states["error"] += cores
@@ -324,13 +660,13 @@ class Slurmrestd:
                 # Look at number of actually allocated/idle cores
                 cores_states["allocated"] += node["alloc_cpus"]
                 cores_states["idle"] += node["alloc_idle_cpus"]
-                allocated_gpus = self.node_gres_extract_gpus(node["gres_used"])
+                allocated_gpus = cls.node_gres_extract_gpus(node["gres_used"])
                 gpus_states["allocated"] += allocated_gpus
                 gpus_states["idle"] += node_gpus - allocated_gpus
             elif "ALLOCATED" in node["state"]:
                 nodes_states["allocated"] += 1
                 cores_states["allocated"] += cores
-                allocated_gpus = self.node_gres_extract_gpus(node["gres_used"])
+                allocated_gpus = cls.node_gres_extract_gpus(node["gres_used"])
                 gpus_states["allocated"] += allocated_gpus
                 gpus_states["idle"] += node_gpus - allocated_gpus
             elif "DOWN" in node["state"]:
@@ -352,14 +688,18 @@ class Slurmrestd:
             nodes_total += 1
             cores_total += cores
             gpus_total += node_gpus
-        return (
-            nodes_states,
-            cores_states,
-            gpus_states,
-            nodes_total,
-            cores_total,
-            gpus_total,
-        )
+            memory_total += node["real_memory"]
+        return {
+            "nodes": nodes_states,
+            "cores": cores_states,
+            "gpus": gpus_states,
+            "totals": {
+                "nodes": nodes_total,
+                "cores": cores_total,
+                "gpus": gpus_total,
+                "memory": memory_total,
+            },
+        }
 
     def node(self, node_name: str, **kwargs):
         try:
@@ -387,16 +727,7 @@ class Slurmrestd:
     @staticmethod
     def node_gres_extract_gpus(gres_full: str) -> int:
         """Return the number of GPU in gres string."""
-        result = 0
-        for gres_s in gres_full.split(","):
-            if not len(gres_s):
-                continue
-            # Remove index if present
-            gres_s = gres_s.split("(")[0]
-            gres = gres_s.split(":")
-            if gres[0] == "gpu":
-                result += int(gres.pop())
-        return result
+        return gres_gpus(gres_full)
 
 
 class SlurmrestdAdapter(Slurmrestd):
@@ -408,82 +739,191 @@ class SlurmrestdAdapter(Slurmrestd):
         uri: urllib.parse.ParseResult,
         auth: SlurmrestdAuthentifier,
         supported_versions: t.List[str],
+        pool_size: int = 10,
+        pool_idle_timeout: int = 30,
+        streaming: bool = False,
     ):
-        super().__init__(uri, auth, supported_versions)
+        super().__init__(
+            uri, auth, supported_versions, pool_size, pool_idle_timeout, streaming
+        )
         # Will be set after discover() is called
-        self._adaptation_chain = []
+        self._adaptation_chain = AdaptationChain([])
 
     def discover(self) -> t.Tuple[str, str, str]:
         """Discover API version and build adaptation chain if needed."""
         result = super().discover()
+        self._setup_adaptation_chain()
+        return result
 
+    def _setup_adaptation_chain(self) -> None:
+        """Build adaptation chain from discovered API version to the highest supported
+        version."""
         # Target version is the highest supported version (first in descending list)
         target_version = self.supported_versions[0]
 
         # Build adaptation chain if API version is older than target
         if self.api_version != target_version:
-            self._adaptation_chain = build_adaptation_chain(
-                self.api_version, target_version, self.supported_versions
+            self._adaptation_chain = AdaptationChain(
+                build_adaptation_chain(
+                    self.api_version, target_version, self.supported_versions
+                )
             )
         else:
-            self._adaptation_chain = []
+            self._adaptation_chain = AdaptationChain([])
 
-        return result
+    def _request(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        ignore_notfound=False,
+        fields: t.Optional[t.List[str]] = None,
+    ):
+        """Make request and adapt response data under the key if needed. When
+        fields is not None, records are projected on the fields required to produce
+        these fields before adaptation."""
+        # Ensure adaptation chain is built before selecting fields
+        if self.api_version is None:
+            self.discover()
+        return self._adapt(
+            component,
+            key,
+            super()._request(
+                component,
+                endpoint,
+                key,
+                ignore_notfound,
+                self._inputs(component, key, fields),
+            ),
+            fields,
+        )
+
+    def _request_since(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        update_time: int,
+        fields: t.Optional[t.List[str]] = None,
+    ) -> t.Tuple[t.List, t.Optional[int]]:
+        """Make request and adapt updated records if needed."""
+        # Ensure adaptation chain is built before selecting fields
+        if self.api_version is None:
+            self.discover()
+        records, last_update = super()._request_since(
+            component, endpoint, key, update_time, self._inputs(component, key, fields)
+        )
+        return self._adapt(component, key, records, fields), last_update
 
-    def _request(self, component: str, endpoint: str, key: str, ignore_notfound=False):
-        """Make request and adapt response data under the key if needed."""
-        result = super()._request(component, endpoint, key, ignore_notfound)
+    def _inputs(
+        self, component: str, key: str, fields: t.Optional[t.List[str]]
+    ) -> t.Optional[t.Set[str]]:
+        """Return the fields of records to select before adaptation to produce the
+        given fields, or None if all fields are selected."""
+        return self._adaptation_chain.selections(component, key, fields)[0]
 
+    def _adapt(
+        self,
+        component: str,
+        key: str,
+        result: t.Any,
+        fields: t.Optional[t.List[str]] = None,
+    ) -> t.Any:
+        """Adapt data under the key with the adaptation chain, in a single pass over
+        the records. When fields are given, adapters only produce these fields."""
         # Apply adaptation chain to data under the key, passing component
         # for differentiation between slurmctld and slurmdbd jobs
         if self._adaptation_chain:
-            for adapter in self._adaptation_chain:
-                result = adapter.adapt(component, key, result)
+            result = self._adaptation_chain.adapt(component, key, result, fields)
 
         return result
 
 
 class SlurmrestdFiltered(SlurmrestdAdapter):
+    # Component and key of the records selected by every filter.
+    FILTERED_RECORDS = {
+        "jobs": ("slurm", "jobs"),
+        "ctldjob": ("slurm", "jobs"),
+        "acctjob": ("slurmdb", "jobs"),
+        "nodes": ("slurm", "nodes"),
+        "node": ("slurm", "nodes"),
+        "partitions": ("slurm", "partitions"),
+        "qos": ("slurmdb", "qos"),
+        "reservations": ("slurm", "reservations"),
+        "accounts": ("slurmdb", "accounts"),
+        "associations": ("slurmdb", "associations"),
+    }
+
     def __init__(
         self,
         uri: urllib.parse.ParseResult,
         auth: SlurmrestdAuthentifier,
         supported_versions: t.List[str],
         filters: "RuntimeSettings",
+        pool_size: int = 10,
+        pool_idle_timeout: int = 30,
+        incremental: t.Optional[t.List[str]] = None,
+        incremental_full_interval: int = 300,
+        streaming: bool = False,
     ):
-        super().__init__(uri, auth, supported_versions)
+        super().__init__(
+            uri, auth, supported_versions, pool_size, pool_idle_timeout, streaming
+        )
         self.filters = filters
+        # Materialized tables of collections synchronized incrementally
+        self.tables: t.Dict[str, SlurmrestdTable] = {}
+        for collection in incremental or []:
+            table = SlurmrestdTable(collection, incremental_full_interval)
+            selection = getattr(self.filters, collection)
+            if selection is not None and table.identifier not in selection:
+                raise SlurmwebConfigurationError(
+                    f"Field {table.identifier} must be selected in {collection} "
+                    "filters for incremental synchronization"
+                )
+            self.tables[collection] = table
+
+    def _setup_adaptation_chain(self) -> None:
+        """Build adaptation chain and compile its transforms for the records and
+        fields selected by filters, so that requests are not delayed by their
+        compilation."""
+        super()._setup_adaptation_chain()
+        if not self._adaptation_chain:
+            return
+        for name, (component, key) in self.FILTERED_RECORDS.items():
+            self._adaptation_chain.transform(
+                component, key, getattr(self.filters, name)
+            )
 
-    @staticmethod
-    def filter_item_fields(item: t.Dict, selection: t.Optional[t.List[str]]):
-        for key in list(item.keys()):
-            if key not in selection:
-                del item[key]
-
-    @staticmethod
-    def filter_fields(
-        items: t.Union[t.List, t.Dict],
-        selection: t.Optional[t.List[str]],
-    ):
-        if selection is not None:
-            if isinstance(items, list):
-                for item in items:
-                    SlurmrestdFiltered.filter_item_fields(item, selection)
-            else:
-                SlurmrestdFiltered.filter_item_fields(items, selection)
-        return items
+    def _synchronize(self, component: str, collection: str) -> t.List[t.Dict]:
+        """Request slurmrestd for the records of the collection updated since the
+        last update of its table, merge them in table and return all records."""
+        table = self.tables[collection]
+        since = table.since()
+        selection = getattr(self.filters, collection)
+        records, last_update = self._request_since(
+            component, collection, collection, since, selection
+        )
+        return table.merge(
+            since, SlurmrestdFiltered.filter_fields(records, selection), last_update
+        )
 
     def jobs(self):
-        return SlurmrestdFiltered.filter_fields(super().jobs(), self.filters.jobs)
+        if "jobs" in self.tables:
+            return self._synchronize("slurm", "jobs")
+        return SlurmrestdFiltered.filter_fields(
+            super().jobs(fields=self.filters.jobs), self.filters.jobs
+        )
 
     def _ctldjob(self, job_id: int, **kwargs):
         return SlurmrestdFiltered.filter_fields(
-            super()._ctldjob(job_id, **kwargs), self.filters.ctldjob
+            super()._ctldjob(job_id, fields=self.filters.ctldjob, **kwargs),
+            self.filters.ctldjob,
         )
 
     def _acctjob(self, job_id: int, **kwargs):
         return SlurmrestdFiltered.filter_fields(
-            super()._acctjob(job_id, **kwargs), self.filters.acctjob
+            super()._acctjob(job_id, fields=self.filters.acctjob, **kwargs),
+            self.filters.acctjob,
         )
 
     def job(self, job_id: int):
@@ -501,38 +941,54 @@ class SlurmrestdFiltered(SlurmrestdAdapter):
         return result
 
     def nodes(self):
-        return SlurmrestdFiltered.filter_fields(super().nodes(), self.filters.nodes)
+        if "nodes" in self.tables:
+            return self._synchronize("slurm", "nodes")
+        return SlurmrestdFiltered.filter_fields(
+            super().nodes(fields=self.filters.nodes),
+            self.filters.nodes,
+        )
 
     def node(self, node_name: str):
         return SlurmrestdFiltered.filter_fields(
-            super().node(node_name), self.filters.node
+            super().node(node_name, fields=self.filters.node),
+            self.filters.node,
         )
 
     def partitions(self):
         return SlurmrestdFiltered.filter_fields(
-            super().partitions(), self.filters.partitions
+            super().partitions(fields=self.filters.partitions),
+            self.filters.partitions,
         )
 
     def accounts(self):
         return SlurmrestdFiltered.filter_fields(
-            super().accounts(), self.filters.accounts
+            super().accounts(fields=self.filters.accounts),
+            self.filters.accounts,
         )
 
     def associations(self: str):
         return SlurmrestdFiltered.filter_fields(
-            super().associations(), self.filters.associations
+            super().associations(fields=self.filters.associations),
+            self.filters.associations,
         )
 
     def reservations(self: str):
         return SlurmrestdFiltered.filter_fields(
-            super().reservations(), self.filters.reservations
+            super().reservations(fields=self.filters.reservations),
+            self.filters.reservations,
         )
 
     def qos(self: str):
-        return SlurmrestdFiltered.filter_fields(super().qos(), self.filters.qos)
+        return SlurmrestdFiltered.filter_fields(
+            super().qos(fields=self.filters.qos), self.filters.qos
+        )
 
 
 class SlurmrestdFilteredCached(SlurmrestdFiltered):
+    # Interval in seconds between checks of cache when waiting for another agent to
+    # refresh a key.
+    LOCK_POLL_INTERVAL = 0.05
+
     def __init__(
         self,
         uri: urllib.parse.ParseResult,
@@ -541,69 +997,330 @@ class SlurmrestdFilteredCached(SlurmrestdFiltered):
         filters: "RuntimeSettings",
         cache: "RuntimeSettings",
         service: "CachingService",
+        pool_size: int = 10,
+        pool_idle_timeout: int = 30,
+        incremental: t.Optional[t.List[str]] = None,
+        incremental_full_interval: int = 300,
+        streaming: bool = False,
     ):
-        super().__init__(uri, auth, supported_versions, filters)
+        super().__init__(
+            uri,
+            auth,
+            supported_versions,
+            filters,
+            pool_size,
+            pool_idle_timeout,
+            incremental,
+            incremental_full_interval,
+            streaming,
+        )
         self.cache = cache
         self.service = service
+        # Requests to slurmrestd in progress for keys missing in cache, shared by all
+        # threads of the process.
+        self._flights: t.Dict[str, concurrent.futures.Future] = {}
+        # Keys served stale which are being refreshed in background.
+        self._revalidations: t.Set[str] = set()
+        self._flights_lock = threading.Lock()
+
+    def _flight(self, key: "CacheKey") -> t.Tuple[bool, concurrent.futures.Future]:
+        """Return a tuple with a boolean and the future result of the request to
+        slurmrestd for the given key. The boolean is True if the caller is the leader
+        in charge of the request, or False if another thread is already running the
+        same request."""
+        with self._flights_lock:
+            flight = self._flights.get(key.main)
+            if flight is not None:
+                return (False, flight)
+            flight = self._flights[key.main] = concurrent.futures.Future()
+            return (True, flight)
+
+    def _land(self, key: "CacheKey") -> None:
+        with self._flights_lock:
+            del self._flights[key.main]
+
+    def _stale(self, family: str) -> int:
+        """Return the delay in seconds during which data of the given family is
+        kept in cache after expiration, or 0 if family is not served stale."""
+        if self.cache.stale and family in self.cache.stale:
+            return self.cache.stale_delay
+        return 0
+
+    def _save(self, key: "CacheKey", family: str, data: t.Any) -> None:
+        expiration, stale = getattr(self.cache, family), self._stale(family)
+        derivations = self._derivations(family) if key.main == family else {}
+        if not derivations:
+            self.service.put(key, data, expiration, stale)
+            return
+        # Entries derived from the snapshot of the collection are saved in the same
+        # transaction, they are always consistent with this snapshot and expire
+        # with it.
+        self.service.put_many(
+            [(key, data)]
+            + [(CacheKey(name), derive(data)) for name, derive in derivations.items()],
+            expiration,
+            stale,
+        )
+
+    def _call(self, func: t.Callable, *args, **kwargs) -> t.Any:
+        return func(*args, **kwargs)
+
+    def _lookup(self, key: "CacheKey", family: str) -> t.Tuple[t.Any, bool]:
+        """Return a tuple with the data of the given key in cache, or None if
+        missing, and a boolean which is False when data is expired and must be
+        refreshed. Data is searched in local cache of the process first, then in
+        Redis."""
+        if self.service.local is not None:
+            data = self.service.local.get(key)
+            if data is not None:
+                return data, True
+        if self._stale(family):
+            data, fresh = self.service.get_stale(key)
+        else:
+            data, fresh = self.service.get(key), True
+        if data is not None:
+            self.service.count_hit(key)
+        return data, fresh
 
     def _cached(
         self,
         key: "CacheKey",
-        expiration: int,
+        family: str,
         func: t.Callable,
         *args: t.Tuple[t.Any, ...],
         **kwargs: t.Dict[str, t.Any],
     ) -> t.Any:
         if not self.cache.enabled:
             return func(*args, **kwargs)
-        data = self.service.get(key)
-        if data is None:
+        data, fresh = self._lookup(key, family)
+        if data is not None:
+            if not fresh:
+                self._revalidate(key, family, func, *args, **kwargs)
+            return data
+        # Key is missing in cache, only one thread of the process sends the request
+        # to slurmrestd, the others wait for its result.
+        leader, flight = self._flight(key)
+        if not leader:
+            data = flight.result()
+            self.service.count_coalesced(key)
+            return data
+        try:
+            data = self._cached_locked(key, family, func, *args, **kwargs)
+            flight.set_result(data)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        finally:
+            self._land(key)
+        return data
+
+    def _cached_locked(
+        self,
+        key: "CacheKey",
+        family: str,
+        func: t.Callable,
+        *args: t.Tuple[t.Any, ...],
+        **kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        """Request slurmrestd and put result in cache under the protection of the
+        lock shared with all agents connected to the same Redis server. If the lock
+        is already acquired by another agent, wait for this agent to put the result
+        in cache. When the result is not available after the configured delay,
+        slurmrestd is requested anyway."""
+        lock = self.service.lock(key, self.cache.lock_timeout)
+        if lock is None:
+            deadline = time.monotonic() + self.cache.lock_wait
+            while time.monotonic() < deadline:
+                time.sleep(self.LOCK_POLL_INTERVAL)
+                data = self.service.get(key)
+                if data is not None:
+                    self.service.count_coalesced(key)
+                    return data
+            logger.warning(
+                "Timeout while waiting for cache key %s to be refreshed by another "
+                "agent, requesting slurmrestd",
+                key.main,
+            )
             data = func(*args, **kwargs)
-            self.service.put(key, data, expiration)
+            self._save(key, family, data)
             self.service.count_miss(key)
-        else:
-            self.service.count_hit(key)
+            return data
+        try:
+            data = func(*args, **kwargs)
+            self._save(key, family, data)
+            self.service.count_miss(key)
+        finally:
+            self.service.unlock(lock)
+        return data
+
+    def _revalidate(
+        self,
+        key: "CacheKey",
+        family: str,
+        func: t.Callable,
+        *args: t.Tuple[t.Any, ...],
+        **kwargs: t.Dict[str, t.Any],
+    ) -> None:
+        """Refresh expired key in cache in a background thread, unless this key is
+        already being refreshed in the process."""
+        with self._flights_lock:
+            if key.main in self._revalidations:
+                return
+            self._revalidations.add(key.main)
+        threading.Thread(
+            target=self._revalidate_run,
+            args=(key, family, func) + args,
+            kwargs=kwargs,
+            daemon=True,
+        ).start()
+
+    def _revalidate_run(
+        self,
+        key: "CacheKey",
+        family: str,
+        func: t.Callable,
+        *args: t.Tuple[t.Any, ...],
+        **kwargs: t.Dict[str, t.Any],
+    ) -> None:
+        try:
+            lock = self.service.lock(key, self.cache.lock_timeout)
+            # Skip refresh if the key is already being refreshed by another agent.
+            if lock is None:
+                return
+            try:
+                self._save(key, family, self._call(func, *args, **kwargs))
+            finally:
+                self.service.unlock(lock)
+        except Exception as err:
+            logger.error("Unable to refresh stale cache key %s: %s", key.main, err)
+        finally:
+            with self._flights_lock:
+                self._revalidations.discard(key.main)
+
+    def snapshot_version(self, *keys: str) -> t.Optional[str]:
+        """Return the version of the snapshot of data saved in cache under the given
+        keys, as the combination of the versions of all keys, or None if cache is
+        disabled or any key is missing in cache. The version changes when the content
+        of any key changes. It must be retrieved before the data, a version older than
+        the data is harmless whereas a version newer than the data would make clients
+        keep outdated data."""
+        if not self.cache.enabled:
+            return None
+        versions = self.service.versions([CacheKey(key) for key in keys])
+        if None in versions:
+            return None
+        return "-".join(versions)
+
+    @staticmethod
+    def _snapshot_key(collection: str, version: str) -> "CacheKey":
+        return CacheKey(f"{collection}-snapshot-{version}", f"{collection}-snapshot")
+
+    def _save_snapshot_history(self, collection: str, snapshot: t.Dict[str, t.Any]):
+        """Save digests of the records of the given snapshot fingerprint in cache,
+        shared with all agents, for the configured retention delay."""
+        if not self.cache.enabled:
+            return super()._save_snapshot_history(collection, snapshot)
+        self.service.put(
+            self._snapshot_key(collection, snapshot["version"]),
+            snapshot["digests"],
+            self.cache.changes_retention,
+        )
+
+    def _snapshot_history(
+        self, collection: str, version: t.Optional[str]
+    ) -> t.Optional[t.Dict[str, str]]:
+        if not self.cache.enabled:
+            return super()._snapshot_history(collection, version)
+        if version is None:
+            return None
+        return self.service.get(self._snapshot_key(collection, version))
+
+    def _uncached(self, collection: str) -> t.Callable:
+        return getattr(super(), collection)
+
+    def refresh(self, collection: str) -> None:
+        """Request slurmrestd for the given collection and save the result in cache
+        with its derived entries, whatever the value currently in cache."""
+        self._save(
+            CacheKey(collection),
+            collection,
+            self._call(self._uncached(collection)),
+        )
+
+    def _derived(self, collection: str, name: str) -> t.Any:
+        """Return the entry derived from the snapshot of the collection saved in
+        cache. When the entry is missing, the snapshot of the collection is
+        retrieved, which saves the entry in cache with the snapshot when the
+        snapshot is missing too. Otherwise, the entry is computed from the current
+        snapshot without being saved, so entries in cache are always derived from
+        the snapshot saved with them."""
+        if not self.cache.enabled:
+            return super()._derived(collection, name)
+        data, fresh = self._lookup(CacheKey(name), collection)
+        if data is None:
+            records = getattr(self, collection)()
+            data, fresh = self._lookup(CacheKey(name), collection)
+            if data is None:
+                return self._derivations(collection)[name](records)
+        if not fresh:
+            self._revalidate(
+                CacheKey(collection), collection, self._uncached(collection)
+            )
         return data
 
     def jobs(self):
-        return self._cached(CacheKey("jobs"), self.cache.jobs, super().jobs)
+        return self._cached(CacheKey("jobs"), "jobs", super().jobs)
+
+    def jobs_query(self, query: JobsQuery):
+        """Select the page of jobs filtered and sorted with the given query in the
+        index of jobs saved in cache, to avoid filtering and sorting all jobs on
+        every request."""
+        if not self.cache.enabled:
+            return super().jobs_query(query)
+        return select_jobs_in_index(self.jobs_index(), query)
+
+    def jobs_by_node(self, node: str):
+        """Select jobs not completed which are allocated the given node in the
+        inverted index of jobs by node saved in cache, to avoid parsing the nodes of
+        all jobs on every request."""
+        if not self.cache.enabled:
+            return super().jobs_by_node(node)
+        return self._jobs_in_index(self.jobs_nodes_index(), node)
 
     def job(self, job_id: int):
         return self._cached(
             CacheKey(f"job-{job_id}", "individual-job"),
-            self.cache.job,
+            "job",
             super().job,
             job_id,
         )
 
     def nodes(self):
-        return self._cached(CacheKey("nodes"), self.cache.nodes, super().nodes)
+        return self._cached(CacheKey("nodes"), "nodes", super().nodes)
 
     def node(self, node_name: str):
         return self._cached(
             CacheKey(f"node-{node_name}", "individual-node"),
-            self.cache.node,
+            "node",
             super().node,
             node_name,
         )
 
     def partitions(self):
-        return self._cached(
-            CacheKey("partitions"), self.cache.partitions, super().partitions
-        )
+        return self._cached(CacheKey("partitions"), "partitions", super().partitions)
 
     def accounts(self):
-        return self._cached(CacheKey("accounts"), self.cache.accounts, super().accounts)
+        return self._cached(CacheKey("accounts"), "accounts", super().accounts)
 
     def associations(self):
         return self._cached(
-            CacheKey("associations"), self.cache.associations, super().associations
+            CacheKey("associations"), "associations", super().associations
         )
 
     def reservations(self):
         return self._cached(
-            CacheKey("reservations"), self.cache.reservations, super().reservations
+            CacheKey("reservations"), "reservations", super().reservations
         )
 
     def qos(self):
-        return self._cached(CacheKey("qos"), self.cache.qos, super().qos)
+        return self._cached(CacheKey("qos"), "qos", super().qos)
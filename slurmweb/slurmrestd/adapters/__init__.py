@@ -7,7 +7,7 @@
 import typing as t
 import logging
 
-from .base import BaseAdapter
+from .base import BaseAdapter, RecordTransform
 
 # Import adapter classes after BaseAdapter is defined to avoid circular imports
 from .v0_0_41 import AdapterV0_0_41
@@ -65,3 +65,86 @@ def build_adaptation_chain(
             logger.debug("No adapter found for version %s", version)
 
     return chain
+
+
+class AdaptationChain:
+    """Chain of adapters from one API version to another. The transforms of
+    records of all adapters are fused in a single transform for every key, so that
+    every record is walked only once. Fused transforms are compiled for every key
+    and selection of fields by transform(), when the chain is built for the
+    selections of filters or on first use for other selections, then reused."""
+
+    def __init__(self, adapters: t.List[BaseAdapter]):
+        self.adapters = adapters
+        self._transforms: t.Dict[
+            t.Tuple[str, str, t.Optional[t.FrozenSet[str]]],
+            t.Optional[RecordTransform],
+        ] = {}
+
+    def __len__(self) -> int:
+        return len(self.adapters)
+
+    def selections(
+        self, component: str, key: str, fields: t.Optional[t.Iterable[str]]
+    ) -> t.List[t.Optional[t.Set[str]]]:
+        """Return the list of fields of records to select before every adapter of
+        the chain, followed by the given fields selected after the last adapter.
+        Items are None when all fields are selected."""
+        selections = [None if fields is None else set(fields)]
+        for adapter in reversed(self.adapters):
+            selections.insert(0, adapter.inputs(component, key, selections[0]))
+        return selections
+
+    def transform(
+        self, component: str, key: str, fields: t.Optional[t.Iterable[str]] = None
+    ) -> t.Optional[RecordTransform]:
+        """Return the function which adapts one record of data under the given key
+        with all adapters of the chain to produce the given fields, or None if
+        records are not modified by the chain."""
+        index = (component, key, None if fields is None else frozenset(fields))
+        try:
+            return self._transforms[index]
+        except KeyError:
+            pass
+        selections = self.selections(component, key, fields)
+        transforms = tuple(
+            transform
+            for transform in (
+                adapter.transform(component, key, selections[idx + 1])
+                for idx, adapter in enumerate(self.adapters)
+            )
+            if transform is not None
+        )
+        if not transforms:
+            result = None
+        elif len(transforms) == 1:
+            result = transforms[0]
+        else:
+
+            def result(record: t.Dict) -> None:
+                for transform in transforms:
+                    transform(record)
+
+        logger.debug(
+            "Compiled adaptation transform of %s %s records with %d adapter(s)",
+            component,
+            key,
+            len(transforms),
+        )
+        self._transforms[index] = result
+        return result
+
+    def adapt(
+        self,
+        component: str,
+        key: str,
+        data: t.Any,
+        fields: t.Optional[t.Iterable[str]] = None,
+    ) -> t.Any:
+        """Adapt in a single pass the records of data under the given key with all
+        adapters of the chain to produce the given fields."""
+        transform = self.transform(component, key, fields)
+        if transform is not None:
+            for record in data:
+                transform(record)
+        return data
@@ -6,62 +6,83 @@
 
 import typing as t
 
+# Function which adapts one record in place
+RecordTransform = t.Callable[[t.Dict], None]
+
 
 class BaseAdapter:
     """Base class for API version adapters.
 
-    Each adapter converts data from one API version to the next version.
-    Methods should be named after the endpoint key (e.g., adapt_jobs, adapt_nodes).
+    Each adapter converts data from one API version to the next version. Records
+    are adapted in place one by one by methods named after the component and the
+    endpoint key (e.g., adapt_slurm_jobs_record, adapt_slurmdb_qos_record).
+
+    Adapters declare in FIELDS the fields of records produced by their methods,
+    associated to the fields of records required to produce them. Methods must
+    support records projected on the required fields of a subset of the fields
+    they produce. All other fields are left unmodified by adapters.
     """
 
-    def adapt(self, component: str, key: str, data: t.Any) -> t.Any:
+    # Fields of records produced by adapter methods, associated to the list of
+    # fields required to produce them, indexed by method component and key.
+    FIELDS: t.Dict[str, t.Dict[str, t.List[str]]] = {}
+
+    def inputs(
+        self, component: str, key: str, fields: t.Optional[t.Set[str]]
+    ) -> t.Optional[t.Set[str]]:
+        """Return the set of fields of records required to produce the given set of
+        fields with the adapter, or None if all fields are required."""
+        if fields is None:
+            return None
+        produced = self.FIELDS.get(f"{component}_{key}", {})
+        result = set()
+        for field in fields:
+            result.update(produced.get(field, [field]))
+        return result
+
+    def transform(
+        self, component: str, key: str, fields: t.Optional[t.Set[str]] = None
+    ) -> t.Optional[RecordTransform]:
+        """Return the function which adapts one record of data under the given key,
+        or None if records are not modified by the adapter.
+
+        Args:
+            component: The API component (e.g., "slurm", "slurmdb")
+            key: The response key (e.g., "jobs", "nodes", "partitions")
+            fields: Fields of records selected after adaptation, None if all fields
+              are selected. None is returned when the adapter does not produce
+              any of these fields.
+        """
+        method = getattr(self, f"adapt_{component}_{key}_record", None)
+        if method is None:
+            return None
+        if fields is not None and fields.isdisjoint(
+            self.FIELDS.get(f"{component}_{key}", {})
+        ):
+            return None
+        return method
+
+    def adapt(
+        self,
+        component: str,
+        key: str,
+        data: t.Any,
+        fields: t.Optional[t.Set[str]] = None,
+    ) -> t.Any:
         """Adapt data for the given key using the appropriate method.
 
         Args:
             component: The API component (e.g., "slurm", "slurmdb")
             key: The response key (e.g., "jobs", "nodes", "partitions")
             data: The data under that key to adapt)
+            fields: Fields of records selected after adaptation, None if all fields
+              are selected.
 
         Returns:
             Adapted data
         """
-        method_name = f"adapt_{component}_{key}"
-        adapter = getattr(self, method_name, None)
-        if adapter is not None:
-            return adapter(data)
-
-    def adapt_slurm_jobs(self, data: t.Any) -> t.Any:
-        """Adapt jobs data from slurmctld."""
-        return data
-
-    def adapt_slurmdb_jobs(self, data: t.Any) -> t.Any:
-        """Adapt jobs data from slurmdbd"""
-        return data
-
-    def adapt_slurm_nodes(self, data: t.Any) -> t.Any:
-        """Adapt nodes data."""
-        return data
-
-    def adapt_slurm_partitions(self, data: t.Any) -> t.Any:
-        """Adapt partitions data."""
-        return data
-
-    def adapt_slurmdb_accounts(self, data: t.Any) -> t.Any:
-        """Adapt accounts data."""
-        return data
-
-    def adapt_slurmdb_associations(self, data: t.Any) -> t.Any:
-        """Adapt associations data."""
-        return data
-
-    def adapt_slurm_reservations(self, data: t.Any) -> t.Any:
-        """Adapt reservations data."""
-        return data
-
-    def adapt_slurmdb_qos(self, data: t.Any) -> t.Any:
-        """Adapt qos data."""
-        return data
-
-    def adapt_slurm_ping(self, data: t.Any) -> t.Any:
-        """Adapt ping data."""
+        transform = self.transform(component, key, fields)
+        if transform is not None:
+            for record in data:
+                transform(record)
         return data
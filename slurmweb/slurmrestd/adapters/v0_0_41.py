@@ -78,7 +78,11 @@ class AdapterV0_0_41(BaseAdapter):
 
     """
 
-    def adapt_slurmdb_qos(self, data: t.Any) -> t.Any:
+    FIELDS = {
+        "slurmdb_qos": {"limits": ["limits"]},
+    }
+
+    def adapt_slurmdb_qos_record(self, qos: t.Dict) -> None:
         """
         Differences spotted between v0.0.41 and v0.0.42 API:
 
@@ -94,13 +98,11 @@ class AdapterV0_0_41(BaseAdapter):
           + parameters.Include deleted QOS
             → not used by Slurm-web
         """
-        logger.debug("running AdapterV0_0_41.adapt_slurmdb_qos()")
-        for qos in data:
-            qos["limits"]["max"]["jobs"]["count"] = {
-                "infinite": True,
-                "number": 0,
-                "set": False,
-            }
-            qos["limits"]["max"]["tres"]["minutes"]["total"] = []
-
-        return data
+        if "limits" not in qos:
+            return
+        qos["limits"]["max"]["jobs"]["count"] = {
+            "infinite": True,
+            "number": 0,
+            "set": False,
+        }
+        qos["limits"]["max"]["tres"]["minutes"]["total"] = []
@@ -42,7 +42,16 @@ class AdapterV0_0_42(BaseAdapter):
         → not used by Slurm-web
     """
 
-    def adapt_slurm_jobs(self, data: t.Any) -> t.Any:
+    FIELDS = {
+        "slurm_jobs": {
+            "stderr_expanded": ["standard_error"],
+            "stdin_expanded": ["standard_input"],
+            "stdout_expanded": ["standard_output"],
+        },
+        "slurmdb_jobs": {"steps": ["steps"]},
+    }
+
+    def adapt_slurm_jobs_record(self, job: t.Dict) -> None:
         """
         Differences spotted between v0.0.42 and v0.0.43 API:
 
@@ -70,14 +79,15 @@ class AdapterV0_0_42(BaseAdapter):
           + responses.200.properties.jobs.items.properties.stdin_expanded
             → converted from standard_input
         """
-        logger.debug("running AdapterV0_0_42.adapt_slurm_jobs()")
-        for job in data:
+        # Records may be projected on a subset of the fields.
+        if "standard_error" in job:
             job["stderr_expanded"] = job["standard_error"]
+        if "standard_input" in job:
             job["stdin_expanded"] = job["standard_input"]
+        if "standard_output" in job:
             job["stdout_expanded"] = job["standard_output"]
-        return data
 
-    def adapt_slurmdb_jobs(self, data: t.Any) -> t.Any:
+    def adapt_slurmdb_jobs_record(self, job: t.Dict) -> None:
         """
         Differences spotted between v0.0.42 and v0.0.43 API:
 
@@ -107,18 +117,15 @@ class AdapterV0_0_42(BaseAdapter):
             requested
             → not used by Slurm-web
         """
-        logger.debug("running AdapterV0_0_42.adapt_slurmdb_jobs()")
-        for job in data:
-            for step in job["steps"]:
-                step["step"]["stderr"] = ""
-                step["step"]["stderr_expanded"] = ""
-                step["step"]["stdin"] = ""
-                step["step"]["stdin_expanded"] = ""
-                step["step"]["stdout"] = ""
-                step["step"]["stdout_expanded"] = ""
-                step["time"]["limit"] = {
-                    "set": False,
-                    "infinite": True,
-                    "number": 0,
-                }
-        return data
+        for step in job.get("steps", []):
+            step["step"]["stderr"] = ""
+            step["step"]["stderr_expanded"] = ""
+            step["step"]["stdin"] = ""
+            step["step"]["stdin_expanded"] = ""
+            step["step"]["stdout"] = ""
+            step["step"]["stdout_expanded"] = ""
+            step["time"]["limit"] = {
+                "set": False,
+                "infinite": True,
+                "number": 0,
+            }
@@ -0,0 +1,692 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Asynchronous variants of slurmrestd clients based on aiohttp.
+
+Every asynchronous class mirrors the synchronous class of the same layer and inherits
+its configuration, state and helpers. The methods which send requests to slurmrestd are
+overriden with coroutines. These classes must be listed before the synchronous classes
+in the MRO so their coroutines take precedence on the synchronous methods.
+
+Methods are supposed to be called through query() which runs the given calls
+concurrently in an event loop running in a dedicated thread, with a client session
+kept for the lifetime of the client and shared by all calls. Blocking requests to cache
+and computations over all records run in the default executor of the event loop."""
+
+import typing as t
+import asyncio
+import threading
+import time
+import logging
+
+import aiohttp
+from . import (
+    Slurmrestd,
+    SlurmrestdAdapter,
+    SlurmrestdFiltered,
+    SlurmrestdFilteredCached,
+)
+from .stream import SlurmrestdProjection, load_ijson
+from .jobs import JobsQuery, select_jobs, select_jobs_in_index
+from .changes import CHANGES_IDENTIFIERS, snapshot_changes
+from ..cache import CacheKey
+from .errors import (
+    SlurmrestdNotFoundError,
+    SlurmrestdInvalidResponseError,
+    SlurmrestConnectionError,
+    SlurmrestdAuthenticationError,
+    SlurmrestdInternalError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncSlurmrestd(Slurmrestd):
+    def _setup_session(self) -> None:
+        # Override synchronous HTTP session, the event loop and the client session
+        # are initialized on first query.
+        self._loop = None
+        self._thread = None
+        self._session = None
+        self._loop_lock = threading.Lock()
+
+    def _connector(self) -> aiohttp.BaseConnector:
+        """Return aiohttp connector for slurmrestd URI, on either Unix socket or
+        TCP/IP."""
+        if self.uri.scheme == "unix":
+            return aiohttp.UnixConnector(
+                path=self.uri.path,
+                limit=self.pool_size,
+                keepalive_timeout=self.pool_idle_timeout,
+            )
+        return aiohttp.TCPConnector(
+            limit=self.pool_size, keepalive_timeout=self.pool_idle_timeout
+        )
+
+    def _url(self, query: str) -> str:
+        if self.uri.scheme == "unix":
+            return f"http://slurmrestd{query}"
+        return f"{self.uri.geturl()}{query}"
+
+    def _start(self) -> asyncio.AbstractEventLoop:
+        """Return the event loop, started in a dedicated thread if not running.
+        Threads are not inherited by forked processes, the event loop is started again
+        with a new client session in this case."""
+        with self._loop_lock:
+            if self._thread is None or not self._thread.is_alive():
+                logger.debug("Starting slurmrestd client event loop")
+                self._loop = asyncio.new_event_loop()
+                self._session = None
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _run(self, coroutine: t.Awaitable) -> t.Any:
+        """Run the coroutine in the event loop, wait for its completion and return
+        its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._start()).result()
+
+    def _client_session(self) -> aiohttp.ClientSession:
+        """Return the client session to slurmrestd, created if missing. This must be
+        called by coroutines running in the event loop."""
+        if self._session is None or self._session.closed:
+            logger.debug("Opening client session to slurmrestd")
+            self._session = aiohttp.ClientSession(connector=self._connector())
+        return self._session
+
+    async def _close_session(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def stop(self) -> None:
+        """Close the client session and stop the event loop."""
+        with self._loop_lock:
+            if self._thread is None:
+                return
+            asyncio.run_coroutine_threadsafe(self._close_session(), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop.close()
+            self._loop = None
+            self._thread = None
+
+    def query(self, *calls: t.Tuple[str, t.Tuple[t.Any, ...]]) -> t.List[t.Any]:
+        """Run the given calls, as tuples of method name and arguments, concurrently
+        and return the list of their results in the same order."""
+        return self._run(self._query(calls))
+
+    async def _query(self, calls):
+        return await asyncio.gather(
+            *[getattr(self, method)(*args) for method, args in calls]
+        )
+
+    async def _blocking(self, func: t.Callable, *args: t.Any) -> t.Any:
+        """Run the blocking function, such as requests to cache or computations over
+        all records, in the default executor of the event loop, so that it does not
+        delay the other coroutines running in the event loop."""
+        return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
+    async def _validate_status(self, response, ignore_notfound: bool) -> None:
+        """Check response status code. When HTTP/401, raise
+        SlurmrestdAuthenticationError. When HTTP/404 and ignore_notfound is False, raise
+        SlurmrestdNotFoundError."""
+        # FIXME: Same workaround as in synchronous client for regression in
+        # Slurm 25.11.0 which return HTTP/500 on authentication error.
+        if response.status == 401 or (
+            response.status == 500
+            and (await response.text()).strip()
+            == "Authentication does not apply to request"
+        ):
+            raise SlurmrestdAuthenticationError(str(response.url))
+        if not ignore_notfound and response.status == 404:
+            raise SlurmrestdNotFoundError(str(response.url))
+
+    async def _validate_json(self, response) -> None:
+        """Check json reponse or abort with HTTP/500"""
+        content_type = response.headers.get("content-type")
+        if content_type != "application/json":
+            logger.debug(
+                "slurmrestd query %s response: %s", response.url, await response.text()
+            )
+            raise SlurmrestdInvalidResponseError(
+                f"Unsupported Content-Type for slurmrestd response {response.url}: "
+                f"{content_type}"
+            )
+
+    async def _execute_request(
+        self,
+        component: str,
+        api_version: str,
+        endpoint: str,
+        ignore_notfound=False,
+        key: t.Optional[str] = None,
+        fields: t.Optional[t.List[str]] = None,
+    ) -> dict:
+        """Execute HTTP request to slurmrestd API with provided API version and return
+        parsed JSON result. When fields is not None, the records under the key are
+        projected on these fields, while the response is received when streaming
+        is enabled."""
+        # Compose query path with provided API version
+        query = f"/{component}/v{api_version}/{endpoint}"
+        streaming = self.streaming and fields is not None
+
+        try:
+            async with self._client_session().get(
+                self._url(query), headers=self.auth.headers()
+            ) as response:
+                await self._validate_status(response, ignore_notfound)
+                await self._validate_json(response)
+                if not streaming:
+                    result = await response.json()
+                else:
+                    result = await SlurmrestdProjection(
+                        load_ijson(), key, fields
+                    ).parse_async(
+                        response.content.iter_chunked(self.STREAMING_CHUNK_SIZE)
+                    )
+        except aiohttp.ClientConnectionError as err:
+            raise SlurmrestConnectionError(str(err))
+
+        self._check_result(query, result)
+        if not streaming and fields is not None and key in result:
+            self.filter_fields(result[key], fields)
+        return result
+
+    async def _request(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        ignore_notfound=False,
+        fields: t.Optional[t.List[str]] = None,
+    ):
+        """Make a request to slurmrestd API with detected API version."""
+        # Ensure API version is discovered before making request
+        if self.api_version is None:
+            await self.discover()
+
+        result = await self._execute_request(
+            component, self.api_version, endpoint, ignore_notfound, key, fields
+        )
+        return result[key]
+
+    async def _request_since(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        update_time: int,
+        fields: t.Optional[t.List[str]] = None,
+    ) -> t.Tuple[t.List, t.Optional[int]]:
+        """Make a request to slurmrestd API for the records updated since the given
+        timestamp, or all records if 0."""
+        # Ensure API version is discovered before making request
+        if self.api_version is None:
+            await self.discover()
+
+        try:
+            result = await self._execute_request(
+                component,
+                self.api_version,
+                f"{endpoint}?update_time={update_time}",
+                key=key,
+                fields=fields,
+            )
+        except SlurmrestdInternalError as err:
+            if err.error != self.SLURM_NO_CHANGE_IN_DATA:
+                raise err
+            return [], None
+        return result[key], self._last_update(result)
+
+    async def discover(self) -> t.Tuple[str, str, str]:
+        """Discover the actual slurmrestd API version and Slurm version by trying
+        versions from the configured list."""
+        if (
+            self.cluster_name is not None
+            and self.slurm_version is not None
+            and self.api_version is not None
+        ):
+            return (self.cluster_name, self.slurm_version, self.api_version)
+
+        # Try each configured supported slurmrestd API version in descending order
+        for version in self.supported_versions:
+            try:
+                result = await self._execute_request(
+                    "slurm", version, "ping", ignore_notfound=True
+                )
+                self.cluster_name = result["meta"]["slurm"]["cluster"]
+                self.slurm_version = result["meta"]["slurm"]["release"]
+                self.api_version = version
+                logger.info(
+                    "Discovered slurmrestd Slurm version: %s and API version: %s",
+                    self.slurm_version,
+                    self.api_version,
+                )
+                return (self.cluster_name, self.slurm_version, self.api_version)
+            except SlurmrestdNotFoundError:
+                logger.debug(
+                    "Slurmrestd API version %s not supported, trying next", version
+                )
+                continue
+            except (
+                SlurmrestdInvalidResponseError,
+                SlurmrestdInternalError,
+                KeyError,
+                ValueError,
+            ) as err:
+                logger.warning(
+                    "Unable to parse Slurmrestd API ping response for version %s: %s",
+                    version,
+                    err,
+                )
+                continue
+
+        raise SlurmrestConnectionError(
+            f"Unable to discover slurmrestd API version. "
+            f"Tried versions: {', '.join(self.supported_versions)}"
+        )
+
+    async def _derived(self, collection: str, name: str) -> t.Any:
+        return await self._blocking(
+            self._derivations(collection)[name], await getattr(self, collection)()
+        )
+
+    async def jobs(self, **kwargs):
+        return await self._request("slurm", "jobs", "jobs", **kwargs)
+
+    async def jobs_by_node(self, node: str):
+        return self._jobs_on_node(await self.jobs(), node)
+
+    async def jobs_nodes_index(self):
+        return await self._derived("jobs", "jobs-nodes")
+
+    async def jobs_query(self, query: JobsQuery):
+        return select_jobs(await self.jobs(), query)
+
+    async def jobs_index(self):
+        return await self._derived("jobs", "jobs-index")
+
+    async def jobs_digests(self):
+        return await self._derived("jobs", "jobs-digests")
+
+    async def jobs_changes(self, since: t.Optional[str] = None):
+        return await self._changes("jobs", since, self.jobs_digests, self.jobs)
+
+    async def _changes(
+        self,
+        collection: str,
+        since: t.Optional[str],
+        digests: t.Callable[[], t.Awaitable[t.Dict[str, t.Any]]],
+        records: t.Callable[[], t.Awaitable[t.List[t.Dict]]],
+    ) -> t.Dict[str, t.Any]:
+        current = await digests()
+        if since == current["version"]:
+            return snapshot_changes(
+                [], CHANGES_IDENTIFIERS[collection], current, current["digests"]
+            )
+        return snapshot_changes(
+            await records(),
+            CHANGES_IDENTIFIERS[collection],
+            current,
+            await self._blocking(self._snapshot_history, collection, since),
+        )
+
+    async def jobs_states(self):
+        return self._summary_jobs_states(await self.jobs_summary())
+
+    async def jobs_summary(self):
+        return await self._derived("jobs", "jobs-summary")
+
+    async def _ctldjob(self, job_id: int, **kwargs):
+        return (await self._request("slurm", f"job/{job_id}", "jobs", **kwargs))[0]
+
+    async def _acctjob(self, job_id: int, **kwargs):
+        return (await self._request("slurmdb", f"job/{job_id}", "jobs", **kwargs))[0]
+
+    async def nodes(self, **kwargs):
+        return await self._request("slurm", "nodes", "nodes", **kwargs)
+
+    async def resources_states(self):
+        return self._summary_resources_states(await self.nodes_summary())
+
+    async def nodes_summary(self):
+        return await self._derived("nodes", "nodes-summary")
+
+    async def nodes_digests(self):
+        return await self._derived("nodes", "nodes-digests")
+
+    async def nodes_changes(self, since: t.Optional[str] = None):
+        return await self._changes("nodes", since, self.nodes_digests, self.nodes)
+
+    async def node(self, node_name: str, **kwargs):
+        try:
+            return (
+                await self._request("slurm", f"node/{node_name}", "nodes", **kwargs)
+            )[0]
+        except SlurmrestdInternalError as err:
+            if err.description.startswith("Failure to query node "):
+                raise SlurmrestdNotFoundError(f"Node {node_name} not found")
+            raise err
+
+    async def partitions(self, **kwargs):
+        return await self._request("slurm", "partitions", "partitions", **kwargs)
+
+    async def accounts(self, **kwargs):
+        return await self._request("slurmdb", "accounts", "accounts", **kwargs)
+
+    async def associations(self, **kwargs):
+        return await self._request("slurmdb", "associations", "associations", **kwargs)
+
+    async def reservations(self, **kwargs):
+        return await self._request("slurm", "reservations", "reservations", **kwargs)
+
+    async def qos(self, **kwargs):
+        return await self._request("slurmdb", "qos", "qos", **kwargs)
+
+
+class AsyncSlurmrestdAdapter(AsyncSlurmrestd, SlurmrestdAdapter):
+    async def discover(self) -> t.Tuple[str, str, str]:
+        """Discover API version and build adaptation chain if needed."""
+        result = await super().discover()
+        self._setup_adaptation_chain()
+        return result
+
+    async def _request(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        ignore_notfound=False,
+        fields: t.Optional[t.List[str]] = None,
+    ):
+        """Make request and adapt response data under the key if needed."""
+        # Ensure adaptation chain is built before selecting fields
+        if self.api_version is None:
+            await self.discover()
+        return self._adapt(
+            component,
+            key,
+            await super()._request(
+                component,
+                endpoint,
+                key,
+                ignore_notfound,
+                self._inputs(component, key, fields),
+            ),
+            fields,
+        )
+
+    async def _request_since(
+        self,
+        component: str,
+        endpoint: str,
+        key: str,
+        update_time: int,
+        fields: t.Optional[t.List[str]] = None,
+    ) -> t.Tuple[t.List, t.Optional[int]]:
+        """Make request and adapt updated records if needed."""
+        # Ensure adaptation chain is built before selecting fields
+        if self.api_version is None:
+            await self.discover()
+        records, last_update = await super()._request_since(
+            component, endpoint, key, update_time, self._inputs(component, key, fields)
+        )
+        return self._adapt(component, key, records, fields), last_update
+
+
+class AsyncSlurmrestdFiltered(AsyncSlurmrestdAdapter, SlurmrestdFiltered):
+    async def _synchronize(self, component: str, collection: str) -> t.List[t.Dict]:
+        """Request slurmrestd for the records of the collection updated since the
+        last update of its table, merge them in table and return all records."""
+        table = self.tables[collection]
+        since = table.since()
+        selection = getattr(self.filters, collection)
+        records, last_update = await self._request_since(
+            component, collection, collection, since, selection
+        )
+        return table.merge(since, self.filter_fields(records, selection), last_update)
+
+    async def jobs(self):
+        if "jobs" in self.tables:
+            return await self._synchronize("slurm", "jobs")
+        return self.filter_fields(
+            await super().jobs(fields=self.filters.jobs),
+            self.filters.jobs,
+        )
+
+    async def _ctldjob(self, job_id: int, **kwargs):
+        return self.filter_fields(
+            await super()._ctldjob(job_id, fields=self.filters.ctldjob, **kwargs),
+            self.filters.ctldjob,
+        )
+
+    async def _acctjob(self, job_id: int, **kwargs):
+        return self.filter_fields(
+            await super()._acctjob(job_id, fields=self.filters.acctjob, **kwargs),
+            self.filters.acctjob,
+        )
+
+    async def job(self, job_id: int):
+        # Request slurmdbd and slurmctld concurrently, errors are then handled the
+        # same way as synchronous client.
+        result, ctldjob = await asyncio.gather(
+            self._acctjob(job_id),
+            self._ctldjob(job_id, ignore_notfound=True),
+            return_exceptions=True,
+        )
+        if isinstance(result, IndexError):
+            raise SlurmrestdNotFoundError(f"Job {job_id} not found")
+        if isinstance(result, BaseException):
+            raise result
+        # try to enrich result with additional fields from slurmctld
+        if isinstance(ctldjob, SlurmrestdInternalError):
+            if ctldjob.error != 2017:
+                raise ctldjob
+            # pass the error, the job is just not available in ctld queue
+        elif isinstance(ctldjob, BaseException):
+            raise ctldjob
+        else:
+            result.update(ctldjob)
+        return result
+
+    async def nodes(self):
+        if "nodes" in self.tables:
+            return await self._synchronize("slurm", "nodes")
+        return self.filter_fields(
+            await super().nodes(fields=self.filters.nodes),
+            self.filters.nodes,
+        )
+
+    async def node(self, node_name: str):
+        return self.filter_fields(
+            await super().node(node_name, fields=self.filters.node),
+            self.filters.node,
+        )
+
+    async def partitions(self):
+        return self.filter_fields(
+            await super().partitions(fields=self.filters.partitions),
+            self.filters.partitions,
+        )
+
+    async def accounts(self):
+        return self.filter_fields(
+            await super().accounts(fields=self.filters.accounts),
+            self.filters.accounts,
+        )
+
+    async def associations(self):
+        return self.filter_fields(
+            await super().associations(fields=self.filters.associations),
+            self.filters.associations,
+        )
+
+    async def reservations(self):
+        return self.filter_fields(
+            await super().reservations(fields=self.filters.reservations),
+            self.filters.reservations,
+        )
+
+    async def qos(self):
+        return self.filter_fields(
+            await super().qos(fields=self.filters.qos),
+            self.filters.qos,
+        )
+
+
+class AsyncSlurmrestdFilteredCached(AsyncSlurmrestdFiltered, SlurmrestdFilteredCached):
+    def _call(self, func: t.Callable, *args, **kwargs) -> t.Any:
+        # Run the coroutine in the event loop of the client and wait for its result
+        # in the current thread.
+        return self._run(func(*args, **kwargs))
+
+    def _uncached(self, collection: str) -> t.Callable:
+        # Override required to get the coroutine of the asynchronous parent class
+        # instead of the synchronous parent class method.
+        return getattr(super(), collection)
+
+    async def _cached(
+        self,
+        key: "CacheKey",
+        family: str,
+        func: t.Callable,
+        *args: t.Tuple[t.Any, ...],
+        **kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        if not self.cache.enabled:
+            return await func(*args, **kwargs)
+        data, fresh = await self._blocking(self._lookup, key, family)
+        if data is not None:
+            if not fresh:
+                self._revalidate(key, family, func, *args, **kwargs)
+            return data
+        # Futures of requests in progress are shared with the other threads and the
+        # other coroutines of the process.
+        leader, flight = self._flight(key)
+        if not leader:
+            data = await asyncio.wrap_future(flight)
+            await self._blocking(self.service.count_coalesced, key)
+            return data
+        try:
+            data = await self._cached_locked(key, family, func, *args, **kwargs)
+            flight.set_result(data)
+        except BaseException as err:
+            flight.set_exception(err)
+            raise
+        finally:
+            self._land(key)
+        return data
+
+    async def _cached_locked(
+        self,
+        key: "CacheKey",
+        family: str,
+        func: t.Callable,
+        *args: t.Tuple[t.Any, ...],
+        **kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        lock = await self._blocking(self.service.lock, key, self.cache.lock_timeout)
+        if lock is None:
+            deadline = time.monotonic() + self.cache.lock_wait
+            while time.monotonic() < deadline:
+                await asyncio.sleep(self.LOCK_POLL_INTERVAL)
+                data = await self._blocking(self.service.get, key)
+                if data is not None:
+                    await self._blocking(self.service.count_coalesced, key)
+                    return data
+            logger.warning(
+                "Timeout while waiting for cache key %s to be refreshed by another "
+                "agent, requesting slurmrestd",
+                key.main,
+            )
+            data = await func(*args, **kwargs)
+            await self._blocking(self._saved, key, family, data)
+            return data
+        try:
+            data = await func(*args, **kwargs)
+            await self._blocking(self._saved, key, family, data)
+        finally:
+            await self._blocking(self.service.unlock, lock)
+        return data
+
+    def _saved(self, key: "CacheKey", family: str, data: t.Any) -> None:
+        """Save data retrieved from slurmrestd in cache with its derived entries and
+        count the cache miss."""
+        self._save(key, family, data)
+        self.service.count_miss(key)
+
+    async def _derived(self, collection: str, name: str) -> t.Any:
+        if not self.cache.enabled:
+            return await super()._derived(collection, name)
+        data, fresh = await self._blocking(self._lookup, CacheKey(name), collection)
+        if data is None:
+            records = await getattr(self, collection)()
+            data, fresh = await self._blocking(self._lookup, CacheKey(name), collection)
+            if data is None:
+                return await self._blocking(
+                    self._derivations(collection)[name], records
+                )
+        if not fresh:
+            self._revalidate(
+                CacheKey(collection), collection, self._uncached(collection)
+            )
+        return data
+
+    async def jobs(self):
+        return await self._cached(CacheKey("jobs"), "jobs", super().jobs)
+
+    async def jobs_query(self, query: JobsQuery):
+        if not self.cache.enabled:
+            return await super().jobs_query(query)
+        return select_jobs_in_index(await self.jobs_index(), query)
+
+    async def jobs_by_node(self, node: str):
+        if not self.cache.enabled:
+            return await super().jobs_by_node(node)
+        return self._jobs_in_index(await self.jobs_nodes_index(), node)
+
+    async def job(self, job_id: int):
+        return await self._cached(
+            CacheKey(f"job-{job_id}", "individual-job"),
+            "job",
+            super().job,
+            job_id,
+        )
+
+    async def nodes(self):
+        return await self._cached(CacheKey("nodes"), "nodes", super().nodes)
+
+    async def node(self, node_name: str):
+        return await self._cached(
+            CacheKey(f"node-{node_name}", "individual-node"),
+            "node",
+            super().node,
+            node_name,
+        )
+
+    async def partitions(self):
+        return await self._cached(
+            CacheKey("partitions"), "partitions", super().partitions
+        )
+
+    async def accounts(self):
+        return await self._cached(CacheKey("accounts"), "accounts", super().accounts)
+
+    async def associations(self):
+        return await self._cached(
+            CacheKey("associations"), "associations", super().associations
+        )
+
+    async def reservations(self):
+        return await self._cached(
+            CacheKey("reservations"), "reservations", super().reservations
+        )
+
+    async def qos(self):
+        return await self._cached(CacheKey("qos"), "qos", super().qos)
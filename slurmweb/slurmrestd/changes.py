@@ -0,0 +1,87 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Changes of jobs and nodes between snapshots, for clients which poll these records
+frequently and apply changes to their local copy instead of downloading all
+records."""
+
+import typing as t
+import hashlib
+import json
+
+# Field identifying records by collection
+CHANGES_IDENTIFIERS = {"jobs": "job_id", "nodes": "name"}
+# Maximum number of snapshots fingerprints kept in memory by collection, when they
+# are not saved in cache.
+CHANGES_HISTORY_SIZE = 16
+
+
+def _record_digest(record: t.Dict) -> str:
+    """Return digest of the content of the given record, independent of the order of
+    its fields."""
+    return hashlib.blake2b(
+        json.dumps(record, sort_keys=True, separators=(",", ":")).encode(),
+        digest_size=8,
+    ).hexdigest()
+
+
+def build_snapshot_digests(
+    records: t.List[t.Dict], identifier: str
+) -> t.Dict[str, t.Any]:
+    """Return fingerprint of the given snapshot of records. The fingerprint is a dict
+    with:
+
+    - version: the version of the snapshot, independent of the order of records,
+    - digests: the digests of the records content by record identifier.
+
+    Identifiers are converted to strings for compatibility with all cache codecs."""
+    digests = {str(record[identifier]): _record_digest(record) for record in records}
+    version = hashlib.blake2b(digest_size=12)
+    for key in sorted(digests.keys()):
+        version.update(f"{key}:{digests[key]};".encode())
+    return {"version": version.hexdigest(), "digests": digests}
+
+
+def snapshot_changes(
+    records: t.List[t.Dict],
+    identifier: str,
+    current: t.Dict[str, t.Any],
+    previous: t.Optional[t.Dict[str, str]],
+) -> t.Dict[str, t.Any]:
+    """Return changes of records between the previous digests and the current
+    fingerprint. The result is a dict with:
+
+    - version: the version of the current snapshot,
+    - full: True if previous digests are unknown, all records are then added,
+    - added: the records missing in previous snapshot,
+    - modified: the records whose content differs with previous snapshot,
+    - removed: the identifiers, as strings, of the records missing in current
+      snapshot.
+
+    Records which are not in current fingerprint are ignored, they are reported in
+    the changes since this snapshot."""
+    result = {
+        "version": current["version"],
+        "full": previous is None,
+        "added": [],
+        "modified": [],
+        "removed": [],
+    }
+    if previous is None:
+        previous = {}
+    digests = current["digests"]
+    for record in records:
+        key = str(record[identifier])
+        digest = digests.get(key)
+        if digest is None:
+            continue
+        former = previous.get(key)
+        if former is None:
+            result["added"].append(record)
+        elif former != digest:
+            result["modified"].append(record)
+    result["removed"] = [key for key in previous.keys() if key not in digests]
+    return result
@@ -0,0 +1,255 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Selection of a page of jobs filtered and sorted on the agent side, with the
+same semantics as the jobs view of the frontend."""
+
+import typing as t
+import itertools
+
+from ..errors import SlurmwebQueryError
+
+# Default number of jobs per page, when page is requested without limit
+JOBS_PAGE_SIZE = 100
+# Maximum number of jobs per page
+JOBS_MAX_LIMIT = 10000
+
+# Filters parameters and the corresponding fields of jobs
+JOBS_FILTERS = {
+    "states": "job_state",
+    "users": "user_name",
+    "accounts": "account",
+    "qos": "qos",
+    "partitions": "partition",
+}
+JOBS_SORT_ORDERS = ["asc", "desc"]
+# Jobs matching filters are sorted when their number multiplied by this ratio is
+# below the total number of jobs, they are selected in sort order of all jobs
+# otherwise.
+SORT_CANDIDATES_RATIO = 8
+
+
+def _optional_number_key(value: t.Dict) -> t.Tuple[int, int, t.Any]:
+    """Return sort key of slurmrestd optional number. Unset values are lower than
+    all numbers, infinite values are greater than all numbers."""
+    if not value.get("set"):
+        return (0, 0, 0)
+    if value.get("infinite"):
+        return (1, 1, 0)
+    return (1, 0, value.get("number", 0))
+
+
+# Sort keys of jobs by sort criterion
+JOBS_SORT_KEYS: t.Dict[str, t.Callable[[t.Dict], t.Any]] = {
+    "id": lambda job: job["job_id"],
+    "user": lambda job: job["user_name"],
+    "state": lambda job: job["job_state"],
+    "priority": lambda job: _optional_number_key(job["priority"]),
+    "resources": lambda job: (
+        _optional_number_key(job["node_count"]),
+        _optional_number_key(job["cpus"]),
+    ),
+}
+
+
+def _job_values(job: t.Dict, field: str) -> t.List[str]:
+    """Return the list of lowercase values of the given job field, for comparison
+    with filters."""
+    value = job[field]
+    if isinstance(value, list):
+        return [item.lower() for item in value]
+    return [value.lower()]
+
+
+class JobsQuery:
+    """Parameters of a query of a page of jobs, filtered and sorted."""
+
+    def __init__(
+        self,
+        sort: str = "id",
+        order: str = "asc",
+        filters: t.Optional[t.Dict[str, t.Set[str]]] = None,
+        page: int = 1,
+        limit: t.Optional[int] = None,
+    ):
+        self.sort = sort
+        self.order = order
+        self.filters = filters or {}
+        self.page = page
+        self.limit = limit
+
+    @classmethod
+    def from_args(cls, args: t.Mapping[str, str]) -> t.Optional["JobsQuery"]:
+        """Return query defined by the given request arguments, or None if no
+        query parameter is defined. Raise SlurmwebQueryError if a parameter is
+        invalid."""
+        parameters = ["sort", "order", "page", "limit"] + list(JOBS_FILTERS.keys())
+        if not any(parameter in args for parameter in parameters):
+            return None
+        sort = args.get("sort", "id")
+        if sort not in JOBS_SORT_KEYS:
+            raise SlurmwebQueryError(f"Unsupported jobs sort criterion {sort}")
+        order = args.get("order", "asc")
+        if order not in JOBS_SORT_ORDERS:
+            raise SlurmwebQueryError(f"Unsupported jobs sort order {order}")
+        filters = {}
+        for parameter in JOBS_FILTERS.keys():
+            values = args.get(parameter)
+            if values:
+                filters[parameter] = {value.lower() for value in values.split(",")}
+        page = cls._integer(args, "page", 1)
+        limit = cls._integer(args, "limit", JOBS_PAGE_SIZE if "page" in args else None)
+        if limit is not None and limit > JOBS_MAX_LIMIT:
+            raise SlurmwebQueryError(
+                f"Jobs limit {limit} is over maximum value {JOBS_MAX_LIMIT}"
+            )
+        return cls(sort, order, filters, page, limit)
+
+    @staticmethod
+    def _integer(
+        args: t.Mapping[str, str], parameter: str, default: t.Optional[int]
+    ) -> t.Optional[int]:
+        if parameter not in args:
+            return default
+        try:
+            value = int(args[parameter])
+        except ValueError:
+            raise SlurmwebQueryError(
+                f"Invalid integer value {args[parameter]} for jobs {parameter}"
+            )
+        if value < 1:
+            raise SlurmwebQueryError(f"Jobs {parameter} must be greater than 0")
+        return value
+
+    def matches(self, job: t.Dict) -> bool:
+        """Return True if job matches all filters of the query."""
+        for parameter, values in self.filters.items():
+            if values.isdisjoint(_job_values(job, JOBS_FILTERS[parameter])):
+                return False
+        return True
+
+    def paginate(self, items: t.List[t.Any]) -> t.List[t.Any]:
+        """Return the items of the requested page in the given list."""
+        if self.limit is None:
+            return items
+        first = (self.page - 1) * self.limit
+        return items[first : first + self.limit]
+
+    def result(self, jobs: t.List[t.Dict], total: int) -> t.Dict[str, t.Any]:
+        """Return the response with the given page of jobs and the total number of
+        jobs matching filters."""
+        return {
+            "jobs": jobs,
+            "total": total,
+            "page": self.page,
+            "limit": self.limit,
+        }
+
+
+def select_jobs(jobs: t.List[t.Dict], query: JobsQuery) -> t.Dict[str, t.Any]:
+    """Return the page of jobs selected by the query in the given list of jobs."""
+    # Python sort is stable, jobs with equal keys are kept in their original order
+    # in both orders, as in the frontend.
+    result = sorted(
+        (job for job in jobs if query.matches(job)),
+        key=JOBS_SORT_KEYS[query.sort],
+        reverse=query.order == "desc",
+    )
+    return query.result(query.paginate(result), len(result))
+
+
+def build_jobs_index(jobs: t.List[t.Dict]) -> t.Dict[str, t.Any]:
+    """Return index of the given jobs to evaluate queries of jobs without iterating
+    over all jobs. The index is a dict with:
+
+    - jobs: the list of jobs,
+    - filters: the positions of jobs in list for all lowercase values of the
+      fields of the filters, by filter parameter,
+    - orders: the positions of jobs in ascending order, by sort criterion,
+    - ranks: the rank of jobs in ascending order by sort criterion, with the same
+      rank for jobs with equal sort keys.
+
+    Values are positions in lists and strings keys for compatibility with all cache
+    codecs."""
+    index = {
+        "jobs": jobs,
+        "filters": {parameter: {} for parameter in JOBS_FILTERS.keys()},
+        "orders": {},
+        "ranks": {},
+    }
+    for position, job in enumerate(jobs):
+        for parameter, field in JOBS_FILTERS.items():
+            for value in set(_job_values(job, field)):
+                index["filters"][parameter].setdefault(value, []).append(position)
+    for criterion, key in JOBS_SORT_KEYS.items():
+        keys = [key(job) for job in jobs]
+        order = sorted(range(len(jobs)), key=keys.__getitem__)
+        ranks = [0] * len(jobs)
+        rank = 0
+        for idx, position in enumerate(order):
+            if idx and keys[position] != keys[order[idx - 1]]:
+                rank += 1
+            ranks[position] = rank
+        index["orders"][criterion] = order
+        index["ranks"][criterion] = ranks
+    return index
+
+
+def select_jobs_in_index(
+    index: t.Dict[str, t.Any], query: JobsQuery
+) -> t.Dict[str, t.Any]:
+    """Return the page of jobs selected by the query in the given index of jobs,
+    with the same result as select_jobs() on the indexed jobs."""
+    jobs = index["jobs"]
+    ranks = index["ranks"][query.sort]
+    candidates = None
+    for parameter, values in query.filters.items():
+        positions = set()
+        for value in values:
+            positions.update(index["filters"][parameter].get(value, []))
+        candidates = positions if candidates is None else candidates & positions
+    if candidates is not None and (
+        query.limit is None or len(candidates) * SORT_CANDIDATES_RATIO < len(jobs)
+    ):
+        # Sort the jobs matching filters when they are a small fraction of all jobs.
+        if query.order == "desc":
+            order = sorted(
+                candidates, key=lambda position: (-ranks[position], position)
+            )
+        else:
+            order = sorted(candidates, key=lambda position: (ranks[position], position))
+        return query.result(
+            [jobs[position] for position in query.paginate(order)], len(order)
+        )
+    # Otherwise, iterate over jobs in sort order until the end of the requested page
+    # is reached.
+    order = index["orders"][query.sort]
+    if query.order == "desc":
+        order = _descending(order, ranks)
+    if candidates is not None:
+        order = (position for position in order if position in candidates)
+        total = len(candidates)
+    else:
+        total = len(jobs)
+    if query.limit is None:
+        page = order
+    else:
+        first = (query.page - 1) * query.limit
+        page = itertools.islice(order, first, first + query.limit)
+    return query.result([jobs[position] for position in page], total)
+
+
+def _descending(order: t.List[int], ranks: t.List[int]) -> t.Iterator[int]:
+    """Iterate over positions in descending order from the positions in ascending
+    order, with positions of equal ranks kept in ascending positions order."""
+    end = len(order)
+    while end:
+        start = end - 1
+        rank = ranks[order[start]]
+        while start and ranks[order[start - 1]] == rank:
+            start -= 1
+        yield from order[start:end]
+        end = start
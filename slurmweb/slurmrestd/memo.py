@@ -0,0 +1,61 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Memoized parsing of the nodesets and GRES strings found in slurmrestd
+responses. Clusters have a small number of distinct GRES strings and many jobs
+share the same nodesets, the results are kept in bounded LRU caches shared by all
+threads of the process."""
+
+import typing as t
+import functools
+
+from ClusterShell.NodeSet import NodeSet
+
+# Maximum number of entries in memoization caches
+NODESET_CACHE_SIZE = 4096
+GRES_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=NODESET_CACHE_SIZE)
+def nodeset_expand(nodes: str) -> t.FrozenSet[str]:
+    """Return the set of node names in the given nodeset. The set is shared by all
+    callers, it is immutable."""
+    return frozenset(NodeSet(nodes))
+
+
+@functools.lru_cache(maxsize=GRES_CACHE_SIZE)
+def gres_gpus(gres_full: str) -> int:
+    """Return the number of GPU in gres string."""
+    result = 0
+    for gres_s in gres_full.split(","):
+        if not len(gres_s):
+            continue
+        # Remove index if present
+        gres_s = gres_s.split("(")[0]
+        gres = gres_s.split(":")
+        if gres[0] == "gpu":
+            result += int(gres.pop())
+    return result
+
+
+MEMOIZED = {"nodeset": nodeset_expand, "gres": gres_gpus}
+
+
+def memo_metrics() -> t.Tuple[t.Dict[str, int], t.Dict[str, int]]:
+    """Return a tuple with memoization caches hits and misses per cache."""
+    hits = {}
+    misses = {}
+    for name, func in MEMOIZED.items():
+        info = func.cache_info()
+        hits[name] = info.hits
+        misses[name] = info.misses
+    return hits, misses
+
+
+def memo_reset() -> None:
+    """Clear memoization caches and reset their counters."""
+    for func in MEMOIZED.values():
+        func.cache_clear()
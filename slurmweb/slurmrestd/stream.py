@@ -0,0 +1,139 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+"""Streaming parse of slurmrestd JSON responses with an incremental parser, to
+materialize only the selected fields of the records."""
+
+import typing as t
+
+from ..errors import SlurmwebConfigurationError
+
+
+def load_ijson():
+    """Return ijson module or raise SlurmwebConfigurationError if not available."""
+    try:
+        import ijson
+    except ModuleNotFoundError as err:
+        raise SlurmwebConfigurationError(
+            "ijson module is required for streaming parse of slurmrestd responses"
+        ) from err
+    return ijson
+
+
+class SlurmrestdProjection:
+    """Build slurmrestd response from chunks of JSON document. All fields of the
+    response are kept except the records under the given key which are projected on
+    the selected fields. The fields which are not selected are never materialized,
+    the document is never entirely loaded in memory."""
+
+    def __init__(self, ijson, key: str, fields: t.List[str]):
+        self.ijson = ijson
+        self.key = key
+        self.fields = set(fields)
+        self.result = {}
+        # Parsing state, saved between chunks of document in asynchronous mode
+        self._builder = None  # builder of the value being parsed
+        self._top = None  # current key of the top-level object
+        self._records = None
+        self._record = None
+        self._field = None  # current selected field of record
+
+    def parse(self, fileobj) -> dict:
+        """Parse JSON document read from file-like object and return the projected
+        response."""
+        self._consume(self.ijson.parse(fileobj, use_float=True))
+        return self.result
+
+    async def parse_async(self, chunks: t.AsyncIterable[bytes]) -> dict:
+        """Parse JSON document from asynchronous iterable of chunks and return the
+        projected response."""
+        # Parser events are pushed in this list by the parser coroutine for every
+        # chunk of document.
+        events = self.ijson.sendable_list()
+        parser = self.ijson.parse_coro(events, use_float=True)
+        async for chunk in chunks:
+            parser.send(chunk)
+            self._consume(events)
+            del events[:]
+        parser.close()
+        self._consume(events)
+        return self.result
+
+    def _consume(self, events: t.Iterable[t.Tuple[str, str, t.Any]]) -> None:
+        # This is the hot path of the parsing, the state is loaded in local
+        # variables and the most frequent events are checked first.
+        key, item, fields = self.key, f"{self.key}.item", self.fields
+        builder, top, records, record, field = (
+            self._builder,
+            self._top,
+            self._records,
+            self._record,
+            self._field,
+        )
+        for prefix, event, value in events:
+            if prefix == item:
+                # Events of the records
+                if event == "map_key":
+                    if field is not None:
+                        record[field] = builder.value
+                    if value in fields:
+                        field = value
+                        builder = self.ijson.ObjectBuilder()
+                    else:
+                        field = None
+                elif event == "start_map":
+                    record = {}
+                    records.append(record)
+                elif event == "end_map":
+                    if field is not None:
+                        record[field] = builder.value
+                        field = None
+                else:
+                    # Scalar record
+                    records.append(value)
+            elif field is not None:
+                # Events of a selected field of a record
+                builder.event(event, value)
+            elif top == key and prefix:
+                # Events of a field of a record which is not selected, or records
+                # array boundaries.
+                if prefix == key and event == "null":
+                    self.result[key] = None
+            elif not prefix:
+                # Events of the top-level object
+                if top is not None and top != key:
+                    self.result[top] = builder.value
+                    top = None
+                if event == "map_key":
+                    top = value
+                    if value == key:
+                        records = self.result[key] = []
+                    else:
+                        builder = self.ijson.ObjectBuilder()
+            else:
+                # Events of other top-level values
+                builder.event(event, value)
+        self._builder, self._top, self._records, self._record, self._field = (
+            builder,
+            top,
+            records,
+            record,
+            field,
+        )
+
+
+class IteratorReader:
+    """File-like object which reads bytes from an iterator of chunks."""
+
+    def __init__(self, chunks: t.Iterator[bytes]):
+        self.chunks = chunks
+
+    def read(self, size: int = -1) -> bytes:
+        # ijson reads zero bytes to determine the type of data returned by the
+        # file-like object, do not consume a chunk in this case.
+        if not size:
+            return b""
+        return next(self.chunks, b"")
@@ -0,0 +1,68 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import typing as t
+import threading
+import time
+
+
+class SlurmrestdTable:
+    """Materialized table of the records of a slurmrestd collection, indexed by
+    their identifier. The table is synchronized incrementally with the records
+    updated in Slurm since its last update. Records removed from Slurm (eg. purged
+    jobs) are not reported in updates, the table is then fully synchronized
+    periodically to remove them."""
+
+    # Identifier field of records in collections supported in tables
+    IDENTIFIERS = {"jobs": "job_id", "nodes": "name"}
+
+    def __init__(self, collection: str, full_interval: int):
+        self.collection = collection
+        self.identifier = self.IDENTIFIERS[collection]
+        self.full_interval = full_interval
+        self.records: t.Dict[t.Any, t.Dict] = {}
+        # Slurm last update timestamp of the records in table
+        self.last_update: t.Optional[int] = None
+        # Monotonic time of the last full synchronization
+        self.last_full: t.Optional[float] = None
+        self._lock = threading.Lock()
+
+    def since(self) -> int:
+        """Return the timestamp to select the records updated since the last
+        update of the table, or 0 to select all records when full synchronization
+        is required."""
+        with self._lock:
+            if (
+                self.last_update is None
+                or self.last_full is None
+                or time.monotonic() - self.last_full >= self.full_interval
+            ):
+                return 0
+            return self.last_update
+
+    def merge(
+        self, since: int, records: t.List[t.Dict], last_update: t.Optional[int]
+    ) -> t.List[t.Dict]:
+        """Merge the records updated since the given timestamp in the table, or
+        replace all records in table when since is 0, and return the list of all
+        records in table. Records must not be modified."""
+        with self._lock:
+            # Skip updates older than the current content of the table, when
+            # concurrent synchronizations are completed out of order.
+            if (
+                last_update is not None
+                and self.last_update is not None
+                and last_update < self.last_update
+            ):
+                return list(self.records.values())
+            if not since:
+                self.records = {}
+                self.last_full = time.monotonic()
+            for record in records:
+                self.records[record[self.identifier]] = record
+            if last_update is not None:
+                self.last_update = last_update
+            return list(self.records.values())
@@ -5,6 +5,7 @@
 # SPDX-License-Identifier: MIT
 
 import socket
+import time
 import logging
 
 from urllib3.connection import HTTPConnection
@@ -18,6 +19,9 @@ class SlurmrestdUnixConnection(HTTPConnection):
     def __init__(self, path):
         super().__init__("localhost")
         self.path = path
+        # Monotonic timestamp of the last time the connection has been released in
+        # the pool, None when the connection has never been used.
+        self.released = None
 
     def connect(self):
         self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
@@ -26,18 +30,57 @@ class SlurmrestdUnixConnection(HTTPConnection):
 
 
 class SlurmrestdUnixConnectionPool(HTTPConnectionPool):
-    def __init__(self, path):
-        super().__init__("localhost")
+    """Bounded pool of persistent HTTP connections on slurmrestd Unix socket.
+
+    Connections are kept open between requests to benefit from HTTP keep-alive. The
+    pool is blocking, at most maxsize sockets are opened on the Unix socket and
+    additional concurrent requests wait for a connection to be released. Connections
+    idle for more than idle_timeout seconds, or closed by slurmrestd in the meantime,
+    are reset before being reused."""
+
+    def __init__(self, path, maxsize=10, idle_timeout=30):
+        super().__init__("localhost", maxsize=maxsize, block=True)
         self.path = path
+        self.idle_timeout = idle_timeout
 
     def _new_conn(self):
+        self.num_connections += 1
+        logger.debug(
+            "Starting new connection (%d) to unix socket %s",
+            self.num_connections,
+            self.path,
+        )
         return SlurmrestdUnixConnection(self.path)
 
+    def _get_conn(self, timeout=None):
+        # Parent method already resets connections dropped by the server.
+        conn = super()._get_conn(timeout)
+        if (
+            conn.sock is not None
+            and conn.released is not None
+            and time.monotonic() - conn.released > self.idle_timeout
+        ):
+            logger.debug(
+                "Resetting connection to unix socket %s idle for more than %d seconds",
+                self.path,
+                self.idle_timeout,
+            )
+            conn.close()
+        return conn
+
+    def _put_conn(self, conn):
+        if conn is not None:
+            conn.released = time.monotonic()
+        super()._put_conn(conn)
+
 
 class SlurmrestdUnixAdapter(HTTPAdapter):
-    def __init__(self, path):
+    def __init__(self, path, pool_size=10, pool_idle_timeout=30):
         super().__init__()
         self.path = path
+        self.pool = SlurmrestdUnixConnectionPool(
+            path, maxsize=pool_size, idle_timeout=pool_idle_timeout
+        )
 
     # Required by Requests >= 2.32.2. For reference:
     # https://github.com/psf/requests/pull/6710
@@ -48,4 +91,8 @@ class SlurmrestdUnixAdapter(HTTPAdapter):
         return self.get_connection(request.url, proxies)
 
     def get_connection(self, url, proxies=None):
-        return SlurmrestdUnixConnectionPool(self.path)
+        return self.pool
+
+    def close(self):
+        super().close()
+        self.pool.close()
@@ -9,6 +9,9 @@ import unittest
 from unittest import mock
 
 from slurmweb.errors import SlurmwebConfigurationError
+from slurmweb.prewarm import CachePrewarmer
+from slurmweb.slurmrestd import SlurmrestdFilteredCached
+from slurmweb.slurmrestd.aio import AsyncSlurmrestdFilteredCached
 
 from ..lib.agent import TestAgentBase, is_racksdb_available
 
@@ -74,6 +77,15 @@ class TestAgentApp(TestAgentBase):
         )
         self.assertEqual(self.app.settings.slurmrestd.auth, "local")
 
+    def test_app_slurmrestd_client_sync(self):
+        self.setup_client()
+        self.assertIsInstance(self.app.slurmrestd, SlurmrestdFilteredCached)
+        self.assertNotIsInstance(self.app.slurmrestd, AsyncSlurmrestdFilteredCached)
+
+    def test_app_slurmrestd_client_async(self):
+        self.setup_client(slurmrestd_parameters=["client=async"])
+        self.assertIsInstance(self.app.slurmrestd, AsyncSlurmrestdFilteredCached)
+
     @mock.patch("slurmweb.apps.agent.SlurmrestdFilteredCached")
     def test_app_slurmrestd_conf_error(self, mock_slurmrestd):
         mock_slurmrestd.side_effect = SlurmwebConfigurationError("fail")
@@ -83,3 +95,18 @@ class TestAgentApp(TestAgentBase):
         self.assertEqual(
             cm.output, ["CRITICAL:slurmweb.apps.agent:Configuration error: fail"]
         )
+
+    @mock.patch.object(CachePrewarmer, "start")
+    def test_app_prewarm_started_on_request(self, mock_start):
+        self.setup_client(cache=True, cache_parameters=["prewarm=jobs"])
+        self.assertIsInstance(self.app.prewarmer, CachePrewarmer)
+        # Pre-warming thread is not started when the application is loaded, as it
+        # would not be inherited by uWSGI workers.
+        mock_start.assert_not_called()
+        self.client.get("/version")
+        mock_start.assert_called_once_with()
+
+    def test_app_prewarm_disabled(self):
+        self.setup_client(cache=True)
+        self.assertIsNone(self.app.prewarmer)
+        self.client.get("/version")
@@ -12,6 +12,7 @@ from urllib.parse import urlparse
 
 import aiohttp.client_exceptions
 import aiohttp
+from rfl.core.asyncio import asyncio_run
 
 from ..lib.gateway import TestGatewayBase
 from slurmweb.apps.gateway import (
@@ -240,9 +241,80 @@ class TestGatewayApp(TestGatewayBase):
             ],
         )
 
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_agents_refresh_started(self, mock_get):
+        agent_info, mock_get.return_value = mock_agent_aio_response(asset="info")
+        with mock.patch.object(self.app.sessions, "spawn") as mock_spawn:
+            agents = self.app.agents
+            # Agents are not polled again on next accesses, background refresh
+            # task is started once.
+            self.assertIs(self.app.agents, agents)
+        mock_get.assert_called_once()
+        mock_spawn.assert_called_once()
+        mock_spawn.call_args[0][0].close()
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_update_agents_keep_last(self, mock_get):
+        agent_info, mock_get.return_value = mock_agent_aio_response(asset="info")
+        self.assertFalse(self.app.sessions.run(self.app._update_agents()))
+        agents = self.app._agents
+        self.assertIn(agent_info["cluster"], agents)
+        # Agent temporarily unreachable is kept with last retrieved information
+        mock_get.side_effect = aiohttp.client_exceptions.ClientConnectionError(
+            "fake connection error"
+        )
+        with self.assertLogs("slurmweb", level="WARNING") as cm:
+            self.assertTrue(self.app.sessions.run(self.app._update_agents()))
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.apps.gateway:Unable to retrieve agent info from url "
+                "http://localhost: [ClientConnectionError] fake connection error",
+                "WARNING:slurmweb.apps.gateway:Keeping last information retrieved "
+                "from agent at url http://localhost",
+            ],
+        )
+        # Dictionnary of agents is replaced, not modified
+        self.assertIsNot(self.app._agents, agents)
+        self.assertEqual(self.app._agents, agents)
+
+    def test_refresh_agents(self):
+        delays = []
+
+        class StopRefresh(Exception):
+            pass
+
+        async def sleep(delay):
+            if len(delays) == 4:
+                raise StopRefresh()
+            delays.append(delay)
+
+        updates = [True, False, RuntimeError("fake error"), False]
+
+        async def update():
+            result = updates.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        with mock.patch("slurmweb.apps.gateway.asyncio.sleep", sleep):
+            with mock.patch.object(self.app, "_update_agents", update):
+                with self.assertLogs("slurmweb", level="ERROR") as cm:
+                    with self.assertRaises(StopRefresh):
+                        asyncio_run(self.app._refresh_agents(False))
+        # Refresh is retried sooner after failures.
+        self.assertEqual(delays, [300, 30, 300, 30])
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.apps.gateway:Unable to refresh agents information: "
+                "fake error"
+            ],
+        )
+
 
 class TestGatewayAppAgentConnector(TestGatewayBase):
-    @mock.patch("slurmweb.apps.gateway.ssl.create_default_context")
+    @mock.patch("slurmweb.sessions.ssl.create_default_context")
     @mock.patch("slurmweb.apps.gateway.aiohttp.TCPConnector")
     def test_agent_connector(self, mock_connector, mock_context):
         with tempfile.NamedTemporaryFile(mode="w") as cacert:
@@ -252,12 +324,36 @@ class TestGatewayAppAgentConnector(TestGatewayBase):
             connector = self.app.get_agent_connector()
             self.assertIs(connector, mock.sentinel.agent_connector)
             mock_context.assert_called_once_with(cafile=cacert.name)
-            mock_connector.assert_called_once_with(ssl=mock.sentinel.agent_ssl_context)
+            mock_connector.assert_called_once_with(
+                limit=0,
+                limit_per_host=100,
+                keepalive_timeout=15,
+                ssl=mock.sentinel.agent_ssl_context,
+            )
+            # SSL context is loaded once for all connectors
+            self.app.get_agent_connector()
+            mock_context.assert_called_once()
 
-    def test_agent_connector_no_cacert(self):
+    @mock.patch("slurmweb.apps.gateway.aiohttp.TCPConnector")
+    def test_agent_connector_no_cacert(self, mock_connector):
+        mock_connector.return_value = mock.sentinel.agent_connector
         self.setup_app()
         connector = self.app.get_agent_connector()
-        self.assertIsNone(connector)
+        self.assertIs(connector, mock.sentinel.agent_connector)
+        mock_connector.assert_called_once_with(
+            limit=0, limit_per_host=100, keepalive_timeout=15
+        )
+        self.assertIsNone(self.app.sessions.ssl_context)
+
+    @mock.patch("slurmweb.apps.gateway.aiohttp.TCPConnector")
+    def test_agent_connector_limits(self, mock_connector):
+        self.setup_app(
+            conf_overrides={"agents_extra": {"connections": 10, "keepalive": 60}}
+        )
+        self.app.get_agent_connector()
+        mock_connector.assert_called_once_with(
+            limit=0, limit_per_host=10, keepalive_timeout=60
+        )
 
     def test_agent_connector_missing_cacert_file(self):
         self.setup_gateway_conf(agents_extra={"cacert": "/dev/fail"})
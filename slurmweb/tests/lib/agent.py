@@ -63,6 +63,11 @@ enabled=yes
 {% if cache %}
 [cache]
 enabled=yes
+{% if cache_parameters %}
+{% for cache_parameter in cache_parameters %}
+{{ cache_parameter }}
+{% endfor %}
+{% endif %}
 {% endif %}
 """
 
@@ -81,7 +86,12 @@ class FakeRacksDBWebBlueprint(Blueprint):
 
 class TestAgentConfBase(unittest.TestCase):
     def setup_agent_conf(
-        self, slurmrestd_parameters=None, racksdb=True, metrics=False, cache=False
+        self,
+        slurmrestd_parameters=None,
+        racksdb=True,
+        metrics=False,
+        cache=False,
+        cache_parameters=None,
     ):
         # Generate JWT signing key
         self.key = tempfile.NamedTemporaryFile(mode="w+")
@@ -116,6 +126,7 @@ class TestAgentConfBase(unittest.TestCase):
                 racksdb=racksdb,
                 metrics=metrics,
                 cache=cache,
+                cache_parameters=cache_parameters,
             )
         )
         self.conf.seek(0)
@@ -145,6 +156,7 @@ class TestAgentBase(TestSlurmrestdClient):
         racksdb=True,
         metrics=False,
         cache=False,
+        cache_parameters=None,
         racksdb_format_error=False,
         racksdb_schema_error=False,
         anonymous_user=False,
@@ -163,6 +175,7 @@ class TestAgentBase(TestSlurmrestdClient):
             racksdb=racksdb,
             metrics=metrics,
             cache=cache,
+            cache_parameters=cache_parameters,
         )
 
         if racksdb:
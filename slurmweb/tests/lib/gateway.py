@@ -8,7 +8,6 @@ import typing as t
 import unittest
 import tempfile
 import os
-import time
 
 import werkzeug
 import jinja2
@@ -45,6 +44,11 @@ enabled=yes
 enabled=no
 {% endif %}
 
+{% if metrics %}
+[metrics]
+enabled=yes
+{% endif %}
+
 {% if ldap %}
 [authentication]
 enabled=yes
@@ -114,6 +118,8 @@ class TestGatewayBase(TestGatewayConfBase):
         # Close conf and key file handlers to remove temporary files
         self.conf.close()
         self.key.close()
+        # Stop event loop thread and close agents sessions at the end of the test
+        self.addCleanup(self.app.sessions.stop)
         self.app.config.update(
             {
                 "TESTING": True,
@@ -147,7 +153,6 @@ class TestGatewayBase(TestGatewayConfBase):
             self.client.environ_base["HTTP_AUTHORIZATION"] = "Bearer " + token
 
     def app_set_agents(self, agents: t.Dict[str, SlurmwebAgent]):
-        """Set gateway application _agents attribute with timeout in future to
-        avoid application sending GET requests to retrieve /info."""
+        """Set gateway application _agents attribute to avoid application sending
+        GET requests to retrieve /info."""
         self.app._agents = agents
-        self.app._agents_timeout = int(time.time()) + 300
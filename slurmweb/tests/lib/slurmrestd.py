@@ -5,12 +5,18 @@
 # SPDX-License-Identifier: MIT
 
 import unittest
+from unittest import mock
 import os
 from pathlib import Path
 
+import aiohttp
 from rfl.settings import RuntimeSettings
 
-from .utils import mock_slurmrestd_responses, SlurmwebAssetUnavailable
+from .utils import (
+    mock_slurmrestd_responses,
+    mock_slurmrestd_aio_responses,
+    SlurmwebAssetUnavailable,
+)
 from slurmweb.slurmrestd.auth import SlurmrestdAuthentifier
 
 
@@ -34,6 +40,20 @@ class TestSlurmrestdBase(unittest.TestCase):
         except SlurmwebAssetUnavailable as err:
             self.skipTest(str(err))
 
+    def mock_slurmrestd_aio_responses(self, slurm_version, api_version, assets):
+        """Mock aiohttp client session responses for the duration of the test and
+        return the list of expected results."""
+        try:
+            results, get = mock_slurmrestd_aio_responses(
+                slurm_version, api_version, assets
+            )
+        except SlurmwebAssetUnavailable as err:
+            self.skipTest(str(err))
+        patcher = mock.patch.object(aiohttp.ClientSession, "get", get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return results
+
     def setup_slurmrestd(self, slurm_version, api_version):
         """Set slurmrestd cluster name, Slurm version and API version for the test."""
         self.slurmrestd.cluster_name = "foo"
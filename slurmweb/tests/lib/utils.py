@@ -78,6 +78,19 @@ class SlurmwebAssetUnavailable(Exception):
     pass
 
 
+def json_chunks(data: str, size: int = 1024):
+    """Return iterator over chunks of bytes of the given JSON document, to mock
+    responses parsed while they are received."""
+    data = data.encode()
+    return iter([data[idx : idx + size] for idx in range(0, len(data), size)])
+
+
+async def async_json_chunks(data: str, size: int = 1024):
+    """Asynchronous variant of json_chunks()."""
+    for chunk in json_chunks(data, size):
+        yield chunk
+
+
 def mock_slurmrestd_responses(slurmrestd, slurm_version, api_version, assets):
     """Mock slurmrestd responses for given assets.
 
@@ -128,6 +141,9 @@ def mock_slurmrestd_responses(slurmrestd, slurm_version, api_version, assets):
         }
         if is_json:
             fake_response.json = mock.Mock(return_value=asset)
+            fake_response.iter_content = mock.Mock(
+                side_effect=lambda chunk_size, data=json.dumps(asset): json_chunks(data)
+            )
         else:
             type(fake_response).text = mock.PropertyMock(return_value=asset)
         responses.append(fake_response)
@@ -144,6 +160,64 @@ def mock_slurmrestd_responses(slurmrestd, slurm_version, api_version, assets):
     return results
 
 
+def mock_slurmrestd_aio_responses(slurm_version, api_version, assets):
+    """Mock aiohttp slurmrestd responses for given assets. Return the list of expected
+    results and the mock to substitute aiohttp.ClientSession.get().
+
+    Args:
+        slurm_version: Slurm version (e.g., "24.05")
+        api_version: API version (e.g., "0.0.44")
+        assets: List of (asset_name, key) tuples
+    """
+    responses = []
+    results = []
+
+    status_path = ASSETS / f"slurmrestd/{slurm_version}/{api_version}/status.json"
+    if not status_path.exists():
+        raise SlurmwebAssetUnavailable(
+            f"Status file not found for Slurm {slurm_version}, API {api_version}"
+        )
+
+    with open(status_path) as fh:
+        requests_statuses = json.load(fh)
+
+    for asset_name, key in assets:
+        if asset_name not in requests_statuses:
+            raise SlurmwebAssetUnavailable(
+                f"Unable to find asset {asset_name} in requests status file for Slurm "
+                f"{slurm_version}, API {api_version}"
+            )
+        content_type = requests_statuses[asset_name]["content-type"]
+        if content_type == "application/json":
+            asset = load_json_asset(
+                f"slurmrestd/{slurm_version}/{api_version}/{asset_name}.json"
+            )
+            original = copy.deepcopy(asset)
+            text = json.dumps(asset)
+        else:
+            asset = load_asset(
+                f"slurmrestd/{slurm_version}/{api_version}/{asset_name}.txt"
+            )
+            original = text = asset
+        fake_response = mock.create_autospec(aiohttp.client_reqrep.ClientResponse)
+        fake_response.url = "/mocked/query"
+        fake_response.status = requests_statuses[asset_name]["status"]
+        fake_response.headers = {"content-type": content_type}
+        fake_response.json = async_mock(asset, False)
+        fake_response.text = async_mock(text, False)
+        fake_response.content = mock.Mock()
+        fake_response.content.iter_chunked = mock.Mock(
+            side_effect=lambda size, data=text: async_json_chunks(data)
+        )
+        responses.append(AsyncContextManagerMock(fake_response))
+        if key is not None:
+            results.append(original[key])
+        else:
+            results.append(original)
+
+    return results, mock.Mock(side_effect=responses)
+
+
 class SlurmwebCustomTestResponse(flask.Response):
     """Custom flask Response class to backport text property of
     werkzeug.test.TestResponse class on werkzeug < 0.15."""
@@ -216,6 +290,24 @@ class AsyncContextManagerMock:
         pass
 
 
+class AsyncStreamMock:
+    """Mock for aiohttp responses content streams. The stream is rewound when its
+    end is reached, so the same mocked response can be read multiple times."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.position = 0
+
+    async def read(self, n: int = -1) -> bytes:
+        if self.position >= len(self.body):
+            self.position = 0
+            return b""
+        end = len(self.body) if n < 0 else self.position + n
+        chunk = self.body[self.position : end]
+        self.position += len(chunk)
+        return chunk
+
+
 def async_mock(content, fail_content_type: bool):
     """Unfortunately, mock.AsyncMock is not available in Python >= 3.8. When this class
     is not available, return a dumb awaitable."""
@@ -271,9 +363,12 @@ def mock_component_aio_response(
     if is_json:
         response.headers = {"content-type": "application/json"}
         response.json = async_mock(content, fail_content_type)
+        body = json.dumps(content).encode()
     else:
         response.headers = {"content-type": "text/plain"}
         response.json = async_mock(content, fail_content_type)
+        body = content.encode() if isinstance(content, str) else content
+    response.content = AsyncStreamMock(body)
 
     return content, AsyncContextManagerMock(response)
 
@@ -11,10 +11,9 @@ import ipaddress
 import prometheus_client
 import prometheus_client.core
 
-from slurmweb.metrics.collector import (
-    SlurmWebMetricsCollector,
-    get_client_ipaddress,
-)
+from slurmweb.metrics.base import get_client_ipaddress
+from slurmweb.metrics.collector import SlurmWebMetricsCollector
+from slurmweb.prewarm import CachePrewarmer
 from slurmweb.errors import SlurmwebCacheError
 from slurmweb.slurmrestd.errors import (
     SlurmrestdNotFoundError,
@@ -96,6 +95,10 @@ class TestSlurmWebMetricsCollector(unittest.TestCase):
             self.collector = SlurmWebMetricsCollector(
                 slurmrestd=self.mock_slurmrestd, cache=self.mock_cache
             )
+        # Run slurmrestd calls sequentially on mocked methods
+        self.mock_slurmrestd.query.side_effect = lambda *calls: [
+            getattr(self.mock_slurmrestd, method)(*args) for method, args in calls
+        ]
         # Mock slurmrestd responses
         self.mock_slurmrestd.resources_states.return_value = (
             {"idle": 5, "allocated": 3, "down": 1},  # nodes_states
@@ -114,9 +117,12 @@ class TestSlurmWebMetricsCollector(unittest.TestCase):
         self.mock_cache.metrics.return_value = (
             {"nodes": 5, "jobs": 3},  # cache_hits
             {"nodes": 2, "jobs": 1},  # cache_misses
+            {"jobs": 2},  # cache_coalesced
             8,  # total_hits
             3,  # total_misses
+            2,  # total_coalesced
         )
+        self.mock_cache.local = None
 
     def test_collect_success_with_cache(self):
         """Test successful collection with cache enabled."""
@@ -125,13 +131,99 @@ class TestSlurmWebMetricsCollector(unittest.TestCase):
         metrics = list(self.collector.collect())
 
         # Verify we got the expected number of metrics
-        self.assertEqual(len(metrics), 12)  # 8 slurm metrics + 4 cache metrics
+        # 8 slurm metrics + 2 memoization metrics + 6 cache metrics
+        self.assertEqual(len(metrics), 16)
 
         # Verify slurmrestd methods were called
         self.mock_slurmrestd.resources_states.assert_called_once()
         self.mock_slurmrestd.jobs_states.assert_called_once()
         self.mock_cache.metrics.assert_called_once()
 
+    def test_collect_success_with_local_cache(self):
+        """Test successful collection with local cache enabled."""
+        self.mock_cache.local = mock.Mock()
+        self.mock_cache.local.metrics.return_value = (
+            {"jobs": 12},  # local_hits
+            {"jobs": 4, "nodes": 2},  # local_misses
+            12,  # local_total_hits
+            6,  # local_total_misses
+        )
+
+        metrics = {metric.name: metric for metric in self.collector.collect()}
+
+        # 8 slurm metrics + 2 memoization metrics + 6 cache metrics + 4 local cache
+        # metrics
+        self.assertEqual(len(metrics), 20)
+        self.assertEqual(
+            [
+                (sample.labels, sample.value)
+                for sample in metrics["slurmweb_cache_local_miss"].samples
+            ],
+            [({"key": "jobs"}, 4), ({"key": "nodes"}, 2)],
+        )
+        self.assertEqual(metrics["slurmweb_cache_local_hit_total"].samples[0].value, 12)
+
+    def test_collect_success_with_prewarm(self):
+        """Test successful collection with cache pre-warming enabled."""
+        prewarmer = CachePrewarmer(
+            self.mock_slurmrestd, self.mock_cache, mock.Mock(prewarm=["jobs", "nodes"])
+        )
+        prewarmer.leader = True
+        prewarmer.statistics["jobs"].refreshes = 4
+        prewarmer.statistics["jobs"].failures = 1
+        prewarmer.statistics["jobs"].duration = 0.5
+        self.collector.prewarmer = prewarmer
+
+        metrics = {metric.name: metric for metric in self.collector.collect()}
+
+        # 8 slurm metrics + 2 memoization metrics + 6 cache metrics + 4 pre-warming
+        # metrics
+        self.assertEqual(len(metrics), 20)
+        self.assertEqual(metrics["slurmweb_cache_prewarm_leader"].samples[0].value, 1)
+        self.assertEqual(
+            [
+                (sample.labels, sample.value)
+                for sample in metrics["slurmweb_cache_prewarm_duration_seconds"].samples
+            ],
+            [({"key": "jobs"}, 0.5)],
+        )
+        self.assertEqual(
+            [
+                (sample.labels, sample.value)
+                for sample in metrics["slurmweb_cache_prewarm_refreshes"].samples
+            ],
+            [({"key": "jobs"}, 4), ({"key": "nodes"}, 0)],
+        )
+        self.assertEqual(
+            [
+                (sample.labels, sample.value)
+                for sample in metrics["slurmweb_cache_prewarm_failures"].samples
+            ],
+            [({"key": "jobs"}, 1), ({"key": "nodes"}, 0)],
+        )
+
+    def test_collect_memo_metrics(self):
+        """Test collection of memoization caches metrics."""
+        with mock.patch(
+            "slurmweb.metrics.collector.memo_metrics",
+            return_value=({"nodeset": 10, "gres": 4}, {"nodeset": 2, "gres": 1}),
+        ):
+            metrics = {metric.name: metric for metric in self.collector.collect()}
+        self.assertEqual(
+            [
+                (sample.labels, sample.value)
+                for sample in metrics["slurmweb_memo_hit"].samples
+            ],
+            [({"cache": "nodeset"}, 10), ({"cache": "gres"}, 4)],
+        )
+        self.assertEqual(
+            [
+                (sample.labels, sample.value)
+                for sample in metrics["slurmweb_memo_miss"].samples
+            ],
+            [({"cache": "nodeset"}, 2), ({"cache": "gres"}, 1)],
+        )
+
     def test_collect_success_without_cache(self):
         """Test successful collection without cache."""
 
@@ -141,8 +233,8 @@ class TestSlurmWebMetricsCollector(unittest.TestCase):
         # Collect metrics
         metrics = list(self.collector.collect())
 
-        # Verify we got only slurm metrics (no cache metrics)
-        self.assertEqual(len(metrics), 8)
+        # Verify we got only slurm and memoization metrics (no cache metrics)
+        self.assertEqual(len(metrics), 10)
 
         # Verify slurmrestd methods were called
         self.mock_slurmrestd.resources_states.assert_called_once()
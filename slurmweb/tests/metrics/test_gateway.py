@@ -0,0 +1,73 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import sys
+import importlib
+
+from slurmweb.metrics.gateway import SlurmwebGatewayMetricsCollector
+from slurmweb.sessions import AgentsSessions
+
+
+class TestSlurmwebGatewayMetricsCollector(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.sessions = AgentsSessions(mock.Mock(), breaker_threshold=2)
+        # Mock the prometheus registry to avoid side effects
+        with mock.patch("prometheus_client.REGISTRY"):
+            self.collector = SlurmwebGatewayMetricsCollector(self.sessions)
+
+    def test_collect(self):
+        """Test collection of agents circuit breakers metrics."""
+        self.sessions.breaker("http://agent1")
+        with self.assertLogs("slurmweb", level="WARNING"):
+            for _ in range(2):
+                self.sessions.breaker("http://agent2").failure()
+
+        states, failures, trips = list(self.collector.collect())
+        self.assertEqual(
+            {tuple(sample.labels.values()): sample.value for sample in states.samples},
+            {
+                ("http://agent1", "closed"): 1,
+                ("http://agent1", "open"): 0,
+                ("http://agent1", "half-open"): 0,
+                ("http://agent2", "closed"): 0,
+                ("http://agent2", "open"): 1,
+                ("http://agent2", "half-open"): 0,
+            },
+        )
+        self.assertEqual(
+            {sample.labels["agent"]: sample.value for sample in failures.samples},
+            {"http://agent1": 0, "http://agent2": 2},
+        )
+        self.assertEqual(
+            {
+                sample.labels["agent"]: sample.value
+                for sample in trips.samples
+                if sample.name == "slurmweb_agent_breaker_trips_total"
+            },
+            {"http://agent1": 0, "http://agent2": 1},
+        )
+
+    def test_collect_no_agent(self):
+        """Test collection without requests to agents."""
+        metrics = list(self.collector.collect())
+        self.assertEqual(len(metrics), 3)
+        for metric in metrics:
+            self.assertEqual(metric.samples, [])
+
+    def test_import_without_agent_dependencies(self):
+        """Test gateway metrics module does not require agent dependencies."""
+        with mock.patch.dict(
+            sys.modules,
+            {"requests": None, "redis": None, "ClusterShell": None},
+        ):
+            for module in list(sys.modules):
+                if module.startswith(("slurmweb.metrics", "slurmweb.slurmrestd")):
+                    del sys.modules[module]
+            importlib.import_module("slurmweb.metrics.gateway")
+            self.assertNotIn("slurmweb.slurmrestd", sys.modules)
@@ -0,0 +1,90 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+from slurmweb.slurmrestd.changes import build_snapshot_digests, snapshot_changes
+
+JOBS = [
+    {"job_id": 1, "job_state": ["RUNNING"], "user_name": "alice"},
+    {"job_id": 2, "job_state": ["PENDING"], "user_name": "bob"},
+    {"job_id": 3, "job_state": ["PENDING"], "user_name": "alice"},
+]
+
+
+class TestSnapshotDigests(unittest.TestCase):
+    def test_digests(self):
+        snapshot = build_snapshot_digests(JOBS, "job_id")
+        self.assertCountEqual(snapshot.keys(), ["version", "digests"])
+        # Identifiers are converted to strings
+        self.assertCountEqual(snapshot["digests"].keys(), ["1", "2", "3"])
+        self.assertEqual(len(set(snapshot["digests"].values())), 3)
+
+    def test_version_stable(self):
+        # Version does not depend on the order of records and fields.
+        reordered = [
+            {"user_name": job["user_name"], "job_state": job["job_state"], **job}
+            for job in reversed(JOBS)
+        ]
+        self.assertEqual(
+            build_snapshot_digests(JOBS, "job_id"),
+            build_snapshot_digests(reordered, "job_id"),
+        )
+
+    def test_version_modified(self):
+        modified = [dict(JOBS[0], job_state=["COMPLETED"])] + JOBS[1:]
+        self.assertNotEqual(
+            build_snapshot_digests(JOBS, "job_id")["version"],
+            build_snapshot_digests(modified, "job_id")["version"],
+        )
+
+
+class TestSnapshotChanges(unittest.TestCase):
+    def test_changes(self):
+        previous = build_snapshot_digests(JOBS, "job_id")
+        jobs = [
+            dict(JOBS[0], job_state=["COMPLETED"]),
+            JOBS[1],
+            {"job_id": 4, "job_state": ["PENDING"], "user_name": "carol"},
+        ]
+        current = build_snapshot_digests(jobs, "job_id")
+        self.assertEqual(
+            snapshot_changes(jobs, "job_id", current, previous["digests"]),
+            {
+                "version": current["version"],
+                "full": False,
+                "added": [jobs[2]],
+                "modified": [jobs[0]],
+                "removed": ["3"],
+            },
+        )
+
+    def test_changes_unchanged(self):
+        current = build_snapshot_digests(JOBS, "job_id")
+        self.assertEqual(
+            snapshot_changes(JOBS, "job_id", current, current["digests"]),
+            {
+                "version": current["version"],
+                "full": False,
+                "added": [],
+                "modified": [],
+                "removed": [],
+            },
+        )
+
+    def test_changes_full(self):
+        current = build_snapshot_digests(JOBS, "job_id")
+        result = snapshot_changes(JOBS, "job_id", current, None)
+        self.assertTrue(result["full"])
+        self.assertEqual(result["added"], JOBS)
+        self.assertEqual(result["modified"], [])
+        self.assertEqual(result["removed"], [])
+
+    def test_changes_records_not_in_snapshot(self):
+        # Records more recent than the snapshot fingerprint are ignored.
+        current = build_snapshot_digests(JOBS[:2], "job_id")
+        result = snapshot_changes(JOBS, "job_id", current, None)
+        self.assertEqual(result["added"], JOBS[:2])
@@ -0,0 +1,184 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+import itertools
+
+from slurmweb.slurmrestd.jobs import (
+    JobsQuery,
+    JOBS_PAGE_SIZE,
+    JOBS_SORT_KEYS,
+    select_jobs,
+    build_jobs_index,
+    select_jobs_in_index,
+)
+from slurmweb.errors import SlurmwebQueryError
+
+from ..lib.utils import all_slurm_api_versions, load_json_asset
+
+
+def optional_number(number):
+    if number is None:
+        return {"set": False, "infinite": False, "number": 0}
+    if number == "infinite":
+        return {"set": True, "infinite": True, "number": 0}
+    return {"set": True, "infinite": False, "number": number}
+
+
+def job(job_id, user, state, account="physics", priority=None, nodes=1, cpus=1):
+    return {
+        "job_id": job_id,
+        "user_name": user,
+        "job_state": state,
+        "account": account,
+        "qos": "normal",
+        "partition": "normal",
+        "priority": optional_number(priority),
+        "node_count": optional_number(nodes),
+        "cpus": optional_number(cpus),
+    }
+
+
+JOBS = [
+    job(4, "alice", ["RUNNING"], priority=10, nodes=2, cpus=4),
+    job(2, "bob", ["PENDING"], account="biology", priority="infinite"),
+    job(7, "alice", ["PENDING"], priority=None, nodes=None, cpus=None),
+    job(1, "charlie", ["COMPLETED"], priority=10, nodes=2, cpus=2),
+    job(3, "bob", ["RUNNING", "COMPLETING"], account="biology", priority=5),
+]
+
+
+def ids(result):
+    return [job["job_id"] for job in result["jobs"]]
+
+
+class TestJobsQuery(unittest.TestCase):
+    def test_from_args_none(self):
+        self.assertIsNone(JobsQuery.from_args({}))
+        self.assertIsNone(JobsQuery.from_args({"other": "value"}))
+
+    def test_from_args(self):
+        query = JobsQuery.from_args(
+            {
+                "sort": "priority",
+                "order": "desc",
+                "states": "running,PENDING",
+                "users": "Alice",
+                "page": "3",
+                "limit": "20",
+            }
+        )
+        self.assertEqual(query.sort, "priority")
+        self.assertEqual(query.order, "desc")
+        self.assertEqual(
+            query.filters, {"states": {"running", "pending"}, "users": {"alice"}}
+        )
+        self.assertEqual(query.page, 3)
+        self.assertEqual(query.limit, 20)
+
+    def test_from_args_defaults(self):
+        query = JobsQuery.from_args({"users": "alice"})
+        self.assertEqual((query.sort, query.order), ("id", "asc"))
+        self.assertEqual((query.page, query.limit), (1, None))
+        # Default limit is set when page is requested.
+        query = JobsQuery.from_args({"page": "2"})
+        self.assertEqual((query.page, query.limit), (2, JOBS_PAGE_SIZE))
+
+    def test_from_args_invalid(self):
+        for args, message in [
+            ({"sort": "fail"}, "^Unsupported jobs sort criterion fail$"),
+            ({"order": "fail"}, "^Unsupported jobs sort order fail$"),
+            ({"page": "fail"}, "^Invalid integer value fail for jobs page$"),
+            ({"page": "0"}, "^Jobs page must be greater than 0$"),
+            ({"limit": "-1"}, "^Jobs limit must be greater than 0$"),
+            ({"limit": "100000"}, "^Jobs limit 100000 is over maximum value 10000$"),
+        ]:
+            with self.subTest(args=args):
+                with self.assertRaisesRegex(SlurmwebQueryError, message):
+                    JobsQuery.from_args(args)
+
+
+class TestSelectJobs(unittest.TestCase):
+    def test_sort(self):
+        for sort, order, expected in [
+            ("id", "asc", [1, 2, 3, 4, 7]),
+            ("id", "desc", [7, 4, 3, 2, 1]),
+            ("user", "asc", [4, 7, 2, 3, 1]),
+            # Jobs with equal keys are kept in original order in both orders.
+            ("user", "desc", [1, 2, 3, 4, 7]),
+            ("priority", "asc", [7, 3, 4, 1, 2]),
+            ("priority", "desc", [2, 4, 1, 3, 7]),
+            ("resources", "asc", [7, 2, 3, 1, 4]),
+            ("resources", "desc", [4, 1, 2, 3, 7]),
+            ("state", "asc", [1, 2, 7, 4, 3]),
+        ]:
+            with self.subTest(sort=sort, order=order):
+                self.assertEqual(
+                    ids(select_jobs(JOBS, JobsQuery(sort, order))), expected
+                )
+
+    def test_filters(self):
+        result = select_jobs(
+            JOBS,
+            JobsQuery(filters={"states": {"running", "pending"}, "users": {"bob"}}),
+        )
+        self.assertEqual(ids(result), [2, 3])
+        self.assertEqual(result["total"], 2)
+        self.assertEqual(
+            ids(select_jobs(JOBS, JobsQuery(filters={"accounts": {"fail"}}))), []
+        )
+
+    def test_pagination(self):
+        result = select_jobs(JOBS, JobsQuery(page=2, limit=2))
+        self.assertEqual(ids(result), [3, 4])
+        self.assertEqual(
+            {key: value for key, value in result.items() if key != "jobs"},
+            {"total": 5, "page": 2, "limit": 2},
+        )
+        self.assertEqual(ids(select_jobs(JOBS, JobsQuery(page=4, limit=2))), [])
+
+
+class TestJobsIndex(unittest.TestCase):
+    def check_same(self, jobs, filters_values):
+        index = build_jobs_index(jobs)
+        # Jobs matching filters are either sorted or selected in sort order of all
+        # jobs depending on the number of matching jobs and the limit.
+        for sort, order, filters, (page, limit) in itertools.product(
+            JOBS_SORT_KEYS.keys(),
+            ["asc", "desc"],
+            filters_values,
+            [(1, 2), (2, 2), (1, None)],
+        ):
+            query = JobsQuery(sort, order, filters, page, limit)
+            with self.subTest(query=vars(query)):
+                self.assertEqual(
+                    select_jobs_in_index(index, query), select_jobs(jobs, query)
+                )
+
+    def test_same_as_select(self):
+        self.check_same(
+            JOBS,
+            [
+                {},
+                {"states": {"pending"}},
+                {"users": {"alice", "bob"}, "states": {"running"}},
+                {"qos": {"fail"}},
+            ],
+        )
+
+    @all_slurm_api_versions
+    def test_same_as_select_assets(self, slurm_version, api_version):
+        jobs = load_json_asset(
+            f"slurmrestd/{slurm_version}/{api_version}/slurm-jobs.json"
+        )["jobs"]
+        self.check_same(
+            jobs,
+            [
+                {},
+                {"states": {"running"}},
+                {"users": {jobs[0]["user_name"]}, "partitions": {jobs[0]["partition"]}},
+            ],
+        )
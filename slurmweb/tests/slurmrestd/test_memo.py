@@ -0,0 +1,53 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+
+from slurmweb.slurmrestd.memo import (
+    nodeset_expand,
+    gres_gpus,
+    memo_metrics,
+    memo_reset,
+)
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        memo_reset()
+
+    def tearDown(self):
+        memo_reset()
+
+    def test_nodeset_expand(self):
+        self.assertEqual(
+            nodeset_expand("cn[1-3],gpu1"), frozenset(["cn1", "cn2", "cn3", "gpu1"])
+        )
+        self.assertEqual(nodeset_expand(""), frozenset())
+
+    def test_gres_gpus(self):
+        self.assertEqual(gres_gpus(""), 0)
+        self.assertEqual(gres_gpus("gpu:4"), 4)
+        self.assertEqual(gres_gpus("gpu:h100:2(S:0-1),gpu:a100:1(S:0),fpga:1"), 3)
+
+    def test_metrics(self):
+        self.assertEqual(
+            memo_metrics(), ({"nodeset": 0, "gres": 0}, {"nodeset": 0, "gres": 0})
+        )
+        for _ in range(3):
+            nodeset_expand("cn[1-3]")
+            gres_gpus("gpu:2")
+        gres_gpus("gpu:4")
+        self.assertEqual(
+            memo_metrics(), ({"nodeset": 2, "gres": 2}, {"nodeset": 1, "gres": 2})
+        )
+
+    def test_reset(self):
+        nodeset_expand("cn[1-3]")
+        nodeset_expand("cn[1-3]")
+        memo_reset()
+        self.assertEqual(
+            memo_metrics(), ({"nodeset": 0, "gres": 0}, {"nodeset": 0, "gres": 0})
+        )
@@ -12,6 +12,7 @@ import requests
 from ClusterShell.NodeSet import NodeSet
 
 from slurmweb.slurmrestd import Slurmrestd
+from slurmweb.slurmrestd.changes import CHANGES_HISTORY_SIZE
 from slurmweb.slurmrestd.errors import (
     SlurmrestConnectionError,
     SlurmrestdAuthenticationError,
@@ -44,6 +45,51 @@ class TestSlurmrestd(TestSlurmrestdBase):
         response = self.slurmrestd._request("slurm", "whatever", key="jobs")
         self.assertEqual(response, asset)
 
+    @all_slurm_api_versions
+    def test_request_since(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [response] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", None)],
+        )
+        records, last_update = self.slurmrestd._request_since(
+            "slurm", "jobs", "jobs", 1700000000
+        )
+        self.assertEqual(records, response["jobs"])
+        self.assertEqual(last_update, response["last_update"]["number"])
+        self.slurmrestd.session.get.assert_called_once_with(
+            f"http+unix://slurmrestd/slurm/v{api_version}/jobs?update_time=1700000000",
+            headers=mock.ANY,
+            stream=False,
+        )
+
+    def test_request_since_no_change(self):
+        self.setup_slurmrestd("25.11.0", "0.0.44")
+        self.slurmrestd._execute_request = mock.Mock(
+            side_effect=SlurmrestdInternalError(
+                "No change", 1900, "Data has not changed since time specified", "fake"
+            )
+        )
+        self.assertEqual(
+            self.slurmrestd._request_since("slurm", "jobs", "jobs", 1700000000),
+            ([], None),
+        )
+
+    def test_last_update(self):
+        self.assertEqual(
+            Slurmrestd._last_update(
+                {"last_update": {"set": True, "infinite": False, "number": 10}}
+            ),
+            10,
+        )
+        self.assertIsNone(
+            Slurmrestd._last_update(
+                {"last_update": {"set": False, "infinite": False, "number": 0}}
+            )
+        )
+        self.assertIsNone(Slurmrestd._last_update({}))
+
     def test_request_connection_error(self):
         self.slurmrestd.session.get = mock.Mock(
             side_effect=requests.exceptions.ConnectionError("test connection error")
@@ -202,6 +248,79 @@ class TestSlurmrestd(TestSlurmrestdBase):
         jobs = self.slurmrestd.jobs_by_node("fail")
         self.assertEqual(jobs, [])
 
+    def test_project_fields(self):
+        items = [{"a": 1, "b": 2, "c": 3}, {"a": 4}]
+        self.assertEqual(
+            Slurmrestd.project_fields(items, ["a", "b"]), [{"a": 1, "b": 2}, {"a": 4}]
+        )
+        # Items are not modified.
+        self.assertEqual(items, [{"a": 1, "b": 2, "c": 3}, {"a": 4}])
+        self.assertIs(Slurmrestd.project_fields(items, None), items)
+
+    def test_jobs_changes(self):
+        jobs = [
+            {"job_id": 1, "job_state": ["RUNNING"]},
+            {"job_id": 2, "job_state": ["PENDING"]},
+        ]
+        self.slurmrestd.jobs = mock.Mock(return_value=jobs)
+        result = self.slurmrestd.jobs_changes()
+        self.assertTrue(result["full"])
+        self.assertEqual(result["added"], jobs)
+        version = result["version"]
+        # Unchanged snapshot, jobs are retrieved only once to compute digests.
+        self.slurmrestd.jobs.reset_mock()
+        self.assertEqual(
+            self.slurmrestd.jobs_changes(version),
+            {
+                "version": version,
+                "full": False,
+                "added": [],
+                "modified": [],
+                "removed": [],
+            },
+        )
+        self.slurmrestd.jobs.assert_called_once_with()
+        # Changes since the previous snapshot
+        self.slurmrestd.jobs.return_value = [
+            {"job_id": 2, "job_state": ["RUNNING"]},
+            {"job_id": 3, "job_state": ["PENDING"]},
+        ]
+        result = self.slurmrestd.jobs_changes(version)
+        self.assertFalse(result["full"])
+        self.assertNotEqual(result["version"], version)
+        self.assertEqual(result["added"], [{"job_id": 3, "job_state": ["PENDING"]}])
+        self.assertEqual(result["modified"], [{"job_id": 2, "job_state": ["RUNNING"]}])
+        self.assertEqual(result["removed"], ["1"])
+        # Unknown version
+        self.assertTrue(self.slurmrestd.jobs_changes("unknown")["full"])
+
+    def test_changes_history_bounded(self):
+        self.slurmrestd.nodes = mock.Mock()
+        versions = []
+        for idx in range(CHANGES_HISTORY_SIZE + 1):
+            self.slurmrestd.nodes.return_value = [{"name": f"cn{idx}"}]
+            versions.append(self.slurmrestd.nodes_changes()["version"])
+        # Oldest snapshot is evicted from history.
+        self.assertTrue(self.slurmrestd.nodes_changes(versions[0])["full"])
+        self.assertFalse(self.slurmrestd.nodes_changes(versions[1])["full"])
+
+    def test_jobs_nodes_index(self):
+        jobs = [
+            {"job_id": 1, "nodes": "cn[1-3]", "job_state": ["RUNNING"]},
+            {"job_id": 2, "nodes": "", "job_state": ["PENDING"]},
+            {"job_id": 3, "nodes": "cn[2,4]", "job_state": ["COMPLETED"]},
+            {"job_id": 4, "nodes": "cn3", "job_state": ["COMPLETING"]},
+        ]
+        index = Slurmrestd._jobs_nodes_index(jobs)
+        # Only jobs not completed with allocated nodes are indexed.
+        self.assertEqual(index["jobs"], [jobs[0], jobs[3]])
+        self.assertEqual(index["nodes"], {"cn1": [0], "cn2": [0], "cn3": [0, 1]})
+        for node in ["cn1", "cn2", "cn3", "cn4", "fail"]:
+            self.assertEqual(
+                Slurmrestd._jobs_in_index(index, node),
+                Slurmrestd._jobs_on_node(jobs, node),
+            )
+
     @all_slurm_api_versions
     def test_jobs_states(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -222,6 +341,24 @@ class TestSlurmrestd(TestSlurmrestdBase):
         self.assertEqual(total, jobs_sum)
         self.assertEqual(jobs["unknown"], 0)
 
+    @all_slurm_api_versions
+    def test_jobs_summary(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        summary = self.slurmrestd.jobs_summary()
+        self.assertEqual(
+            (summary["states"], summary["total"]),
+            Slurmrestd._jobs_states(asset),
+        )
+        self.assertEqual(
+            summary["states"]["running"],
+            len([job for job in asset if "RUNNING" in job["job_state"]]),
+        )
+
     @all_slurm_api_versions
     def test_nodes(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -275,6 +412,32 @@ class TestSlurmrestd(TestSlurmrestdBase):
         self.assertEqual(gpus_total, gpus_sum)
         self.assertEqual(gpus_states["unknown"], 0)
 
+    @all_slurm_api_versions
+    def test_nodes_summary(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-nodes", "nodes")],
+        )
+        summary = self.slurmrestd.nodes_summary()
+        self.assertEqual(
+            summary["totals"],
+            {
+                "nodes": len(asset),
+                "cores": sum(node["cpus"] for node in asset),
+                "gpus": sum(
+                    Slurmrestd.node_gres_extract_gpus(node["gres"]) for node in asset
+                ),
+                "memory": sum(node["real_memory"] for node in asset),
+            },
+        )
+        # Resources states are derived from nodes summary.
+        self.assertEqual(
+            Slurmrestd._summary_resources_states(summary),
+            Slurmrestd._resources_states(asset),
+        )
+
     @all_slurm_api_versions
     def test_node(self, slurm_version, api_version):
         # We can use slurm-node-allocated asset for this test.
@@ -4,10 +4,17 @@
 #
 # SPDX-License-Identifier: MIT
 
+import unittest
+import copy
 import urllib
 
 from slurmweb.slurmrestd import SlurmrestdAdapter
-from ..lib.utils import all_slurm_api_versions
+from slurmweb.slurmrestd.adapters import (
+    AdapterV0_0_42,
+    AdaptationChain,
+    build_adaptation_chain,
+)
+from ..lib.utils import all_slurm_api_versions, load_json_asset, ASSETS
 from ..lib.slurmrestd import TestSlurmrestdBase, basic_authentifier
 
 
@@ -113,3 +120,214 @@ class TestSlurmrestdAdapter(TestSlurmrestdBase):
             self.assertIn("set", limit)
             self.assertIn("infinite", limit)
             self.assertIn("number", limit)
+
+    def test_selections(self):
+        self.setup_slurmrestd("25.11", "0.0.41")
+        # Fields selected before every adapter of the chain 0.0.41 → 0.0.44
+        self.assertEqual(
+            self.slurmrestd._adaptation_chain.selections(
+                "slurm", "jobs", ["job_id", "stdout_expanded"]
+            ),
+            [
+                {"job_id", "standard_output"},
+                {"job_id", "standard_output"},
+                {"job_id", "stdout_expanded"},
+                {"job_id", "stdout_expanded"},
+            ],
+        )
+        self.assertEqual(
+            self.slurmrestd._adaptation_chain.selections("slurm", "jobs", None),
+            [None, None, None, None],
+        )
+
+    def test_selections_latest(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        self.assertEqual(
+            self.slurmrestd._adaptation_chain.selections("slurm", "jobs", ["job_id"]),
+            [{"job_id"}],
+        )
+
+    @all_slurm_api_versions
+    def test_projection_before_adaptation(self, slurm_version, api_version):
+        """Test records projected before adaptation are equal to records adapted and
+        then filtered."""
+        self.setup_slurmrestd(slurm_version, api_version)
+        for method, args, asset, fields in [
+            ("jobs", (), "slurm-jobs", ["job_id", "stdout_expanded"]),
+            ("jobs", (), "slurm-jobs", ["job_id", "standard_output"]),
+            ("_acctjob", (1,), "slurmdb-job-running", ["job_id", "steps"]),
+            ("qos", (), "slurm-qos", ["name", "limits"]),
+            ("qos", (), "slurm-qos", ["name"]),
+        ]:
+            self.mock_slurmrestd_responses(slurm_version, api_version, [(asset, None)])
+            expected = self.slurmrestd.filter_fields(
+                getattr(self.slurmrestd, method)(*args), fields
+            )
+            self.mock_slurmrestd_responses(slurm_version, api_version, [(asset, None)])
+            self.assertEqual(
+                self.slurmrestd.filter_fields(
+                    getattr(self.slurmrestd, method)(*args, fields=fields), fields
+                ),
+                expected,
+            )
+
+
+class TestAdapterFields(unittest.TestCase):
+    def setUp(self):
+        self.adapter = AdapterV0_0_42()
+
+    def test_inputs(self):
+        self.assertEqual(
+            self.adapter.inputs("slurm", "jobs", {"job_id", "stderr_expanded"}),
+            {"job_id", "standard_error"},
+        )
+        # Fields which are not produced by adapter are required as is.
+        self.assertEqual(
+            self.adapter.inputs("slurm", "nodes", {"name"}),
+            {"name"},
+        )
+        self.assertIsNone(self.adapter.inputs("slurm", "jobs", None))
+
+    def test_adapt_projected(self):
+        self.assertEqual(
+            self.adapter.adapt(
+                "slurm",
+                "jobs",
+                [{"job_id": 1, "standard_error": "err"}],
+                {"job_id", "stderr_expanded"},
+            ),
+            [{"job_id": 1, "standard_error": "err", "stderr_expanded": "err"}],
+        )
+
+    def test_adapt_skipped(self):
+        # Adapter method is skipped when it does not produce any selected field.
+        jobs = [{"job_id": 1}]
+        self.assertIs(
+            self.adapter.adapt("slurm", "jobs", jobs, {"job_id"}),
+            jobs,
+        )
+        self.assertEqual(jobs, [{"job_id": 1}])
+
+
+# Supported API versions in descending order
+SUPPORTED_VERSIONS = ["0.0.44", "0.0.43", "0.0.42", "0.0.41"]
+
+# Assets of adapted data, with their component and key.
+ADAPTED_ASSETS = [
+    ("slurm-jobs", "slurm", "jobs"),
+    ("slurm-job-running", "slurm", "jobs"),
+    ("slurm-job-pending", "slurm", "jobs"),
+    ("slurmdb-job-running", "slurmdb", "jobs"),
+    ("slurmdb-job-completed", "slurmdb", "jobs"),
+    ("slurm-nodes", "slurm", "nodes"),
+    ("slurm-partitions", "slurm", "partitions"),
+    ("slurm-reservations", "slurm", "reservations"),
+    ("slurm-qos", "slurmdb", "qos"),
+    ("slurm-accounts", "slurmdb", "accounts"),
+    ("slurmdb-associations", "slurmdb", "associations"),
+]
+
+
+class TestAdaptationChain(TestSlurmrestdBase):
+    def setUp(self):
+        self.settings = self.load_agent_settings_definition()
+
+    def chains(self, api_version):
+        """Return list of adaptation chains from the given API version to all more
+        recent supported versions."""
+        return [
+            (
+                to_version,
+                build_adaptation_chain(api_version, to_version, SUPPORTED_VERSIONS),
+            )
+            for to_version in SUPPORTED_VERSIONS[
+                : SUPPORTED_VERSIONS.index(api_version)
+            ]
+        ]
+
+    @all_slurm_api_versions
+    def test_fused_same_as_chained(self, slurm_version, api_version):
+        """Test records adapted in a single pass with fused chain are identical to
+        records adapted by all adapters successively, for all pairs of versions."""
+        for asset_name, component, key in ADAPTED_ASSETS:
+            path = f"slurmrestd/{slurm_version}/{api_version}/{asset_name}.json"
+            if not (ASSETS / path).exists():
+                continue
+            asset = load_json_asset(path)
+            if key not in asset:
+                continue
+            for to_version, adapters in self.chains(api_version):
+                chain = AdaptationChain(adapters)
+                for fields in [None, getattr(self.settings.filters, key, None)]:
+                    with self.subTest(
+                        asset=asset_name, to_version=to_version, fields=fields
+                    ):
+                        # Records are projected on selected fields before
+                        # adaptation in both cases.
+                        inputs = chain.selections(component, key, fields)[0]
+                        expected = SlurmrestdAdapter.filter_fields(
+                            copy.deepcopy(asset[key]), inputs
+                        )
+                        for adapter in adapters:
+                            expected = adapter.adapt(component, key, expected)
+                        result = chain.adapt(
+                            component,
+                            key,
+                            SlurmrestdAdapter.filter_fields(
+                                copy.deepcopy(asset[key]), inputs
+                            ),
+                            fields,
+                        )
+                        self.assertEqual(
+                            SlurmrestdAdapter.filter_fields(result, fields),
+                            SlurmrestdAdapter.filter_fields(expected, fields),
+                        )
+
+    def test_transform_compiled_once(self):
+        chain = AdaptationChain(
+            build_adaptation_chain("0.0.41", "0.0.44", SUPPORTED_VERSIONS)
+        )
+        transform = chain.transform("slurm", "jobs", ["job_id", "stdout_expanded"])
+        self.assertIsNotNone(transform)
+        self.assertIs(
+            chain.transform("slurm", "jobs", ["stdout_expanded", "job_id"]), transform
+        )
+        self.assertIs(
+            chain.transform("slurm", "jobs"), chain.transform("slurm", "jobs")
+        )
+
+    def test_transform_none(self):
+        chain = AdaptationChain(
+            build_adaptation_chain("0.0.41", "0.0.44", SUPPORTED_VERSIONS)
+        )
+        # No adapter modify nodes
+        self.assertIsNone(chain.transform("slurm", "nodes"))
+        # No adapter produce selected fields
+        self.assertIsNone(chain.transform("slurm", "jobs", ["job_id"]))
+        records = [{"job_id": 1}]
+        self.assertIs(chain.adapt("slurm", "jobs", records, ["job_id"]), records)
+
+    def test_single_pass(self):
+        """Test records are walked only once by the chain."""
+
+        class CountingList(list):
+            iterations = 0
+
+            def __iter__(self):
+                CountingList.iterations += 1
+                return super().__iter__()
+
+        chain = AdaptationChain(
+            build_adaptation_chain("0.0.41", "0.0.44", SUPPORTED_VERSIONS)
+        )
+        records = CountingList([{"job_id": 1, "standard_error": "err", "steps": []}])
+        chain.adapt("slurmdb", "jobs", records)
+        chain.adapt("slurm", "jobs", records)
+        self.assertEqual(CountingList.iterations, 2)
+        self.assertEqual(records[0]["stderr_expanded"], "err")
+
+    def test_empty(self):
+        chain = AdaptationChain([])
+        self.assertFalse(chain)
+        self.assertEqual(chain.selections("slurm", "jobs", ["job_id"]), [{"job_id"}])
+        self.assertIsNone(chain.transform("slurm", "jobs"))
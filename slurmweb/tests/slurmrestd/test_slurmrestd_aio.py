@@ -0,0 +1,633 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import asyncio
+import concurrent.futures
+import tempfile
+import threading
+import urllib
+import os
+
+import aiohttp
+from rfl.core.asyncio import asyncio_run
+
+from slurmweb.slurmrestd import SlurmrestdFiltered
+from slurmweb.slurmrestd.aio import (
+    AsyncSlurmrestd,
+    AsyncSlurmrestdFiltered,
+    AsyncSlurmrestdFilteredCached,
+)
+from slurmweb.slurmrestd.jobs import JobsQuery, select_jobs, build_jobs_index
+from slurmweb.slurmrestd.table import SlurmrestdTable
+from slurmweb.slurmrestd.stream import load_ijson
+from slurmweb.slurmrestd.errors import (
+    SlurmrestConnectionError,
+    SlurmrestdAuthenticationError,
+    SlurmrestdInvalidResponseError,
+    SlurmrestdNotFoundError,
+)
+from slurmweb.cache import CacheKey
+from slurmweb.errors import SlurmwebConfigurationError
+
+from ..lib.utils import (
+    all_slurm_api_versions,
+    mock_slurmrestd_responses,
+    AsyncContextManagerMock,
+    async_mock,
+)
+from ..lib.slurmrestd import TestSlurmrestdBase, basic_authentifier
+from .test_unix import FakeSlurmrestdServer, FakeSlurmrestdHandler
+
+
+class TestAsyncSlurmrestd(TestSlurmrestdBase):
+    def setUp(self):
+        self.slurmrestd = AsyncSlurmrestd(
+            urllib.parse.urlparse("unix:///dev/null"),
+            basic_authentifier(),
+            ["0.0.44"],
+        )
+        self.addCleanup(self.slurmrestd.stop)
+
+    def test_no_sync_session(self):
+        # Synchronous HTTP session and pool of Unix socket connections are not
+        # initialized by asynchronous client.
+        self.assertFalse(hasattr(self.slurmrestd, "session"))
+        self.assertFalse(hasattr(self.slurmrestd, "prefix"))
+
+    def test_connector_unix(self):
+        async def check():
+            connector = self.slurmrestd._connector()
+            self.assertIsInstance(connector, aiohttp.UnixConnector)
+            self.assertEqual(connector.path, "/dev/null")
+            await connector.close()
+
+        asyncio_run(check())
+        self.assertEqual(
+            self.slurmrestd._url("/slurm/v0.0.44/jobs"),
+            "http://slurmrestd/slurm/v0.0.44/jobs",
+        )
+
+    def test_connector_tcp(self):
+        slurmrestd = AsyncSlurmrestd(
+            urllib.parse.urlparse("http://localhost:6820"),
+            mock.Mock(method="jwt"),
+            ["0.0.44"],
+        )
+
+        async def check():
+            connector = slurmrestd._connector()
+            self.assertIsInstance(connector, aiohttp.TCPConnector)
+            await connector.close()
+
+        asyncio_run(check())
+        self.assertEqual(
+            slurmrestd._url("/slurm/v0.0.44/jobs"),
+            "http://localhost:6820/slurm/v0.0.44/jobs",
+        )
+
+    def test_session_persistent(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        self.mock_slurmrestd_aio_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs"), ("slurm-nodes", "nodes")]
+        )
+        self.slurmrestd.query(("jobs", ()))
+        session, thread = self.slurmrestd._session, self.slurmrestd._thread
+        self.assertIsInstance(session, aiohttp.ClientSession)
+        # The same client session and event loop are used by the following queries.
+        self.slurmrestd.query(("nodes", ()))
+        self.assertIs(self.slurmrestd._session, session)
+        self.assertIs(self.slurmrestd._thread, thread)
+        self.assertFalse(session.closed)
+        # Session is closed when the client is stopped.
+        self.slurmrestd.stop()
+        self.assertTrue(session.closed)
+        self.assertIsNone(self.slurmrestd._session)
+        self.assertFalse(thread.is_alive())
+
+    def test_loop_restarted(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        self.mock_slurmrestd_aio_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs"), ("slurm-jobs", "jobs")]
+        )
+        self.slurmrestd.query(("jobs", ()))
+        loop, session = self.slurmrestd._loop, self.slurmrestd._session
+        # Simulate event loop thread not inherited by forked process, the event loop
+        # is started again with a new client session.
+        dead = mock.Mock(spec=threading.Thread)
+        dead.is_alive.return_value = False
+        self.slurmrestd._thread = dead
+        self.slurmrestd.query(("jobs", ()))
+        self.assertIsNot(self.slurmrestd._loop, loop)
+        self.assertIsNot(self.slurmrestd._session, session)
+        self.assertTrue(self.slurmrestd._thread.is_alive())
+        # Stop the initial event loop and close its session.
+        asyncio.run_coroutine_threadsafe(session.close(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+
+    @all_slurm_api_versions
+    def test_request(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        [response] = self.slurmrestd.query(("_request", ("slurm", "whatever", "jobs")))
+        self.assertEqual(response, asset)
+
+    @all_slurm_api_versions
+    def test_discover(self, slurm_version, api_version):
+        [asset] = self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurm-ping", None)],
+        )
+        self.slurmrestd.supported_versions = [api_version]
+        [result] = self.slurmrestd.query(("discover", ()))
+        self.assertEqual(
+            result,
+            (
+                asset["meta"]["slurm"]["cluster"],
+                asset["meta"]["slurm"]["release"],
+                api_version,
+            ),
+        )
+
+    def test_request_connection_error(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        with mock.patch.object(
+            aiohttp.ClientSession,
+            "get",
+            side_effect=aiohttp.ClientConnectionError("test connection error"),
+        ):
+            with self.assertRaisesRegex(
+                SlurmrestConnectionError, "^test connection error$"
+            ):
+                self.slurmrestd.query(("jobs", ()))
+
+    @all_slurm_api_versions
+    def test_request_authentication_error(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jwt-invalid-headers", None)],
+        )
+        with self.assertRaises(SlurmrestdAuthenticationError):
+            self.slurmrestd.query(("jobs", ()))
+
+    @all_slurm_api_versions
+    def test_request_not_found(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurm-not-found", None)],
+        )
+        with self.assertRaisesRegex(SlurmrestdNotFoundError, "^/mocked/query$"):
+            self.slurmrestd.query(("jobs", ()))
+
+    def test_request_invalid_content_type(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        response = mock.create_autospec(aiohttp.client_reqrep.ClientResponse)
+        response.status = 200
+        response.url = "/mocked/query"
+        response.headers = {"content-type": "text/plain"}
+        response.text = async_mock("fake content", False)
+        with mock.patch.object(
+            aiohttp.ClientSession,
+            "get",
+            return_value=AsyncContextManagerMock(response),
+        ):
+            with self.assertRaisesRegex(
+                SlurmrestdInvalidResponseError,
+                "^Unsupported Content-Type for slurmrestd response /mocked/query: "
+                "text/plain$",
+            ):
+                self.slurmrestd.query(("jobs", ()))
+
+
+class TestAsyncSlurmrestdFiltered(TestSlurmrestdBase):
+    def setUp(self):
+        self.settings = self.load_agent_settings_definition()
+        self.slurmrestd = AsyncSlurmrestdFiltered(
+            urllib.parse.urlparse("unix:///dev/null"),
+            basic_authentifier(),
+            ["0.0.44", "0.0.43", "0.0.42", "0.0.41"],
+            self.settings.filters,
+        )
+        self.addCleanup(self.slurmrestd.stop)
+
+    def setup_slurmrestd(self, slurm_version, api_version):
+        super().setup_slurmrestd(slurm_version, api_version)
+        self.slurmrestd._setup_adaptation_chain()
+
+    def sync_slurmrestd(self, slurm_version, api_version):
+        """Return synchronous slurmrestd client with the same settings."""
+        slurmrestd = SlurmrestdFiltered(
+            urllib.parse.urlparse("unix:///dev/null"),
+            basic_authentifier(),
+            self.slurmrestd.supported_versions,
+            self.settings.filters,
+        )
+        slurmrestd.cluster_name = "foo"
+        slurmrestd.slurm_version = slurm_version
+        slurmrestd.api_version = api_version
+        slurmrestd._setup_adaptation_chain()
+        return slurmrestd
+
+    @all_slurm_api_versions
+    def test_collections_same_as_sync(self, slurm_version, api_version):
+        """Check asynchronous client returns the same adapted and filtered results as
+        synchronous client."""
+        sync = self.sync_slurmrestd(slurm_version, api_version)
+        self.setup_slurmrestd(slurm_version, api_version)
+        assets = [
+            ("slurm-jobs", "jobs"),
+            ("slurm-nodes", "nodes"),
+            ("slurm-partitions", "partitions"),
+            ("slurm-reservations", "reservations"),
+            ("slurm-qos", "qos"),
+        ]
+        self.mock_slurmrestd_aio_responses(slurm_version, api_version, assets)
+        results = self.slurmrestd.query(
+            ("jobs", ()),
+            ("nodes", ()),
+            ("partitions", ()),
+            ("reservations", ()),
+            ("qos", ()),
+        )
+        mock_slurmrestd_responses(sync, slurm_version, api_version, assets)
+        self.assertEqual(
+            results,
+            [
+                sync.jobs(),
+                sync.nodes(),
+                sync.partitions(),
+                sync.reservations(),
+                sync.qos(),
+            ],
+        )
+
+    @all_slurm_api_versions
+    def test_incremental_same_as_sync(self, slurm_version, api_version):
+        """Check asynchronous client returns the same adapted and filtered results as
+        synchronous client with incremental synchronization."""
+        sync = self.sync_slurmrestd(slurm_version, api_version)
+        self.slurmrestd.tables = {
+            "jobs": SlurmrestdTable("jobs", 300),
+            "nodes": SlurmrestdTable("nodes", 300),
+        }
+        self.setup_slurmrestd(slurm_version, api_version)
+        assets = [("slurm-jobs", "jobs"), ("slurm-nodes", "nodes")]
+        self.mock_slurmrestd_aio_responses(slurm_version, api_version, assets)
+        results = self.slurmrestd.query(("jobs", ()), ("nodes", ()))
+        mock_slurmrestd_responses(sync, slurm_version, api_version, assets)
+        self.assertEqual(results, [sync.jobs(), sync.nodes()])
+        self.assertIsNotNone(self.slurmrestd.tables["jobs"].last_update)
+        self.assertIsNotNone(self.slurmrestd.tables["nodes"].last_update)
+
+    @all_slurm_api_versions
+    def test_streaming_same_as_sync(self, slurm_version, api_version):
+        """Check asynchronous client returns the same results as synchronous client
+        when responses are parsed while they are received."""
+        try:
+            load_ijson()
+        except SlurmwebConfigurationError:
+            self.skipTest("ijson module is not available")
+        sync = self.sync_slurmrestd(slurm_version, api_version)
+        self.slurmrestd.streaming = True
+        self.setup_slurmrestd(slurm_version, api_version)
+        assets = [("slurm-jobs", "jobs"), ("slurm-nodes", "nodes")]
+        self.mock_slurmrestd_aio_responses(slurm_version, api_version, assets)
+        results = self.slurmrestd.query(("jobs", ()), ("nodes", ()))
+        mock_slurmrestd_responses(sync, slurm_version, api_version, assets)
+        self.assertEqual(results, [sync.jobs(), sync.nodes()])
+
+    @all_slurm_api_versions
+    def test_job(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [slurmdb_asset, slurm_asset] = self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurmdb-job-running", "jobs"), ("slurm-job-running", "jobs")],
+        )
+        [job] = self.slurmrestd.query(("job", (1,)))
+        self.assertLess(len(job.keys()), len(slurm_asset[0].keys()))
+        self.assertEqual(job["time"], slurmdb_asset[0]["time"])
+        self.assertNotIn("array_job_id", job)
+
+    @all_slurm_api_versions
+    def test_job_not_found(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurmdb-job-unfound", None), ("slurm-job-unfound", None)],
+        )
+        with self.assertRaisesRegex(SlurmrestdNotFoundError, "Job 1 not found"):
+            self.slurmrestd.query(("job", (1,)))
+
+    def test_job_concurrent_requests(self):
+        """Check slurmdbd and slurmctld requests for a job are in progress at the same
+        time."""
+        self.setup_slurmrestd("25.11", "0.0.44")
+        in_progress = []
+        max_in_progress = []
+
+        class SlowResponse:
+            def __init__(self, url):
+                self.status = 200
+                self.url = url
+                self.headers = {"content-type": "application/json"}
+
+            async def json(self):
+                return {"errors": [], "warnings": [], "jobs": [{"url": self.url}]}
+
+        class SlowContext(AsyncContextManagerMock):
+            async def __aenter__(self):
+                in_progress.append(self)
+                max_in_progress.append(len(in_progress))
+                await asyncio.sleep(0.05)
+                in_progress.remove(self)
+                return self.mock
+
+        def get(session, url, headers):
+            return SlowContext(SlowResponse(url))
+
+        with mock.patch.object(aiohttp.ClientSession, "get", autospec=True) as m:
+            m.side_effect = get
+            self.slurmrestd.filters.acctjob = None
+            self.slurmrestd.filters.ctldjob = None
+            [job] = self.slurmrestd.query(("job", (1,)))
+        self.assertEqual(max(max_in_progress), 2)
+        self.assertEqual(job, {"url": "http://slurmrestd/slurm/v0.0.44/job/1"})
+
+
+class TestAsyncSlurmrestdFilteredCached(TestSlurmrestdBase):
+    def setUp(self):
+        self.settings = self.load_agent_settings_definition()
+        self.settings.cache.enabled = True
+        self.service = mock.Mock()
+        self.service.local = None
+        self.slurmrestd = AsyncSlurmrestdFilteredCached(
+            urllib.parse.urlparse("unix:///dev/null"),
+            basic_authentifier(),
+            ["0.0.44"],
+            self.settings.filters,
+            self.settings.cache,
+            self.service,
+        )
+        self.addCleanup(self.slurmrestd.stop)
+
+    @all_slurm_api_versions
+    def test_not_in_cache(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        self.service.get.return_value = None
+        [jobs] = self.slurmrestd.query(("jobs", ()))
+        for idx in range(len(jobs)):
+            self.assertEqual(jobs[idx]["job_id"], asset[idx]["job_id"])
+        self.service.get.assert_called_once_with(CacheKey("jobs"))
+        # Jobs are saved in cache in the same transaction as their derived entries.
+        self.service.put_many.assert_called_once()
+        entries, expiration, stale = self.service.put_many.call_args[0]
+        self.assertEqual(entries[0], (CacheKey("jobs"), jobs))
+        self.assertIn(
+            (CacheKey("jobs-summary"), self.slurmrestd._jobs_summary(jobs)), entries
+        )
+        self.assertEqual((expiration, stale), (self.settings.cache.jobs, 0))
+        self.service.count_miss.assert_called_once_with(CacheKey("jobs"))
+        self.service.count_hit.assert_not_called()
+
+    def test_in_cache(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        self.service.get.return_value = ["fake"]
+        with mock.patch.object(aiohttp.ClientSession, "get") as get:
+            [jobs] = self.slurmrestd.query(("jobs", ()))
+        get.assert_not_called()
+        self.assertEqual(jobs, ["fake"])
+        self.service.put.assert_not_called()
+        self.service.count_hit.assert_called_once_with(CacheKey("jobs"))
+
+    @all_slurm_api_versions
+    def test_jobs_by_node(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_aio_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        self.service.get.return_value = None
+        jobs = self.slurmrestd.filter_fields(asset, self.settings.filters.jobs)
+        index = self.slurmrestd._jobs_nodes_index(jobs)
+        node = next(iter(index["nodes"]))
+        [result] = self.slurmrestd.query(("jobs_by_node", (node,)))
+        self.assertEqual(result, self.slurmrestd._jobs_on_node(jobs, node))
+        # Index is saved in cache with jobs in the same transaction.
+        entries, _, _ = self.service.put_many.call_args[0]
+        self.assertIn((CacheKey("jobs-nodes"), index), entries)
+
+    def test_jobs_query(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        [asset] = self.mock_slurmrestd_aio_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs")]
+        )
+        self.service.get.return_value = None
+        query = JobsQuery("user", "desc", page=1, limit=2)
+        [result] = self.slurmrestd.query(("jobs_query", (query,)))
+        # Index is saved in cache with jobs in the same transaction.
+        entries, _, _ = self.service.put_many.call_args[0]
+        [jobs] = [value for key, value in entries if key == CacheKey("jobs")]
+        self.assertEqual(result, select_jobs(jobs, query))
+        self.assertIn((CacheKey("jobs-index"), build_jobs_index(jobs)), entries)
+
+    def test_jobs_changes(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        jobs = [{"job_id": 1, "job_state": ["RUNNING"]}]
+        self.service.get.side_effect = lambda key: (
+            jobs if key == CacheKey("jobs") else None
+        )
+        [result] = self.slurmrestd.query(("jobs_changes", (None,)))
+        self.assertTrue(result["full"])
+        self.assertEqual(result["added"], jobs)
+        # Digests of snapshot missing in cache are computed from the jobs in cache,
+        # they are saved in history only.
+        self.service.put_many.assert_not_called()
+        self.service.put.assert_called_once_with(
+            CacheKey(f"jobs-snapshot-{result['version']}", "jobs-snapshot"),
+            {"1": mock.ANY},
+            self.settings.cache.changes_retention,
+        )
+
+    def test_slow_cache_not_blocking(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        blocked = threading.Event()
+        released = threading.Event()
+
+        def get(key):
+            if key == CacheKey("partitions"):
+                blocked.set()
+                released.wait(10)
+            return [key.main]
+
+        self.service.get.side_effect = get
+        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+            slow = executor.submit(self.slurmrestd.query, ("partitions", ()))
+            try:
+                self.assertTrue(blocked.wait(10))
+                # Query is answered while the request to cache of another query is
+                # in progress.
+                fast = executor.submit(self.slurmrestd.query, ("qos", ()))
+                self.assertEqual(fast.result(timeout=5), [["qos"]])
+                self.assertFalse(slow.done())
+            finally:
+                released.set()
+            self.assertEqual(slow.result(timeout=10), [["partitions"]])
+
+    def test_coalesced(self):
+        self.service.get.return_value = None
+        calls = []
+
+        async def func():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return ["fake"]
+
+        async def run():
+            return await asyncio.gather(
+                *[
+                    self.slurmrestd._cached(CacheKey("partitions"), "partitions", func)
+                    for _ in range(4)
+                ]
+            )
+
+        # Concurrent coroutines requesting the same key send only one request to
+        # slurmrestd.
+        self.assertEqual(asyncio_run(run()), [["fake"]] * 4)
+        self.assertEqual(len(calls), 1)
+        self.service.lock.assert_called_once()
+        self.service.put.assert_called_once_with(
+            CacheKey("partitions"), ["fake"], self.settings.cache.partitions, 0
+        )
+        self.service.count_miss.assert_called_once_with(CacheKey("partitions"))
+        self.assertEqual(self.service.count_coalesced.call_count, 3)
+        self.assertEqual(self.slurmrestd._flights, {})
+
+    def test_coalesced_agents(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        # Lock is acquired by another agent which saves the value in cache while
+        # this agent is waiting.
+        self.service.lock.return_value = None
+        self.service.get.side_effect = [None, None, ["fake"]]
+        self.slurmrestd.LOCK_POLL_INTERVAL = 0
+        with mock.patch.object(aiohttp.ClientSession, "get") as get:
+            [jobs] = self.slurmrestd.query(("jobs", ()))
+        get.assert_not_called()
+        self.assertEqual(jobs, ["fake"])
+        self.service.put.assert_not_called()
+        self.service.count_coalesced.assert_called_once_with(CacheKey("jobs"))
+
+    def test_stale_expired(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        self.settings.cache.stale = ["jobs"]
+        self.service.get_stale.return_value = (["stale"], False)
+        refreshed = threading.Event()
+        self.service.unlock.side_effect = lambda lock: refreshed.set()
+        [asset] = self.mock_slurmrestd_aio_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs")]
+        )
+        [jobs] = self.slurmrestd.query(("jobs", ()))
+        self.assertEqual(jobs, ["stale"])
+        # Stale jobs are refreshed in background by another thread, in the event
+        # loop of the client.
+        self.assertTrue(refreshed.wait(10))
+        self.service.put_many.assert_called_once()
+        [(key, fresh), *_], expiration, stale = self.service.put_many.call_args[0]
+        self.assertEqual(key, CacheKey("jobs"))
+        self.assertEqual(len(fresh), len(asset))
+        self.assertEqual(expiration, self.settings.cache.jobs)
+        self.assertEqual(stale, self.settings.cache.stale_delay)
+        self.service.count_miss.assert_not_called()
+
+    def test_refresh(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        [asset] = self.mock_slurmrestd_aio_responses(
+            "25.11", "0.0.44", [("slurm-nodes", "nodes")]
+        )
+        self.slurmrestd.refresh("nodes")
+        self.service.get.assert_not_called()
+        self.service.put_many.assert_called_once()
+        entries, expiration, stale = self.service.put_many.call_args[0]
+        (key, nodes), derived = (
+            entries[0],
+            {key.main: value for key, value in entries[1:]},
+        )
+        self.assertEqual(key, CacheKey("nodes"))
+        self.assertEqual(len(nodes), len(asset))
+        # Summary and digests of nodes are refreshed with the snapshot.
+        self.assertEqual(
+            derived["nodes-summary"], self.slurmrestd._nodes_summary(nodes)
+        )
+        self.assertEqual(
+            derived["nodes-digests"],
+            self.slurmrestd._snapshot_digests("nodes", nodes),
+        )
+        self.assertEqual(expiration, self.settings.cache.nodes)
+
+
+class TestAsyncSlurmrestdUnixSocket(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "slurmrestd.socket")
+        self.server = FakeSlurmrestdServer(self.path, FakeSlurmrestdHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def test_query(self):
+        slurmrestd = AsyncSlurmrestd(
+            urllib.parse.urlparse(f"unix://{self.path}"),
+            basic_authentifier(),
+            ["0.0.44"],
+            pool_size=2,
+        )
+        self.addCleanup(slurmrestd.stop)
+        # Requests are sent concurrently on a limited number of connections, API
+        # version is discovered by the way.
+        self.assertEqual(
+            slurmrestd.query(*[("jobs", ())] * 10),
+            [[]] * 10,
+        )
+        self.assertEqual(slurmrestd.api_version, "0.0.44")
+        self.assertEqual(slurmrestd.cluster_name, "foo")
+
+    def test_keep_alive(self):
+        slurmrestd = AsyncSlurmrestd(
+            urllib.parse.urlparse(f"unix://{self.path}"),
+            basic_authentifier(),
+            ["0.0.44"],
+        )
+        self.addCleanup(slurmrestd.stop)
+        with mock.patch.object(
+            FakeSlurmrestdServer,
+            "get_request",
+            autospec=True,
+            side_effect=FakeSlurmrestdServer.get_request,
+        ) as accept:
+            for _ in range(10):
+                self.assertEqual(slurmrestd.query(("jobs", ())), [[]])
+        # All queries are sent on the same persistent connection.
+        self.assertEqual(accept.call_count, 1)
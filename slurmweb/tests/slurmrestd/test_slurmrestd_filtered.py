@@ -4,9 +4,13 @@
 #
 # SPDX-License-Identifier: MIT
 
+from unittest import mock
 import urllib
 
 from slurmweb.slurmrestd import SlurmrestdFiltered
+from slurmweb.slurmrestd.stream import load_ijson
+from slurmweb.errors import SlurmwebConfigurationError
+from slurmweb.slurmrestd.table import SlurmrestdTable
 from ..lib.utils import all_slurm_api_versions
 from ..lib.slurmrestd import TestSlurmrestdBase, basic_authentifier
 
@@ -39,6 +43,191 @@ class TestSlurmrestdFiltered(TestSlurmrestdBase):
             self.assertIn("accrue_time", asset[idx])
             self.assertNotIn("accrue_time", jobs[idx])
 
+    def incremental(self, collections):
+        self.slurmrestd = SlurmrestdFiltered(
+            urllib.parse.urlparse("unix:///dev/null"),
+            basic_authentifier(),
+            ["0.0.44"],
+            self.settings.filters,
+            incremental=collections,
+            incremental_full_interval=300,
+        )
+
+    @all_slurm_api_versions
+    def test_jobs_incremental(self, slurm_version, api_version):
+        self.incremental(["jobs"])
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        response = self.slurmrestd.session.get.return_value.json.return_value
+        last_update = response["last_update"]["number"]
+        # First synchronization retrieves all jobs.
+        jobs = self.slurmrestd.jobs()
+        self.assertEqual(
+            [job["job_id"] for job in jobs], [job["job_id"] for job in asset]
+        )
+        self.assertNotIn("accrue_time", jobs[0])
+        self.assertIn("jobs?update_time=0", self.slurmrestd.session.get.call_args[0][0])
+        # Next synchronization retrieves jobs updated since last update, merged in
+        # table.
+        updated = dict(asset[0], job_state=["COMPLETED"])
+        response["jobs"] = [updated]
+        response["last_update"]["number"] = last_update + 10
+        jobs = self.slurmrestd.jobs()
+        self.assertIn(
+            f"jobs?update_time={last_update}",
+            self.slurmrestd.session.get.call_args[0][0],
+        )
+        self.assertEqual(len(jobs), len(asset))
+        self.assertEqual(jobs[0]["job_state"], ["COMPLETED"])
+        self.assertEqual(self.slurmrestd.tables["jobs"].last_update, last_update + 10)
+
+    @all_slurm_api_versions
+    def test_nodes_incremental_no_change(self, slurm_version, api_version):
+        self.incremental(["nodes"])
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-nodes", "nodes")],
+        )
+        response = self.slurmrestd.session.get.return_value.json.return_value
+        nodes = self.slurmrestd.nodes()
+        # Slurm reports no change
+        response["nodes"] = []
+        response["last_update"] = {"set": False, "infinite": False, "number": 0}
+        self.assertEqual(self.slurmrestd.nodes(), nodes)
+        self.assertEqual(
+            [node["name"] for node in nodes], [node["name"] for node in asset]
+        )
+
+    def streaming(self):
+        try:
+            load_ijson()
+        except SlurmwebConfigurationError:
+            self.skipTest("ijson module is not available")
+        self.slurmrestd = SlurmrestdFiltered(
+            urllib.parse.urlparse("unix:///dev/null"),
+            basic_authentifier(),
+            ["0.0.44"],
+            self.settings.filters,
+            streaming=True,
+        )
+
+    @all_slurm_api_versions
+    def test_streaming_same_as_full_parse(self, slurm_version, api_version):
+        assets = [
+            ("slurm-jobs", "jobs"),
+            ("slurm-nodes", "nodes"),
+            ("slurm-partitions", "partitions"),
+            ("slurm-reservations", "reservations"),
+            ("slurm-qos", "qos"),
+            ("slurmdb-job-running", "jobs"),
+            ("slurm-job-running", "jobs"),
+        ]
+
+        def collections():
+            return [
+                self.slurmrestd.jobs(),
+                self.slurmrestd.nodes(),
+                self.slurmrestd.partitions(),
+                self.slurmrestd.reservations(),
+                self.slurmrestd.qos(),
+                self.slurmrestd.job(1),
+            ]
+
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_responses(slurm_version, api_version, assets)
+        expected = collections()
+        self.streaming()
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_responses(slurm_version, api_version, assets)
+        self.assertEqual(collections(), expected)
+        # Check all responses have been streamed.
+        for call in self.slurmrestd.session.get.call_args_list:
+            self.assertTrue(call[1]["stream"])
+
+    def test_streaming_incremental(self):
+        self.streaming()
+        self.slurmrestd.tables = {"jobs": SlurmrestdTable("jobs", 300)}
+        self.setup_slurmrestd("25.11", "0.0.44")
+        [response] = self.mock_slurmrestd_responses(
+            "25.11", "0.0.44", [("slurm-jobs", None)]
+        )
+        jobs = self.slurmrestd.jobs()
+        self.assertEqual(
+            [job["job_id"] for job in jobs],
+            [job["job_id"] for job in response["jobs"]],
+        )
+        self.assertNotIn("accrue_time", jobs[0])
+        self.assertEqual(
+            self.slurmrestd.tables["jobs"].last_update,
+            response["last_update"]["number"],
+        )
+
+    def test_streaming_adapted(self):
+        # Responses of older API versions are parsed in streaming and adapted.
+        self.streaming()
+        self.slurmrestd.supported_versions = ["0.0.44", "0.0.43", "0.0.42", "0.0.41"]
+        self.slurmrestd.api_version = "0.0.41"
+        self.slurmrestd._setup_adaptation_chain()
+        self.settings.filters.jobs = ["job_id", "stdout_expanded"]
+        [asset] = self.mock_slurmrestd_responses(
+            "25.11", "0.0.41", [("slurm-jobs", "jobs")]
+        )
+        self.assertEqual(
+            self.slurmrestd.jobs(),
+            [
+                {"job_id": job["job_id"], "stdout_expanded": job["standard_output"]}
+                for job in asset
+            ],
+        )
+
+    def test_adaptation_chain_compiled(self):
+        # Transforms of adaptation chain are compiled for the selections of all
+        # filters when the chain is built.
+        self.slurmrestd.supported_versions = ["0.0.44", "0.0.43", "0.0.42", "0.0.41"]
+        self.slurmrestd.api_version = "0.0.41"
+        self.slurmrestd._setup_adaptation_chain()
+        chain = self.slurmrestd._adaptation_chain
+        for name, (component, key) in SlurmrestdFiltered.FILTERED_RECORDS.items():
+            fields = getattr(self.settings.filters, name)
+            self.assertIn(
+                (component, key, None if fields is None else frozenset(fields)),
+                chain._transforms,
+            )
+        # Requests reuse the compiled transforms.
+        self.mock_slurmrestd_responses("25.11", "0.0.41", [("slurm-jobs", "jobs")])
+        with mock.patch.object(chain, "selections", wraps=chain.selections) as m:
+            self.slurmrestd.jobs()
+        # Selections are computed once for the fields to request, but not to
+        # compile a transform.
+        m.assert_called_once()
+
+    def test_adaptation_chain_latest_not_compiled(self):
+        # No transform is compiled when API version is the latest supported.
+        self.slurmrestd.api_version = "0.0.44"
+        self.slurmrestd._setup_adaptation_chain()
+        self.assertEqual(self.slurmrestd._adaptation_chain._transforms, {})
+
+    def test_incremental_missing_identifier(self):
+        self.settings.filters.jobs = ["job_state"]
+        with self.assertRaisesRegex(
+            SlurmwebConfigurationError,
+            "^Field job_id must be selected in jobs filters for incremental "
+            "synchronization$",
+        ):
+            self.incremental(["jobs"])
+
+    def test_jobs_not_incremental(self):
+        self.slurmrestd._request_since = mock.Mock()
+        self.slurmrestd._request = mock.Mock(return_value=[])
+        self.assertEqual(self.slurmrestd.jobs(), [])
+        self.slurmrestd._request_since.assert_not_called()
+
     @all_slurm_api_versions
     def test_job(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -6,9 +6,13 @@
 
 from unittest import mock
 import urllib
+import threading
+import concurrent.futures
 
-from slurmweb.slurmrestd import SlurmrestdFilteredCached
-from slurmweb.cache import CachingService, CacheKey
+from slurmweb.slurmrestd import SlurmrestdFiltered, SlurmrestdFilteredCached
+from slurmweb.slurmrestd.jobs import JobsQuery, select_jobs, build_jobs_index
+from slurmweb.cache import CachingService, CacheKey, LocalCache
+from slurmweb.slurmrestd.errors import SlurmrestConnectionError
 from slurmweb.errors import SlurmwebCacheError
 
 from ..lib.utils import all_slurm_api_versions
@@ -24,6 +28,9 @@ class TestSlurmrestdFilteredCached(TestSlurmrestdBase):
             self.settings.cache.port,
             self.settings.cache.password,
         )
+        # Lock in Redis is always acquired unless stated otherwise
+        self.cache.lock = mock.Mock()
+        self.cache.unlock = mock.Mock()
         self.slurmrestd = SlurmrestdFilteredCached(
             urllib.parse.urlparse("unix:///dev/null"),
             basic_authentifier(),
@@ -33,6 +40,42 @@ class TestSlurmrestdFilteredCached(TestSlurmrestdBase):
             self.cache,
         )
 
+    def assert_snapshot_saved(self, collection, expiration, stale=0):
+        """Check the snapshot of the collection is saved in cache in the same
+        transaction as its derived entries, return the records of the snapshot and
+        the derived entries."""
+        self.slurmrestd.service.put_many.assert_called_once()
+        entries, _expiration, _stale = self.slurmrestd.service.put_many.call_args[0]
+        (key, records), derived = (
+            entries[0],
+            {key.main: value for key, value in entries[1:]},
+        )
+        self.assertEqual(key, CacheKey(collection))
+        self.assertEqual(
+            derived.keys(), self.slurmrestd._derivations(collection).keys()
+        )
+        self.assertEqual(_expiration, expiration)
+        self.assertEqual(_stale, stale)
+        return records, derived
+
+    def mock_cache_store(self):
+        """Mock cache service methods with a dict and return this dict."""
+        cache = {}
+        self.slurmrestd.service.get = mock.Mock(
+            side_effect=lambda key: cache.get(key.main)
+        )
+        self.slurmrestd.service.put = mock.Mock(
+            side_effect=lambda key, data, *args: cache.update({key.main: data})
+        )
+        self.slurmrestd.service.put_many = mock.Mock(
+            side_effect=lambda entries, *args: cache.update(
+                {key.main: data for key, data in entries}
+            )
+        )
+        self.slurmrestd.service.count_hit = mock.Mock()
+        self.slurmrestd.service.count_miss = mock.Mock()
+        return cache
+
     @all_slurm_api_versions
     def test_not_in_cache(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -43,6 +86,7 @@ class TestSlurmrestdFilteredCached(TestSlurmrestdBase):
         )
         self.slurmrestd.service.get = mock.Mock(return_value=None)
         self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.put_many = mock.Mock()
         self.slurmrestd.service.count_hit = mock.Mock()
         self.slurmrestd.service.count_miss = mock.Mock()
         jobs = self.slurmrestd.jobs()
@@ -52,11 +96,17 @@ class TestSlurmrestdFilteredCached(TestSlurmrestdBase):
         self.slurmrestd.service.get.assert_called_once_with(CacheKey("jobs"))
         # Check SlurmrestdFilteredCached has up jobs in cache with corresponding
         # expiration timeout.
-        self.slurmrestd.service.put.assert_called_once_with(
-            CacheKey("jobs"), jobs, self.settings.cache.jobs
-        )
+        records, _ = self.assert_snapshot_saved("jobs", self.settings.cache.jobs)
+        self.assertEqual(records, jobs)
         self.slurmrestd.service.count_hit.assert_not_called()
         self.slurmrestd.service.count_miss.assert_called_once_with(CacheKey("jobs"))
+        # Check lock has been acquired and released in Redis
+        self.slurmrestd.service.lock.assert_called_once_with(
+            CacheKey("jobs"), self.settings.cache.lock_timeout
+        )
+        self.slurmrestd.service.unlock.assert_called_once_with(
+            self.slurmrestd.service.lock.return_value
+        )
 
     @all_slurm_api_versions
     def test_in_cache(self, slurm_version, api_version):
@@ -80,6 +130,31 @@ class TestSlurmrestdFilteredCached(TestSlurmrestdBase):
         self.slurmrestd.service.count_hit.assert_called_once_with(CacheKey("jobs"))
         self.slurmrestd.service.count_miss.assert_not_called()
 
+    def test_in_local_cache(self):
+        self.slurmrestd.service.local = LocalCache(5, 10, 1024)
+        self.slurmrestd.service.local.put(CacheKey("jobs"), ["fake"], 10, 30)
+        self.slurmrestd.service.get = mock.Mock()
+        self.slurmrestd.service.count_hit = mock.Mock()
+        self.assertEqual(self.slurmrestd.jobs(), ["fake"])
+        # Redis is not requested and hit is counted in local cache only.
+        self.slurmrestd.service.get.assert_not_called()
+        self.slurmrestd.service.count_hit.assert_not_called()
+        self.assertEqual(
+            self.slurmrestd.service.local.metrics(), ({"jobs": 1}, {}, 1, 0)
+        )
+
+    def test_not_in_local_cache(self):
+        self.slurmrestd.service.local = LocalCache(5, 10, 1024)
+        self.slurmrestd.service.get = mock.Mock(return_value=["fake"])
+        self.slurmrestd.service.count_hit = mock.Mock()
+        self.assertEqual(self.slurmrestd.jobs(), ["fake"])
+        # Data is retrieved from Redis after miss in local cache.
+        self.slurmrestd.service.get.assert_called_once_with(CacheKey("jobs"))
+        self.slurmrestd.service.count_hit.assert_called_once_with(CacheKey("jobs"))
+        self.assertEqual(
+            self.slurmrestd.service.local.metrics(), ({}, {"jobs": 1}, 0, 1)
+        )
+
     @all_slurm_api_versions
     def test_cache_get_error(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -108,10 +183,447 @@ class TestSlurmrestdFilteredCached(TestSlurmrestdBase):
         )
         # Check behaviour when SlurmwebCacheError in raised at put()
         self.slurmrestd.service.get = mock.Mock(return_value=None)
-        self.slurmrestd.service.put = mock.Mock(
+        self.slurmrestd.service.put_many = mock.Mock(
             side_effect=SlurmwebCacheError("fake cache error")
         )
         with self.assertRaisesRegex(SlurmwebCacheError, "^fake cache error$"):
             self.slurmrestd.jobs()
         self.slurmrestd.service.get.assert_called_once_with(CacheKey("jobs"))
-        self.slurmrestd.service.put.assert_called_once()
+        self.slurmrestd.service.put_many.assert_called_once()
+
+    def test_coalesced_threads(self):
+        self.slurmrestd.service.get = mock.Mock(return_value=None)
+        self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.count_miss = mock.Mock()
+        self.slurmrestd.service.count_coalesced = mock.Mock()
+        # Request to slurmrestd is blocked until all threads have joined the flight.
+        joined = threading.Semaphore(0)
+        release = threading.Event()
+
+        def func():
+            release.wait(10)
+            return ["fake"]
+
+        def flight(key):
+            result = _flight(key)
+            joined.release()
+            return result
+
+        _flight = self.slurmrestd._flight
+        func = mock.Mock(side_effect=func)
+        with mock.patch.object(self.slurmrestd, "_flight", side_effect=flight):
+            with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
+                futures = [
+                    executor.submit(
+                        self.slurmrestd._cached,
+                        CacheKey("partitions"),
+                        "partitions",
+                        func,
+                    )
+                    for _ in range(8)
+                ]
+                for _ in range(8):
+                    self.assertTrue(joined.acquire(timeout=10))
+                release.set()
+                results = [future.result(timeout=10) for future in futures]
+        self.assertEqual(results, [["fake"]] * 8)
+        # Only one thread requested slurmrestd, the others got its result.
+        func.assert_called_once()
+        self.slurmrestd.service.lock.assert_called_once()
+        self.slurmrestd.service.put.assert_called_once_with(
+            CacheKey("partitions"), ["fake"], self.settings.cache.partitions, 0
+        )
+        self.slurmrestd.service.count_miss.assert_called_once_with(
+            CacheKey("partitions")
+        )
+        self.assertEqual(self.slurmrestd.service.count_coalesced.call_count, 7)
+        self.assertEqual(self.slurmrestd._flights, {})
+
+    def test_coalesced_threads_error(self):
+        self.slurmrestd.service.get = mock.Mock(return_value=None)
+        self.slurmrestd.service.put = mock.Mock()
+        # The leader is blocked in slurmrestd request when the follower joins the
+        # flight.
+        leader, flight = self.slurmrestd._flight(CacheKey("jobs"))
+        self.assertTrue(leader)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(
+                self.slurmrestd._cached, CacheKey("jobs"), "jobs", mock.Mock()
+            )
+            flight.set_exception(SlurmrestConnectionError("fake error"))
+            # Error of the leader is raised in the follower
+            with self.assertRaisesRegex(SlurmrestConnectionError, "^fake error$"):
+                future.result(timeout=10)
+        self.slurmrestd.service.put.assert_not_called()
+
+    def test_coalesced_agents(self):
+        # Lock is acquired by another agent which saves the value in cache while
+        # this agent is waiting.
+        self.slurmrestd.service.lock = mock.Mock(return_value=None)
+        self.slurmrestd.service.get = mock.Mock(side_effect=[None, None, ["fake"]])
+        self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.count_miss = mock.Mock()
+        self.slurmrestd.service.count_coalesced = mock.Mock()
+        func = mock.Mock()
+        self.slurmrestd.LOCK_POLL_INTERVAL = 0
+        result = self.slurmrestd._cached(CacheKey("jobs"), "jobs", func)
+        self.assertEqual(result, ["fake"])
+        func.assert_not_called()
+        self.assertEqual(self.slurmrestd.service.get.call_count, 3)
+        self.slurmrestd.service.put.assert_not_called()
+        self.slurmrestd.service.unlock.assert_not_called()
+        self.slurmrestd.service.count_miss.assert_not_called()
+        self.slurmrestd.service.count_coalesced.assert_called_once_with(
+            CacheKey("jobs")
+        )
+
+    def test_coalesced_agents_timeout(self):
+        # Lock is acquired by another agent which never saves the value in cache.
+        self.settings.cache.lock_wait = 0
+        self.slurmrestd.service.lock = mock.Mock(return_value=None)
+        self.slurmrestd.service.get = mock.Mock(return_value=None)
+        self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.count_miss = mock.Mock()
+        self.slurmrestd.service.count_coalesced = mock.Mock()
+        func = mock.Mock(return_value=["fake"])
+        with self.assertLogs("slurmweb", level="WARNING") as cm:
+            result = self.slurmrestd._cached(CacheKey("partitions"), "partitions", func)
+        self.assertEqual(result, ["fake"])
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:slurmweb.slurmrestd:Timeout while waiting for cache key "
+                "partitions to be refreshed by another agent, requesting slurmrestd"
+            ],
+        )
+        func.assert_called_once()
+        self.slurmrestd.service.put.assert_called_once_with(
+            CacheKey("partitions"), ["fake"], self.settings.cache.partitions, 0
+        )
+        self.slurmrestd.service.count_miss.assert_called_once_with(
+            CacheKey("partitions")
+        )
+        self.slurmrestd.service.count_coalesced.assert_not_called()
+
+    def test_unlock_on_error(self):
+        self.slurmrestd.service.get = mock.Mock(return_value=None)
+        self.slurmrestd.service.put = mock.Mock()
+        func = mock.Mock(side_effect=SlurmrestConnectionError("fake error"))
+        with self.assertRaisesRegex(SlurmrestConnectionError, "^fake error$"):
+            self.slurmrestd._cached(CacheKey("jobs"), "jobs", func)
+        # Lock is released and flight has landed despite the error.
+        self.slurmrestd.service.unlock.assert_called_once_with(
+            self.slurmrestd.service.lock.return_value
+        )
+        self.slurmrestd.service.put.assert_not_called()
+        self.assertEqual(self.slurmrestd._flights, {})
+
+    def test_stale_fresh(self):
+        self.settings.cache.stale = ["jobs"]
+        self.slurmrestd.service.get_stale = mock.Mock(return_value=(["fake"], True))
+        self.slurmrestd.service.count_hit = mock.Mock()
+        func = mock.Mock()
+        with mock.patch.object(self.slurmrestd, "_revalidate") as revalidate:
+            result = self.slurmrestd._cached(CacheKey("jobs"), "jobs", func)
+        self.assertEqual(result, ["fake"])
+        self.slurmrestd.service.get_stale.assert_called_once_with(CacheKey("jobs"))
+        self.slurmrestd.service.count_hit.assert_called_once_with(CacheKey("jobs"))
+        revalidate.assert_not_called()
+        func.assert_not_called()
+
+    def test_stale_expired(self):
+        self.settings.cache.stale = ["partitions"]
+        self.slurmrestd.service.get_stale = mock.Mock(return_value=(["stale"], False))
+        self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.count_hit = mock.Mock()
+        self.slurmrestd.service.count_miss = mock.Mock()
+        # Refresh in background is blocked until stale value is returned.
+        release = threading.Event()
+        refreshed = threading.Event()
+
+        def func():
+            release.wait(10)
+            return ["fresh"]
+
+        self.slurmrestd.service.unlock.side_effect = lambda lock: refreshed.set()
+        result = self.slurmrestd._cached(CacheKey("partitions"), "partitions", func)
+        # Stale value is returned immediately
+        self.assertEqual(result, ["stale"])
+        self.slurmrestd.service.count_hit.assert_called_once_with(
+            CacheKey("partitions")
+        )
+        # Another request while refresh is in progress does not trigger another
+        # refresh.
+        self.assertEqual(
+            self.slurmrestd._cached(CacheKey("partitions"), "partitions", mock.Mock()),
+            ["stale"],
+        )
+        release.set()
+        self.assertTrue(refreshed.wait(10))
+        self.slurmrestd.service.lock.assert_called_once_with(
+            CacheKey("partitions"), self.settings.cache.lock_timeout
+        )
+        self.slurmrestd.service.put.assert_called_once_with(
+            CacheKey("partitions"),
+            ["fresh"],
+            self.settings.cache.partitions,
+            self.settings.cache.stale_delay,
+        )
+        # Background refresh is not counted as a miss
+        self.slurmrestd.service.count_miss.assert_not_called()
+
+    def test_stale_expired_locked(self):
+        # Stale key is already being refreshed by another agent
+        self.settings.cache.stale = ["jobs"]
+        self.slurmrestd.service.lock = mock.Mock(return_value=None)
+        self.slurmrestd.service.put = mock.Mock()
+        func = mock.Mock()
+        self.slurmrestd._revalidate_run(CacheKey("jobs"), "jobs", func)
+        func.assert_not_called()
+        self.slurmrestd.service.put.assert_not_called()
+        self.slurmrestd.service.unlock.assert_not_called()
+
+    def test_stale_expired_error(self):
+        self.settings.cache.stale = ["jobs"]
+        self.slurmrestd.service.put = mock.Mock()
+        func = mock.Mock(side_effect=SlurmrestConnectionError("fake error"))
+        self.slurmrestd._revalidations.add("jobs")
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            self.slurmrestd._revalidate_run(CacheKey("jobs"), "jobs", func)
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.slurmrestd:Unable to refresh stale cache key jobs: "
+                "fake error"
+            ],
+        )
+        self.slurmrestd.service.put.assert_not_called()
+        self.slurmrestd.service.unlock.assert_called_once_with(
+            self.slurmrestd.service.lock.return_value
+        )
+        self.assertEqual(self.slurmrestd._revalidations, set())
+
+    def test_stale_not_in_cache(self):
+        # Value is not available in cache, even stale
+        self.settings.cache.stale = ["partitions"]
+        self.slurmrestd.service.get_stale = mock.Mock(return_value=(None, False))
+        self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.count_miss = mock.Mock()
+        func = mock.Mock(return_value=["fake"])
+        result = self.slurmrestd._cached(CacheKey("partitions"), "partitions", func)
+        self.assertEqual(result, ["fake"])
+        func.assert_called_once()
+        self.slurmrestd.service.put.assert_called_once_with(
+            CacheKey("partitions"),
+            ["fake"],
+            self.settings.cache.partitions,
+            self.settings.cache.stale_delay,
+        )
+        self.slurmrestd.service.count_miss.assert_called_once_with(
+            CacheKey("partitions")
+        )
+
+    @all_slurm_api_versions
+    def test_refresh(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        self.slurmrestd.service.get = mock.Mock()
+        self.slurmrestd.service.put = mock.Mock()
+        self.slurmrestd.service.put_many = mock.Mock()
+        self.slurmrestd.refresh("jobs")
+        # Cache is not checked, slurmrestd response is saved in cache with its
+        # derived entries.
+        self.slurmrestd.service.get.assert_not_called()
+        jobs, derived = self.assert_snapshot_saved("jobs", self.settings.cache.jobs)
+        self.assertEqual(
+            [job["job_id"] for job in jobs], [job["job_id"] for job in asset]
+        )
+        self.assertEqual(
+            derived["jobs-summary"], SlurmrestdFilteredCached._jobs_summary(jobs)
+        )
+
+    @all_slurm_api_versions
+    def test_jobs_by_node(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        self.mock_cache_store()
+        jobs = self.slurmrestd.jobs()
+        index = self.slurmrestd.jobs_nodes_index()
+        self.assertEqual(index, SlurmrestdFilteredCached._jobs_nodes_index(jobs))
+        # Jobs on all nodes in index are the same as jobs selected by parsing the
+        # nodes of all jobs.
+        for node in list(index["nodes"].keys()) + ["fail"]:
+            self.assertEqual(
+                self.slurmrestd.jobs_by_node(node),
+                SlurmrestdFilteredCached._jobs_on_node(jobs, node),
+            )
+        # Index is saved in cache with jobs in the same transaction, then retrieved
+        # from cache.
+        _, derived = self.assert_snapshot_saved("jobs", self.settings.cache.jobs)
+        self.assertEqual(derived["jobs-nodes"], index)
+
+    @all_slurm_api_versions
+    def test_jobs_by_node_cache_disabled(self, slurm_version, api_version):
+        self.settings.cache.enabled = False
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        self.slurmrestd.service.put = mock.Mock()
+        with mock.patch.object(SlurmrestdFilteredCached, "_jobs_nodes_index") as index:
+            self.slurmrestd.jobs_by_node("fail")
+        # Index is not built without cache.
+        index.assert_not_called()
+        self.slurmrestd.service.put.assert_not_called()
+
+    @mock.patch.object(SlurmrestdFiltered, "jobs", return_value=[])
+    @mock.patch.object(SlurmrestdFiltered, "nodes", return_value=[])
+    @mock.patch.object(SlurmrestdFilteredCached, "_jobs_summary")
+    @mock.patch.object(SlurmrestdFilteredCached, "_nodes_summary")
+    def test_summaries(self, _nodes_summary, _jobs_summary, *_):
+        self.mock_cache_store()
+        jobs_summary = _jobs_summary.return_value = {
+            "states": {"running": 1},
+            "total": 2,
+        }
+        nodes_summary = _nodes_summary.return_value = {
+            "nodes": {"idle": 1},
+            "cores": {"idle": 4},
+            "gpus": {"idle": 0},
+            "totals": {"nodes": 1, "cores": 4, "gpus": 0, "memory": 1024},
+        }
+        self.assertEqual(self.slurmrestd.jobs_states(), ({"running": 1}, 2))
+        self.assertEqual(
+            self.slurmrestd.resources_states(),
+            ({"idle": 1}, {"idle": 4}, {"idle": 0}, 1, 4, 0),
+        )
+        # Summaries are saved in cache in the same transaction as their snapshots,
+        # with the same expiration.
+        [jobs_call, nodes_call] = self.slurmrestd.service.put_many.call_args_list
+        self.assertEqual(jobs_call[0][0][0], (CacheKey("jobs"), []))
+        self.assertIn((CacheKey("jobs-summary"), jobs_summary), jobs_call[0][0])
+        self.assertEqual(jobs_call[0][1:], (self.settings.cache.jobs, 0))
+        self.assertEqual(nodes_call[0][0][0], (CacheKey("nodes"), []))
+        self.assertIn((CacheKey("nodes-summary"), nodes_summary), nodes_call[0][0])
+        self.assertEqual(nodes_call[0][1:], (self.settings.cache.nodes, 0))
+
+    def test_summaries_new_snapshot(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        [asset] = self.mock_slurmrestd_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs")]
+        )
+        cache = self.mock_cache_store()
+        with mock.patch.object(SlurmrestdFiltered, "jobs", return_value=asset[:1]):
+            self.assertEqual(self.slurmrestd.jobs_states()[1], 1)
+        # Snapshot and summary expire together, the summary of the new snapshot is
+        # returned with this snapshot.
+        cache.clear()
+        with mock.patch.object(SlurmrestdFiltered, "jobs", return_value=asset[:2]):
+            self.assertEqual(len(self.slurmrestd.jobs()), 2)
+            self.assertEqual(self.slurmrestd.jobs_states()[1], 2)
+
+    def test_summaries_missing(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        [asset] = self.mock_slurmrestd_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs")]
+        )
+        # Summary is missing in cache next to the snapshot, it is computed from this
+        # snapshot without being saved.
+        cache = self.mock_cache_store()
+        cache["jobs"] = asset
+        self.assertEqual(
+            self.slurmrestd.jobs_states(),
+            SlurmrestdFilteredCached._jobs_states(asset),
+        )
+        self.slurmrestd.service.put.assert_not_called()
+        self.slurmrestd.service.put_many.assert_not_called()
+        self.assertNotIn("jobs-summary", cache)
+
+    @all_slurm_api_versions
+    def test_jobs_query(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        cache = self.mock_cache_store()
+        query = JobsQuery("user", "desc", page=1, limit=2)
+        result = self.slurmrestd.jobs_query(query)
+        jobs = cache["jobs"]
+        self.assertEqual(result, select_jobs(jobs, query))
+        # Jobs index is saved in cache with jobs in the same transaction.
+        _, derived = self.assert_snapshot_saved("jobs", self.settings.cache.jobs)
+        self.assertEqual(derived["jobs-index"], build_jobs_index(jobs))
+
+    def test_snapshot_version(self):
+        self.slurmrestd.service.versions = mock.Mock(return_value=["1a2b", "3c4d"])
+        self.assertEqual(
+            self.slurmrestd.snapshot_version("jobs-summary", "nodes-summary"),
+            "1a2b-3c4d",
+        )
+        self.slurmrestd.service.versions.assert_called_once_with(
+            [CacheKey("jobs-summary"), CacheKey("nodes-summary")]
+        )
+
+    def test_snapshot_version_missing(self):
+        # Version is unknown when any key is missing in cache
+        self.slurmrestd.service.versions = mock.Mock(return_value=["1a2b", None])
+        self.assertIsNone(
+            self.slurmrestd.snapshot_version("jobs-summary", "nodes-summary")
+        )
+
+    def test_snapshot_version_cache_disabled(self):
+        self.settings.cache.enabled = False
+        self.slurmrestd.service.versions = mock.Mock()
+        self.assertIsNone(self.slurmrestd.snapshot_version("jobs"))
+        self.slurmrestd.service.versions.assert_not_called()
+
+    def test_changes_history(self):
+        self.setup_slurmrestd("25.11", "0.0.44")
+        [asset] = self.mock_slurmrestd_responses(
+            "25.11", "0.0.44", [("slurm-jobs", "jobs")]
+        )
+        self.mock_cache_store()
+        result = self.slurmrestd.jobs_changes("1a2b")
+        # Digests of the snapshot are saved in cache with the snapshot and in
+        # history, history is searched for the requested version.
+        self.assertTrue(result["full"])
+        _, derived = self.assert_snapshot_saved("jobs", self.settings.cache.jobs)
+        self.assertEqual(derived["jobs-digests"]["version"], result["version"])
+        self.slurmrestd.service.put.assert_called_once_with(
+            CacheKey(f"jobs-snapshot-{result['version']}", "jobs-snapshot"),
+            {str(job["job_id"]): mock.ANY for job in asset},
+            self.settings.cache.changes_retention,
+        )
+        self.slurmrestd.service.get.assert_called_with(
+            CacheKey("jobs-snapshot-1a2b", "jobs-snapshot")
+        )
+
+    def test_changes_history_found(self):
+        jobs = [{"job_id": 1, "job_state": ["RUNNING"]}]
+        self.slurmrestd.jobs = mock.Mock(return_value=jobs)
+        self.slurmrestd.jobs_digests = mock.Mock(
+            return_value={"version": "3c4d", "digests": {"1": "ffff"}}
+        )
+        self.slurmrestd.service.get = mock.Mock(return_value={"1": "eeee", "2": "dddd"})
+        self.assertEqual(
+            self.slurmrestd.jobs_changes("1a2b"),
+            {
+                "version": "3c4d",
+                "full": False,
+                "added": [],
+                "modified": jobs,
+                "removed": ["2"],
+            },
+        )
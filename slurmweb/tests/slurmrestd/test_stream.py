@@ -0,0 +1,149 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import json
+import io
+
+from rfl.core.asyncio import asyncio_run
+
+from slurmweb.slurmrestd import SlurmrestdFiltered
+from slurmweb.slurmrestd.stream import (
+    SlurmrestdProjection,
+    IteratorReader,
+    load_ijson,
+)
+from slurmweb.errors import SlurmwebConfigurationError
+from ..lib.utils import (
+    all_slurm_api_versions,
+    load_json_asset,
+    json_chunks,
+    async_json_chunks,
+)
+from ..lib.slurmrestd import TestSlurmrestdBase
+
+
+class TestSlurmrestdProjection(TestSlurmrestdBase):
+    def setUp(self):
+        try:
+            self.ijson = load_ijson()
+        except SlurmwebConfigurationError:
+            self.skipTest("ijson module is not available")
+        self.settings = self.load_agent_settings_definition()
+
+    def projection(self, key, fields, document):
+        return SlurmrestdProjection(self.ijson, key, fields).parse(
+            io.BytesIO(json.dumps(document).encode())
+        )
+
+    def check_asset(self, slurm_version, api_version, asset_name, key):
+        asset = load_json_asset(
+            f"slurmrestd/{slurm_version}/{api_version}/{asset_name}.json"
+        )
+        selection = getattr(self.settings.filters, key)
+        result = self.projection(key, selection, asset)
+        # Records are projected on selection, all other fields of the response are
+        # kept.
+        asset[key] = SlurmrestdFiltered.filter_fields(asset[key], selection)
+        self.assertEqual(result, asset)
+
+    @all_slurm_api_versions
+    def test_jobs(self, slurm_version, api_version):
+        self.check_asset(slurm_version, api_version, "slurm-jobs", "jobs")
+
+    @all_slurm_api_versions
+    def test_nodes(self, slurm_version, api_version):
+        self.check_asset(slurm_version, api_version, "slurm-nodes", "nodes")
+
+    @all_slurm_api_versions
+    def test_partitions(self, slurm_version, api_version):
+        self.check_asset(slurm_version, api_version, "slurm-partitions", "partitions")
+
+    def test_nested_fields(self):
+        document = {
+            "meta": {"slurm": {"cluster": "foo"}},
+            "jobs": [
+                {"job_id": 1, "tres": {"cpu": [1, 2.5]}, "other": {"a": [{}]}},
+                {"other": None, "job_id": 2, "tres": {}},
+            ],
+            "errors": [],
+        }
+        self.assertEqual(
+            self.projection("jobs", ["job_id", "tres"], document),
+            {
+                "meta": {"slurm": {"cluster": "foo"}},
+                "jobs": [
+                    {"job_id": 1, "tres": {"cpu": [1, 2.5]}},
+                    {"job_id": 2, "tres": {}},
+                ],
+                "errors": [],
+            },
+        )
+
+    def test_no_selected_field(self):
+        self.assertEqual(
+            self.projection("jobs", [], {"jobs": [{"job_id": 1}], "errors": []}),
+            {"jobs": [{}], "errors": []},
+        )
+
+    def test_scalar_records(self):
+        self.assertEqual(
+            self.projection("jobs", ["job_id"], {"jobs": [1, "two", None]}),
+            {"jobs": [1, "two", None]},
+        )
+
+    def test_null_records(self):
+        self.assertEqual(
+            self.projection("jobs", ["job_id"], {"jobs": None, "errors": []}),
+            {"jobs": None, "errors": []},
+        )
+
+    def test_parse_chunks(self):
+        asset = load_json_asset("slurmrestd/25.11/0.0.44/slurm-jobs.json")
+        result = SlurmrestdProjection(self.ijson, "jobs", ["job_id"]).parse(
+            IteratorReader(json_chunks(json.dumps(asset), 10))
+        )
+        self.assertEqual(
+            result["jobs"], [{"job_id": job["job_id"]} for job in asset["jobs"]]
+        )
+        self.assertEqual(result["last_update"], asset["last_update"])
+
+    def test_parse_async(self):
+        asset = load_json_asset("slurmrestd/25.11/0.0.44/slurm-jobs.json")
+        result = asyncio_run(
+            SlurmrestdProjection(self.ijson, "jobs", ["job_id"]).parse_async(
+                async_json_chunks(json.dumps(asset), 10)
+            )
+        )
+        self.assertEqual(result, self.projection("jobs", ["job_id"], asset))
+
+    def test_parse_invalid(self):
+        with self.assertRaises(self.ijson.JSONError):
+            SlurmrestdProjection(self.ijson, "jobs", ["job_id"]).parse(
+                io.BytesIO(b'{"jobs": [{"job_id": 1}')
+            )
+
+
+class TestIteratorReader(unittest.TestCase):
+    def test_read(self):
+        reader = IteratorReader(iter([b"foo", b"bar"]))
+        # Reading zero bytes does not consume chunks.
+        self.assertEqual(reader.read(0), b"")
+        self.assertEqual(reader.read(1024), b"foo")
+        self.assertEqual(reader.read(1024), b"bar")
+        self.assertEqual(reader.read(1024), b"")
+
+
+class TestLoadIjson(unittest.TestCase):
+    def test_missing(self):
+        with mock.patch.dict("sys.modules", {"ijson": None}):
+            with self.assertRaisesRegex(
+                SlurmwebConfigurationError,
+                "^ijson module is required for streaming parse of slurmrestd "
+                "responses$",
+            ):
+                load_ijson()
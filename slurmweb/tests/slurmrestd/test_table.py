@@ -0,0 +1,77 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+
+from slurmweb.slurmrestd.table import SlurmrestdTable
+
+
+class TestSlurmrestdTable(unittest.TestCase):
+    def setUp(self):
+        self.table = SlurmrestdTable("jobs", 300)
+
+    def test_identifier(self):
+        self.assertEqual(self.table.identifier, "job_id")
+        self.assertEqual(SlurmrestdTable("nodes", 300).identifier, "name")
+
+    def test_since_empty(self):
+        # Full synchronization is required on empty table
+        self.assertEqual(self.table.since(), 0)
+
+    def test_merge(self):
+        records = self.table.merge(
+            0,
+            [{"job_id": 1, "state": "PENDING"}, {"job_id": 2, "state": "PENDING"}],
+            100,
+        )
+        self.assertEqual(len(records), 2)
+        self.assertEqual(self.table.since(), 100)
+        # Updated and new records are merged
+        records = self.table.merge(
+            100,
+            [{"job_id": 2, "state": "RUNNING"}, {"job_id": 3, "state": "PENDING"}],
+            110,
+        )
+        self.assertEqual(
+            records,
+            [
+                {"job_id": 1, "state": "PENDING"},
+                {"job_id": 2, "state": "RUNNING"},
+                {"job_id": 3, "state": "PENDING"},
+            ],
+        )
+        self.assertEqual(self.table.since(), 110)
+
+    def test_merge_no_change(self):
+        self.table.merge(0, [{"job_id": 1}], 100)
+        # Last update is kept when not reported
+        self.assertEqual(self.table.merge(100, [], None), [{"job_id": 1}])
+        self.assertEqual(self.table.last_update, 100)
+
+    def test_merge_full(self):
+        self.table.merge(0, [{"job_id": 1}, {"job_id": 2}], 100)
+        # Full synchronization removes records missing in Slurm
+        self.assertEqual(self.table.merge(0, [{"job_id": 2}], 110), [{"job_id": 2}])
+
+    def test_merge_outdated(self):
+        self.table.merge(0, [{"job_id": 1, "state": "RUNNING"}], 110)
+        # Update older than table content is ignored
+        self.assertEqual(
+            self.table.merge(100, [{"job_id": 1, "state": "PENDING"}], 100),
+            [{"job_id": 1, "state": "RUNNING"}],
+        )
+        self.assertEqual(self.table.last_update, 110)
+
+    @mock.patch("slurmweb.slurmrestd.table.time.monotonic")
+    def test_since_full_interval(self, mock_monotonic):
+        mock_monotonic.return_value = 1000
+        self.table.merge(0, [{"job_id": 1}], 100)
+        mock_monotonic.return_value = 1299
+        self.assertEqual(self.table.since(), 100)
+        # Full synchronization is required after interval
+        mock_monotonic.return_value = 1300
+        self.assertEqual(self.table.since(), 0)
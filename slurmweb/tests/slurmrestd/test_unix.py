@@ -0,0 +1,159 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import tempfile
+import threading
+import socketserver
+import http.server
+import concurrent.futures
+import urllib
+import json
+import os
+
+from slurmweb.slurmrestd import Slurmrestd
+from slurmweb.slurmrestd.unix import (
+    SlurmrestdUnixAdapter,
+    SlurmrestdUnixConnection,
+)
+
+from ..lib.slurmrestd import basic_authentifier
+
+
+class FakeSlurmrestdHandler(http.server.BaseHTTPRequestHandler):
+    # HTTP/1.1 is required for keep-alive connections.
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps(
+            {
+                "meta": {"slurm": {"cluster": "foo", "release": "25.11.0"}},
+                "errors": [],
+                "warnings": [],
+                "jobs": [],
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.server.close_connections:
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeSlurmrestdServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+    close_connections = False
+
+    def get_request(self):
+        # Unix sockets have no client address, give a fake one to the request handler
+        # which expects a tuple.
+        request, _ = super().get_request()
+        return request, ("local", 0)
+
+
+class TestSlurmrestdUnixConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "slurmrestd.socket")
+        self.server = FakeSlurmrestdServer(self.path, FakeSlurmrestdHandler)
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, daemon=True
+        )
+        self.server_thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def slurmrestd(self, **kwargs):
+        slurmrestd = Slurmrestd(
+            urllib.parse.urlparse(f"unix://{self.path}"),
+            basic_authentifier(),
+            ["0.0.44"],
+            **kwargs,
+        )
+        self.addCleanup(slurmrestd.session.close)
+        return slurmrestd
+
+    def count_connects(self):
+        return mock.patch.object(
+            SlurmrestdUnixConnection,
+            "connect",
+            autospec=True,
+            side_effect=SlurmrestdUnixConnection.connect,
+        )
+
+    def test_adapter_pool(self):
+        slurmrestd = self.slurmrestd(pool_size=4, pool_idle_timeout=60)
+        adapter = slurmrestd.session.adapters[slurmrestd.prefix]
+        self.assertIsInstance(adapter, SlurmrestdUnixAdapter)
+        # The same pool is returned for all requests.
+        self.assertIs(
+            adapter.get_connection(f"{slurmrestd.prefix}/slurm/v0.0.44/jobs"),
+            adapter.get_connection(f"{slurmrestd.prefix}/slurm/v0.0.44/nodes"),
+        )
+        self.assertEqual(adapter.pool.pool.maxsize, 4)
+        self.assertEqual(adapter.pool.idle_timeout, 60)
+        self.assertTrue(adapter.pool.block)
+
+    def test_keep_alive_sequential(self):
+        slurmrestd = self.slurmrestd()
+        with self.count_connects() as connect:
+            for _ in range(100):
+                slurmrestd._execute_request("slurm", "0.0.44", "jobs")
+        # All requests are sent on the same persistent connection.
+        self.assertEqual(connect.call_count, 1)
+
+    def test_keep_alive_concurrent(self):
+        pool_size = 4
+        slurmrestd = self.slurmrestd(pool_size=pool_size)
+        with self.count_connects() as connect:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=16) as executor:
+                results = list(
+                    executor.map(
+                        lambda _: slurmrestd._execute_request(
+                            "slurm", "0.0.44", "jobs"
+                        ),
+                        range(400),
+                    )
+                )
+        self.assertEqual(len(results), 400)
+        # The number of opened sockets is bounded by the pool size, whatever the
+        # number of concurrent threads.
+        self.assertGreaterEqual(connect.call_count, 1)
+        self.assertLessEqual(connect.call_count, pool_size)
+
+    def test_idle_timeout(self):
+        slurmrestd = self.slurmrestd(pool_idle_timeout=10)
+        with self.count_connects() as connect:
+            with mock.patch("slurmweb.slurmrestd.unix.time.monotonic") as monotonic:
+                monotonic.return_value = 1000
+                slurmrestd._execute_request("slurm", "0.0.44", "jobs")
+                monotonic.return_value = 1005
+                slurmrestd._execute_request("slurm", "0.0.44", "jobs")
+                self.assertEqual(connect.call_count, 1)
+                # Connection is idle for more than 10 seconds, it must be reset.
+                monotonic.return_value = 1020
+                slurmrestd._execute_request("slurm", "0.0.44", "jobs")
+                self.assertEqual(connect.call_count, 2)
+
+    def test_stale_connection(self):
+        slurmrestd = self.slurmrestd()
+        # Server closes connections after every response, stale sockets kept in the
+        # pool must be detected and reopened transparently.
+        self.server.close_connections = True
+        with self.count_connects() as connect:
+            for _ in range(5):
+                slurmrestd._execute_request("slurm", "0.0.44", "jobs")
+        self.assertEqual(connect.call_count, 5)
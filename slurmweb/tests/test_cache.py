@@ -10,10 +10,103 @@ import pickle
 
 import redis
 
-from slurmweb.cache import CachingService, CacheKey
+from slurmweb.cache import CachingService, CacheKey, LocalCache
+from slurmweb.serialization import CacheSerializer
 from slurmweb.errors import SlurmwebCacheError
 
 
+class TestLocalCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = LocalCache(ttl=5, max_entries=3, max_size=100)
+
+    def test_get_put(self):
+        self.cache.put(CacheKey("job-1", "individual-job"), {"fake": "value"}, 10, 30)
+        self.assertEqual(
+            self.cache.get(CacheKey("job-1", "individual-job")), {"fake": "value"}
+        )
+        self.assertIsNone(self.cache.get(CacheKey("job-2", "individual-job")))
+        self.assertEqual(self.cache.size, 10)
+        self.assertEqual(
+            self.cache.metrics(),
+            ({"individual-job": 1}, {"individual-job": 1}, 1, 1),
+        )
+
+    def test_put_replace(self):
+        self.cache.put(CacheKey("jobs"), ["old"], 10, 30)
+        self.cache.put(CacheKey("jobs"), ["new"], 20, 30)
+        self.assertEqual(self.cache.get(CacheKey("jobs")), ["new"])
+        self.assertEqual(self.cache.size, 20)
+
+    @mock.patch("slurmweb.cache.time.monotonic")
+    def test_get_expired(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.cache.put(CacheKey("jobs"), ["fake"], 10, 30)
+        # Local cache delay is reached
+        mock_monotonic.return_value = 105
+        self.assertIsNone(self.cache.get(CacheKey("jobs")))
+        self.assertEqual(self.cache.size, 0)
+
+    @mock.patch("slurmweb.cache.time.monotonic")
+    def test_put_expiration_capped(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        # Delay is capped by the expiration of the value in Redis.
+        self.cache.put(CacheKey("jobs"), ["fake"], 10, 2)
+        mock_monotonic.return_value = 101.5
+        self.assertEqual(self.cache.get(CacheKey("jobs")), ["fake"])
+        mock_monotonic.return_value = 102
+        self.assertIsNone(self.cache.get(CacheKey("jobs")))
+
+    def test_put_expired(self):
+        self.cache.put(CacheKey("jobs"), ["fake"], 10, 0)
+        self.assertIsNone(self.cache.get(CacheKey("jobs")))
+
+    def test_evict_max_entries(self):
+        for key in ["jobs", "nodes", "partitions"]:
+            self.cache.put(CacheKey(key), [key], 10, 30)
+        # Use jobs to make nodes the least recently used value.
+        self.cache.get(CacheKey("jobs"))
+        self.cache.put(CacheKey("qos"), ["qos"], 10, 30)
+        self.assertIsNone(self.cache.get(CacheKey("nodes")))
+        for key in ["jobs", "partitions", "qos"]:
+            self.assertEqual(self.cache.get(CacheKey(key)), [key])
+        self.assertEqual(self.cache.size, 30)
+
+    def test_evict_max_size(self):
+        self.cache.put(CacheKey("jobs"), ["jobs"], 60, 30)
+        self.cache.put(CacheKey("nodes"), ["nodes"], 60, 30)
+        self.assertIsNone(self.cache.get(CacheKey("jobs")))
+        self.assertEqual(self.cache.get(CacheKey("nodes")), ["nodes"])
+        self.assertEqual(self.cache.size, 60)
+
+    def test_put_too_large(self):
+        self.cache.put(CacheKey("jobs"), ["jobs"], 110, 30)
+        self.assertIsNone(self.cache.get(CacheKey("jobs")))
+        self.assertEqual(self.cache.size, 0)
+
+    @mock.patch("slurmweb.cache.time.monotonic")
+    def test_version(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        self.cache.put(CacheKey("jobs"), ["jobs"], 10, 30, "1a2b")
+        self.cache.put(CacheKey("nodes"), ["nodes"], 10, 30)
+        self.assertEqual(self.cache.version(CacheKey("jobs")), "1a2b")
+        self.assertIsNone(self.cache.version(CacheKey("nodes")))
+        self.assertIsNone(self.cache.version(CacheKey("qos")))
+        # Hits and misses are not counted
+        self.assertEqual(self.cache.metrics(), ({}, {}, 0, 0))
+        # Version of expired value is unknown
+        mock_monotonic.return_value = 105
+        self.assertIsNone(self.cache.version(CacheKey("jobs")))
+
+    def test_reset(self):
+        self.cache.put(CacheKey("jobs"), ["jobs"], 10, 30)
+        self.cache.get(CacheKey("jobs"))
+        self.cache.get(CacheKey("nodes"))
+        self.cache.reset()
+        self.assertEqual(self.cache.metrics(), ({}, {}, 0, 0))
+        # Values are kept in local cache.
+        self.assertEqual(self.cache.get(CacheKey("jobs")), ["jobs"])
+
+
 class TestCachingService(unittest.TestCase):
     def setUp(self):
         self.cache = CachingService("localhost", -1, None)
@@ -24,6 +117,15 @@ class TestCachingService(unittest.TestCase):
         result = self.cache.get(CacheKey("whetever"))
         self.assertEqual(result, data)
 
+    def test_get_codec(self):
+        # Value saved with another codec than the one selected in settings
+        data = {"fake": "value"}
+        self.cache.connection.get = mock.Mock(
+            return_value=CacheSerializer("orjson").dumps(data)
+        )
+        result = self.cache.get(CacheKey("whetever"))
+        self.assertEqual(result, data)
+
     def test_get_not_in_cache(self):
         self.cache.connection.get = mock.Mock(return_value=None)
         result = self.cache.get(CacheKey("whetever"))
@@ -45,184 +147,348 @@ class TestCachingService(unittest.TestCase):
 
     def test_put(self):
         data = {"fake": "value"}
-        self.cache.connection.set = mock.Mock()
+        serialized = b"SW\x01\x00\x00" + pickle.dumps(data)
+        pipeline = mock.Mock()
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
         self.cache.put(CacheKey("whetever"), data, 10)
-        self.cache.connection.set.assert_called_once_with(
-            "whetever", pickle.dumps(data), ex=10
+        # Value is saved with the digest of its content as version.
+        pipeline.set.assert_has_calls(
+            [
+                mock.call("whetever", serialized, ex=10),
+                mock.call(
+                    "cache-version-whetever", CachingService.digest(serialized), ex=10
+                ),
+            ]
         )
+        self.assertEqual(pipeline.set.call_count, 2)
+        pipeline.execute.assert_called_once_with()
 
-    def test_put_connection_error(self):
-        self.cache.connection.set = mock.Mock(
-            side_effect=redis.exceptions.ConnectionError
+    def test_digest(self):
+        self.assertEqual(
+            CachingService.digest(b"fake value"), CachingService.digest(b"fake value")
+        )
+        self.assertNotEqual(
+            CachingService.digest(b"fake value"), CachingService.digest(b"other value")
         )
-        with self.assertRaises(SlurmwebCacheError):
-            self.cache.put(CacheKey("whetever"), "value", 10)
 
-    def test_put_response_error(self):
-        self.cache.connection.set = mock.Mock(
-            side_effect=redis.exceptions.ResponseError
+    def test_put_stale(self):
+        data = {"fake": "value"}
+        pipeline = mock.Mock()
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        self.cache.put(CacheKey("whetever"), data, 10, 60)
+        # Value is kept in cache for the additional stale delay, a separate key
+        # expires with the value freshness.
+        pipeline.set.assert_has_calls(
+            [
+                mock.call("whetever", b"SW\x01\x00\x00" + pickle.dumps(data), ex=70),
+                mock.call("cache-version-whetever", mock.ANY, ex=70),
+                mock.call("cache-fresh-whetever", 1, ex=10),
+            ]
         )
-        with self.assertRaises(SlurmwebCacheError):
-            self.cache.put(CacheKey("whetever"), "value", 10)
+        pipeline.execute.assert_called_once_with()
+
+    def test_put_many(self):
+        pipeline = mock.Mock()
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        self.cache.put_many(
+            [(CacheKey("jobs"), ["job"]), (CacheKey("jobs-summary"), {"total": 1})],
+            10,
+            60,
+        )
+        # All values are saved in the same transaction with the same expiration.
+        self.cache.connection.pipeline.assert_called_once_with()
+        pipeline.set.assert_has_calls(
+            [
+                mock.call("jobs", b"SW\x01\x00\x00" + pickle.dumps(["job"]), ex=70),
+                mock.call("cache-version-jobs", mock.ANY, ex=70),
+                mock.call("cache-fresh-jobs", 1, ex=10),
+                mock.call(
+                    "jobs-summary",
+                    b"SW\x01\x00\x00" + pickle.dumps({"total": 1}),
+                    ex=70,
+                ),
+                mock.call("cache-version-jobs-summary", mock.ANY, ex=70),
+                mock.call("cache-fresh-jobs-summary", 1, ex=10),
+            ]
+        )
+        pipeline.execute.assert_called_once_with()
 
-    def test_count_miss(self):
-        self.cache.connection.sadd = mock.Mock()
-        self.cache.connection.incr = mock.Mock()
+    def test_get_stale(self):
+        data = {"fake": "value"}
+        self.cache.connection.mget = mock.Mock(return_value=[pickle.dumps(data), b"1"])
+        result = self.cache.get_stale(CacheKey("whetever"))
+        self.assertEqual(result, (data, True))
+        self.cache.connection.mget.assert_called_once_with(
+            ["whetever", "cache-fresh-whetever"]
+        )
 
-        key = CacheKey("test-key", "test-count")
-        self.cache.count_miss(key)
+    def test_get_stale_expired(self):
+        data = {"fake": "value"}
+        self.cache.connection.mget = mock.Mock(return_value=[pickle.dumps(data), None])
+        result = self.cache.get_stale(CacheKey("whetever"))
+        self.assertEqual(result, (data, False))
+
+    def test_get_stale_not_in_cache(self):
+        self.cache.connection.mget = mock.Mock(return_value=[None, None])
+        result = self.cache.get_stale(CacheKey("whetever"))
+        self.assertEqual(result, (None, False))
 
-        # Verify that sadd is called to add the key to the set
-        self.cache.connection.sadd.assert_called_once_with(
-            "cache-miss-keys", "test-count"
+    def test_get_stale_connection_error(self):
+        self.cache.connection.mget = mock.Mock(
+            side_effect=redis.exceptions.ConnectionError
         )
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.get_stale(CacheKey("whetever"))
 
-        # Verify that incr is called twice: for the specific key and the total
-        expected_calls = [
-            mock.call("cache-miss-test-count"),
-            mock.call("cache-miss-total"),
-        ]
-        self.cache.connection.incr.assert_has_calls(expected_calls)
+    def test_get_local(self):
+        data = {"fake": "value"}
+        self.cache.local = LocalCache(5, 10, 1024)
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [pickle.dumps(data), 2000, b"1a2b"]
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        result = self.cache.get(CacheKey("whetever"))
+        self.assertEqual(result, data)
+        pipeline.get.assert_has_calls(
+            [mock.call("whetever"), mock.call("cache-version-whetever")]
+        )
+        pipeline.pttl.assert_called_once_with("whetever")
+        # Value is saved in local cache with its version
+        self.assertEqual(self.cache.local.get(CacheKey("whetever")), data)
+        self.assertEqual(self.cache.local.version(CacheKey("whetever")), "1a2b")
+        self.assertEqual(self.cache.local.size, len(pickle.dumps(data)))
+
+    def test_get_local_not_in_cache(self):
+        self.cache.local = LocalCache(5, 10, 1024)
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [None, -2, None]
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        self.assertIsNone(self.cache.get(CacheKey("whetever")))
+        self.assertEqual(self.cache.local.size, 0)
+
+    def test_get_stale_local(self):
+        data = {"fake": "value"}
+        self.cache.local = LocalCache(5, 10, 1024)
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [pickle.dumps(data), 2000, b"1a2b"]
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        result = self.cache.get_stale(CacheKey("whetever"))
+        self.assertEqual(result, (data, True))
+        pipeline.pttl.assert_called_once_with("cache-fresh-whetever")
+        self.assertEqual(self.cache.local.get(CacheKey("whetever")), data)
+
+    def test_get_stale_local_expired(self):
+        data = {"fake": "value"}
+        self.cache.local = LocalCache(5, 10, 1024)
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [pickle.dumps(data), -2, b"1a2b"]
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        result = self.cache.get_stale(CacheKey("whetever"))
+        self.assertEqual(result, (data, False))
+        # Expired value is not saved in local cache
+        self.assertEqual(self.cache.local.size, 0)
+
+    def test_put_local(self):
+        data = {"fake": "value"}
+        self.cache.local = LocalCache(5, 10, 1024)
+        self.cache.connection.pipeline = mock.Mock()
+        self.cache.put(CacheKey("whetever"), data, 10)
+        self.assertEqual(self.cache.local.get(CacheKey("whetever")), data)
+        self.assertEqual(
+            self.cache.local.version(CacheKey("whetever")),
+            CachingService.digest(b"SW\x01\x00\x00" + pickle.dumps(data)),
+        )
 
-    def test_count_hit(self):
-        self.cache.connection.sadd = mock.Mock()
-        self.cache.connection.incr = mock.Mock()
+    def test_put_connection_error(self):
+        pipeline = mock.Mock()
+        pipeline.execute.side_effect = redis.exceptions.ConnectionError
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.put(CacheKey("whetever"), "value", 10)
 
-        key = CacheKey("test-key", "test-count")
-        self.cache.count_hit(key)
+    def test_put_response_error(self):
+        pipeline = mock.Mock()
+        pipeline.execute.side_effect = redis.exceptions.ResponseError
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.put(CacheKey("whetever"), "value", 10)
 
-        # Verify that sadd is called to add the key to the set
-        self.cache.connection.sadd.assert_called_once_with(
-            "cache-hit-keys", "test-count"
+    def test_versions(self):
+        self.cache.connection.mget = mock.Mock(return_value=[b"1a2b", None])
+        self.assertEqual(
+            self.cache.versions([CacheKey("jobs"), CacheKey("nodes")]),
+            ["1a2b", None],
+        )
+        self.cache.connection.mget.assert_called_once_with(
+            ["cache-version-jobs", "cache-version-nodes"]
         )
 
-        # Verify that incr is called twice: for the specific key and the total
-        expected_calls = [
-            mock.call("cache-hit-test-count"),
-            mock.call("cache-hit-total"),
-        ]
-        self.cache.connection.incr.assert_has_calls(expected_calls)
+    def test_versions_local(self):
+        self.cache.local = LocalCache(5, 10, 1024)
+        self.cache.local.put(CacheKey("jobs"), ["jobs"], 10, 30, "3c4d")
+        self.cache.connection.mget = mock.Mock(return_value=[b"1a2b"])
+        # Only versions missing in local cache are retrieved in Redis.
+        self.assertEqual(
+            self.cache.versions([CacheKey("jobs"), CacheKey("nodes")]),
+            ["3c4d", "1a2b"],
+        )
+        self.cache.connection.mget.assert_called_once_with(["cache-version-nodes"])
+        self.cache.connection.mget.reset_mock()
+        self.assertEqual(self.cache.versions([CacheKey("jobs")]), ["3c4d"])
+        self.cache.connection.mget.assert_not_called()
 
-    def test_metrics_empty(self):
-        # Mock for empty sets and null values
-        self.cache.connection.smembers = mock.Mock(return_value=set())
-        self.cache.connection.get = mock.Mock(return_value=None)
+    def test_versions_connection_error(self):
+        self.cache.connection.mget = mock.Mock(
+            side_effect=redis.exceptions.ConnectionError
+        )
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.versions([CacheKey("jobs")])
 
-        result = self.cache.metrics()
+    def test_elect(self):
+        self.cache.connection.set = mock.Mock(return_value=True)
+        self.cache.connection.eval = mock.Mock()
+        self.assertTrue(self.cache.elect("test", "candidate", 30))
+        self.cache.connection.set.assert_called_once_with(
+            "cache-leader-test", "candidate", nx=True, ex=30
+        )
+        self.cache.connection.eval.assert_not_called()
+
+    def test_elect_renew(self):
+        # Leader key is already set, expiration is extended if owned by candidate
+        self.cache.connection.set = mock.Mock(return_value=None)
+        self.cache.connection.eval = mock.Mock(return_value=1)
+        self.assertTrue(self.cache.elect("test", "candidate", 30))
+        self.cache.connection.eval.assert_called_once_with(
+            CachingService.RENEW_LEADER_SCRIPT, 1, "cache-leader-test", "candidate", 30
+        )
 
-        # Verify the returned tuple: (cache_hits, cache_misses, hit_total, miss_total)
-        self.assertEqual(result, ({}, {}, 0, 0))
+    def test_elect_lost(self):
+        self.cache.connection.set = mock.Mock(return_value=None)
+        self.cache.connection.eval = mock.Mock(return_value=0)
+        self.assertFalse(self.cache.elect("test", "candidate", 30))
 
-    def test_metrics_with_data(self):
-        # Mock for sets with keys
-        self.cache.connection.smembers = mock.Mock(
-            side_effect=[
-                {b"key1", b"key2"},  # cache-miss-keys
-                {b"key1", b"key3"},  # cache-hit-keys
-            ]
+    def test_elect_connection_error(self):
+        self.cache.connection.set = mock.Mock(
+            side_effect=redis.exceptions.ConnectionError
         )
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.elect("test", "candidate", 30)
 
-        # Mock for counter values
-        def mock_get(key):
-            if key == "cache-miss-key1":
-                return b"5"
-            elif key == "cache-miss-key2":
-                return b"3"
-            elif key == "cache-hit-key1":
-                return b"10"
-            elif key == "cache-hit-key3":
-                return b"7"
-            elif key == "cache-hit-total":
-                return b"17"
-            elif key == "cache-miss-total":
-                return b"8"
-            else:
-                return None
-
-        self.cache.connection.get = mock.Mock(side_effect=mock_get)
-
-        result = self.cache.metrics()
+    def test_count_miss(self):
+        self.cache.connection.hincrby = mock.Mock()
+        self.cache.count_miss(CacheKey("test-key", "test-count"))
+        self.cache.connection.hincrby.assert_called_once_with(
+            "cache-misses", "test-count"
+        )
 
-        # Verify the returned tuple
-        self.assertEqual(
-            result, ({"key1": 10, "key3": 7}, {"key1": 5, "key2": 3}, 17, 8)
+    def test_count_hit(self):
+        self.cache.connection.hincrby = mock.Mock()
+        self.cache.count_hit(CacheKey("test-key", "test-count"))
+        self.cache.connection.hincrby.assert_called_once_with(
+            "cache-hits", "test-count"
         )
 
-    def test_metrics_with_missing_values(self):
-        # Mock for sets with keys
-        self.cache.connection.smembers = mock.Mock(
-            side_effect=[
-                {b"key1", b"key2"},  # cache-miss-keys
-                {b"key1", b"key3"},  # cache-hit-keys
-            ]
+    def test_count_coalesced(self):
+        self.cache.connection.hincrby = mock.Mock()
+        self.cache.count_coalesced(CacheKey("test-key", "test-count"))
+        self.cache.connection.hincrby.assert_called_once_with(
+            "cache-coalesced", "test-count"
         )
 
-        # Mock for counter values - key2 and key3 have no value
-        def mock_get(key):
-            if key == "cache-miss-key1":
-                return b"5"
-            elif key == "cache-hit-key1":
-                return b"10"
-            elif key == "cache-hit-total":
-                return b"10"
-            elif key == "cache-miss-total":
-                return b"5"
-            else:
-                return None
+    def test_lock(self):
+        lock = mock.Mock()
+        lock.acquire.return_value = True
+        self.cache.connection.lock = mock.Mock(return_value=lock)
+        self.assertIs(self.cache.lock(CacheKey("whetever", "count"), 30), lock)
+        self.cache.connection.lock.assert_called_once_with(
+            "cache-lock-whetever", timeout=30
+        )
+        lock.acquire.assert_called_once_with(blocking=False)
+
+    def test_lock_not_acquired(self):
+        lock = mock.Mock()
+        lock.acquire.return_value = False
+        self.cache.connection.lock = mock.Mock(return_value=lock)
+        self.assertIsNone(self.cache.lock(CacheKey("whetever"), 30))
+
+    def test_lock_connection_error(self):
+        lock = mock.Mock()
+        lock.acquire.side_effect = redis.exceptions.ConnectionError
+        self.cache.connection.lock = mock.Mock(return_value=lock)
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.lock(CacheKey("whetever"), 30)
 
-        self.cache.connection.get = mock.Mock(side_effect=mock_get)
+    def test_unlock(self):
+        lock = mock.Mock()
+        self.cache.unlock(lock)
+        lock.release.assert_called_once_with()
 
-        # Verify that warnings are logged for missing keys and check the result
+    def test_unlock_expired(self):
+        lock = mock.Mock()
+        lock.name = "cache-lock-whetever"
+        lock.release.side_effect = redis.exceptions.LockNotOwnedError
         with self.assertLogs("slurmweb.cache", level="WARNING") as cm:
-            result = self.cache.metrics()
-
-        # Verify the warning messages
-        self.assertIn(
-            "WARNING:slurmweb.cache:Miss cache key cache-miss-key2 referenced without "
-            "value",
-            cm.output,
-        )
-        self.assertIn(
-            "WARNING:slurmweb.cache:Hit cache key cache-hit-key3 referenced without "
-            "value",
+            self.cache.unlock(lock)
+        self.assertEqual(
             cm.output,
+            [
+                "WARNING:slurmweb.cache:Cache lock cache-lock-whetever expired before "
+                "being released"
+            ],
         )
 
-        # Verify the returned tuple (without missing keys)
-        self.assertEqual(result, ({"key1": 10}, {"key1": 5}, 10, 5))
+    def test_unlock_connection_error(self):
+        lock = mock.Mock()
+        lock.release.side_effect = redis.exceptions.ConnectionError
+        with self.assertRaises(SlurmwebCacheError):
+            self.cache.unlock(lock)
 
-    def test_reset(self):
-        # Setup mocks for Redis operations used in reset()
-        self.cache.connection.set = mock.Mock()
-        # Mock fake cache keys for hit and miss
-        self.cache.connection.smembers = mock.Mock(
-            side_effect=[{b"hit1", b"hit2"}, {b"miss1"}]
-        )
-        self.cache.connection.delete = mock.Mock()
+    def test_metrics_empty(self):
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [{}, {}, {}]
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
 
-        # Call reset()
-        self.cache.reset()
+        result = self.cache.metrics()
 
-        # Check that totals are reset to 0
-        self.cache.connection.set.assert_has_calls(
-            [mock.call("cache-hit-total", 0), mock.call("cache-miss-total", 0)]
-        )
+        # Verify the returned tuple: (cache_hits, cache_misses, cache_coalesced,
+        # hit_total, miss_total, coalesced_total)
+        self.assertEqual(result, ({}, {}, {}, 0, 0, 0))
 
-        # Check that per-key counters are deleted for all hit keys
-        self.cache.connection.delete.assert_has_calls(
+    def test_metrics_with_data(self):
+        pipeline = mock.Mock()
+        pipeline.execute.return_value = [
+            {b"key1": b"10", b"key3": b"7"},  # cache-hits
+            {b"key1": b"5", b"key2": b"3"},  # cache-misses
+            {b"key1": b"4"},  # cache-coalesced
+        ]
+        self.cache.connection.pipeline = mock.Mock(return_value=pipeline)
+
+        result = self.cache.metrics()
+
+        # All counters are retrieved in a single pipeline
+        pipeline.hgetall.assert_has_calls(
             [
-                mock.call("cache-hit-hit1"),
-                mock.call("cache-hit-hit2"),
-            ],
-            any_order=True,
+                mock.call("cache-hits"),
+                mock.call("cache-misses"),
+                mock.call("cache-coalesced"),
+            ]
         )
-
-        # Check that per-key counters are deleted for all miss keys
-        self.cache.connection.delete.assert_has_calls(
-            [mock.call("cache-miss-miss1")], any_order=True
+        pipeline.execute.assert_called_once_with()
+        # Verify the returned tuple
+        self.assertEqual(
+            result,
+            ({"key1": 10, "key3": 7}, {"key1": 5, "key2": 3}, {"key1": 4}, 17, 8, 4),
         )
 
-        # Check that sets are cleared
-        self.cache.connection.delete.assert_has_calls(
-            [mock.call("cache-hit-keys"), mock.call("cache-miss-keys")]
+    def test_reset(self):
+        self.cache.connection.delete = mock.Mock()
+        self.cache.reset()
+        # Check that all counters are deleted at once
+        self.cache.connection.delete.assert_called_once_with(
+            "cache-hits", "cache-misses", "cache-coalesced"
         )
+
+    def test_reset_local(self):
+        self.cache.local = mock.Mock()
+        self.cache.connection.delete = mock.Mock()
+        self.cache.reset()
+        self.cache.local.reset.assert_called_once_with()
@@ -0,0 +1,422 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import json
+import os
+import threading
+
+import aiohttp
+from rfl.settings import RuntimeSettings
+
+from slurmweb.sessions import AgentsSessions
+from slurmweb.events import (
+    EventsChannel,
+    EventsHub,
+    AgentPollResponse,
+    encode_event,
+    EVENTS_KEEPALIVE,
+    EVENTS_QUEUE_SIZE,
+)
+
+from .lib.utils import mock_agent_aio_response
+
+
+def decode_event(event: bytes):
+    """Return tuple with name, id and data of the encoded event."""
+    fields = dict(line.split(": ", 1) for line in event.decode().strip().split("\n"))
+    return fields["event"], fields.get("id"), json.loads(fields["data"])
+
+
+def changes(version, full=False, added=None, modified=None, removed=None):
+    return {
+        "version": version,
+        "full": full,
+        "added": added or [],
+        "modified": modified or [],
+        "removed": removed or [],
+    }
+
+
+class TestEventsChannel(unittest.TestCase):
+    def setUp(self):
+        self.settings = RuntimeSettings.yaml_definition(
+            os.path.join(
+                os.path.dirname(__file__), "..", "..", "conf", "vendor", "gateway.yml"
+            )
+        ).events
+        self.responses = []
+        self.fetch = mock.Mock()
+
+        def fetch(*args):
+            self.fetch(*args)
+            response = self.responses.pop(0)
+            if isinstance(response, Exception):
+                raise response
+            return response
+
+        self.agent = mock.Mock()
+        self.channel = EventsChannel("foo", "jobs", fetch, self.settings)
+        # Polls are triggered by tests, the polling thread is not started.
+        patcher = mock.patch("slurmweb.events.threading.Thread")
+        self.thread = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def pending(self, subscription):
+        """Return list of events pending in subscription, decoded."""
+        events = []
+        while not subscription.events.empty():
+            events.append(decode_event(subscription.events.get_nowait()))
+        return events
+
+    def test_encode_event(self):
+        self.assertEqual(
+            encode_event("changes", {"version": "1a2b"}, "1a2b"),
+            b'event: changes\nid: 1a2b\ndata: {"version": "1a2b"}\n\n',
+        )
+        self.assertEqual(
+            encode_event("failure", {"description": "fail"}),
+            b'event: failure\ndata: {"description": "fail"}\n\n',
+        )
+
+    def test_subscribe_starts_polling(self):
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.thread.assert_called_once_with(target=self.channel._run, daemon=True)
+        self.thread.return_value.start.assert_called_once()
+        self.assertEqual(self.channel.subscribers, 1)
+        # No snapshot is available yet
+        self.assertEqual(self.pending(subscription), [])
+        # Polling thread is started once
+        self.channel.subscribe("token", self.agent, None)
+        self.thread.assert_called_once()
+        self.assertEqual(self.channel.subscribers, 2)
+
+    def test_poll_changes(self):
+        subscriptions = [
+            self.channel.subscribe(token, self.agent, None)
+            for token in ["token1", "token2"]
+        ]
+        self.responses = [
+            AgentPollResponse(
+                200,
+                '"e1"',
+                changes("v1", True, [{"job_id": 1}, {"job_id": 2}]),
+            ),
+            AgentPollResponse(
+                200,
+                '"e2"',
+                changes("v2", added=[{"job_id": 3}], removed=["1"]),
+            ),
+        ]
+        self.channel.poll(self.agent, "token2")
+        self.fetch.assert_called_once_with(
+            self.agent, "jobs/changes", "token2", None, {}
+        )
+        self.channel.poll(self.agent, "token2")
+        # Version and ETag of previous response are sent to agent
+        self.fetch.assert_called_with(
+            self.agent, "jobs/changes", "token2", '"e1"', {"since": "v1"}
+        )
+        # All subscribers receive the same events
+        for subscription in subscriptions:
+            self.assertEqual(
+                self.pending(subscription),
+                [
+                    (
+                        "changes",
+                        "v1",
+                        changes("v1", True, [{"job_id": 1}, {"job_id": 2}]),
+                    ),
+                    (
+                        "changes",
+                        "v2",
+                        changes("v2", added=[{"job_id": 3}], removed=["1"]),
+                    ),
+                ],
+            )
+        self.assertEqual(self.channel.version, "v2")
+
+    def test_poll_unchanged(self):
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(200, '"e1"', changes("v1", True, [{"job_id": 1}])),
+            AgentPollResponse(304, '"e1"', None),
+            AgentPollResponse(200, '"e2"', changes("v1")),
+        ]
+        for _ in range(3):
+            self.channel.poll(self.agent, "token")
+        # Only the first response is pushed to subscribers
+        self.assertEqual(len(self.pending(subscription)), 1)
+
+    def test_subscribe_snapshot(self):
+        self.channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(
+                200, None, changes("v1", True, [{"job_id": 1}, {"job_id": 2}])
+            ),
+            AgentPollResponse(
+                200,
+                None,
+                changes("v2", added=[{"job_id": 3}], modified=[{"job_id": 1, "a": 1}]),
+            ),
+        ]
+        self.channel.poll(self.agent, "token")
+        self.channel.poll(self.agent, "token")
+        # New subscriber receives the current snapshot with all records
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.assertEqual(
+            self.pending(subscription),
+            [
+                (
+                    "changes",
+                    "v2",
+                    changes(
+                        "v2",
+                        True,
+                        [{"job_id": 1, "a": 1}, {"job_id": 2}, {"job_id": 3}],
+                    ),
+                )
+            ],
+        )
+        # Subscriber which already received the current version does not receive
+        # the snapshot.
+        subscription = self.channel.subscribe("token", self.agent, "v2")
+        self.assertEqual(self.pending(subscription), [])
+
+    def test_poll_stats(self):
+        channel = EventsChannel("foo", "stats", self.channel.fetch, self.settings)
+        subscription = channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(200, None, {"jobs": {"running": 1}}),
+            AgentPollResponse(200, None, {"jobs": {"running": 1}}),
+            AgentPollResponse(200, None, {"jobs": {"running": 2}}),
+        ]
+        for _ in range(3):
+            channel.poll(self.agent, "token")
+        # Stats are polled without version, unchanged stats are not pushed.
+        self.fetch.assert_called_with(self.agent, "stats", "token", None, {})
+        events = self.pending(subscription)
+        self.assertEqual(
+            [(event, data) for event, _, data in events],
+            [("stats", {"jobs": {"running": 1}}), ("stats", {"jobs": {"running": 2}})],
+        )
+        # Snapshot of new subscribers is the current stats
+        self.assertEqual(
+            self.pending(channel.subscribe("token", self.agent, None)), events[1:]
+        )
+
+    def test_poll_failure(self):
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(200, None, changes("v1", True, [{"job_id": 1}])),
+            aiohttp.ClientConnectionError("connection refused"),
+            AgentPollResponse(500, None, None),
+            AgentPollResponse(200, None, changes("v1")),
+        ]
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            for _ in range(4):
+                self.channel.poll(self.agent, "token")
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.events:Unable to poll jobs events of cluster foo: "
+                "Connection error with agent: connection refused",
+                "ERROR:slurmweb.events:Unable to poll jobs events of cluster foo: "
+                "Unexpected status code 500 from agent",
+            ],
+        )
+        # Subscribers are notified of the failure once, and of the recovery with
+        # the changes of the next successful poll.
+        self.assertEqual(
+            self.pending(subscription),
+            [
+                ("changes", "v1", changes("v1", True, [{"job_id": 1}])),
+                (
+                    "failure",
+                    None,
+                    {"description": "Connection error with agent: connection refused"},
+                ),
+                ("changes", "v1", changes("v1")),
+            ],
+        )
+
+    def test_poll_token_rejected(self):
+        rejected = [
+            self.channel.subscribe("token1", self.agent, None) for _ in range(2)
+        ]
+        subscription = self.channel.subscribe("token2", self.agent, None)
+        self.responses = [AgentPollResponse(401, None, None)]
+        with self.assertLogs("slurmweb", level="WARNING") as cm:
+            self.channel.poll(self.agent, "token1")
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:slurmweb.events:Token rejected by agent with status 401 "
+                "while polling jobs events of cluster foo"
+            ],
+        )
+        # Subscriptions with rejected token are closed with failure event
+        self.assertEqual(self.channel.subscribers, 1)
+        for _subscription in rejected:
+            self.assertEqual(
+                [decode_event(event) for event in self.channel.stream(_subscription)],
+                [
+                    (
+                        "failure",
+                        None,
+                        {"code": 401, "description": "Token rejected by agent"},
+                    )
+                ],
+            )
+        self.assertEqual(self.pending(subscription), [])
+        # Channel polls again immediately
+        self.assertTrue(self.channel._wakeup.is_set())
+
+    def test_stream(self):
+        self.settings.keepalive = 0.01
+        self.settings.duration = 0.05
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(200, None, changes("v1", True, [{"job_id": 1}]))
+        ]
+        self.channel.poll(self.agent, "token")
+        events = list(self.channel.stream(subscription))
+        # Pending event is sent, followed by keepalive comments until the deadline.
+        self.assertEqual(
+            decode_event(events[0]),
+            ("changes", "v1", changes("v1", True, [{"job_id": 1}])),
+        )
+        self.assertGreater(len(events), 1)
+        self.assertTrue(all(event == EVENTS_KEEPALIVE for event in events[1:]))
+        # Subscription is removed at the end of the stream
+        self.assertEqual(self.channel.subscribers, 0)
+
+    def test_stream_overflow(self):
+        self.settings.keepalive = 0.01
+        self.settings.duration = 0.05
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(
+                200,
+                None,
+                changes(f"v{idx}", added=[{"job_id": idx}]),
+            )
+            for idx in range(EVENTS_QUEUE_SIZE + 2)
+        ]
+        for _ in range(EVENTS_QUEUE_SIZE + 2):
+            self.channel.poll(self.agent, "token")
+        # Pending events are dropped, the subscriber receives the current snapshot
+        events = [
+            decode_event(event)
+            for event in self.channel.stream(subscription)
+            if event != EVENTS_KEEPALIVE
+        ]
+        self.assertEqual(
+            events,
+            [
+                (
+                    "changes",
+                    f"v{EVENTS_QUEUE_SIZE + 1}",
+                    changes(
+                        f"v{EVENTS_QUEUE_SIZE + 1}",
+                        True,
+                        [{"job_id": idx} for idx in range(EVENTS_QUEUE_SIZE + 2)],
+                    ),
+                )
+            ],
+        )
+
+    def test_run(self):
+        self.settings.duration = -self.settings.keepalive - 1
+        self.channel.subscribe("token", self.agent, None)
+        self.assertIsNotNone(self.channel._thread)
+        # Subscriptions not consumed before their deadline are removed, polling
+        # thread stops without subscriber.
+        self.channel._run()
+        self.assertEqual(self.channel.subscribers, 0)
+        self.assertIsNone(self.channel._thread)
+        self.fetch.assert_not_called()
+
+    def test_run_unexpected_error(self):
+        self.settings.keepalive = 0.01
+        self.settings.interval = 0.01
+        self.settings.duration = 0.1
+        subscription = self.channel.subscribe("token", self.agent, None)
+        self.responses = [
+            AgentPollResponse(200, None, changes("v1", True, [{"job_id": 1}])),
+            ValueError("fake JSON decode error"),
+        ] + [AgentPollResponse(200, None, changes("v2", True, [{"job_id": 2}]))] * 100
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            self.channel._run()
+        self.assertTrue(
+            cm.output[0].startswith(
+                "ERROR:slurmweb.events:Unexpected error while polling jobs events of "
+                "cluster foo"
+            )
+        )
+        self.assertEqual(
+            cm.output[1],
+            "ERROR:slurmweb.events:Unable to poll jobs events of cluster foo: "
+            "Unexpected error: fake JSON decode error",
+        )
+        # Subscribers are notified of the failure, polling continues with a full
+        # snapshot requested to the agent.
+        self.assertEqual(
+            self.pending(subscription)[:3],
+            [
+                ("changes", "v1", changes("v1", True, [{"job_id": 1}])),
+                (
+                    "failure",
+                    None,
+                    {"description": "Unexpected error: fake JSON decode error"},
+                ),
+                ("changes", "v2", changes("v2", True, [{"job_id": 2}])),
+            ],
+        )
+        self.assertGreater(self.fetch.call_count, 2)
+        self.assertEqual(self.fetch.call_args_list[2][0][3:], (None, {}))
+        self.assertIsNone(self.channel._thread)
+
+    def test_run_thread_reset(self):
+        self.channel.subscribe("token", self.agent, None)
+        self.channel._thread = threading.current_thread()
+        with mock.patch.object(self.channel, "poll", side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.channel._run()
+        # Polling thread is started again by the next subscriber.
+        self.assertIsNone(self.channel._thread)
+        self.channel.subscribe("token", self.agent, None)
+        self.assertEqual(self.thread.call_count, 2)
+
+
+class TestEventsHub(unittest.TestCase):
+    def setUp(self):
+        self.sessions = AgentsSessions(lambda: aiohttp.TCPConnector())
+        self.addCleanup(self.sessions.stop)
+        self.agent = mock.Mock(url="http://localhost", version="6.0.0")
+
+    def test_channel(self):
+        hub = EventsHub(mock.Mock(), self.sessions)
+        channel = hub.channel("foo", "jobs")
+        self.assertIs(hub.channel("foo", "jobs"), channel)
+        self.assertIsNot(hub.channel("foo", "nodes"), channel)
+        self.assertIsNot(hub.channel("bar", "jobs"), channel)
+
+    @mock.patch("slurmweb.events.aiohttp.ClientSession.get")
+    def test_fetch(self, mock_get):
+        content, mock_get.return_value = mock_agent_aio_response(
+            content=changes("v1", True, [{"job_id": 1}])
+        )
+        mock_get.return_value.mock.headers["ETag"] = '"e1"'
+        hub = EventsHub(mock.Mock(), self.sessions)
+        response = hub.fetch(self.agent, "jobs/changes", "token", '"e0"', {})
+        self.assertEqual(response, AgentPollResponse(200, '"e1"', content))
+        mock_get.assert_called_once_with(
+            "http://localhost/v6.0.0/jobs/changes",
+            headers={"Authorization": "Bearer token", "If-None-Match": '"e0"'},
+            params={},
+        )
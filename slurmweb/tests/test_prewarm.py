@@ -0,0 +1,133 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+from unittest import mock
+import threading
+
+from slurmweb.prewarm import CachePrewarmer
+from slurmweb.slurmrestd.errors import SlurmrestConnectionError
+from slurmweb.errors import SlurmwebCacheError
+
+from .lib.slurmrestd import TestSlurmrestdBase
+
+
+class TestCachePrewarmer(TestSlurmrestdBase):
+    def setUp(self):
+        self.settings = self.load_agent_settings_definition()
+        self.settings.cache.prewarm = ["jobs", "nodes"]
+        self.slurmrestd = mock.Mock()
+        self.service = mock.Mock()
+        self.prewarmer = CachePrewarmer(
+            self.slurmrestd, self.service, self.settings.cache
+        )
+
+    def tearDown(self):
+        self.prewarmer.stop()
+
+    def test_interval(self):
+        self.settings.cache.jobs = 30
+        self.settings.cache.prewarm_margin = 5
+        self.assertEqual(self.prewarmer.interval("jobs"), 25)
+        # Interval is at least 1 second
+        self.settings.cache.prewarm_margin = 40
+        self.assertEqual(self.prewarmer.interval("jobs"), 1)
+
+    def test_elect(self):
+        self.service.elect.return_value = True
+        with self.assertLogs("slurmweb", level="INFO") as cm:
+            self.assertTrue(self.prewarmer.elect())
+        self.assertEqual(
+            cm.output,
+            ["INFO:slurmweb.prewarm:Agent elected leader for cache pre-warming"],
+        )
+        self.service.elect.assert_called_once_with(
+            "prewarm", self.prewarmer.identity, CachePrewarmer.LEADER_TTL
+        )
+        self.assertTrue(self.prewarmer.leader)
+        # Leadership lost
+        self.service.elect.return_value = False
+        with self.assertLogs("slurmweb", level="INFO") as cm:
+            self.assertFalse(self.prewarmer.elect())
+        self.assertEqual(
+            cm.output,
+            ["INFO:slurmweb.prewarm:Agent is not leader for cache pre-warming anymore"],
+        )
+        self.assertFalse(self.prewarmer.leader)
+
+    def test_elect_cache_error(self):
+        self.prewarmer.leader = True
+        self.service.elect.side_effect = SlurmwebCacheError("fake error")
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            self.assertFalse(self.prewarmer.elect())
+        self.assertIn(
+            "ERROR:slurmweb.prewarm:Unable to elect cache pre-warming leader: "
+            "fake error",
+            cm.output,
+        )
+        self.assertFalse(self.prewarmer.leader)
+
+    def test_refresh(self):
+        self.prewarmer.refresh("jobs")
+        self.slurmrestd.refresh.assert_called_once_with("jobs")
+        statistics = self.prewarmer.statistics["jobs"]
+        self.assertEqual(statistics.refreshes, 1)
+        self.assertEqual(statistics.failures, 0)
+        self.assertIsNotNone(statistics.duration)
+
+    def test_refresh_error(self):
+        self.slurmrestd.refresh.side_effect = SlurmrestConnectionError("fake error")
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            self.prewarmer.refresh("jobs")
+        self.assertEqual(
+            cm.output,
+            ["ERROR:slurmweb.prewarm:Unable to pre-warm jobs in cache: fake error"],
+        )
+        statistics = self.prewarmer.statistics["jobs"]
+        self.assertEqual(statistics.refreshes, 0)
+        self.assertEqual(statistics.failures, 1)
+        self.assertIsNone(statistics.duration)
+
+    def test_run_leader(self):
+        self.service.elect.return_value = True
+        refreshed = threading.Semaphore(0)
+        self.slurmrestd.refresh.side_effect = lambda collection: refreshed.release()
+        self.prewarmer.start()
+        # All collections are refreshed once leadership is gained.
+        for _ in range(2):
+            self.assertTrue(refreshed.acquire(timeout=10))
+        self.prewarmer.stop()
+        self.slurmrestd.refresh.assert_has_calls(
+            [mock.call("jobs"), mock.call("nodes")], any_order=True
+        )
+
+    def test_run_not_leader(self):
+        elected = threading.Event()
+        # Election is lost, elected event is set but None is returned.
+        self.service.elect.side_effect = lambda *args: elected.set()
+        self.prewarmer.start()
+        self.assertTrue(elected.wait(10))
+        self.prewarmer.stop()
+        self.slurmrestd.refresh.assert_not_called()
+
+    def test_start_once(self):
+        self.service.elect.return_value = False
+        self.prewarmer.start()
+        thread = self.prewarmer._thread
+        # Thread is not started again while it is running.
+        self.prewarmer.start()
+        self.assertIs(self.prewarmer._thread, thread)
+        self.assertTrue(thread.is_alive())
+
+    def test_start_thread_not_alive(self):
+        # Thread inherited from parent process is not alive after fork, it must be
+        # started again.
+        dead = mock.Mock(spec=threading.Thread)
+        dead.is_alive.return_value = False
+        self.prewarmer._thread = dead
+        self.service.elect.return_value = False
+        self.prewarmer.start()
+        self.assertIsNot(self.prewarmer._thread, dead)
+        self.assertTrue(self.prewarmer._thread.is_alive())
@@ -0,0 +1,127 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import importlib.util
+import pickle
+import sys
+
+import parameterized
+
+from slurmweb.serialization import CacheSerializer
+from slurmweb.errors import SlurmwebConfigurationError, SlurmwebCacheError
+
+from .lib.utils import load_json_asset
+
+
+def available(module):
+    return importlib.util.find_spec(module) is not None
+
+
+CODECS = [
+    codec
+    for codec, module in [
+        ("pickle", "pickle"),
+        ("msgpack", "msgpack"),
+        ("orjson", "orjson"),
+    ]
+    if available(module)
+]
+COMPRESSIONS = [
+    compression
+    for compression, module in [
+        ("none", "pickle"),
+        ("zstd", "zstandard"),
+        ("lz4", "lz4"),
+    ]
+    if available(module)
+]
+
+
+class TestCacheSerializer(unittest.TestCase):
+    def setUp(self):
+        self.jobs = load_json_asset("slurmrestd/25.11/0.0.44/slurm-jobs.json")["jobs"]
+        self.nodes = load_json_asset("slurmrestd/25.11/0.0.44/slurm-nodes.json")[
+            "nodes"
+        ]
+
+    @parameterized.parameterized.expand(
+        [(codec, compression) for codec in CODECS for compression in COMPRESSIONS]
+    )
+    def test_dumps_loads(self, codec, compression):
+        serializer = CacheSerializer(codec, compression)
+        for value in (self.jobs, self.nodes):
+            data = serializer.dumps(value)
+            self.assertEqual(
+                data[:5],
+                b"SW"
+                + bytes(
+                    [1, serializer.codec.ID, serializer.compression.ID],
+                ),
+            )
+            self.assertEqual(serializer.loads(data), value)
+
+    def test_compression_threshold(self):
+        if "zstd" not in COMPRESSIONS:
+            self.skipTest("zstandard module is not available")
+        serializer = CacheSerializer("pickle", "zstd", 1024)
+        # Small value is not compressed
+        self.assertEqual(serializer.dumps("small")[:5], b"SW\x01\x00\x00")
+        # Large value is compressed
+        self.assertEqual(serializer.dumps(self.jobs)[:5], b"SW\x01\x00\x01")
+
+    def test_loads_other_codec(self):
+        # Values encoded with other settings are decoded with the codec and
+        # compression declared in their header.
+        for codec in CODECS:
+            for compression in COMPRESSIONS:
+                data = CacheSerializer(codec, compression).dumps(self.nodes)
+                self.assertEqual(CacheSerializer().loads(data), self.nodes)
+
+    def test_loads_legacy(self):
+        # Values saved without header are decoded with pickle
+        self.assertEqual(CacheSerializer().loads(pickle.dumps(self.jobs)), self.jobs)
+
+    def test_loads_unsupported_version(self):
+        with self.assertRaisesRegex(
+            SlurmwebCacheError, "^Unsupported cache serialization format version 2$"
+        ):
+            CacheSerializer().loads(b"SW\x02\x00\x00fake")
+
+    def test_loads_unsupported_codec(self):
+        with self.assertRaisesRegex(
+            SlurmwebCacheError, "^Unsupported cache serialization ID 9$"
+        ):
+            CacheSerializer().loads(b"SW\x01\x09\x00fake")
+
+    def test_loads_missing_module(self):
+        with mock.patch.dict(sys.modules, {"msgpack": None}):
+            with self.assertRaisesRegex(
+                SlurmwebCacheError,
+                "^msgpack module is required for msgpack cache codec$",
+            ):
+                CacheSerializer().loads(b"SW\x01\x01\x00fake")
+
+    def test_unsupported_codec(self):
+        with self.assertRaisesRegex(
+            SlurmwebConfigurationError, "^Unsupported cache serialization fail$"
+        ):
+            CacheSerializer("fail")
+
+    def test_missing_module(self):
+        with mock.patch.dict(sys.modules, {"orjson": None}):
+            with self.assertRaisesRegex(
+                SlurmwebConfigurationError,
+                "^orjson module is required for orjson cache codec$",
+            ):
+                CacheSerializer("orjson")
+        with mock.patch.dict(sys.modules, {"zstandard": None}):
+            with self.assertRaisesRegex(
+                SlurmwebConfigurationError,
+                "^zstandard module is required for zstd cache compression$",
+            ):
+                CacheSerializer("pickle", "zstd")
@@ -0,0 +1,344 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+import unittest
+from unittest import mock
+import asyncio
+import http.server
+import os
+import socket
+import ssl
+import tempfile
+import threading
+from pathlib import Path
+
+import aiohttp
+
+from slurmweb.sessions import (
+    AgentsSessions,
+    AgentsSSLContext,
+    AgentCircuitOpenError,
+    CircuitBreaker,
+)
+from slurmweb.errors import SlurmwebConfigurationError
+
+
+class TestAgentsSessions(unittest.TestCase):
+    def setUp(self):
+        self.connector = mock.Mock(side_effect=lambda: aiohttp.TCPConnector())
+        self.sessions = AgentsSessions(self.connector)
+        self.addCleanup(self.sessions.stop)
+
+    def test_run(self):
+        async def coroutine():
+            return threading.current_thread()
+
+        # Coroutines run in the same dedicated thread
+        thread = self.sessions.run(coroutine())
+        self.assertIsNot(thread, threading.current_thread())
+        self.assertIs(self.sessions.run(coroutine()), thread)
+
+    def test_run_exception(self):
+        async def coroutine():
+            raise aiohttp.ClientConnectionError("fake connection error")
+
+        with self.assertRaisesRegex(
+            aiohttp.ClientConnectionError, "^fake connection error$"
+        ):
+            self.sessions.run(coroutine())
+
+    def test_spawn(self):
+        started = threading.Event()
+        cancelled = threading.Event()
+
+        async def coroutine():
+            started.set()
+            try:
+                await asyncio.sleep(3600)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        # Coroutine runs in background, it is cancelled when event loop is stopped.
+        self.sessions.spawn(coroutine())
+        self.assertTrue(started.wait(1))
+        self.sessions.stop()
+        self.assertTrue(cancelled.is_set())
+
+    def test_session(self):
+        async def sessions():
+            return [
+                self.sessions.session(url)
+                for url in ["http://agent1", "http://agent1", "http://agent2"]
+            ]
+
+        session1, session2, session3 = self.sessions.run(sessions())
+        # Sessions are shared by all requests to the same agent, all sessions share
+        # the same connector.
+        self.assertIsInstance(session1, aiohttp.ClientSession)
+        self.assertIs(session1, session2)
+        self.assertIsNot(session1, session3)
+        self.assertIs(session1.connector, session3.connector)
+        self.connector.assert_called_once()
+
+    def test_stop(self):
+        async def session():
+            return self.sessions.session("http://agent1")
+
+        session1 = self.sessions.run(session())
+        thread = self.sessions._thread
+        self.sessions.stop()
+        self.assertTrue(session1.closed)
+        self.assertFalse(thread.is_alive())
+        # Event loop is started again with new sessions when used after stop
+        session2 = self.sessions.run(session())
+        self.assertIsNot(session2, session1)
+        self.assertFalse(session2.closed)
+
+    def test_session_ssl_context_reloaded(self):
+        contexts = [mock.sentinel.context1]
+        self.sessions.ssl_context = lambda: contexts[-1]
+
+        async def session():
+            return self.sessions.session("http://agent1")
+
+        session1 = self.sessions.run(session())
+        connector = self.sessions._connector
+        self.assertIs(self.sessions.run(session()), session1)
+        # When SSL context changes, connector and sessions are replaced. Previous
+        # ones are closed after a delay.
+        contexts.append(mock.sentinel.context2)
+        with mock.patch("slurmweb.sessions.CONNECTOR_CLOSE_DELAY", 0):
+            session2 = self.sessions.run(session())
+            self.sessions.run(asyncio.sleep(0.01))
+        self.assertIsNot(session2, session1)
+        self.assertIsNot(self.sessions._connector, connector)
+        self.assertEqual(self.connector.call_count, 2)
+        self.assertTrue(session1.closed)
+        self.assertTrue(connector.closed)
+        self.assertFalse(session2.closed)
+
+    def test_session_timeout(self):
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=5, sock_read=30)
+        self.sessions.timeout = timeout
+
+        async def session():
+            return self.sessions.session("http://agent1")
+
+        self.assertEqual(self.sessions.run(session()).timeout, timeout)
+
+    def test_session_breaker_open(self):
+        self.sessions.breaker_threshold = 1
+        self.sessions.breaker_delay = 30
+
+        async def session(url):
+            return self.sessions.session(url)
+
+        self.sessions.breaker("http://agent1").failure()
+        # Requests to agent with open circuit breaker are rejected, other agents
+        # are not impacted.
+        with self.assertRaisesRegex(
+            AgentCircuitOpenError,
+            "^Circuit breaker open for agent at url http://agent1$",
+        ):
+            self.sessions.run(session("http://agent1"))
+        self.assertIsInstance(
+            self.sessions.run(session("http://agent2")), aiohttp.ClientSession
+        )
+
+    def test_session_breaker_failures(self):
+        self.sessions.breaker_threshold = 2
+        self.sessions.breaker_delay = 30
+        # Get a local TCP port without listening socket to make connections fail.
+        with socket.socket() as sock:
+            sock.bind(("127.0.0.1", 0))
+            url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+        async def request():
+            async with self.sessions.session(url).get(f"{url}/info"):
+                pass
+
+        for _ in range(2):
+            with self.assertRaises(aiohttp.ClientConnectionError):
+                self.sessions.run(request())
+        breaker = self.sessions.breakers[url]
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.failures, 2)
+        self.assertEqual(breaker.trips, 1)
+        with self.assertRaises(AgentCircuitOpenError):
+            self.sessions.run(request())
+
+    def test_session_breaker_server_errors(self):
+        self.sessions.breaker_threshold = 2
+        self.sessions.breaker_delay = 30
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            """Answer requests with the status in the path of the request."""
+
+            def do_GET(self):
+                self.send_response(int(self.path[1:]))
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.HTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+
+        async def request(status):
+            async with self.sessions.session(url).get(f"{url}/{status}"):
+                pass
+
+        breaker = self.sessions.breaker(url)
+        # Client errors and HTTP/501 for disabled features are not failures.
+        for status in (200, 404, 501):
+            self.sessions.run(request(status))
+        self.assertEqual(breaker.failures, 0)
+        with self.assertLogs("slurmweb", level="WARNING"):
+            for _ in range(2):
+                self.sessions.run(request(500))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(breaker.failures, 2)
+
+
+@mock.patch("slurmweb.sessions.time.monotonic")
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.breaker = CircuitBreaker("http://agent1", 3, 30)
+
+    def test_open(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        for _ in range(2):
+            self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(self.breaker.allow())
+        with self.assertLogs("slurmweb", level="WARNING") as cm:
+            self.breaker.failure()
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:slurmweb.sessions:Circuit breaker open for agent at url "
+                "http://agent1 after 3 failures"
+            ],
+        )
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.trips, 1)
+        mock_monotonic.return_value = 129
+        self.assertFalse(self.breaker.allow())
+
+    def test_success_reset_failures(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        for _ in range(2):
+            self.breaker.failure()
+        self.breaker.success()
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.failures, 1)
+
+    def test_half_open(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        for _ in range(3):
+            self.breaker.failure()
+        # After delay, a single probe is allowed.
+        mock_monotonic.return_value = 130
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        self.assertFalse(self.breaker.allow())
+        # Another probe is allowed if the previous one has not completed after
+        # delay.
+        mock_monotonic.return_value = 160
+        self.assertTrue(self.breaker.allow())
+        # Circuit is closed when probe succeeds.
+        self.breaker.success()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.failures, 0)
+        self.assertTrue(self.breaker.allow())
+
+    def test_half_open_failure(self, mock_monotonic):
+        mock_monotonic.return_value = 100
+        for _ in range(3):
+            self.breaker.failure()
+        mock_monotonic.return_value = 130
+        self.assertTrue(self.breaker.allow())
+        # Circuit is opened again when probe fails, for another delay.
+        self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        self.assertEqual(self.breaker.trips, 1)
+        mock_monotonic.return_value = 159
+        self.assertFalse(self.breaker.allow())
+        mock_monotonic.return_value = 160
+        self.assertTrue(self.breaker.allow())
+
+    def test_disabled(self, mock_monotonic):
+        self.breaker.threshold = 0
+        for _ in range(10):
+            self.breaker.failure()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.failures, 10)
+        self.assertTrue(self.breaker.allow())
+
+
+@mock.patch("slurmweb.sessions.ssl.create_default_context")
+class TestAgentsSSLContext(unittest.TestCase):
+    def setUp(self):
+        self.cacert = tempfile.NamedTemporaryFile()
+        self.addCleanup(self.cacert.close)
+        self.context = AgentsSSLContext(Path(self.cacert.name))
+
+    def modify(self):
+        """Set modification time of CA certificate file in the future, as if it
+        was modified."""
+        mtime = os.stat(self.cacert.name).st_mtime + 10
+        os.utime(self.cacert.name, (mtime, mtime))
+
+    def test_get(self, mock_context):
+        mock_context.return_value = mock.sentinel.context
+        self.assertIs(self.context.get(), mock.sentinel.context)
+        self.assertIs(self.context.get(), mock.sentinel.context)
+        mock_context.assert_called_once_with(cafile=self.cacert.name)
+
+    def test_get_reload(self, mock_context):
+        mock_context.side_effect = [mock.sentinel.context1, mock.sentinel.context2]
+        self.assertIs(self.context.get(), mock.sentinel.context1)
+        self.modify()
+        # Modification is not checked before the interval
+        self.assertIs(self.context.get(), mock.sentinel.context1)
+        with mock.patch("slurmweb.sessions.CACERT_CHECK_INTERVAL", 0):
+            self.assertIs(self.context.get(), mock.sentinel.context2)
+            # Context is not loaded again when the file is not modified
+            self.assertIs(self.context.get(), mock.sentinel.context2)
+        self.assertEqual(mock_context.call_count, 2)
+
+    def test_get_reload_error(self, mock_context):
+        mock_context.side_effect = [
+            mock.sentinel.context,
+            ssl.SSLError(1, "fake ssl error"),
+        ]
+        self.context.get()
+        self.modify()
+        with mock.patch("slurmweb.sessions.CACERT_CHECK_INTERVAL", 0):
+            with self.assertLogs("slurmweb", level="ERROR") as cm:
+                self.assertIs(self.context.get(), mock.sentinel.context)
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.sessions:Unable to load agent CA certificate "
+                f"{self.cacert.name}: fake ssl error, keeping current certificate"
+            ],
+        )
+
+    def test_get_not_found(self, mock_context):
+        context = AgentsSSLContext(Path("/dev/fail"))
+        with self.assertRaisesRegex(
+            SlurmwebConfigurationError,
+            r"^Agent CA certificate file /dev/fail not found$",
+        ):
+            context.get()
+        mock_context.assert_not_called()
@@ -15,7 +15,7 @@ from slurmweb.slurmrestd.errors import (
     SlurmrestConnectionError,
     SlurmrestdInvalidResponseError,
 )
-from slurmweb.cache import CachingService
+from slurmweb.cache import CachingService, LocalCache
 from slurmweb.views.agent import racksdb_get_version
 
 from ..lib.agent import TestAgentBase
@@ -212,6 +212,89 @@ class TestAgentViews(TestAgentBase):
                 NodeSet(job["nodes"]),
             )
 
+    @all_slurm_api_versions
+    def test_request_jobs_query(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [jobs_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        user = jobs_asset[0]["user_name"]
+        response = self.client.get(
+            f"/v{get_version()}/jobs?users={user.upper()}&sort=id&order=desc"
+            "&page=1&limit=2"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.json, dict)
+        expected = sorted(
+            [job["job_id"] for job in jobs_asset if job["user_name"] == user],
+            reverse=True,
+        )
+        self.assertEqual(response.json["total"], len(expected))
+        self.assertEqual(response.json["page"], 1)
+        self.assertEqual(response.json["limit"], 2)
+        self.assertEqual([job["job_id"] for job in response.json["jobs"]], expected[:2])
+
+    def test_request_jobs_query_invalid(self):
+        response = self.client.get(f"/v{get_version()}/jobs?sort=fail")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json,
+            {
+                "code": 400,
+                "description": "Unsupported jobs sort criterion fail",
+                "name": "Bad Request",
+            },
+        )
+
+    @all_slurm_api_versions
+    def test_request_jobs_fields(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [jobs_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        response = self.client.get(f"/v{get_version()}/jobs?fields=job_id,job_state")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json,
+            [
+                {"job_id": job["job_id"], "job_state": job["job_state"]}
+                for job in jobs_asset
+            ],
+        )
+
+    @all_slurm_api_versions
+    def test_request_jobs_query_fields(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [jobs_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        response = self.client.get(
+            f"/v{get_version()}/jobs?fields=job_id&sort=user&page=1&limit=3"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json["total"], len(jobs_asset))
+        self.assertEqual(len(response.json["jobs"]), min(3, len(jobs_asset)))
+        for job in response.json["jobs"]:
+            self.assertEqual(list(job.keys()), ["job_id"])
+
+    def test_request_fields_unsupported(self):
+        response = self.client.get(f"/v{get_version()}/nodes?fields=name,fail,other")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json,
+            {
+                "code": 400,
+                "description": "Unsupported nodes fields: fail, other",
+                "name": "Bad Request",
+            },
+        )
+
     @all_slurm_api_versions
     def test_request_job_running(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -523,6 +606,140 @@ class TestAgentViews(TestAgentBase):
         for idx in range(len(response.json)):
             self.assertEqual(response.json[idx]["name"], partitions_asset[idx]["name"])
 
+    @all_slurm_api_versions
+    def test_request_nodes_fields(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [nodes_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-nodes", "nodes")],
+        )
+        response = self.client.get(f"/v{get_version()}/nodes?fields=name,state")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json,
+            [{"name": node["name"], "state": node["state"]} for node in nodes_asset],
+        )
+
+    @all_slurm_api_versions
+    def test_request_nodes_etag(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [nodes_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-nodes", "nodes")],
+        )
+        self.app.slurmrestd.snapshot_version = mock.Mock(return_value="1a2b")
+        response = self.client.get(f"/v{get_version()}/nodes")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), len(nodes_asset))
+        etag = response.headers["ETag"]
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        self.app.slurmrestd.snapshot_version.assert_called_once_with("nodes")
+        # Snapshot is not modified, slurmrestd is not requested and response has no
+        # content.
+        self.app.slurmrestd._request = mock.Mock()
+        response = self.client.get(
+            f"/v{get_version()}/nodes", headers={"If-None-Match": etag}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], etag)
+        self.app.slurmrestd._request.assert_not_called()
+
+    @all_slurm_api_versions
+    def test_request_nodes_etag_modified(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [nodes_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-nodes", "nodes")],
+        )
+        self.app.slurmrestd.snapshot_version = mock.Mock(return_value="3c4d")
+        response = self.client.get(
+            f"/v{get_version()}/nodes", headers={"If-None-Match": '"1a2b"'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), len(nodes_asset))
+        self.assertNotEqual(response.headers["ETag"], '"1a2b"')
+
+    @all_slurm_api_versions
+    def test_request_jobs_changes(self, slurm_version, api_version):
+        self.setup_slurmrestd(slurm_version, api_version)
+        [jobs_asset] = self.mock_slurmrestd_responses(
+            slurm_version,
+            api_version,
+            [("slurm-jobs", "jobs")],
+        )
+        response = self.client.get(f"/v{get_version()}/jobs/changes")
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            response.json.keys(), ["version", "full", "added", "modified", "removed"]
+        )
+        self.assertTrue(response.json["full"])
+        self.assertEqual(len(response.json["added"]), len(jobs_asset))
+
+    def test_request_changes_since(self):
+        nodes = [{"name": "cn1", "state": ["IDLE"]}, {"name": "cn2", "state": ["IDLE"]}]
+        self.app.slurmrestd.nodes = mock.Mock(return_value=nodes)
+        response = self.client.get(f"/v{get_version()}/nodes/changes?fields=state")
+        version = response.json["version"]
+        # Identifier is always selected with fields.
+        self.assertEqual(
+            response.json["added"],
+            [{"name": "cn1", "state": ["IDLE"]}, {"name": "cn2", "state": ["IDLE"]}],
+        )
+        self.app.slurmrestd.nodes.return_value = [
+            {"name": "cn1", "state": ["ALLOCATED"]}
+        ]
+        response = self.client.get(
+            f"/v{get_version()}/nodes/changes?since={version}&fields=state"
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.json["full"])
+        self.assertEqual(response.json["added"], [])
+        self.assertEqual(
+            response.json["modified"], [{"name": "cn1", "state": ["ALLOCATED"]}]
+        )
+        self.assertEqual(response.json["removed"], ["cn2"])
+
+    def test_request_etag_query_parameters(self):
+        self.app.slurmrestd.snapshot_version = mock.Mock(return_value="1a2b")
+        self.app.slurmrestd._request = mock.Mock(return_value=[])
+        etags = [
+            self.client.get(f"/v{get_version()}/jobs{query}").headers["ETag"]
+            for query in ["", "?fields=job_id", "?sort=user"]
+        ]
+        # ETag depends on query parameters
+        self.assertEqual(len(set(etags)), 3)
+        self.assertEqual(
+            self.app.slurmrestd.snapshot_version.call_args_list,
+            [mock.call("jobs"), mock.call("jobs"), mock.call("jobs-index")],
+        )
+
+    def test_request_stats_etag(self):
+        self.app.slurmrestd.snapshot_version = mock.Mock(return_value="1a2b-3c4d")
+        self.app.slurmrestd._request = mock.Mock(return_value=[])
+        response = self.client.get(f"/v{get_version()}/stats")
+        self.assertEqual(response.status_code, 200)
+        self.app.slurmrestd.snapshot_version.assert_called_once_with(
+            "jobs-summary", "nodes-summary"
+        )
+        response = self.client.get(
+            f"/v{get_version()}/stats",
+            headers={"If-None-Match": response.headers["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_request_etag_unknown_version(self):
+        self.app.slurmrestd._request = mock.Mock(return_value=[])
+        # Without cache, snapshot version is unknown, response has no ETag.
+        response = self.client.get(
+            f"/v{get_version()}/nodes", headers={"If-None-Match": "*"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response.headers)
+
     @all_slurm_api_versions
     def test_request_qos(self, slurm_version, api_version):
         self.setup_slurmrestd(slurm_version, api_version)
@@ -614,11 +831,14 @@ class TestAgentViews(TestAgentBase):
 
     def test_cache_stats(self):
         self.app.cache = mock.Mock(spec=CachingService)
+        self.app.cache.local = None
         self.app.cache.metrics.return_value = (
             {"jobs": 10, "nodes": 5},
             {"jobs": 8, "nodes": 3},
+            {"jobs": 2},
             15,
             11,
+            2,
         )
         response = self.client.get(f"/v{get_version()}/cache/stats")
         self.assertEqual(response.status_code, 200)
@@ -627,6 +847,39 @@ class TestAgentViews(TestAgentBase):
             {
                 "hit": {"keys": {"jobs": 10, "nodes": 5}, "total": 15},
                 "miss": {"keys": {"jobs": 8, "nodes": 3}, "total": 11},
+                "coalesced": {"keys": {"jobs": 2}, "total": 2},
+            },
+        )
+
+    def test_cache_stats_local(self):
+        self.app.cache = mock.Mock(spec=CachingService)
+        self.app.cache.local = mock.Mock(spec=LocalCache)
+        self.app.cache.metrics.return_value = (
+            {"jobs": 10, "nodes": 5},
+            {"jobs": 8, "nodes": 3},
+            {"jobs": 2},
+            15,
+            11,
+            2,
+        )
+        self.app.cache.local.metrics.return_value = (
+            {"jobs": 30},
+            {"jobs": 10, "nodes": 8},
+            30,
+            18,
+        )
+        response = self.client.get(f"/v{get_version()}/cache/stats")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json,
+            {
+                "hit": {"keys": {"jobs": 10, "nodes": 5}, "total": 15},
+                "miss": {"keys": {"jobs": 8, "nodes": 3}, "total": 11},
+                "coalesced": {"keys": {"jobs": 2}, "total": 2},
+                "local": {
+                    "hit": {"keys": {"jobs": 30}, "total": 30},
+                    "miss": {"keys": {"jobs": 10, "nodes": 8}, "total": 18},
+                },
             },
         )
 
@@ -652,9 +905,12 @@ class TestAgentViews(TestAgentBase):
 
     def test_cache_reset(self):
         self.app.cache = mock.Mock(spec=CachingService)
+        self.app.cache.local = None
         self.app.cache.metrics.return_value = (
             {"jobs": 0},
             {"jobs": 0},
+            {"jobs": 0},
+            0,
             0,
             0,
         )
@@ -668,6 +924,7 @@ class TestAgentViews(TestAgentBase):
             {
                 "hit": {"keys": {"jobs": 0}, "total": 0},
                 "miss": {"keys": {"jobs": 0}, "total": 0},
+                "coalesced": {"keys": {"jobs": 0}, "total": 0},
             },
         )
 
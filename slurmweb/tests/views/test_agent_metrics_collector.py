@@ -52,6 +52,8 @@ class TestAgentMetricsCollector(TestAgentBase):
                 "slurm_gpus_total",
                 "slurm_jobs",
                 "slurm_jobs_total",
+                "slurmweb_memo_hit",
+                "slurmweb_memo_miss",
             ],
             metrics_names,
         )
@@ -71,11 +73,14 @@ class TestAgentMetricsCollector(TestAgentBase):
             [("slurm-nodes", "nodes"), ("slurm-jobs", "jobs")],
         )
         self.app.metrics_collector.cache = mock.Mock(spec=CachingService)
+        self.app.metrics_collector.cache.local = None
         self.app.metrics_collector.cache.metrics.return_value = (
             {"jobs": 10, "nodes": 5},
             {"jobs": 8, "nodes": 3},
+            {"jobs": 4},
             15,
             11,
+            4,
         )
         response = self.client.get("/metrics")
         self.assertEqual(response.status_code, 200)
@@ -92,10 +97,14 @@ class TestAgentMetricsCollector(TestAgentBase):
                 "slurm_gpus_total",
                 "slurm_jobs",
                 "slurm_jobs_total",
+                "slurmweb_memo_hit",
+                "slurmweb_memo_miss",
                 "slurmweb_cache_hit",
                 "slurmweb_cache_miss",
+                "slurmweb_cache_coalesced",
                 "slurmweb_cache_hit_total",
                 "slurmweb_cache_miss_total",
+                "slurmweb_cache_coalesced_total",
             ],
             metrics_names,
         )
@@ -105,6 +114,8 @@ class TestAgentMetricsCollector(TestAgentBase):
                 self.assertEqual(family.samples[0].value, 15)
             if family.name == "slurmweb_cache_miss_total":
                 self.assertEqual(family.samples[0].value, 11)
+            if family.name == "slurmweb_cache_coalesced_total":
+                self.assertEqual(family.samples[0].value, 4)
 
     def test_request_metrics_forbidden(self):
         # Change restricted list of network allowed to request metrics
@@ -121,7 +132,7 @@ class TestAgentMetricsCollector(TestAgentBase):
         self.assertEqual(
             cm.output,
             [
-                "WARNING:slurmweb.metrics.collector:IP address 127.0.0.1 not "
+                "WARNING:slurmweb.metrics.base:IP address 127.0.0.1 not "
                 "authorized to request metrics"
             ],
         )
@@ -5,14 +5,23 @@
 # SPDX-License-Identifier: MIT
 
 from unittest import mock
+import asyncio
 import tempfile
 import os
 import shutil
+import json
+
+import aiohttp
 
 from slurmweb.version import get_version
+from slurmweb.views.gateway import proxy_agent
 
 from ..lib.gateway import TestGatewayBase, fake_slurmweb_agent
-from ..lib.utils import flask_version, mock_agent_aio_response
+from ..lib.utils import (
+    flask_version,
+    mock_agent_aio_response,
+    AsyncContextManagerMock,
+)
 
 
 class TestGatewayViews(TestGatewayBase):
@@ -125,26 +134,257 @@ class TestGatewayViews(TestGatewayBase):
         self.assertEqual(response.status_code, 200)
         self.assertCountEqual(response.json.keys(), ["hit", "miss"])
 
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_validators_forwarded(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        asset, mock_get.return_value = mock_agent_aio_response(asset="jobs")
+        mock_get.return_value.mock.headers.update(
+            {"ETag": '"1a2b"', "Cache-Control": "no-cache"}
+        )
+        response = self.client.get(
+            "/api/agents/foo/jobs", headers={"If-None-Match": '"3c4d"'}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, asset)
+        self.assertEqual(response.headers["ETag"], '"1a2b"')
+        self.assertEqual(response.headers["Cache-Control"], "no-cache")
+        # Request validators are sent to agent
+        self.assertEqual(mock_get.call_args[1]["headers"]["If-None-Match"], '"3c4d"')
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_not_modified(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        _, mock_get.return_value = mock_agent_aio_response(status=304, content="-")
+        mock_get.return_value.mock.headers.update({"ETag": '"1a2b"'})
+        response = self.client.get(
+            "/api/agents/foo/jobs", headers={"If-None-Match": '"1a2b"'}
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b"")
+        self.assertEqual(response.headers["ETag"], '"1a2b"')
+        mock_get.return_value.mock.json.assert_not_called()
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_jobs_changes(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        changes = {
+            "version": "3c4d",
+            "full": False,
+            "added": [],
+            "modified": [],
+            "removed": ["1"],
+        }
+        _, mock_get.return_value = mock_agent_aio_response(content=changes)
+        response = self.client.get("/api/agents/foo/jobs/changes?since=1a2b")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, changes)
+        # Query parameters are forwarded to agent
+        self.assertTrue(mock_get.call_args[0][0].endswith("/jobs/changes?since=1a2b"))
+
+    def test_events_disabled(self):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        response = self.client.get("/api/agents/foo/events/jobs")
+        self.assertEqual(response.status_code, 501)
+        self.assertEqual(response.json["description"], "Events streams are disabled")
+
+    def test_events_unsupported_resource(self):
+        self.app.settings.events.enabled = True
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        response = self.client.get("/api/agents/foo/events/qos")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(
+            response.json["description"], "Unsupported events resource qos"
+        )
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_events(self, mock_get):
+        self.app.settings.events.enabled = True
+        agent = fake_slurmweb_agent("foo")
+        self.app_set_agents({"foo": agent})
+        _, mock_get.return_value = mock_agent_aio_response(
+            content={"roles": ["user"], "actions": ["view-jobs"]}
+        )
+        with mock.patch.object(self.app.events, "channel") as mock_channel:
+            mock_channel.return_value.stream.return_value = iter(
+                [b"event: changes\nid: 1a2b\ndata: {}\n\n"]
+            )
+            response = self.client.get(
+                "/api/agents/foo/events/jobs", headers={"Last-Event-ID": "3c4d"}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.mimetype, "text/event-stream")
+            self.assertEqual(response.headers["Cache-Control"], "no-cache")
+            self.assertEqual(response.data, b"event: changes\nid: 1a2b\ndata: {}\n\n")
+            mock_channel.assert_called_once_with("foo", "jobs")
+            mock_channel.return_value.subscribe.assert_called_once_with(
+                mock.ANY, agent, "3c4d"
+            )
+        # Permissions are checked on agent
+        self.assertTrue(mock_get.call_args[0][0].endswith("/permissions"))
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_events_denied(self, mock_get):
+        self.app.settings.events.enabled = True
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        _, mock_get.return_value = mock_agent_aio_response(
+            content={"roles": ["user"], "actions": ["view-jobs"]}
+        )
+        with mock.patch.object(self.app.events, "channel") as mock_channel:
+            response = self.client.get("/api/agents/foo/events/nodes")
+            mock_channel.assert_not_called()
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            response.json["description"],
+            "Not allowed to receive nodes events from cluster foo",
+        )
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_passthrough(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        asset, mock_get.return_value = mock_agent_aio_response(asset="nodes")
+        stream = mock_get.return_value.mock.content
+        with mock.patch.object(stream, "read", wraps=stream.read) as mock_read:
+            with mock.patch("slurmweb.views.gateway.STREAM_CHUNK_SIZE", 1024):
+                response = self.client.get("/api/agents/foo/nodes")
+                data = response.data
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/json")
+        # Agent response body is forwarded unmodified in chunks, without being
+        # decoded.
+        self.assertGreater(len(data), 1024)
+        self.assertEqual(data, json.dumps(asset).encode())
+        self.assertEqual(mock_read.call_count, len(data) // 1024 + 2)
+        mock_get.return_value.mock.json.assert_not_called()
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_passthrough_read_error(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        for error in (asyncio.TimeoutError, aiohttp.ClientPayloadError):
+            _, mock_get.return_value = mock_agent_aio_response(asset="nodes")
+            stream = mock_get.return_value.mock.content
+            with mock.patch.object(stream, "read", side_effect=error):
+                with self.assertRaises(error):
+                    self.client.get("/api/agents/foo/nodes").data
+        # Errors while reading the body of agent responses are recorded as failures
+        # in the circuit breaker of the agent.
+        self.assertEqual(self.app.sessions.breaker("http://foo").failures, 2)
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_passthrough_closed_not_iterated(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        _, mock_get.return_value = mock_agent_aio_response(asset="nodes")
+        released = []
+
+        async def aexit(context, exc_type, exc, tb):
+            released.append(context)
+
+        with mock.patch.object(AsyncContextManagerMock, "__aexit__", aexit):
+            with self.app.test_request_context("/api/agents/foo/nodes"):
+                response = proxy_agent("foo", "nodes", "token")
+            self.assertEqual(released, [])
+            # Connection to the agent is released when the response is closed
+            # without being iterated.
+            response.close()
+            self.assertEqual(released, [mock_get.return_value])
+            # Connection is released once when the response is also iterated.
+            with self.app.test_request_context("/api/agents/foo/nodes"):
+                response = proxy_agent("foo", "nodes", "token")
+            response.get_data()
+            response.close()
+        self.assertEqual(released, [mock_get.return_value] * 2)
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_passthrough_error_status(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        _, mock_get.return_value = mock_agent_aio_response(
+            status=404,
+            content={"code": 404, "description": "Unable to find job 1"},
+        )
+        response = self.client.get("/api/agents/foo/job/1")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json["description"], "Unable to find job 1")
+
     @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
     def test_unexpected_not_json(self, mock_get):
         self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
         _, mock_get.return_value = mock_agent_aio_response(
-            content="fail", fail_content_type=True
+            content="fail", is_json=False
         )
-        response = self.client.get("/api/agents/foo/jobs")
+        with self.assertLogs("slurmweb", level="ERROR"):
+            response = self.client.get("/api/agents/foo/jobs")
         self.assertEqual(response.status_code, 500)
         self.assertEqual(
             response.json,
             {
                 "code": 500,
                 "description": (
-                    "Unsupported Content-Type for agent foo URL http://localhost/info: "
-                    "0, message='', url='http://localhost/info'"
+                    "Unsupported Content-Type text/plain for agent foo URL "
+                    f"http://foo/v{get_version()}/jobs"
                 ),
                 "name": "Internal Server Error",
             },
         )
 
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_agent_connection_error(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        mock_get.side_effect = aiohttp.ClientConnectionError("fake connection error")
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            response = self.client.get("/api/agents/foo/jobs")
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(
+            response.json["description"], "Connection error: fake connection error"
+        )
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.views.gateway:Connection error with agent foo: fake "
+                "connection error"
+            ],
+        )
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_agent_circuit_open(self, mock_get):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        breaker = self.app.sessions.breaker("http://foo")
+        with self.assertLogs("slurmweb", level="WARNING"):
+            for _ in range(self.app.settings.agents.breaker_threshold):
+                breaker.failure()
+        with self.assertLogs("slurmweb", level="WARNING") as cm:
+            response = self.client.get("/api/agents/foo/jobs")
+        # Request is rejected without being sent to the agent.
+        mock_get.assert_not_called()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(
+            response.json["description"],
+            "Circuit breaker open for agent at url http://foo",
+        )
+        self.assertEqual(
+            cm.output,
+            [
+                "WARNING:slurmweb.views.gateway:Request to agent foo rejected: "
+                "Circuit breaker open for agent at url http://foo"
+            ],
+        )
+
+    def test_agent_session_shared(self):
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        _, response = mock_agent_aio_response(asset="stats")
+        sessions = []
+
+        def get(session, *args, **kwargs):
+            sessions.append(session)
+            return response
+
+        with mock.patch.object(aiohttp.ClientSession, "get", get):
+            for _ in range(2):
+                self.assertEqual(
+                    self.client.get("/api/agents/foo/stats").status_code, 200
+                )
+        # Both requests are sent on the same client session of the agent
+        self.assertEqual(len(sessions), 2)
+        self.assertIs(sessions[0], sessions[1])
+
     @mock.patch("slurmweb.views.gateway.get_version")
     def test_unexpected_generic_exception(self, mock_version):
         # By default in development and testing mode, Flask propagate exceptions
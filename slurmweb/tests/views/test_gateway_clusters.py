@@ -6,6 +6,8 @@
 
 from unittest import mock
 
+import aiohttp
+
 from ..lib.gateway import TestGatewayBase, fake_slurmweb_agent
 from ..lib.utils import mock_agent_aio_response
 
@@ -34,6 +36,7 @@ class TestGatewayViews(TestGatewayBase):
                 "name": "foo",
                 "permissions": permissions,
                 "racksdb": True,
+                "error": False,
             },
         )
 
@@ -63,6 +66,7 @@ class TestGatewayViews(TestGatewayBase):
                     "name": "foo",
                     "permissions": permissions,
                     "racksdb": True,
+                    "error": False,
                 },
                 {
                     "infrastructure": "bar",
@@ -71,6 +75,7 @@ class TestGatewayViews(TestGatewayBase):
                     "name": "bar",
                     "permissions": permissions,
                     "racksdb": True,
+                    "error": False,
                 },
                 {
                     "infrastructure": "baz",
@@ -79,6 +84,7 @@ class TestGatewayViews(TestGatewayBase):
                     "name": "baz",
                     "permissions": permissions,
                     "racksdb": True,
+                    "error": False,
                 },
             ],
         )
@@ -93,10 +99,18 @@ class TestGatewayViews(TestGatewayBase):
             response = self.client.get("/api/clusters")
         self.assertEqual(response.status_code, 200)
         self.assertIsInstance(response.json, list)
-        self.assertEqual(len(response.json), 0)
-        self.assertCountEqual(
-            response.json,
-            [],
+        self.assertEqual(len(response.json), 1)
+        self.assertEqual(
+            response.json[0],
+            {
+                "infrastructure": "foo",
+                "metrics": True,
+                "cache": True,
+                "name": "foo",
+                "permissions": {"roles": [], "actions": []},
+                "racksdb": True,
+                "error": True,
+            },
         )
         self.assertEqual(
             cm.output,
@@ -106,6 +120,46 @@ class TestGatewayViews(TestGatewayBase):
             ],
         )
 
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_clusters_agent_unhealthy(self, mock_get):
+        permissions, response = mock_agent_aio_response(asset="permissions")
+
+        def get(url, **kwargs):
+            if url.startswith("http://bar/"):
+                raise aiohttp.ServerTimeoutError("fake timeout")
+            return response
+
+        mock_get.side_effect = get
+        self.app_set_agents(
+            {"foo": fake_slurmweb_agent("foo"), "bar": fake_slurmweb_agent("bar")}
+        )
+        with self.assertLogs("slurmweb", level="ERROR") as cm:
+            response = self.client.get("/api/clusters")
+        # Unhealthy cluster is returned with error, along with other clusters.
+        self.assertEqual(response.status_code, 200)
+        self.assertCountEqual(
+            [(cluster["name"], cluster["error"]) for cluster in response.json],
+            [("foo", False), ("bar", True)],
+        )
+        self.assertEqual(
+            cm.output,
+            [
+                "ERROR:slurmweb.views.gateway:Unable to retrieve permissions from "
+                "cluster bar: [ServerTimeoutError] fake timeout"
+            ],
+        )
+
+    @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
+    def test_clusters_agent_unhealthy_hide(self, mock_get):
+        mock_get.side_effect = aiohttp.ClientConnectionError("fake connection error")
+        self.app_set_agents({"foo": fake_slurmweb_agent("foo")})
+        # Enable UI hide denied parameter
+        self.app.settings.ui.hide_denied = True
+        with self.assertLogs("slurmweb", level="ERROR"):
+            response = self.client.get("/api/clusters")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json, [])
+
     @mock.patch("slurmweb.views.gateway.aiohttp.ClientSession.get")
     def test_clusters_denied_no_hide(self, mock_get):
         permissions = {"actions": []}
@@ -127,6 +181,7 @@ class TestGatewayViews(TestGatewayBase):
                     "name": "foo",
                     "permissions": permissions,
                     "racksdb": True,
+                    "error": False,
                 },
                 {
                     "infrastructure": "bar",
@@ -135,6 +190,7 @@ class TestGatewayViews(TestGatewayBase):
                     "name": "bar",
                     "permissions": permissions,
                     "racksdb": True,
+                    "error": False,
                 },
             ],
         )
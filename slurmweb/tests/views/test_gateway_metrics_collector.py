@@ -0,0 +1,55 @@
+# Copyright (c) 2026 Rackslab
+#
+# This file is part of Slurm-web.
+#
+# SPDX-License-Identifier: MIT
+
+
+from prometheus_client.parser import text_string_to_metric_families
+
+from ..lib.gateway import TestGatewayBase
+
+
+class TestGatewayMetricsCollector(TestGatewayBase):
+    def setUp(self):
+        self.setup_app(conf_overrides={"metrics": True})
+
+    def tearDown(self):
+        self.app.metrics_collector.unregister()
+
+    def test_request_metrics(self):
+        self.app.sessions.breaker("http://foo")
+        with self.assertLogs("slurmweb", level="WARNING"):
+            for _ in range(self.app.settings.agents.breaker_threshold):
+                self.app.sessions.breaker("http://bar").failure()
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        families = {
+            family.name: family
+            for family in text_string_to_metric_families(response.text)
+        }
+        self.assertCountEqual(
+            [
+                "slurmweb_agent_breaker_state",
+                "slurmweb_agent_breaker_failures",
+                "slurmweb_agent_breaker_trips",
+            ],
+            families.keys(),
+        )
+        self.assertCountEqual(
+            [
+                (sample.labels["agent"], sample.labels["state"])
+                for sample in families["slurmweb_agent_breaker_state"].samples
+                if sample.value == 1
+            ],
+            [("http://foo", "closed"), ("http://bar", "open")],
+        )
+
+    def test_request_metrics_forbidden(self):
+        response = self.client.get(
+            "/metrics", environ_base={"REMOTE_ADDR": "192.168.1.1"}
+        )
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(
+            response.text, "IP address 192.168.1.1 not authorized to request metrics\n"
+        )
@@ -40,6 +40,7 @@ class TestGatewayUI(TestGatewayBase):
             {
                 "API_SERVER": "http://localhost:5011/",
                 "AUTHENTICATION": False,
+                "EVENTS": False,
                 "RACKSDB_RACKS_LABELS": False,
                 "RACKSDB_ROWS_LABELS": False,
                 "VERSION": get_version(),
@@ -57,6 +58,7 @@ class TestGatewayUI(TestGatewayBase):
             {
                 "API_SERVER": "http://localhost:5011/slurm-web",
                 "AUTHENTICATION": False,
+                "EVENTS": False,
                 "RACKSDB_RACKS_LABELS": False,
                 "RACKSDB_ROWS_LABELS": False,
                 "VERSION": get_version(),
@@ -4,15 +4,19 @@
 #
 # SPDX-License-Identifier: MIT
 
-from typing import Any, Tuple
+from typing import Any, Callable, List, Optional, Tuple
+import hashlib
 import logging
 
 from flask import Response, current_app, jsonify, abort, request
 from rfl.web.tokens import rbac_action, check_jwt
 
 from ..version import get_version
-from ..errors import SlurmwebCacheError, SlurmwebMetricsDBError
+from ..errors import SlurmwebCacheError, SlurmwebMetricsDBError, SlurmwebQueryError
 
+from ..slurmrestd import Slurmrestd
+from ..slurmrestd.jobs import JobsQuery
+from ..slurmrestd.changes import CHANGES_IDENTIFIERS
 from ..slurmrestd.errors import (
     SlurmrestdNotFoundError,
     SlurmrestdInvalidResponseError,
@@ -110,7 +114,7 @@ def ping():
     """Ping endpoint that discovers slurmrestd API version and returns it along with
     Slurm version information."""
     # Discover and save both API version and Slurm version
-    _, slurm_version, api_version = current_app.slurmrestd.discover()
+    [(_, slurm_version, api_version)] = current_app.slurmrestd.query(("discover", ()))
 
     return jsonify(
         {
@@ -124,88 +128,217 @@ def ping():
 
 @handle_slurmrestd_errors
 def slurmrest(method: str, *args: Tuple[Any, ...]):
-    return getattr(current_app.slurmrestd, method)(*args)
+    [result] = current_app.slurmrestd.query((method, args))
+    return result
+
+
+@handle_slurmrestd_errors
+def slurmrest_query(*calls: Tuple[str, Tuple[Any, ...]]) -> List[Any]:
+    """Run multiple independent slurmrestd calls, concurrently when supported by
+    slurmrestd client, and return the list of results."""
+    return current_app.slurmrestd.query(*calls)
+
+
+@handle_slurmrestd_errors
+def snapshot_etag(*keys: str) -> Optional[str]:
+    """Return the ETag of the response built with the snapshot of data saved in
+    cache under the given keys and the query parameters of the request, or None if
+    the version of this snapshot is unknown."""
+    version = current_app.slurmrestd.snapshot_version(*keys)
+    if version is None:
+        return None
+    return hashlib.blake2b(
+        f"{version}?{request.query_string.decode()}".encode(), digest_size=12
+    ).hexdigest()
+
+
+def conditional(keys: List[str], build: Callable[[], Any]) -> Response:
+    """Return HTTP/304 response without content when the request validators match
+    the ETag of the snapshot of data saved in cache under the given keys, or the JSON
+    response with the result of build otherwise. The ETag is retrieved before the
+    data, so it is never newer than the data sent to clients."""
+    etag = snapshot_etag(*keys)
+    if etag is not None and request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = jsonify(build())
+    if etag is not None:
+        response.set_etag(etag)
+        # Clients must revalidate the response on every request.
+        response.cache_control.no_cache = True
+    return response
 
 
 @rbac_action("view-stats")
 def stats():
-    total = 0
-    running = 0
-
-    for job in slurmrest("jobs"):
-        total += 1
-        if "RUNNING" in job["job_state"]:
-            running += 1
-
-    nodes = 0
-    cores = 0
-    memory = 0
-    gpus = 0
-    for node in slurmrest("nodes"):
-        nodes += 1
-        cores += node["cpus"]
-        memory += node["real_memory"]
-        gpus += current_app.slurmrestd.node_gres_extract_gpus(node["gres"])
-    return jsonify(
-        {
+    def build():
+        jobs, nodes = slurmrest_query(("jobs_summary", ()), ("nodes_summary", ()))
+        return {
             "resources": {
-                "nodes": nodes,
-                "cores": cores,
-                "memory": memory,
-                "gpus": gpus,
+                "nodes": nodes["totals"]["nodes"],
+                "cores": nodes["totals"]["cores"],
+                "memory": nodes["totals"]["memory"],
+                "gpus": nodes["totals"]["gpus"],
             },
-            "jobs": {"running": running, "total": total},
+            "jobs": {"running": jobs["states"]["running"], "total": jobs["total"]},
         }
+
+    return conditional(["jobs-summary", "nodes-summary"], build)
+
+
+def _fields(collection: str) -> Optional[List[str]]:
+    """Return the list of fields of the given collection selected with fields query
+    parameter, or None if this parameter is not defined. Fields must be selected in
+    the filters of the collection, abort with HTTP/400 otherwise."""
+    value = request.args.get("fields")
+    if value is None:
+        return None
+    fields = [field for field in value.split(",") if field]
+    allowed = getattr(current_app.settings.filters, collection)
+    if allowed is not None:
+        unsupported = [field for field in fields if field not in allowed]
+        if unsupported:
+            error = f"Unsupported {collection} fields: {', '.join(unsupported)}"
+            logger.warning(error)
+            abort(400, error)
+    return fields
+
+
+def slurmrest_collection(method: str, *args: Tuple[Any, ...]) -> Response:
+    """Return response with the records of the collection returned by the given
+    slurmrestd method, projected on the fields selected in request."""
+    fields = _fields(method)
+    return conditional(
+        [method],
+        lambda: Slurmrestd.project_fields(slurmrest(method, *args), fields),
     )
 
 
 @rbac_action("view-jobs")
 def jobs():
+    fields = _fields("jobs")
     node = request.args.get("node")
     if node:
-        return jsonify(slurmrest("jobs_by_node", node))
-    else:
-        return jsonify(slurmrest("jobs"))
+        return conditional(
+            ["jobs-nodes"],
+            lambda: Slurmrestd.project_fields(slurmrest("jobs_by_node", node), fields),
+        )
+    try:
+        query = JobsQuery.from_args(request.args)
+    except SlurmwebQueryError as err:
+        logger.warning("Invalid jobs query: %s", err)
+        abort(400, str(err))
+    if query is not None:
+
+        def build():
+            result = slurmrest("jobs_query", query)
+            return dict(result, jobs=Slurmrestd.project_fields(result["jobs"], fields))
+
+        return conditional(["jobs-index"], build)
+    return conditional(
+        ["jobs"], lambda: Slurmrestd.project_fields(slurmrest("jobs"), fields)
+    )
+
+
+def slurmrest_changes(collection: str) -> Response:
+    """Return response with the changes of the records of the collection since the
+    snapshot version selected with since query parameter. Added and modified records
+    are projected on the fields selected in request, with the identifier of records
+    to apply changes."""
+    fields = _fields(collection)
+    identifier = CHANGES_IDENTIFIERS[collection]
+    if fields is not None and identifier not in fields:
+        fields = [identifier] + fields
+
+    def build():
+        result = slurmrest(f"{collection}_changes", request.args.get("since"))
+        return dict(
+            result,
+            added=Slurmrestd.project_fields(result["added"], fields),
+            modified=Slurmrestd.project_fields(result["modified"], fields),
+        )
+
+    return conditional([f"{collection}-digests"], build)
+
+
+@rbac_action("view-jobs")
+def jobs_changes():
+    return slurmrest_changes("jobs")
 
 
 @rbac_action("view-jobs")
 def job(job: int):
-    return jsonify(slurmrest("job", job))
+    return conditional([f"job-{job}"], lambda: slurmrest("job", job))
 
 
 @rbac_action("view-nodes")
 def nodes():
-    return jsonify(slurmrest("nodes"))
+    return slurmrest_collection("nodes")
+
+
+@rbac_action("view-nodes")
+def nodes_changes():
+    return slurmrest_changes("nodes")
 
 
 @rbac_action("view-nodes")
 def node(name: str):
-    return jsonify(slurmrest("node", name))
+    return conditional([f"node-{name}"], lambda: slurmrest("node", name))
 
 
 @rbac_action("view-partitions")
 def partitions():
-    return jsonify(slurmrest("partitions"))
+    return slurmrest_collection("partitions")
 
 
 @rbac_action("view-qos")
 def qos():
-    return jsonify(slurmrest("qos"))
+    return slurmrest_collection("qos")
 
 
 @rbac_action("view-reservations")
 def reservations():
-    return jsonify(slurmrest("reservations"))
+    return slurmrest_collection("reservations")
 
 
 @rbac_action("view-accounts")
 def accounts():
-    return jsonify(slurmrest("accounts"))
+    return slurmrest_collection("accounts")
 
 
 @rbac_action("associations-view")
 def associations():
-    return jsonify(slurmrest("associations"))
+    return slurmrest_collection("associations")
+
+
+def _cache_metrics():
+    """Return cache statistics, with statistics of the local cache of the process
+    when enabled."""
+    (
+        cache_hits,
+        cache_misses,
+        cache_coalesced,
+        total_hits,
+        total_misses,
+        total_coalesced,
+    ) = current_app.cache.metrics()
+    result = {
+        "hit": {"keys": cache_hits, "total": total_hits},
+        "miss": {"keys": cache_misses, "total": total_misses},
+        "coalesced": {"keys": cache_coalesced, "total": total_coalesced},
+    }
+    if current_app.cache.local is not None:
+        (
+            local_hits,
+            local_misses,
+            local_total_hits,
+            local_total_misses,
+        ) = current_app.cache.local.metrics()
+        result["local"] = {
+            "hit": {"keys": local_hits, "total": local_total_hits},
+            "miss": {"keys": local_misses, "total": local_total_misses},
+        }
+    return result
 
 
 @rbac_action("cache-view")
@@ -214,13 +347,7 @@ def cache_stats():
         error = "Cache service is disabled, unable to query cache statistics"
         logger.warning(error)
         abort(501, error)
-    (cache_hits, cache_misses, total_hits, total_misses) = current_app.cache.metrics()
-    return jsonify(
-        {
-            "hit": {"keys": cache_hits, "total": total_hits},
-            "miss": {"keys": cache_misses, "total": total_misses},
-        }
-    )
+    return jsonify(_cache_metrics())
 
 
 @rbac_action("cache-reset")
@@ -234,13 +361,7 @@ def cache_reset():
     current_app.cache.reset()
 
     # Return fresh values right after reset
-    (cache_hits, cache_misses, total_hits, total_misses) = current_app.cache.metrics()
-    return jsonify(
-        {
-            "hit": {"keys": cache_hits, "total": total_hits},
-            "miss": {"keys": cache_misses, "total": total_misses},
-        }
-    )
+    return jsonify(_cache_metrics())
 
 
 @check_jwt
@@ -4,10 +4,13 @@
 #
 # SPDX-License-Identifier: MIT
 
+import typing as t
 import json
 import logging
+import collections
 from functools import wraps
 import asyncio
+import threading
 
 import jinja2
 from flask import Response, current_app, jsonify, request, abort, render_template
@@ -15,14 +18,26 @@ import aiohttp
 from rfl.web.tokens import check_jwt
 from rfl.authentication.user import AnonymousUser
 from rfl.authentication.errors import LDAPAuthenticationError
-from rfl.core.asyncio import asyncio_run
 
 from ..markdown import render_html
 from ..version import get_version
+from ..events import EVENTS_RESOURCES
+from ..sessions import AgentsSessions, AgentCircuitOpenError
 
 
 logger = logging.getLogger(__name__)
 
+# Request to agent, built with the current request in the thread of the view to be
+# sent in the event loop of the gateway.
+AgentRequest = collections.namedtuple(
+    "AgentRequest", ["agent", "method", "url", "headers", "json"]
+)
+
+# Headers of agent responses forwarded to clients for conditional requests.
+VALIDATORS_HEADERS = ["ETag", "Cache-Control"]
+# Maximum size in bytes of chunks of agent responses streamed to clients.
+STREAM_CHUNK_SIZE = 64 * 1024
+
 
 def validate_cluster(view):
     """Decorator for Flask views functions check for valid cluster path parameter."""
@@ -122,55 +137,98 @@ def message_login():
         abort(500, msg)
 
 
-async def get_cluster(agent):
-    """Return dict with cluster information, for the cluster managed by the given agent.
-    The dict contains permissions on the cluster for the request token. Return None if
-    request to get permissions failed."""
-    async with aiohttp.ClientSession(
-        connector=current_app.get_agent_connector()
-    ) as session:
-        async with request_agent(
-            session, agent.cluster, "permissions", request.token
-        ) as response:
+async def get_permissions(
+    sessions: AgentsSessions, cluster: str, agent_request: AgentRequest
+) -> t.Optional[t.Dict[str, t.Any]]:
+    """Return permissions on the cluster returned by its agent for the given request.
+    Return None if request to get permissions failed."""
+    try:
+        async with open_agent_request(sessions, agent_request) as response:
             if response.status != 200:
                 logger.error(
                     "Unable to retrieve permissions from cluster %s: %d",
-                    agent.cluster,
+                    cluster,
                     response.status,
                 )
                 return None
+            return await response.json()
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+        logger.error(
+            "Unable to retrieve permissions from cluster %s: [%s] %s",
+            cluster,
+            type(err).__name__,
+            str(err),
+        )
+        return None
 
-            permissions = await response.json()
 
-        # Hide the cluster if the actions list is empty and ui.hide_denied is enabled.
-        if not len(permissions["actions"]) and current_app.settings.ui.hide_denied:
-            return None
+async def gather_permissions(
+    sessions: AgentsSessions, agent_requests: t.Dict[str, AgentRequest]
+) -> t.List[t.Optional[t.Dict[str, t.Any]]]:
+    """Return the list of permissions on all clusters for the given requests."""
+    return await asyncio.gather(
+        *[
+            get_permissions(sessions, cluster, agent_request)
+            for cluster, agent_request in agent_requests.items()
+        ]
+    )
 
-        cluster = {
-            "name": agent.cluster,
-            "racksdb": agent.racksdb.enabled,
-            "infrastructure": agent.racksdb.infrastructure,
-            "metrics": agent.metrics,
-            "cache": agent.cache,
-            "permissions": permissions,
-        }
 
-    return cluster
+def get_clusters(agents):
+    """Return the list of available clusters with permissions for the request token.
+    Clusters on which request to get permissions failed are marked with error and
+    without permissions, unless denied clusters are hidden."""
+    agents = list(agents)
+    permissions = current_app.sessions.run(
+        gather_permissions(
+            current_app.sessions,
+            {
+                agent.cluster: request_agent(
+                    agent.cluster, "permissions", request.token
+                )
+                for agent in agents
+            },
+        )
+    )
+    clusters = []
+    for agent, _permissions in zip(agents, permissions):
+        error = _permissions is None
+        if error:
+            _permissions = {"roles": [], "actions": []}
+        # Hide the cluster if the actions list is empty and ui.hide_denied is
+        # enabled.
+        if not len(_permissions["actions"]) and current_app.settings.ui.hide_denied:
+            continue
+        clusters.append(
+            {
+                "name": agent.cluster,
+                "racksdb": agent.racksdb.enabled,
+                "infrastructure": agent.racksdb.infrastructure,
+                "metrics": agent.metrics,
+                "cache": agent.cache,
+                "permissions": _permissions,
+                "error": error,
+            }
+        )
+    return clusters
 
 
-async def get_clusters(agents):
-    """Return the list of available clusters with permissions. Clusters on which
-    request to get permissions failed are filtered out."""
-    return [
-        cluster
-        for cluster in await asyncio.gather(*[get_cluster(agent) for agent in agents])
-        if cluster is not None
-    ]
+def allowed_action(cluster: str, action: str) -> bool:
+    """Return True if the request token is allowed to perform the given action on
+    the cluster, according to the permissions returned by its agent."""
+    permissions = current_app.sessions.run(
+        get_permissions(
+            current_app.sessions,
+            cluster,
+            request_agent(cluster, "permissions", request.token),
+        )
+    )
+    return permissions is not None and action in permissions["actions"]
 
 
 @check_jwt
 def clusters():
-    return jsonify(asyncio_run(get_clusters(current_app.agents.values())))
+    return jsonify(get_clusters(current_app.agents.values()))
 
 
 @check_jwt
@@ -190,78 +248,165 @@ def users():
 
 
 def request_agent(
-    session: aiohttp.ClientSession,
     cluster: str,
     query: str,
     token: str = None,
     with_version: bool = True,
-):
-    """Return the aiohttp request context manager on the given session for the given
-    query."""
+) -> AgentRequest:
+    """Return the request to send to the agent of the cluster for the given query,
+    with the method, query string and body of the current request. Conditional
+    request validators are forwarded to the agent."""
     headers = {}
     if token is not None:
         headers = {"Authorization": f"Bearer {token}"}
-    try:
-        if with_version:
-            url = (
-                f"{current_app.agents[cluster].url}/"
-                f"v{current_app.agents[cluster].version}/{query}"
-            )
-        else:
-            url = f"{current_app.agents[cluster].url}/{query}"
-        if len(request.query_string):
-            url += f"?{request.query_string.decode()}"
-        if request.method == "GET":
-            return session.get(url, headers=headers)
-        elif request.method == "POST":
-            return session.post(
-                url,
-                headers=headers,
-                json=request.json,
-            )
-        else:
-            abort(500, f"Unsupported request method {request.method}")
-    except aiohttp.ClientConnectionError as err:
-        logger.error("Connection error with agent %s: %s", cluster, str(err))
-        abort(500, f"Connection error: {str(err)}")
+    if "If-None-Match" in request.headers:
+        headers["If-None-Match"] = request.headers["If-None-Match"]
+    agent = current_app.agents[cluster]
+    if with_version:
+        url = f"{agent.url}/v{agent.version}/{query}"
+    else:
+        url = f"{agent.url}/{query}"
+    if len(request.query_string):
+        url += f"?{request.query_string.decode()}"
+    if request.method == "GET":
+        return AgentRequest(agent.url, "GET", url, headers, None)
+    elif request.method == "POST":
+        return AgentRequest(agent.url, "POST", url, headers, request.json)
+    else:
+        abort(500, f"Unsupported request method {request.method}")
 
 
-async def async_proxy_agent(
+def open_agent_request(sessions: AgentsSessions, agent_request: AgentRequest):
+    """Return the aiohttp request context manager for the given request on the client
+    session of the agent."""
+    session = sessions.session(agent_request.agent)
+    if agent_request.method == "POST":
+        return session.post(
+            agent_request.url, headers=agent_request.headers, json=agent_request.json
+        )
+    return session.get(agent_request.url, headers=agent_request.headers)
+
+
+async def open_agent_response(
+    sessions: AgentsSessions, agent_request: AgentRequest
+) -> t.Tuple[t.Any, aiohttp.ClientResponse]:
+    """Send the request to the agent and return the request context manager with
+    the response, as soon as its headers are received. The body of the response is
+    not read, the context manager must be exited to release the connection."""
+    context = open_agent_request(sessions, agent_request)
+    return context, await context.__aenter__()
+
+
+async def read_agent_response(
+    sessions: AgentsSessions, agent: str, response: aiohttp.ClientResponse
+) -> bytes:
+    """Return the next chunk of the body of the agent response. Timeouts and
+    interrupted bodies are recorded as failures in the circuit breaker of the
+    agent, as they are not reported to the trace configuration of its session."""
+    try:
+        return await response.content.read(STREAM_CHUNK_SIZE)
+    except (asyncio.TimeoutError, aiohttp.ClientPayloadError):
+        sessions.breaker(agent).failure()
+        raise
+
+
+def release_agent_response(
+    sessions: AgentsSessions, context: t.Any
+) -> t.Callable[[], None]:
+    """Return function which exits the request context manager of the agent
+    response to release the connection to the agent. The context manager is exited
+    only once, whatever the number of calls of the function."""
+    lock = threading.Lock()
+    released = False
+
+    def release() -> None:
+        nonlocal released
+        with lock:
+            if released:
+                return
+            released = True
+        sessions.run(context.__aexit__(None, None, None))
+
+    return release
+
+
+def stream_agent_response(
+    sessions: AgentsSessions,
+    agent: str,
+    response: aiohttp.ClientResponse,
+    release: t.Callable[[], None],
+) -> t.Iterator[bytes]:
+    """Yield chunks of the body of the agent response as they are received, and
+    release the connection to the agent at the end."""
+    try:
+        while True:
+            chunk = sessions.run(read_agent_response(sessions, agent, response))
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        release()
+
+
+def forward_validators(
+    agent_response: aiohttp.ClientResponse, response: Response
+) -> Response:
+    """Copy ETag and Cache-Control headers of the agent response to the given Flask
+    response and return it."""
+    for header in VALIDATORS_HEADERS:
+        if header in agent_response.headers:
+            response.headers[header] = agent_response.headers[header]
+    return response
+
+
+def proxy_agent(
     cluster: str,
     query: str,
     token: str = None,
     json: bool = True,
     with_version: bool = True,
 ):
-    """Initialize an asynchronous client session, send the request to the agent and
-    return Flask response."""
-    async with aiohttp.ClientSession(
-        connector=current_app.get_agent_connector()
-    ) as session:
-        async with request_agent(
-            session, cluster, query, token, with_version
-        ) as response:
-            if json:
-                try:
-                    return jsonify(await response.json()), response.status
-                except aiohttp.client_exceptions.ContentTypeError as err:
-                    msg = (
-                        f"Unsupported Content-Type for agent {cluster} URL "
-                        f"{err.request_info.url}: {err}"
-                    )
-                    logger.error(msg)
-                    abort(500, msg)
-            else:
-                return Response(
-                    await response.read(),
-                    status=response.status,
-                    mimetype=response.headers.get("content-type"),
-                )
-
-
-def proxy_agent(*args, **kwargs):
-    """Launch asynchronous coroutine to request the agent."""
-    return asyncio_run(async_proxy_agent(*args, **kwargs))
+    """Send the request to the agent in the event loop of the gateway and return
+    Flask response. The body of the agent response is streamed to the client as it
+    is received, without being decoded. When json is True, only the Content-Type of
+    the agent response is checked. When the agent answers with HTTP/304, the
+    response is returned without content. ETag and Cache-Control headers of the
+    agent response are forwarded to the client."""
+    agent_request = request_agent(cluster, query, token, with_version)
+    sessions = current_app.sessions
+    try:
+        context, response = sessions.run(open_agent_response(sessions, agent_request))
+    except AgentCircuitOpenError as err:
+        logger.warning("Request to agent %s rejected: %s", cluster, str(err))
+        abort(503, str(err))
+    except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as err:
+        logger.error("Connection error with agent %s: %s", cluster, str(err))
+        abort(500, f"Connection error: {str(err)}")
+    content_type = response.headers.get("content-type")
+    if response.status == 304:
+        sessions.run(context.__aexit__(None, None, None))
+        return forward_validators(response, Response(status=304))
+    if json and (
+        content_type is None or content_type.split(";")[0].strip() != "application/json"
+    ):
+        sessions.run(context.__aexit__(None, None, None))
+        msg = (
+            f"Unsupported Content-Type {content_type} for agent {cluster} URL "
+            f"{agent_request.url}"
+        )
+        logger.error(msg)
+        abort(500, msg)
+    # The connection to the agent is released when the Flask response is closed,
+    # as the generator is not finalized if the response is never iterated (eg. HEAD
+    # requests).
+    release = release_agent_response(sessions, context)
+    proxied = Response(
+        stream_agent_response(sessions, agent_request.agent, response, release),
+        status=response.status,
+        content_type=content_type,
+    )
+    proxied.call_on_close(release)
+    return forward_validators(response, proxied)
 
 
 @check_jwt
@@ -294,6 +439,12 @@ def jobs(cluster: str):
     return proxy_agent(cluster, "jobs", request.token)
 
 
+@check_jwt
+@validate_cluster
+def jobs_changes(cluster: str):
+    return proxy_agent(cluster, "jobs/changes", request.token)
+
+
 @check_jwt
 @validate_cluster
 def job(cluster: str, job: int):
@@ -306,12 +457,44 @@ def nodes(cluster: str):
     return proxy_agent(cluster, "nodes", request.token)
 
 
+@check_jwt
+@validate_cluster
+def nodes_changes(cluster: str):
+    return proxy_agent(cluster, "nodes/changes", request.token)
+
+
 @check_jwt
 @validate_cluster
 def node(cluster: str, name: str):
     return proxy_agent(cluster, f"node/{name}", request.token)
 
 
+@check_jwt
+@validate_cluster
+def events(cluster: str, resource: str):
+    """Return stream of Server-Sent Events with the updates of the resource of the
+    cluster. The events are shared by all clients subscribed to the resource."""
+    if not current_app.settings.events.enabled:
+        abort(501, "Events streams are disabled")
+    if resource not in EVENTS_RESOURCES:
+        abort(404, f"Unsupported events resource {resource}")
+    action = EVENTS_RESOURCES[resource].action
+    if not allowed_action(cluster, action):
+        abort(403, f"Not allowed to receive {resource} events from cluster {cluster}")
+    channel = current_app.events.channel(cluster, resource)
+    subscription = channel.subscribe(
+        request.token,
+        current_app.agents[cluster],
+        request.headers.get("Last-Event-ID"),
+    )
+    return Response(
+        channel.stream(subscription),
+        mimetype="text/event-stream",
+        # Disable buffering of events by reverse proxies.
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @check_jwt
 @validate_cluster
 def partitions(cluster: str):
@@ -371,6 +554,7 @@ def ui_config():
             "AUTHENTICATION": current_app.settings.authentication.enabled,
             "RACKSDB_ROWS_LABELS": current_app.settings.ui.racksdb_rows_labels,
             "RACKSDB_RACKS_LABELS": current_app.settings.ui.racksdb_racks_labels,
+            "EVENTS": current_app.settings.events.enabled,
             "VERSION": get_version(),
         }
     )